@@ -0,0 +1,124 @@
+// Copyright (C) 2023 The FEniCS Project
+//
+// This file is part of DOLFINx (https://www.fenicsproject.org)
+//
+// SPDX-License-Identifier:    LGPL-3.0-or-later
+
+#include "ThreadPool.h"
+#include <utility>
+
+using namespace dolfinx;
+using namespace dolfinx::common;
+
+namespace
+{
+// True while the calling thread executes a task of a pool
+thread_local bool in_task = false;
+} // namespace
+
+//-----------------------------------------------------------------------------
+ThreadPool::~ThreadPool()
+{
+  {
+    std::scoped_lock lock(_mutex);
+    _stop = true;
+  }
+  _start.notify_all();
+}
+//-----------------------------------------------------------------------------
+void ThreadPool::run(int n, const std::function<void(int)>& f)
+{
+  if (n <= 1 or in_task)
+  {
+    for (int i = 0; i < n; ++i)
+      f(i);
+    return;
+  }
+
+  std::scoped_lock run_lock(_run_mutex);
+  {
+    std::scoped_lock lock(_mutex);
+    while (static_cast<int>(_threads.size()) < n - 1)
+      _threads.emplace_back([this]() { work(); });
+    _task = &f;
+    _num_tasks = n;
+    _next = 0;
+    _pending = n;
+    _error = nullptr;
+    ++_generation;
+  }
+  _start.notify_all();
+
+  // The calling thread also executes tasks
+  execute();
+
+  std::unique_lock lock(_mutex);
+  _finished.wait(lock, [this]() { return _pending == 0; });
+  _task = nullptr;
+  if (std::exception_ptr error = std::exchange(_error, nullptr); error)
+    std::rethrow_exception(error);
+}
+//-----------------------------------------------------------------------------
+int ThreadPool::size() const
+{
+  std::scoped_lock lock(_mutex);
+  return _threads.size();
+}
+//-----------------------------------------------------------------------------
+ThreadPool& ThreadPool::pool()
+{
+  static ThreadPool pool;
+  return pool;
+}
+//-----------------------------------------------------------------------------
+void ThreadPool::execute()
+{
+  in_task = true;
+  while (true)
+  {
+    const std::function<void(int)>* task;
+    int i;
+    {
+      std::scoped_lock lock(_mutex);
+      if (!_task or _next >= _num_tasks)
+        break;
+      task = _task;
+      i = _next++;
+    }
+
+    std::exception_ptr error;
+    try
+    {
+      (*task)(i);
+    }
+    catch (...)
+    {
+      error = std::current_exception();
+    }
+
+    std::scoped_lock lock(_mutex);
+    if (error and !_error)
+      _error = error;
+    if (--_pending == 0)
+      _finished.notify_all();
+  }
+  in_task = false;
+}
+//-----------------------------------------------------------------------------
+void ThreadPool::work()
+{
+  std::uint64_t generation = 0;
+  while (true)
+  {
+    {
+      std::unique_lock lock(_mutex);
+      _start.wait(lock, [this, generation]()
+                  { return _stop or _generation != generation; });
+      if (_stop)
+        return;
+      generation = _generation;
+    }
+    execute();
+  }
+}
+//-----------------------------------------------------------------------------
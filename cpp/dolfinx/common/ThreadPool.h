@@ -0,0 +1,87 @@
+// Copyright (C) 2023 The FEniCS Project
+//
+// This file is part of DOLFINx (https://www.fenicsproject.org)
+//
+// SPDX-License-Identifier:    LGPL-3.0-or-later
+
+#pragma once
+
+#include <condition_variable>
+#include <cstdint>
+#include <exception>
+#include <functional>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+namespace dolfinx::common
+{
+
+/// @brief A pool of worker threads that execute tasks `f(0), ...,
+/// f(n - 1)` concurrently.
+///
+/// The worker threads are created when first needed and are reused by
+/// subsequent calls to ThreadPool::run, which avoids the cost of
+/// creating threads in, e.g., each colour of a threaded assembly loop.
+/// An exception thrown by a task is rethrown on the calling thread.
+///
+///   common::ThreadPool::pool().run(num_threads, [&](int t) { ... });
+class ThreadPool
+{
+public:
+  /// Create a pool without worker threads
+  ThreadPool() = default;
+
+  // Copy constructor (deleted)
+  ThreadPool(const ThreadPool&) = delete;
+
+  // Assignment operator (deleted)
+  ThreadPool& operator=(const ThreadPool&) = delete;
+
+  /// Destructor. Stops and joins the worker threads.
+  ~ThreadPool();
+
+  /// @brief Execute the tasks `f(0), ..., f(n - 1)` and wait for them
+  /// to finish.
+  ///
+  /// The tasks are executed by the calling thread and `n - 1` worker
+  /// threads of the pool, which are created if the pool has fewer
+  /// workers. Tasks are executed serially by the calling thread if it
+  /// is itself executing a task of the pool, or if `n` is one.
+  ///
+  /// @param[in] n Number of tasks
+  /// @param[in] f Task function, called with the task index
+  /// @throws The first exception that is thrown by a task, after all
+  /// tasks have finished.
+  void run(int n, const std::function<void(int)>& f);
+
+  /// Return the number of worker threads
+  int size() const;
+
+  /// Return the pool that is shared by the DOLFINx algorithms
+  static ThreadPool& pool();
+
+private:
+  // Execute tasks of the current run until there are none left
+  void execute();
+
+  // Loop of a worker thread
+  void work();
+
+  // Serialises calls to run
+  std::mutex _run_mutex;
+
+  // Protects the data below
+  mutable std::mutex _mutex;
+  std::condition_variable _start, _finished;
+
+  const std::function<void(int)>* _task = nullptr;
+  int _num_tasks = 0, _next = 0, _pending = 0;
+  std::uint64_t _generation = 0;
+  std::exception_ptr _error;
+  bool _stop = false;
+
+  std::vector<std::jthread> _threads;
+};
+
+} // namespace dolfinx::common
@@ -7,14 +7,19 @@
 #pragma once
 
 #include "FunctionSpace.h"
+#include "profiling.h"
 #include <algorithm>
 #include <array>
 #include <concepts>
 #include <dolfinx/common/IndexMap.h>
 #include <dolfinx/common/types.h>
+#include <dolfinx/graph/AdjacencyList.h>
+#include <dolfinx/graph/ordering.h>
 #include <dolfinx/mesh/Mesh.h>
 #include <functional>
+#include <map>
 #include <memory>
+#include <optional>
 #include <span>
 #include <string>
 #include <tuple>
@@ -154,10 +159,12 @@ public:
   kernel(IntegralType type, int i) const
   {
     auto integrals = _integrals[static_cast<std::size_t>(type)];
-    if (auto it = integrals.find(i); it != integrals.end())
-      return it->second.first;
-    else
+    if (auto it = integrals.find(i); it == integrals.end())
       throw std::runtime_error("No kernel for requested domain index.");
+    else if (profiling::enabled())
+      return profiling::timed_kernel(it->second.first);
+    else
+      return it->second.first;
   }
 
   /// @brief Get types of integrals in the form.
@@ -223,6 +230,98 @@ public:
       throw std::runtime_error("No mesh entities for requested domain index.");
   }
 
+  /// @brief Get a colouring of the entities of the ith integral for
+  /// the given domain type.
+  ///
+  /// Entities of the same colour do not share a degree-of-freedom of
+  /// the test space, and can therefore be assembled concurrently. The
+  /// colouring is computed on first use and cached.
+  ///
+  /// @note Not thread-safe on first use.
+  /// @param[in] type Integral domain type
+  /// @param[in] i Integral ID, i.e. (sub)domain index
+  /// @return Adjacency list where the links of node `c` are the
+  /// positions in `domain(type, i)` of the entities with colour `c`
+  const graph::AdjacencyList<std::int32_t>& colouring(IntegralType type,
+                                                      int i) const
+  {
+    if (auto it = _colourings.find({type, i}); it != _colourings.end())
+      return it->second;
+
+    if (_function_spaces.empty())
+      throw std::runtime_error("Cannot colour the domain of a functional.");
+    std::shared_ptr<const DofMap> dofmap = _function_spaces[0]->dofmap();
+    assert(dofmap);
+
+    // Entities are cells, (cell, local facet) pairs or (cell, local
+    // facet, cell, local facet) tuples
+    std::size_t stride = 1;
+    if (type == IntegralType::exterior_facet)
+      stride = 2;
+    else if (type == IntegralType::interior_facet)
+      stride = 4;
+
+    // Build the list of test space dofs that each entity writes to
+    std::span<const std::int32_t> entities = domain(type, i);
+    std::vector<std::int32_t> dofs;
+    std::vector<std::int32_t> offsets(1, 0);
+    offsets.reserve(entities.size() / stride + 1);
+    for (std::size_t e = 0; e < entities.size(); e += stride)
+    {
+      for (std::size_t k = 0; k < stride; k += 2)
+      {
+        std::span<const std::int32_t> cell_dofs
+            = dofmap->cell_dofs(entities[e + k]);
+        dofs.insert(dofs.end(), cell_dofs.begin(), cell_dofs.end());
+      }
+      offsets.push_back(dofs.size());
+    }
+
+    auto [it, inserted] = _colourings.emplace(
+        std::pair(type, i),
+        graph::colour_greedy(graph::AdjacencyList<std::int32_t>(
+            std::move(dofs), std::move(offsets))));
+    return it->second;
+  }
+
+  /// @brief Enable or disable the use of cached cell geometry in
+  /// assembly.
+  ///
+  /// When enabled, assemblers read the cell geometry from
+  /// mesh::Geometry::cell_geometry(), in which the coordinate dofs of
+  /// each cell are stored contiguously in the scalar type of the form
+  /// (see geometry()). This improves memory locality and avoids
+  /// copying the mesh geometry for each assembly if the geometry and
+  /// form scalar types differ. The cached data is shared by all forms
+  /// on the mesh, and is rebuilt when mesh::Geometry::state() has
+  /// changed, i.e. modifications of the mesh geometry must be followed
+  /// by a call to mesh::Geometry::increase_state().
+  /// @param[in] enable True to enable caching
+  void set_geometry_cache(bool enable) { _cache_geometry = enable; }
+
+  /// @brief Check if caching of the cell geometry is enabled, see
+  /// set_geometry_cache().
+  bool geometry_cache() const { return _cache_geometry; }
+
+  /// @brief Get the cached cell geometry.
+  ///
+  /// @note Not thread-safe if the cache needs to be (re)built.
+  /// @return A geometry dofmap and coordinate array to use in place of
+  /// the mesh geometry data, or `std::nullopt` if caching is not
+  /// enabled
+  std::optional<std::pair<
+      std::experimental::mdspan<const std::int32_t,
+                                std::experimental::dextents<std::size_t, 2>>,
+      std::span<const scalar_value_type_t<T>>>>
+  geometry() const
+  {
+    if (!_cache_geometry)
+      return std::nullopt;
+
+    assert(_mesh);
+    return _mesh->geometry().template cell_geometry<scalar_value_type_t<T>>();
+  }
+
   /// Access coefficients
   const std::vector<std::shared_ptr<const Function<T, U>>>& coefficients() const
   {
@@ -255,6 +354,10 @@ public:
     return _constants;
   }
 
+  /// Name, e.g. for identifying the form in profiling data (see
+  /// profiling.h)
+  std::string name = "form";
+
 private:
   using kern = std::function<void(T*, const T*, const T*,
                                   const scalar_value_type_t<T>*, const int*,
@@ -279,5 +382,13 @@ private:
 
   // True if permutation data needs to be passed into these integrals
   bool _needs_facet_permutations;
+
+  // Cached colourings of the integration domains, see colouring()
+  mutable std::map<std::pair<IntegralType, int>,
+                   graph::AdjacencyList<std::int32_t>>
+      _colourings;
+
+  // Use cached cell geometry, see geometry()
+  bool _cache_geometry = false;
 };
 } // namespace dolfinx::fem
@@ -0,0 +1,376 @@
+// Copyright (C) 2023 The FEniCS Project
+//
+// This file is part of DOLFINx (https://www.fenicsproject.org)
+//
+// SPDX-License-Identifier:    LGPL-3.0-or-later
+
+#pragma once
+
+#include "DirichletBC.h"
+#include "DofMap.h"
+#include "Form.h"
+#include "FunctionSpace.h"
+#include "utils.h"
+#include <algorithm>
+#include <array>
+#include <cmath>
+#include <concepts>
+#include <dolfinx/la/utils.h>
+#include <dolfinx/mesh/Geometry.h>
+#include <dolfinx/mesh/Mesh.h>
+#include <dolfinx/mesh/Topology.h>
+#include <functional>
+#include <map>
+#include <memory>
+#include <span>
+#include <stdexcept>
+#include <vector>
+
+namespace dolfinx::fem::impl
+{
+
+namespace stdex = std::experimental;
+using mdspan2_t
+    = stdex::mdspan<const std::int32_t, stdex::dextents<std::size_t, 2>>;
+
+/// @brief Tabulates the sum of all cell integrals of a form on a
+/// single cell.
+///
+/// Constants and coefficients are packed on construction, so the form
+/// data must not change during the lifetime of the tabulator.
+template <typename T, std::floating_point U>
+class CellTabulator
+{
+public:
+  /// @brief Create a tabulator for the cell integrals of a rank-1 or
+  /// rank-2 form
+  /// @param[in] form The form
+  CellTabulator(const Form<T, U>& form) : _form(form)
+  {
+    if (form.rank() < 1 or form.rank() > 2)
+    {
+      throw std::runtime_error(
+          "Cell tabulator requires a rank-1 or rank-2 form.");
+    }
+
+    _constants = pack_constants(form);
+    _coefficients = allocate_coefficient_storage(form);
+    pack_coefficients(form, _coefficients);
+
+    const auto& V = form.function_spaces();
+    for (std::size_t i = 0; i < V.size(); ++i)
+    {
+      _dims[i] = V[i]->dofmap()->bs() * V[i]->dofmap()->map().extent(1);
+      _needs_transformation_data
+          = _needs_transformation_data
+            or V[i]->element()->needs_dof_transformations();
+    }
+
+    _dof_transform
+        = V[0]->element()->template get_dof_transformation_function<T>();
+    if (form.rank() == 2)
+    {
+      _dof_transform_to_transpose
+          = V[1]->element()
+                ->template get_dof_transformation_to_transpose_function<T>();
+    }
+  }
+
+  /// Number of rows of the cell tensor
+  int num_rows() const { return _dims[0]; }
+
+  /// Number of columns of the cell tensor (one for linear forms)
+  int num_cols() const { return _dims[1]; }
+
+  /// True if the dof transformation data (`cell_info`) is required
+  bool needs_transformation_data() const { return _needs_transformation_data; }
+
+  /// @brief Tabulate the cell tensor on cell `c`.
+  /// @param[out] Ae Row-major cell tensor. It is zeroed before the
+  /// integrals are accumulated.
+  /// @param[in] c Local index of the cell
+  /// @param[in] coordinate_dofs Coordinates of the cell geometry nodes
+  /// @param[in] cell_info Cell permutation information
+  /// @return True if any cell integral of the form is active on `c`
+  bool operator()(std::span<T> Ae, std::int32_t c,
+                  std::span<const scalar_value_type_t<T>> coordinate_dofs,
+                  std::span<const std::uint32_t> cell_info) const
+  {
+    std::fill(Ae.begin(), Ae.end(), 0);
+    bool active = false;
+    for (int i : _form.integral_ids(IntegralType::cell))
+    {
+      // Cell integral domains are sorted
+      std::span<const std::int32_t> cells = _form.domain(IntegralType::cell, i);
+      auto it = std::lower_bound(cells.begin(), cells.end(), c);
+      if (it == cells.end() or *it != c)
+        continue;
+
+      auto fn = _form.kernel(IntegralType::cell, i);
+      assert(fn);
+      auto& [coeffs, cstride] = _coefficients.at({IntegralType::cell, i});
+      std::size_t pos = std::distance(cells.begin(), it);
+      fn(Ae.data(), coeffs.data() + pos * cstride, _constants.data(),
+         coordinate_dofs.data(), nullptr, nullptr);
+      active = true;
+    }
+
+    if (active)
+    {
+      _dof_transform(Ae, cell_info, c, _dims[1]);
+      if (_dof_transform_to_transpose)
+        _dof_transform_to_transpose(Ae, cell_info, c, _dims[0]);
+    }
+
+    return active;
+  }
+
+private:
+  const Form<T, U>& _form;
+  std::vector<T> _constants;
+  std::map<std::pair<IntegralType, int>, std::pair<std::vector<T>, int>>
+      _coefficients;
+  std::array<int, 2> _dims = {1, 1};
+  bool _needs_transformation_data = false;
+  std::function<void(const std::span<T>&, const std::span<const std::uint32_t>&,
+                     std::int32_t, int)>
+      _dof_transform, _dof_transform_to_transpose;
+};
+
+/// @brief Assemble the Schur complement of the cell-local unknowns.
+///
+/// For each owned cell on which `a[l][l]` is active, the cell-local
+/// unknowns are eliminated and
+///
+///     S_e = -A_gl A_ll^{-1} A_lg,   r_e = -A_gl A_ll^{-1} b_l
+///
+/// are added to the global matrix and vector. Only cell integrals of
+/// `a[l][l]`, `a[l][g]`, `a[g][l]` and `L[l]` are used. Rows and
+/// columns of `S_e` that are constrained by a Dirichlet condition are
+/// zeroed, and the lifting `-S_e g` is added to `r_e`.
+///
+/// @param[in] mat_add Function for adding values into the matrix
+/// @param[in,out] b The global vector (including ghosts). May be empty.
+/// @param[in] a The 2x2 blocks of the bilinear form
+/// @param[in] L The blocks of the linear form. `L[l]` may be `nullptr`.
+/// @param[in] l Index of the cell-local space (0 or 1)
+/// @param[in] x_dofmap Geometry dofmap
+/// @param[in] x Geometry coordinates
+/// @param[in] bc_marker Dirichlet markers for the global space. May be
+/// empty.
+/// @param[in] bc_values Dirichlet values for the global space. Only
+/// read where `bc_marker` is set.
+template <typename T, std::floating_point U>
+void assemble_condensed(la::MatSet<T> auto mat_add, std::span<T> b,
+                        const std::vector<std::vector<const Form<T, U>*>>& a,
+                        const std::vector<const Form<T, U>*>& L, int l,
+                        mdspan2_t x_dofmap,
+                        std::span<const scalar_value_type_t<T>> x,
+                        std::span<const std::int8_t> bc_marker,
+                        std::span<const T> bc_values)
+{
+  const int g = 1 - l;
+  assert(a[l][l] and a[l][g] and a[g][l]);
+  std::shared_ptr<const mesh::Mesh<U>> mesh = a[l][l]->mesh();
+  assert(mesh);
+
+  CellTabulator<T, U> A_ll(*a[l][l]), A_lg(*a[l][g]), A_gl(*a[g][l]);
+  std::unique_ptr<CellTabulator<T, U>> b_l;
+  if (L.size() > (std::size_t)l and L[l])
+    b_l = std::make_unique<CellTabulator<T, U>>(*L[l]);
+
+  std::span<const std::uint32_t> cell_info;
+  if (A_ll.needs_transformation_data() or A_lg.needs_transformation_data()
+      or A_gl.needs_transformation_data()
+      or (b_l and b_l->needs_transformation_data()))
+  {
+    mesh->topology_mutable()->create_entity_permutations();
+    cell_info = std::span(mesh->topology()->get_cell_permutation_info());
+  }
+
+  auto dofmap_g = a[l][g]->function_spaces().at(1)->dofmap();
+  assert(dofmap_g);
+  auto dofs_g = dofmap_g->map();
+  const int bs_g = dofmap_g->bs();
+  const int num_dofs_g = dofs_g.extent(1);
+  const int nl = A_ll.num_rows();
+  const int ng = A_lg.num_cols();
+
+  std::vector<scalar_value_type_t<T>> coordinate_dofs(3 * x_dofmap.extent(1));
+  std::vector<T> Ae_ll(nl * nl), Ae_lg(nl * ng), Ae_gl(ng * nl), be_l(nl);
+  std::vector<T> X(nl * (ng + 1)), Se(ng * ng), re(ng);
+  std::vector<int> perm(nl);
+
+  const int tdim = mesh->topology()->dim();
+  const std::int32_t num_cells
+      = mesh->topology()->index_map(tdim)->size_local();
+  for (std::int32_t c = 0; c < num_cells; ++c)
+  {
+    // Get cell coordinates/geometry
+    auto x_dofs = stdex::submdspan(x_dofmap, c, stdex::full_extent);
+    for (std::size_t i = 0; i < x_dofs.size(); ++i)
+    {
+      std::copy_n(std::next(x.begin(), 3 * x_dofs[i]), 3,
+                  std::next(coordinate_dofs.begin(), 3 * i));
+    }
+
+    if (!A_ll(Ae_ll, c, coordinate_dofs, cell_info))
+      continue;
+    A_lg(Ae_lg, c, coordinate_dofs, cell_info);
+    A_gl(Ae_gl, c, coordinate_dofs, cell_info);
+    if (b_l)
+      (*b_l)(be_l, c, coordinate_dofs, cell_info);
+    else
+      std::fill(be_l.begin(), be_l.end(), 0);
+
+    // X = A_ll^{-1} [A_lg | b_l]
+    for (int i = 0; i < nl; ++i)
+    {
+      std::copy_n(std::next(Ae_lg.begin(), i * ng), ng,
+                  std::next(X.begin(), i * (ng + 1)));
+      X[i * (ng + 1) + ng] = be_l[i];
+    }
+    la::impl::lu_factor<T>(Ae_ll, perm);
+    la::impl::lu_solve<T>(Ae_ll, perm, X, ng + 1);
+
+    // [S_e | r_e] = -A_gl X
+    std::fill(Se.begin(), Se.end(), 0);
+    std::fill(re.begin(), re.end(), 0);
+    for (int i = 0; i < ng; ++i)
+    {
+      for (int k = 0; k < nl; ++k)
+      {
+        const T aik = Ae_gl[i * nl + k];
+        for (int j = 0; j < ng; ++j)
+          Se[i * ng + j] -= aik * X[k * (ng + 1) + j];
+        re[i] -= aik * X[k * (ng + 1) + ng];
+      }
+    }
+
+    // Lifting and zeroing of constrained rows/columns
+    auto dofs = std::span(dofs_g.data_handle() + c * num_dofs_g, num_dofs_g);
+    if (!bc_marker.empty())
+    {
+      for (int j = 0; j < num_dofs_g; ++j)
+      {
+        for (int k = 0; k < bs_g; ++k)
+        {
+          const std::int32_t dof = bs_g * dofs[j] + k;
+          if (bc_marker[dof])
+          {
+            const int col = bs_g * j + k;
+            for (int i = 0; i < ng; ++i)
+            {
+              re[i] -= Se[i * ng + col] * bc_values[dof];
+              Se[i * ng + col] = 0;
+            }
+            std::fill_n(std::next(Se.begin(), col * ng), ng, 0);
+          }
+        }
+      }
+    }
+
+    mat_add(dofs, dofs, Se);
+    if (!b.empty())
+    {
+      for (int j = 0; j < num_dofs_g; ++j)
+        for (int k = 0; k < bs_g; ++k)
+          b[bs_g * dofs[j] + k] += re[bs_g * j + k];
+    }
+  }
+}
+
+/// @brief Recover the cell-local unknowns from the global solution,
+///
+///     u_l = A_ll^{-1} (b_l - A_lg u_g),
+///
+/// on each owned cell on which `a[l][l]` is active.
+/// @param[in,out] u_l Cell-local solution array
+/// @param[in] u_g Global solution array (including ghosts)
+/// @param[in] a The 2x2 blocks of the bilinear form
+/// @param[in] L The blocks of the linear form. `L[l]` may be `nullptr`.
+/// @param[in] l Index of the cell-local space (0 or 1)
+/// @param[in] x_dofmap Geometry dofmap
+/// @param[in] x Geometry coordinates
+template <typename T, std::floating_point U>
+void backsubstitute_condensed(
+    std::span<T> u_l, std::span<const T> u_g,
+    const std::vector<std::vector<const Form<T, U>*>>& a,
+    const std::vector<const Form<T, U>*>& L, int l, mdspan2_t x_dofmap,
+    std::span<const scalar_value_type_t<T>> x)
+{
+  const int g = 1 - l;
+  assert(a[l][l] and a[l][g]);
+  std::shared_ptr<const mesh::Mesh<U>> mesh = a[l][l]->mesh();
+  assert(mesh);
+
+  CellTabulator<T, U> A_ll(*a[l][l]), A_lg(*a[l][g]);
+  std::unique_ptr<CellTabulator<T, U>> b_l;
+  if (L.size() > (std::size_t)l and L[l])
+    b_l = std::make_unique<CellTabulator<T, U>>(*L[l]);
+
+  std::span<const std::uint32_t> cell_info;
+  if (A_ll.needs_transformation_data() or A_lg.needs_transformation_data()
+      or (b_l and b_l->needs_transformation_data()))
+  {
+    mesh->topology_mutable()->create_entity_permutations();
+    cell_info = std::span(mesh->topology()->get_cell_permutation_info());
+  }
+
+  auto dofmap_l = a[l][l]->function_spaces().at(0)->dofmap();
+  auto dofmap_g = a[l][g]->function_spaces().at(1)->dofmap();
+  assert(dofmap_l and dofmap_g);
+  auto dofs_l = dofmap_l->map();
+  auto dofs_g = dofmap_g->map();
+  const int bs_l = dofmap_l->bs();
+  const int bs_g = dofmap_g->bs();
+  const int num_dofs_l = dofs_l.extent(1);
+  const int num_dofs_g = dofs_g.extent(1);
+  const int nl = A_ll.num_rows();
+  const int ng = A_lg.num_cols();
+
+  std::vector<scalar_value_type_t<T>> coordinate_dofs(3 * x_dofmap.extent(1));
+  std::vector<T> Ae_ll(nl * nl), Ae_lg(nl * ng), be_l(nl);
+  std::vector<int> perm(nl);
+
+  const int tdim = mesh->topology()->dim();
+  const std::int32_t num_cells
+      = mesh->topology()->index_map(tdim)->size_local();
+  for (std::int32_t c = 0; c < num_cells; ++c)
+  {
+    // Get cell coordinates/geometry
+    auto x_dofs = stdex::submdspan(x_dofmap, c, stdex::full_extent);
+    for (std::size_t i = 0; i < x_dofs.size(); ++i)
+    {
+      std::copy_n(std::next(x.begin(), 3 * x_dofs[i]), 3,
+                  std::next(coordinate_dofs.begin(), 3 * i));
+    }
+
+    if (!A_ll(Ae_ll, c, coordinate_dofs, cell_info))
+      continue;
+    A_lg(Ae_lg, c, coordinate_dofs, cell_info);
+    if (b_l)
+      (*b_l)(be_l, c, coordinate_dofs, cell_info);
+    else
+      std::fill(be_l.begin(), be_l.end(), 0);
+
+    // be_l -= A_lg u_g
+    auto cdofs_g = std::span(dofs_g.data_handle() + c * num_dofs_g, num_dofs_g);
+    for (int i = 0; i < nl; ++i)
+    {
+      for (int j = 0; j < num_dofs_g; ++j)
+        for (int k = 0; k < bs_g; ++k)
+          be_l[i] -= Ae_lg[i * ng + bs_g * j + k] * u_g[bs_g * cdofs_g[j] + k];
+    }
+
+    la::impl::lu_factor<T>(Ae_ll, perm);
+    la::impl::lu_solve<T>(Ae_ll, perm, be_l, 1);
+
+    auto cdofs_l = std::span(dofs_l.data_handle() + c * num_dofs_l, num_dofs_l);
+    for (int j = 0; j < num_dofs_l; ++j)
+      for (int k = 0; k < bs_l; ++k)
+        u_l[bs_l * cdofs_l[j] + k] = be_l[bs_l * j + k];
+  }
+}
+
+} // namespace dolfinx::fem::impl
@@ -9,6 +9,7 @@
 #include "DofMap.h"
 #include "Form.h"
 #include "FunctionSpace.h"
+#include "profiling.h"
 #include "utils.h"
 #include <algorithm>
 #include <concepts>
@@ -28,7 +29,9 @@ namespace stdex = std::experimental;
 using mdspan2_t
     = stdex::mdspan<const std::int32_t, stdex::dextents<std::size_t, 2>>;
 
-/// Execute kernel over cells and accumulate result in matrix
+/// Execute kernel over cells and accumulate result in matrix. If
+/// `positions` is not empty, only the cells at these positions in
+/// `cells` are assembled.
 template <typename T>
 void assemble_cells(
     la::MatSet<T> auto mat_set, mdspan2_t x_dofmap,
@@ -44,7 +47,8 @@ void assemble_cells(
     mdspan2_t dofmap1, int bs1, std::span<const std::int8_t> bc0,
     std::span<const std::int8_t> bc1, FEkernel<T> auto kernel,
     std::span<const T> coeffs, int cstride, std::span<const T> constants,
-    std::span<const std::uint32_t> cell_info)
+    std::span<const std::uint32_t> cell_info,
+    std::span<const std::int32_t> positions = {})
 {
   if (cells.empty())
     return;
@@ -59,8 +63,11 @@ void assemble_cells(
   std::vector<scalar_value_type_t<T>> coordinate_dofs(3 * x_dofmap.extent(1));
 
   // Iterate over active cells
-  for (std::size_t index = 0; index < cells.size(); ++index)
+  const std::size_t num_cells
+      = positions.empty() ? cells.size() : positions.size();
+  for (std::size_t p = 0; p < num_cells; ++p)
   {
+    std::size_t index = positions.empty() ? p : positions[p];
     std::int32_t c = cells[index];
 
     // Get cell coordinates/geometry
@@ -120,7 +127,9 @@ void assemble_cells(
   }
 }
 
-/// Execute kernel over exterior facets and  accumulate result in Mat
+/// Execute kernel over exterior facets and  accumulate result in Mat.
+/// If `positions` is not empty, only the facets at these positions in
+/// `facets` are assembled.
 template <typename T>
 void assemble_exterior_facets(
     la::MatSet<T> auto mat_set, mdspan2_t x_dofmap,
@@ -136,7 +145,8 @@ void assemble_exterior_facets(
     mdspan2_t dofmap1, int bs1, std::span<const std::int8_t> bc0,
     std::span<const std::int8_t> bc1, FEkernel<T> auto kernel,
     std::span<const T> coeffs, int cstride, std::span<const T> constants,
-    std::span<const std::uint32_t> cell_info)
+    std::span<const std::uint32_t> cell_info,
+    std::span<const std::int32_t> positions = {})
 {
   if (facets.empty())
     return;
@@ -150,8 +160,11 @@ void assemble_exterior_facets(
   std::vector<T> Ae(ndim0 * ndim1);
   std::span<T> _Ae(Ae);
   assert(facets.size() % 2 == 0);
-  for (std::size_t index = 0; index < facets.size(); index += 2)
+  const std::size_t num_facets
+      = positions.empty() ? facets.size() / 2 : positions.size();
+  for (std::size_t p = 0; p < num_facets; ++p)
   {
+    std::size_t index = 2 * (positions.empty() ? p : positions[p]);
     std::int32_t cell = facets[index];
     std::int32_t local_facet = facets[index + 1];
 
@@ -210,7 +223,9 @@ void assemble_exterior_facets(
   }
 }
 
-/// Execute kernel over interior facets and  accumulate result in Mat
+/// Execute kernel over interior facets and  accumulate result in Mat.
+/// If `positions` is not empty, only the facets at these positions in
+/// `facets` are assembled.
 template <typename T>
 void assemble_interior_facets(
     la::MatSet<T> auto mat_set, mdspan2_t x_dofmap,
@@ -227,7 +242,8 @@ void assemble_interior_facets(
     std::span<const std::int8_t> bc1, FEkernel<T> auto kernel,
     std::span<const T> coeffs, int cstride, std::span<const int> offsets,
     std::span<const T> constants, std::span<const std::uint32_t> cell_info,
-    const std::function<std::uint8_t(std::size_t)>& get_perm)
+    const std::function<std::uint8_t(std::size_t)>& get_perm,
+    std::span<const std::int32_t> positions = {})
 {
   if (facets.empty())
     return;
@@ -246,8 +262,11 @@ void assemble_interior_facets(
   // Temporaries for joint dofmaps
   std::vector<std::int32_t> dmapjoint0, dmapjoint1;
   assert(facets.size() % 4 == 0);
-  for (std::size_t index = 0; index < facets.size(); index += 4)
+  const std::size_t num_facets
+      = positions.empty() ? facets.size() / 4 : positions.size();
+  for (std::size_t p = 0; p < num_facets; ++p)
   {
+    std::size_t index = 4 * (positions.empty() ? p : positions[p]);
     std::array<std::int32_t, 2> cells = {facets[index], facets[index + 2]};
     std::array<std::int32_t, 2> local_facet
         = {facets[index + 1], facets[index + 3]};
@@ -352,17 +371,26 @@ void assemble_interior_facets(
 /// local indices. Rows (bc0) and columns (bc1) with Dirichlet
 /// conditions are zeroed. Markers (bc0 and bc1) can be empty if not bcs
 /// are applied. Matrix is not finalised.
+///
+/// If `num_threads` is greater than one, entities are assembled
+/// concurrently colour-by-colour (see Form::colouring). Concurrent
+/// calls to `mat_set` then never touch the same matrix row, but
+/// `mat_set` must otherwise be safe to call from multiple threads.
 template <typename T, std::floating_point U>
 void assemble_matrix(
     la::MatSet<T> auto mat_set, const Form<T, U>& a, mdspan2_t x_dofmap,
     std::span<const scalar_value_type_t<T>> x, std::span<const T> constants,
     const std::map<std::pair<IntegralType, int>,
                    std::pair<std::span<const T>, int>>& coefficients,
-    std::span<const std::int8_t> bc0, std::span<const std::int8_t> bc1)
+    std::span<const std::int8_t> bc0, std::span<const std::int8_t> bc1,
+    int num_threads = 1)
 {
   std::shared_ptr<const mesh::Mesh<U>> mesh = a.mesh();
   assert(mesh);
 
+  // Insertion time is recorded if profiling is enabled
+  auto mat_set_timed = profiling::timed_insertion(mat_set);
+
   // Get dofmap data
   std::shared_ptr<const fem::DofMap> dofmap0
       = a.function_spaces().at(0)->dofmap();
@@ -404,10 +432,18 @@ void assemble_matrix(
     auto fn = a.kernel(IntegralType::cell, i);
     assert(fn);
     auto& [coeffs, cstride] = coefficients.at({IntegralType::cell, i});
-    impl::assemble_cells(mat_set, x_dofmap, x, a.domain(IntegralType::cell, i),
-                         dof_transform, dofs0, bs0, dof_transform_to_transpose,
-                         dofs1, bs1, bc0, bc1, fn, coeffs, cstride, constants,
-                         cell_info);
+    std::span<const std::int32_t> cells = a.domain(IntegralType::cell, i);
+    for_each_colour(
+        a, IntegralType::cell, i, num_threads,
+        [&, &coeffs = coeffs, cstride = cstride](
+            std::span<const std::int32_t> positions)
+        {
+          impl::assemble_cells(mat_set_timed, x_dofmap, x, cells,
+                               dof_transform, dofs0, bs0,
+                               dof_transform_to_transpose, dofs1, bs1, bc0,
+                               bc1, fn, coeffs, cstride, constants, cell_info,
+                               positions);
+        });
   }
 
   for (int i : a.integral_ids(IntegralType::exterior_facet))
@@ -416,10 +452,18 @@ void assemble_matrix(
     assert(fn);
     auto& [coeffs, cstride]
         = coefficients.at({IntegralType::exterior_facet, i});
-    impl::assemble_exterior_facets(
-        mat_set, x_dofmap, x, a.domain(IntegralType::exterior_facet, i),
-        dof_transform, dofs0, bs0, dof_transform_to_transpose, dofs1, bs1, bc0,
-        bc1, fn, coeffs, cstride, constants, cell_info);
+    std::span<const std::int32_t> facets
+        = a.domain(IntegralType::exterior_facet, i);
+    for_each_colour(
+        a, IntegralType::exterior_facet, i, num_threads,
+        [&, &coeffs = coeffs, cstride = cstride](
+            std::span<const std::int32_t> positions)
+        {
+          impl::assemble_exterior_facets(
+              mat_set_timed, x_dofmap, x, facets, dof_transform, dofs0, bs0,
+              dof_transform_to_transpose, dofs1, bs1, bc0, bc1, fn, coeffs,
+              cstride, constants, cell_info, positions);
+        });
   }
 
   if (a.num_integrals(IntegralType::interior_facet) > 0)
@@ -447,11 +491,19 @@ void assemble_matrix(
       assert(fn);
       auto& [coeffs, cstride]
           = coefficients.at({IntegralType::interior_facet, i});
-      impl::assemble_interior_facets(
-          mat_set, x_dofmap, x, num_cell_facets,
-          a.domain(IntegralType::interior_facet, i), dof_transform, *dofmap0,
-          bs0, dof_transform_to_transpose, *dofmap1, bs1, bc0, bc1, fn, coeffs,
-          cstride, c_offsets, constants, cell_info, get_perm);
+      std::span<const std::int32_t> facets
+          = a.domain(IntegralType::interior_facet, i);
+      for_each_colour(
+          a, IntegralType::interior_facet, i, num_threads,
+          [&, &coeffs = coeffs, cstride = cstride](
+              std::span<const std::int32_t> positions)
+          {
+            impl::assemble_interior_facets(
+                mat_set_timed, x_dofmap, x, num_cell_facets, facets,
+                dof_transform, *dofmap0, bs0, dof_transform_to_transpose,
+                *dofmap1, bs1, bc0, bc1, fn, coeffs, cstride, c_offsets,
+                constants, cell_info, get_perm, positions);
+          });
     }
   }
 }
@@ -9,13 +9,17 @@
 #include "Constant.h"
 #include "Form.h"
 #include "FunctionSpace.h"
+#include "profiling.h"
 #include "utils.h"
 #include <algorithm>
 #include <dolfinx/common/IndexMap.h>
+#include <dolfinx/common/ThreadPool.h>
 #include <dolfinx/mesh/Geometry.h>
 #include <dolfinx/mesh/Mesh.h>
 #include <dolfinx/mesh/Topology.h>
+#include <functional>
 #include <memory>
+#include <numeric>
 #include <vector>
 
 namespace dolfinx::fem::impl
@@ -150,13 +154,39 @@ T assemble_interior_facets(mdspan2_t x_dofmap,
   return value;
 }
 
-/// Assemble functional into an scalar with provided mesh geometry.
+/// Sum `f(e0, e1)` over `num_threads` contiguous ranges `[e0, e1)`
+/// that partition `[0, n)`, with the ranges processed concurrently by
+/// common::ThreadPool::pool(). The order of summation depends on the
+/// number of threads.
+template <typename T, typename F>
+T sum_ranges(std::size_t n, int num_threads, F&& f)
+{
+  if (num_threads <= 1)
+    return f(0, n);
+
+  std::vector<T> values(num_threads, T(0));
+  common::ThreadPool::pool().run(
+      num_threads,
+      [&f, &values, n, num_threads](int t)
+      {
+        auto [e0, e1] = dolfinx::MPI::local_range(t, n, num_threads);
+        values[t] = f(e0, e1);
+      });
+
+  return std::accumulate(values.begin(), values.end(), T(0));
+}
+
+/// Assemble functional into an scalar with provided mesh geometry. If
+/// `num_threads` is greater than one, the entities of each integral
+/// are split into `num_threads` ranges that are assembled
+/// concurrently.
 template <typename T, std::floating_point U>
 T assemble_scalar(
     const fem::Form<T, U>& M, mdspan2_t x_dofmap,
     std::span<const scalar_value_type_t<T>> x, std::span<const T> constants,
     const std::map<std::pair<IntegralType, int>,
-                   std::pair<std::span<const T>, int>>& coefficients)
+                   std::pair<std::span<const T>, int>>& coefficients,
+    int num_threads = 1)
 {
   std::shared_ptr<const mesh::Mesh<U>> mesh = M.mesh();
   assert(mesh);
@@ -168,8 +198,16 @@ T assemble_scalar(
     assert(fn);
     auto& [coeffs, cstride] = coefficients.at({IntegralType::cell, i});
     std::span<const std::int32_t> cells = M.domain(IntegralType::cell, i);
-    value += impl::assemble_cells(x_dofmap, x, cells, fn, constants, coeffs,
-                                  cstride);
+    value += sum_ranges<T>(
+        cells.size(), num_threads,
+        [&, &coeffs = coeffs, cstride = cstride](std::size_t c0,
+                                                 std::size_t c1)
+        {
+          profiling::Scope scope(M.name, IntegralType::cell, i, c1 - c0);
+          return impl::assemble_cells(x_dofmap, x, cells.subspan(c0, c1 - c0),
+                                      fn, constants,
+                                      coeffs.subspan(c0 * cstride), cstride);
+        });
   }
 
   for (int i : M.integral_ids(IntegralType::exterior_facet))
@@ -178,9 +216,19 @@ T assemble_scalar(
     assert(fn);
     auto& [coeffs, cstride]
         = coefficients.at({IntegralType::exterior_facet, i});
-    value += impl::assemble_exterior_facets(
-        x_dofmap, x, M.domain(IntegralType::exterior_facet, i), fn, constants,
-        coeffs, cstride);
+    std::span<const std::int32_t> facets
+        = M.domain(IntegralType::exterior_facet, i);
+    value += sum_ranges<T>(
+        facets.size() / 2, num_threads,
+        [&, &coeffs = coeffs, cstride = cstride](std::size_t f0,
+                                                 std::size_t f1)
+        {
+          profiling::Scope scope(M.name, IntegralType::exterior_facet, i,
+                                 f1 - f0);
+          return impl::assemble_exterior_facets(
+              x_dofmap, x, facets.subspan(2 * f0, 2 * (f1 - f0)), fn,
+              constants, coeffs.subspan(f0 * cstride), cstride);
+        });
   }
 
   if (M.num_integrals(IntegralType::interior_facet) > 0)
@@ -200,14 +248,253 @@ T assemble_scalar(
       assert(fn);
       auto& [coeffs, cstride]
           = coefficients.at({IntegralType::interior_facet, i});
-      value += impl::assemble_interior_facets(
-          x_dofmap, x, num_cell_facets,
-          M.domain(IntegralType::interior_facet, i), fn, constants, coeffs,
-          cstride, c_offsets, perms);
+      std::span<const std::int32_t> facets
+          = M.domain(IntegralType::interior_facet, i);
+      value += sum_ranges<T>(
+          facets.size() / 4, num_threads,
+          [&, &coeffs = coeffs, cstride = cstride](std::size_t f0,
+                                                   std::size_t f1)
+          {
+            profiling::Scope scope(M.name, IntegralType::interior_facet, i,
+                                   f1 - f0);
+            return impl::assemble_interior_facets(
+                x_dofmap, x, num_cell_facets,
+                facets.subspan(4 * f0, 4 * (f1 - f0)), fn, constants,
+                coeffs.subspan(2 * f0 * cstride), cstride, c_offsets, perms);
+          });
     }
   }
 
   return value;
 }
 
+/// Kernel and packed data of an integral of a functional that is
+/// assembled together with other functionals
+template <typename T>
+struct ScalarIntegral
+{
+  /// Integral kernel
+  std::function<void(T*, const T*, const T*, const scalar_value_type_t<T>*,
+                     const int*, const std::uint8_t*)>
+      fn;
+
+  /// Constants of the functional
+  std::span<const T> constants;
+
+  /// Packed coefficients of the integral and the number of coefficient
+  /// values per entity
+  std::span<const T> coeffs;
+  int cstride;
+
+  /// Position of the functional in the list of functionals
+  std::size_t index;
+};
+
+/// Group the integrals of type `type` of the functionals `M` by
+/// integration domain. Integrals over domains with the same entities
+/// (in the same order) are put in the same group, so that the mesh
+/// entities are traversed only once for each group.
+template <typename T, std::floating_point U>
+std::vector<std::pair<std::span<const std::int32_t>,
+                      std::vector<ScalarIntegral<T>>>>
+group_integrals(
+    IntegralType type,
+    const std::vector<std::reference_wrapper<const Form<T, U>>>& M,
+    const std::vector<std::span<const T>>& constants,
+    const std::vector<std::map<std::pair<IntegralType, int>,
+                               std::pair<std::span<const T>, int>>>&
+        coefficients)
+{
+  std::vector<std::pair<std::span<const std::int32_t>,
+                        std::vector<ScalarIntegral<T>>>>
+      groups;
+  for (std::size_t k = 0; k < M.size(); ++k)
+  {
+    const Form<T, U>& form = M[k].get();
+    for (int i : form.integral_ids(type))
+    {
+      std::span<const std::int32_t> entities = form.domain(type, i);
+      auto& [coeffs, cstride] = coefficients[k].at({type, i});
+      ScalarIntegral<T> integral{form.kernel(type, i), constants[k], coeffs,
+                                 cstride, k};
+      assert(integral.fn);
+
+      auto it = std::find_if(groups.begin(), groups.end(),
+                             [&entities](auto& g)
+                             { return std::ranges::equal(g.first, entities); });
+      if (it == groups.end())
+        groups.push_back({entities, {integral}});
+      else
+        it->second.push_back(integral);
+    }
+  }
+
+  return groups;
+}
+
+/// Assemble the integrals of several functionals over the same
+/// entities `[e0, e1)` of an integration domain, and add the result of
+/// integral `j` to `values[j]`. The coordinate dofs of each cell are
+/// gathered once for all integrals.
+/// @param[in] type The integral type
+/// @param[in,out] values Value of each integral
+/// @param[in] x_dofmap Geometry dofmap
+/// @param[in] x Geometry coordinates
+/// @param[in] entities The integration domain, i.e. cells, (cell, local
+/// facet) pairs or pairs of (cell, local facet) pairs
+/// @param[in] e0 First entity to assemble
+/// @param[in] e1 One past the last entity to assemble
+/// @param[in] integrals Integrals to assemble
+/// @param[in] num_cell_facets Number of facets of a cell (interior
+/// facet integrals only)
+/// @param[in] perms Facet permutations (interior facet integrals only)
+template <typename T>
+void assemble_entities(IntegralType type, std::span<T> values,
+                       mdspan2_t x_dofmap,
+                       std::span<const scalar_value_type_t<T>> x,
+                       std::span<const std::int32_t> entities, std::size_t e0,
+                       std::size_t e1,
+                       std::span<const ScalarIntegral<T>> integrals,
+                       int num_cell_facets = 0,
+                       std::span<const std::uint8_t> perms = {})
+{
+  assert(values.size() == integrals.size());
+  const std::size_t num_dofs_g = x_dofmap.extent(1);
+  std::vector<scalar_value_type_t<T>> coordinate_dofs(2 * 3 * num_dofs_g);
+  auto copy_cell = [&](std::int32_t c, std::size_t pos)
+  {
+    auto x_dofs = stdex::submdspan(x_dofmap, c, stdex::full_extent);
+    for (std::size_t i = 0; i < x_dofs.size(); ++i)
+    {
+      std::copy_n(std::next(x.begin(), 3 * x_dofs[i]), 3,
+                  std::next(coordinate_dofs.begin(), 3 * (pos + i)));
+    }
+  };
+
+  switch (type)
+  {
+  case IntegralType::cell:
+    for (std::size_t e = e0; e < e1; ++e)
+    {
+      copy_cell(entities[e], 0);
+      for (std::size_t j = 0; j < integrals.size(); ++j)
+      {
+        auto& I = integrals[j];
+        I.fn(&values[j], I.coeffs.data() + e * I.cstride, I.constants.data(),
+             coordinate_dofs.data(), nullptr, nullptr);
+      }
+    }
+    break;
+  case IntegralType::exterior_facet:
+    for (std::size_t e = e0; e < e1; ++e)
+    {
+      std::int32_t local_facet = entities[2 * e + 1];
+      copy_cell(entities[2 * e], 0);
+      for (std::size_t j = 0; j < integrals.size(); ++j)
+      {
+        auto& I = integrals[j];
+        I.fn(&values[j], I.coeffs.data() + e * I.cstride, I.constants.data(),
+             coordinate_dofs.data(), &local_facet, nullptr);
+      }
+    }
+    break;
+  case IntegralType::interior_facet:
+    for (std::size_t e = e0; e < e1; ++e)
+    {
+      std::array<std::int32_t, 2> cells
+          = {entities[4 * e], entities[4 * e + 2]};
+      std::array<std::int32_t, 2> local_facet
+          = {entities[4 * e + 1], entities[4 * e + 3]};
+      copy_cell(cells[0], 0);
+      copy_cell(cells[1], num_dofs_g);
+      const std::array perm{
+          perms[cells[0] * num_cell_facets + local_facet[0]],
+          perms[cells[1] * num_cell_facets + local_facet[1]]};
+      for (std::size_t j = 0; j < integrals.size(); ++j)
+      {
+        auto& I = integrals[j];
+        I.fn(&values[j], I.coeffs.data() + 2 * e * I.cstride,
+             I.constants.data(), coordinate_dofs.data(), local_facet.data(),
+             perm.data());
+      }
+    }
+    break;
+  default:
+    throw std::runtime_error("Unsupported integral type");
+  }
+}
+
+/// Assemble several functionals, defined on the same mesh, with
+/// provided mesh geometry. The integrals of all functionals over the
+/// same integration domain are assembled in one pass over the domain.
+/// If `num_threads` is greater than one, the entities of each domain
+/// are split into `num_threads` ranges that are assembled
+/// concurrently.
+template <typename T, std::floating_point U>
+std::vector<T> assemble_scalars(
+    const std::vector<std::reference_wrapper<const Form<T, U>>>& M,
+    mdspan2_t x_dofmap, std::span<const scalar_value_type_t<T>> x,
+    const std::vector<std::span<const T>>& constants,
+    const std::vector<std::map<std::pair<IntegralType, int>,
+                               std::pair<std::span<const T>, int>>>&
+        coefficients,
+    int num_threads = 1)
+{
+  std::vector<T> values(M.size(), 0);
+  if (M.empty())
+    return values;
+
+  std::shared_ptr<const mesh::Mesh<U>> mesh = M.front().get().mesh();
+  assert(mesh);
+  int num_cell_facets = 0;
+  std::span<const std::uint8_t> perms;
+  auto has_interior_facets = [](auto& form)
+  { return form.get().num_integrals(IntegralType::interior_facet) > 0; };
+  if (std::any_of(M.begin(), M.end(), has_interior_facets))
+  {
+    mesh->topology_mutable()->create_entity_permutations();
+    perms = mesh->topology()->get_facet_permutations();
+    auto cell_types = mesh->topology()->cell_types();
+    if (cell_types.size() > 1)
+      throw std::runtime_error("Multiple cell types in the assembler");
+    num_cell_facets = mesh::cell_num_entities(cell_types.back(),
+                                              mesh->topology()->dim() - 1);
+  }
+
+  for (auto [type, entity_size] :
+       {std::pair(IntegralType::cell, 1),
+        std::pair(IntegralType::exterior_facet, 2),
+        std::pair(IntegralType::interior_facet, 4)})
+  {
+    for (auto& [entities, integrals] :
+         group_integrals(type, M, constants, coefficients))
+    {
+      const std::size_t num_entities = entities.size() / entity_size;
+      const int nt = std::max<int>(
+          1, std::min<std::size_t>(num_threads, num_entities));
+      std::vector<T> local(nt * integrals.size(), 0);
+      common::ThreadPool::pool().run(
+          nt,
+          [&, nt, num_entities, type = type, &entities = entities,
+           &integrals = integrals](int t)
+          {
+            auto [e0, e1] = dolfinx::MPI::local_range(t, num_entities, nt);
+            assemble_entities<T>(
+                type,
+                std::span(local.data() + t * integrals.size(),
+                          integrals.size()),
+                x_dofmap, x, entities, e0, e1,
+                std::span<const ScalarIntegral<T>>(integrals),
+                num_cell_facets, perms);
+          });
+
+      for (int t = 0; t < nt; ++t)
+        for (std::size_t j = 0; j < integrals.size(); ++j)
+          values[integrals[j].index] += local[t * integrals.size() + j];
+    }
+  }
+
+  return values;
+}
+
 } // namespace dolfinx::fem::impl
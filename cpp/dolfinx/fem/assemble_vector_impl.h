@@ -11,6 +11,7 @@
 #include "DofMap.h"
 #include "Form.h"
 #include "FunctionSpace.h"
+#include "profiling.h"
 #include "utils.h"
 #include <algorithm>
 #include <concepts>
@@ -479,6 +480,14 @@ void _lift_bc_interior_facets(
 /// less than zero the block size is determined at runtime. If `_bs` is
 /// positive the block size is used as a compile-time constant, which
 /// has performance benefits.
+///
+/// If `positions` is not empty, only the entities at these positions
+/// in the integration domain are assembled.
+///
+/// If `num_rhs` is greater than one, `b`, `constants` and `coeffs` hold
+/// `num_rhs` contiguous blocks of equal size and the form is assembled
+/// into each block of `b` using the corresponding blocks of `constants`
+/// and `coeffs`. The entity geometry is gathered once for all blocks.
 template <typename T, int _bs = -1>
 void assemble_cells(
     const std::function<void(const std::span<T>&,
@@ -489,7 +498,8 @@ void assemble_cells(
     std::span<const std::int32_t> cells, mdspan2_t dofmap, int bs,
     FEkernel<T> auto kernel, std::span<const T> constants,
     std::span<const T> coeffs, int cstride,
-    std::span<const std::uint32_t> cell_info)
+    std::span<const std::uint32_t> cell_info,
+    std::span<const std::int32_t> positions = {}, int num_rhs = 1)
 {
   assert(_bs < 0 or _bs == bs);
 
@@ -502,9 +512,18 @@ void assemble_cells(
   std::vector<T> be(bs * dofmap.extent(1));
   std::span<T> _be(be);
 
+  // Size of the data for each right-hand side
+  assert(num_rhs > 0);
+  const std::size_t b_size = b.size() / num_rhs;
+  const std::size_t coeffs_size = coeffs.size() / num_rhs;
+  const std::size_t constants_size = constants.size() / num_rhs;
+
   // Iterate over active cells
-  for (std::size_t index = 0; index < cells.size(); ++index)
+  const std::size_t num_cells
+      = positions.empty() ? cells.size() : positions.size();
+  for (std::size_t p = 0; p < num_cells; ++p)
   {
+    std::size_t index = positions.empty() ? p : positions[p];
     std::int32_t c = cells[index];
 
     // Get cell coordinates/geometry
@@ -515,25 +534,30 @@ void assemble_cells(
                   std::next(coordinate_dofs.begin(), 3 * i));
     }
 
-    // Tabulate vector for cell
-    std::fill(be.begin(), be.end(), 0);
-    kernel(be.data(), coeffs.data() + index * cstride, constants.data(),
-           coordinate_dofs.data(), nullptr, nullptr);
-    dof_transform(_be, cell_info, c, 1);
-
-    // Scatter cell vector to 'global' vector array
     auto dofs = stdex::submdspan(dofmap, c, stdex::full_extent);
-    if constexpr (_bs > 0)
+    for (int r = 0; r < num_rhs; ++r)
     {
-      for (std::size_t i = 0; i < dofs.size(); ++i)
-        for (int k = 0; k < _bs; ++k)
-          b[_bs * dofs[i] + k] += be[_bs * i + k];
-    }
-    else
-    {
-      for (std::size_t i = 0; i < dofs.size(); ++i)
-        for (int k = 0; k < bs; ++k)
-          b[bs * dofs[i] + k] += be[bs * i + k];
+      // Tabulate vector for cell
+      std::fill(be.begin(), be.end(), 0);
+      kernel(be.data(), coeffs.data() + r * coeffs_size + index * cstride,
+             constants.data() + r * constants_size, coordinate_dofs.data(),
+             nullptr, nullptr);
+      dof_transform(_be, cell_info, c, 1);
+
+      // Scatter cell vector to 'global' vector array
+      T* br = b.data() + r * b_size;
+      if constexpr (_bs > 0)
+      {
+        for (std::size_t i = 0; i < dofs.size(); ++i)
+          for (int k = 0; k < _bs; ++k)
+            br[_bs * dofs[i] + k] += be[_bs * i + k];
+      }
+      else
+      {
+        for (std::size_t i = 0; i < dofs.size(); ++i)
+          for (int k = 0; k < bs; ++k)
+            br[bs * dofs[i] + k] += be[bs * i + k];
+      }
     }
   }
 }
@@ -544,6 +568,14 @@ void assemble_cells(
 /// less than zero the block size is determined at runtime. If `_bs` is
 /// positive the block size is used as a compile-time constant, which
 /// has performance benefits.
+///
+/// If `positions` is not empty, only the entities at these positions
+/// in the integration domain are assembled.
+///
+/// If `num_rhs` is greater than one, `b`, `constants` and `coeffs` hold
+/// `num_rhs` contiguous blocks of equal size and the form is assembled
+/// into each block of `b` using the corresponding blocks of `constants`
+/// and `coeffs`. The entity geometry is gathered once for all blocks.
 template <typename T, int _bs = -1>
 void assemble_exterior_facets(
     const std::function<void(const std::span<T>&,
@@ -554,7 +586,8 @@ void assemble_exterior_facets(
     std::span<const std::int32_t> facets, mdspan2_t dofmap, int bs,
     FEkernel<T> auto fn, std::span<const T> constants,
     std::span<const T> coeffs, int cstride,
-    std::span<const std::uint32_t> cell_info)
+    std::span<const std::uint32_t> cell_info,
+    std::span<const std::int32_t> positions = {}, int num_rhs = 1)
 {
   assert(_bs < 0 or _bs == bs);
 
@@ -567,9 +600,19 @@ void assemble_exterior_facets(
   std::vector<scalar_value_type_t<T>> coordinate_dofs(3 * x_dofmap.extent(1));
   std::vector<T> be(bs * num_dofs);
   std::span<T> _be(be);
+
+  // Size of the data for each right-hand side
+  assert(num_rhs > 0);
+  const std::size_t b_size = b.size() / num_rhs;
+  const std::size_t coeffs_size = coeffs.size() / num_rhs;
+  const std::size_t constants_size = constants.size() / num_rhs;
+
   assert(facets.size() % 2 == 0);
-  for (std::size_t index = 0; index < facets.size(); index += 2)
+  const std::size_t num_facets
+      = positions.empty() ? facets.size() / 2 : positions.size();
+  for (std::size_t p = 0; p < num_facets; ++p)
   {
+    std::size_t index = 2 * (positions.empty() ? p : positions[p]);
     std::int32_t cell = facets[index];
     std::int32_t local_facet = facets[index + 1];
 
@@ -581,26 +624,31 @@ void assemble_exterior_facets(
                   std::next(coordinate_dofs.begin(), 3 * i));
     }
 
-    // Tabulate element vector
-    std::fill(be.begin(), be.end(), 0);
-    fn(be.data(), coeffs.data() + index / 2 * cstride, constants.data(),
-       coordinate_dofs.data(), &local_facet, nullptr);
-
-    dof_transform(_be, cell_info, cell, 1);
-
-    // Add element vector to global vector
     auto dofs = stdex::submdspan(dofmap, cell, stdex::full_extent);
-    if constexpr (_bs > 0)
-    {
-      for (std::size_t i = 0; i < dofs.size(); ++i)
-        for (int k = 0; k < _bs; ++k)
-          b[_bs * dofs[i] + k] += be[_bs * i + k];
-    }
-    else
+    for (int r = 0; r < num_rhs; ++r)
     {
-      for (std::size_t i = 0; i < dofs.size(); ++i)
-        for (int k = 0; k < bs; ++k)
-          b[bs * dofs[i] + k] += be[bs * i + k];
+      // Tabulate element vector
+      std::fill(be.begin(), be.end(), 0);
+      fn(be.data(), coeffs.data() + r * coeffs_size + index / 2 * cstride,
+         constants.data() + r * constants_size, coordinate_dofs.data(),
+         &local_facet, nullptr);
+
+      dof_transform(_be, cell_info, cell, 1);
+
+      // Add element vector to global vector
+      T* br = b.data() + r * b_size;
+      if constexpr (_bs > 0)
+      {
+        for (std::size_t i = 0; i < dofs.size(); ++i)
+          for (int k = 0; k < _bs; ++k)
+            br[_bs * dofs[i] + k] += be[_bs * i + k];
+      }
+      else
+      {
+        for (std::size_t i = 0; i < dofs.size(); ++i)
+          for (int k = 0; k < bs; ++k)
+            br[bs * dofs[i] + k] += be[bs * i + k];
+      }
     }
   }
 }
@@ -611,6 +659,14 @@ void assemble_exterior_facets(
 /// less than zero the block size is determined at runtime. If `_bs` is
 /// positive the block size is used as a compile-time constant, which
 /// has performance benefits.
+///
+/// If `positions` is not empty, only the entities at these positions
+/// in the integration domain are assembled.
+///
+/// If `num_rhs` is greater than one, `b`, `constants` and `coeffs` hold
+/// `num_rhs` contiguous blocks of equal size and the form is assembled
+/// into each block of `b` using the corresponding blocks of `constants`
+/// and `coeffs`. The entity geometry is gathered once for all blocks.
 template <typename T, int _bs = -1>
 void assemble_interior_facets(
     const std::function<void(const std::span<T>&,
@@ -622,7 +678,8 @@ void assemble_interior_facets(
     FEkernel<T> auto fn, std::span<const T> constants,
     std::span<const T> coeffs, int cstride,
     std::span<const std::uint32_t> cell_info,
-    const std::function<std::uint8_t(std::size_t)>& get_perm)
+    const std::function<std::uint8_t(std::size_t)>& get_perm,
+    std::span<const std::int32_t> positions = {}, int num_rhs = 1)
 {
   // Create data structures used in assembly
   using X = scalar_value_type_t<T>;
@@ -634,9 +691,19 @@ void assemble_interior_facets(
 
   const int bs = dofmap.bs();
   assert(_bs < 0 or _bs == bs);
+
+  // Size of the data for each right-hand side
+  assert(num_rhs > 0);
+  const std::size_t b_size = b.size() / num_rhs;
+  const std::size_t coeffs_size = coeffs.size() / num_rhs;
+  const std::size_t constants_size = constants.size() / num_rhs;
+
   assert(facets.size() % 4 == 0);
-  for (std::size_t index = 0; index < facets.size(); index += 4)
+  const std::size_t num_facets
+      = positions.empty() ? facets.size() / 4 : positions.size();
+  for (std::size_t p = 0; p < num_facets; ++p)
   {
+    std::size_t index = 4 * (positions.empty() ? p : positions[p]);
     std::array<std::int32_t, 2> cells = {facets[index], facets[index + 2]};
     std::array<std::int32_t, 2> local_facet
         = {facets[index + 1], facets[index + 3]};
@@ -659,39 +726,44 @@ void assemble_interior_facets(
     std::span<const std::int32_t> dmap0 = dofmap.cell_dofs(cells[0]);
     std::span<const std::int32_t> dmap1 = dofmap.cell_dofs(cells[1]);
 
-    // Tabulate element vector
     be.resize(bs * (dmap0.size() + dmap1.size()));
-    std::fill(be.begin(), be.end(), 0);
     const std::array perm{
         get_perm(cells[0] * num_cell_facets + local_facet[0]),
         get_perm(cells[1] * num_cell_facets + local_facet[1])};
-    fn(be.data(), coeffs.data() + index / 2 * cstride, constants.data(),
-       coordinate_dofs.data(), local_facet.data(), perm.data());
+    for (int r = 0; r < num_rhs; ++r)
+    {
+      // Tabulate element vector
+      std::fill(be.begin(), be.end(), 0);
+      fn(be.data(), coeffs.data() + r * coeffs_size + index / 2 * cstride,
+         constants.data() + r * constants_size, coordinate_dofs.data(),
+         local_facet.data(), perm.data());
 
-    std::span<T> _be(be);
-    std::span<T> sub_be = _be.subspan(bs * dmap0.size(), bs * dmap1.size());
+      std::span<T> _be(be);
+      std::span<T> sub_be = _be.subspan(bs * dmap0.size(), bs * dmap1.size());
 
-    dof_transform(be, cell_info, cells[0], 1);
-    dof_transform(sub_be, cell_info, cells[1], 1);
+      dof_transform(be, cell_info, cells[0], 1);
+      dof_transform(sub_be, cell_info, cells[1], 1);
 
-    // Add element vector to global vector
-    if constexpr (_bs > 0)
-    {
-      for (std::size_t i = 0; i < dmap0.size(); ++i)
-        for (int k = 0; k < _bs; ++k)
-          b[_bs * dmap0[i] + k] += be[_bs * i + k];
-      for (std::size_t i = 0; i < dmap1.size(); ++i)
-        for (int k = 0; k < _bs; ++k)
-          b[_bs * dmap1[i] + k] += be[_bs * (i + dmap0.size()) + k];
-    }
-    else
-    {
-      for (std::size_t i = 0; i < dmap0.size(); ++i)
-        for (int k = 0; k < bs; ++k)
-          b[bs * dmap0[i] + k] += be[bs * i + k];
-      for (std::size_t i = 0; i < dmap1.size(); ++i)
-        for (int k = 0; k < bs; ++k)
-          b[bs * dmap1[i] + k] += be[bs * (i + dmap0.size()) + k];
+      // Add element vector to global vector
+      T* br = b.data() + r * b_size;
+      if constexpr (_bs > 0)
+      {
+        for (std::size_t i = 0; i < dmap0.size(); ++i)
+          for (int k = 0; k < _bs; ++k)
+            br[_bs * dmap0[i] + k] += be[_bs * i + k];
+        for (std::size_t i = 0; i < dmap1.size(); ++i)
+          for (int k = 0; k < _bs; ++k)
+            br[_bs * dmap1[i] + k] += be[_bs * (i + dmap0.size()) + k];
+      }
+      else
+      {
+        for (std::size_t i = 0; i < dmap0.size(); ++i)
+          for (int k = 0; k < bs; ++k)
+            br[bs * dmap0[i] + k] += be[bs * i + k];
+        for (std::size_t i = 0; i < dmap1.size(); ++i)
+          for (int k = 0; k < bs; ++k)
+            br[bs * dmap1[i] + k] += be[bs * (i + dmap0.size()) + k];
+      }
     }
   }
 }
@@ -764,6 +836,7 @@ void lift_bc(std::span<T> b, const Form<T, U>& a, mdspan2_t x_dofmap,
     assert(kernel);
     auto& [coeffs, cstride] = coefficients.at({IntegralType::cell, i});
     std::span<const std::int32_t> cells = a.domain(IntegralType::cell, i);
+    profiling::Scope scope(a.name, IntegralType::cell, i, cells.size());
     if (bs0 == 1 and bs1 == 1)
     {
       _lift_bc_cells<T, 1, 1>(b, x_dofmap, x, kernel, cells, dof_transform,
@@ -793,11 +866,14 @@ void lift_bc(std::span<T> b, const Form<T, U>& a, mdspan2_t x_dofmap,
     assert(kernel);
     auto& [coeffs, cstride]
         = coefficients.at({IntegralType::exterior_facet, i});
-    _lift_bc_exterior_facets(
-        b, x_dofmap, x, kernel, a.domain(IntegralType::exterior_facet, i),
-        dof_transform, dofmap0, bs0, dof_transform_to_transpose, dofmap1, bs1,
-        constants, coeffs, cstride, cell_info, bc_values1, bc_markers1, x0,
-        scale);
+    std::span<const std::int32_t> facets
+        = a.domain(IntegralType::exterior_facet, i);
+    profiling::Scope scope(a.name, IntegralType::exterior_facet, i,
+                           facets.size() / 2);
+    _lift_bc_exterior_facets(b, x_dofmap, x, kernel, facets, dof_transform,
+                             dofmap0, bs0, dof_transform_to_transpose, dofmap1,
+                             bs1, constants, coeffs, cstride, cell_info,
+                             bc_values1, bc_markers1, x0, scale);
   }
 
   if (a.num_integrals(IntegralType::interior_facet) > 0)
@@ -824,11 +900,15 @@ void lift_bc(std::span<T> b, const Form<T, U>& a, mdspan2_t x_dofmap,
       assert(kernel);
       auto& [coeffs, cstride]
           = coefficients.at({IntegralType::interior_facet, i});
+      std::span<const std::int32_t> facets
+          = a.domain(IntegralType::interior_facet, i);
+      profiling::Scope scope(a.name, IntegralType::interior_facet, i,
+                             facets.size() / 4);
       _lift_bc_interior_facets(
-          b, x_dofmap, x, num_cell_facets, kernel,
-          a.domain(IntegralType::interior_facet, i), dof_transform, dofmap0,
-          bs0, dof_transform_to_transpose, dofmap1, bs1, constants, coeffs,
-          cstride, cell_info, get_perm, bc_values1, bc_markers1, x0, scale);
+          b, x_dofmap, x, num_cell_facets, kernel, facets, dof_transform,
+          dofmap0, bs0, dof_transform_to_transpose, dofmap1, bs1, constants,
+          coeffs, cstride, cell_info, get_perm, bc_values1, bc_markers1, x0,
+          scale);
     }
   }
 }
@@ -922,12 +1002,19 @@ void apply_lifting(
 /// @param[in] x Mesh coordinates
 /// @param[in] constants Packed constants that appear in `L`
 /// @param[in] coefficients Packed coefficients that appear in `L`
+/// @param[in] num_threads Number of threads. If greater than one,
+/// entities are assembled concurrently colour-by-colour (see
+/// Form::colouring).
+/// @param[in] num_rhs Number of right-hand sides. `b`, `constants` and
+/// each coefficient array hold `num_rhs` contiguous blocks, one for
+/// each right-hand side.
 template <typename T, std::floating_point U>
 void assemble_vector(
     std::span<T> b, const Form<T, U>& L, mdspan2_t x_dofmap,
     std::span<const scalar_value_type_t<T>> x, std::span<const T> constants,
     const std::map<std::pair<IntegralType, int>,
-                   std::pair<std::span<const T>, int>>& coefficients)
+                   std::pair<std::span<const T>, int>>& coefficients,
+    int num_threads = 1, int num_rhs = 1)
 {
   std::shared_ptr<const mesh::Mesh<U>> mesh = L.mesh();
   assert(mesh);
@@ -962,21 +1049,30 @@ void assemble_vector(
     assert(fn);
     auto& [coeffs, cstride] = coefficients.at({IntegralType::cell, i});
     std::span<const std::int32_t> cells = L.domain(IntegralType::cell, i);
-    if (bs == 1)
-    {
-      impl::assemble_cells<T, 1>(dof_transform, b, x_dofmap, x, cells, dofs, bs,
-                                 fn, constants, coeffs, cstride, cell_info);
-    }
-    else if (bs == 3)
-    {
-      impl::assemble_cells<T, 3>(dof_transform, b, x_dofmap, x, cells, dofs, bs,
-                                 fn, constants, coeffs, cstride, cell_info);
-    }
-    else
-    {
-      impl::assemble_cells(dof_transform, b, x_dofmap, x, cells, dofs, bs, fn,
-                           constants, coeffs, cstride, cell_info);
-    }
+    for_each_colour(
+        L, IntegralType::cell, i, num_threads,
+        [&, &coeffs = coeffs, cstride = cstride](
+            std::span<const std::int32_t> positions)
+        {
+          if (bs == 1)
+          {
+            impl::assemble_cells<T, 1>(dof_transform, b, x_dofmap, x, cells,
+                                       dofs, bs, fn, constants, coeffs,
+                                       cstride, cell_info, positions, num_rhs);
+          }
+          else if (bs == 3)
+          {
+            impl::assemble_cells<T, 3>(dof_transform, b, x_dofmap, x, cells,
+                                       dofs, bs, fn, constants, coeffs,
+                                       cstride, cell_info, positions, num_rhs);
+          }
+          else
+          {
+            impl::assemble_cells(dof_transform, b, x_dofmap, x, cells, dofs,
+                                 bs, fn, constants, coeffs, cstride, cell_info,
+                                 positions, num_rhs);
+          }
+        });
   }
 
   for (int i : L.integral_ids(IntegralType::exterior_facet))
@@ -987,24 +1083,30 @@ void assemble_vector(
         = coefficients.at({IntegralType::exterior_facet, i});
     std::span<const std::int32_t> facets
         = L.domain(IntegralType::exterior_facet, i);
-    if (bs == 1)
-    {
-      impl::assemble_exterior_facets<T, 1>(dof_transform, b, x_dofmap, x,
-                                           facets, dofs, bs, fn, constants,
-                                           coeffs, cstride, cell_info);
-    }
-    else if (bs == 3)
-    {
-      impl::assemble_exterior_facets<T, 3>(dof_transform, b, x_dofmap, x,
-                                           facets, dofs, bs, fn, constants,
-                                           coeffs, cstride, cell_info);
-    }
-    else
-    {
-      impl::assemble_exterior_facets(dof_transform, b, x_dofmap, x, facets,
-                                     dofs, bs, fn, constants, coeffs, cstride,
-                                     cell_info);
-    }
+    for_each_colour(
+        L, IntegralType::exterior_facet, i, num_threads,
+        [&, &coeffs = coeffs, cstride = cstride](
+            std::span<const std::int32_t> positions)
+        {
+          if (bs == 1)
+          {
+            impl::assemble_exterior_facets<T, 1>(
+                dof_transform, b, x_dofmap, x, facets, dofs, bs, fn, constants,
+                coeffs, cstride, cell_info, positions, num_rhs);
+          }
+          else if (bs == 3)
+          {
+            impl::assemble_exterior_facets<T, 3>(
+                dof_transform, b, x_dofmap, x, facets, dofs, bs, fn, constants,
+                coeffs, cstride, cell_info, positions, num_rhs);
+          }
+          else
+          {
+            impl::assemble_exterior_facets(
+                dof_transform, b, x_dofmap, x, facets, dofs, bs, fn, constants,
+                coeffs, cstride, cell_info, positions, num_rhs);
+          }
+        });
   }
 
   if (L.num_integrals(IntegralType::interior_facet) > 0)
@@ -1033,24 +1135,33 @@ void assemble_vector(
           = coefficients.at({IntegralType::interior_facet, i});
       std::span<const std::int32_t> facets
           = L.domain(IntegralType::interior_facet, i);
-      if (bs == 1)
-      {
-        impl::assemble_interior_facets<T, 1>(
-            dof_transform, b, x_dofmap, x, num_cell_facets, facets, *dofmap, fn,
-            constants, coeffs, cstride, cell_info, get_perm);
-      }
-      else if (bs == 3)
-      {
-        impl::assemble_interior_facets<T, 3>(
-            dof_transform, b, x_dofmap, x, num_cell_facets, facets, *dofmap, fn,
-            constants, coeffs, cstride, cell_info, get_perm);
-      }
-      else
-      {
-        impl::assemble_interior_facets(
-            dof_transform, b, x_dofmap, x, num_cell_facets, facets, *dofmap, fn,
-            constants, coeffs, cstride, cell_info, get_perm);
-      }
+      for_each_colour(
+          L, IntegralType::interior_facet, i, num_threads,
+          [&, &coeffs = coeffs, cstride = cstride](
+              std::span<const std::int32_t> positions)
+          {
+            if (bs == 1)
+            {
+              impl::assemble_interior_facets<T, 1>(
+                  dof_transform, b, x_dofmap, x, num_cell_facets, facets,
+                  *dofmap, fn, constants, coeffs, cstride, cell_info, get_perm,
+                  positions, num_rhs);
+            }
+            else if (bs == 3)
+            {
+              impl::assemble_interior_facets<T, 3>(
+                  dof_transform, b, x_dofmap, x, num_cell_facets, facets,
+                  *dofmap, fn, constants, coeffs, cstride, cell_info, get_perm,
+                  positions, num_rhs);
+            }
+            else
+            {
+              impl::assemble_interior_facets(
+                  dof_transform, b, x_dofmap, x, num_cell_facets, facets,
+                  *dofmap, fn, constants, coeffs, cstride, cell_info, get_perm,
+                  positions, num_rhs);
+            }
+          });
     }
   }
 }
@@ -1061,23 +1172,382 @@ void assemble_vector(
 /// @param[in] L The linear forms to assemble into b
 /// @param[in] constants Packed constants that appear in `L`
 /// @param[in] coefficients Packed coefficients that appear in `L`
+/// @param[in] num_threads Number of threads
+/// @param[in] num_rhs Number of right-hand sides
 template <typename T, std::floating_point U>
 void assemble_vector(
     std::span<T> b, const Form<T, U>& L, std::span<const T> constants,
     const std::map<std::pair<IntegralType, int>,
-                   std::pair<std::span<const T>, int>>& coefficients)
+                   std::pair<std::span<const T>, int>>& coefficients,
+    int num_threads = 1, int num_rhs = 1)
 {
   std::shared_ptr<const mesh::Mesh<U>> mesh = L.mesh();
   assert(mesh);
-  if constexpr (std::is_same_v<U, scalar_value_type_t<T>>)
+  if (auto geometry = L.geometry())
+  {
+    assemble_vector(b, L, geometry->first, geometry->second, constants,
+                    coefficients, num_threads, num_rhs);
+  }
+  else if constexpr (std::is_same_v<U, scalar_value_type_t<T>>)
+  {
     assemble_vector(b, L, mesh->geometry().dofmap(), mesh->geometry().x(),
-                    constants, coefficients);
+                    constants, coefficients, num_threads, num_rhs);
+  }
   else
   {
     auto x = mesh->geometry().x();
     std::vector<scalar_value_type_t<T>> _x(x.begin(), x.end());
     assemble_vector(b, L, mesh->geometry().dofmap(), _x, constants,
-                    coefficients);
+                    coefficients, num_threads, num_rhs);
+  }
+}
+
+/// @brief Execute the kernels of a linear form `L` and of a bilinear
+/// form `a` over the same cells, and accumulate
+///
+///   b <- b + L - scale * A (x_bc - x0)
+///
+/// The cell geometry is gathered and the cell vector is added to `b`
+/// once for both forms. The kernel of `a` is only executed on cells
+/// with boundary condition dofs.
+/// @tparam T The scalar type
+/// @tparam _bs0 The block size of the form test function dof map. If
+/// less than zero the block size is determined at runtime. If `_bs0` is
+/// positive the block size is used as a compile-time constant, which
+/// has performance benefits.
+/// @tparam _bs1 The block size of the trial function dof map.
+template <typename T, int _bs0 = -1, int _bs1 = -1>
+void _assemble_lifted_cells(
+    std::span<T> b, mdspan2_t x_dofmap,
+    std::span<const scalar_value_type_t<T>> x,
+    std::span<const std::int32_t> cells, FEkernel<T> auto kernel_L,
+    std::span<const T> constants_L, std::span<const T> coeffs_L,
+    int cstride_L, FEkernel<T> auto kernel_a, std::span<const T> constants_a,
+    std::span<const T> coeffs_a, int cstride_a,
+    const std::function<void(const std::span<T>&,
+                             const std::span<const std::uint32_t>&,
+                             std::int32_t, int)>& dof_transform,
+    mdspan2_t dofmap0, int bs0,
+    const std::function<void(const std::span<T>&,
+                             const std::span<const std::uint32_t>&,
+                             std::int32_t, int)>& dof_transform_to_transpose,
+    mdspan2_t dofmap1, int bs1, std::span<const std::uint32_t> cell_info,
+    std::span<const T> bc_values1, std::span<const std::int8_t> bc_markers1,
+    std::span<const T> x0, T scale)
+{
+  assert(_bs0 < 0 or _bs0 == bs0);
+  assert(_bs1 < 0 or _bs1 == bs1);
+  if constexpr (_bs0 > 0)
+    bs0 = _bs0;
+  if constexpr (_bs1 > 0)
+    bs1 = _bs1;
+
+  if (cells.empty())
+    return;
+
+  // Create data structures used in assembly
+  std::vector<scalar_value_type_t<T>> coordinate_dofs(3 * x_dofmap.extent(1));
+  std::vector<T> be(bs0 * dofmap0.extent(1));
+  std::span<T> _be(be);
+  std::vector<T> Ae;
+  for (std::size_t index = 0; index < cells.size(); ++index)
+  {
+    std::int32_t c = cells[index];
+
+    // Get cell coordinates/geometry
+    auto x_dofs = stdex::submdspan(x_dofmap, c, stdex::full_extent);
+    for (std::size_t i = 0; i < x_dofs.size(); ++i)
+    {
+      std::copy_n(std::next(x.begin(), 3 * x_dofs[i]), 3,
+                  std::next(coordinate_dofs.begin(), 3 * i));
+    }
+
+    // Tabulate vector for cell
+    std::fill(be.begin(), be.end(), 0);
+    kernel_L(be.data(), coeffs_L.data() + index * cstride_L,
+             constants_L.data(), coordinate_dofs.data(), nullptr, nullptr);
+    dof_transform(_be, cell_info, c, 1);
+
+    // Check if bc is applied to cell
+    auto dmap0 = stdex::submdspan(dofmap0, c, stdex::full_extent);
+    auto dmap1 = stdex::submdspan(dofmap1, c, stdex::full_extent);
+    bool has_bc = false;
+    for (std::size_t j = 0; j < dmap1.size() and !has_bc; ++j)
+      for (int k = 0; k < bs1; ++k)
+        has_bc = has_bc or bc_markers1[bs1 * dmap1[j] + k];
+
+    if (has_bc)
+    {
+      // Tabulate matrix for cell and subtract the bc columns
+      const int num_rows = bs0 * dmap0.size();
+      const int num_cols = bs1 * dmap1.size();
+      Ae.resize(num_rows * num_cols);
+      std::fill(Ae.begin(), Ae.end(), 0);
+      kernel_a(Ae.data(), coeffs_a.data() + index * cstride_a,
+               constants_a.data(), coordinate_dofs.data(), nullptr, nullptr);
+      dof_transform(Ae, cell_info, c, num_cols);
+      dof_transform_to_transpose(Ae, cell_info, c, num_rows);
+      for (std::size_t j = 0; j < dmap1.size(); ++j)
+      {
+        for (int k = 0; k < bs1; ++k)
+        {
+          const std::int32_t jj = bs1 * dmap1[j] + k;
+          if (bc_markers1[jj])
+          {
+            const T _x0 = x0.empty() ? 0.0 : x0[jj];
+            const T v = scale * (bc_values1[jj] - _x0);
+            for (int m = 0; m < num_rows; ++m)
+              be[m] -= Ae[m * num_cols + bs1 * j + k] * v;
+          }
+        }
+      }
+    }
+
+    // Scatter cell vector to 'global' vector array
+    for (std::size_t i = 0; i < dmap0.size(); ++i)
+      for (int k = 0; k < bs0; ++k)
+        b[bs0 * dmap0[i] + k] += be[bs0 * i + k];
+  }
+}
+
+/// @brief Assemble a linear form `L` into a vector and modify it to
+/// account for boundary conditions, i.e.
+///
+///   b <- b + L - scale * A (x_bc - x0)
+///
+/// where `A` is generated by the bilinear form `a`. Cell integrals of
+/// `L` and `a` with the same id and the same cells are executed in one
+/// pass over the cells, unless profiling is enabled. Other integrals
+/// are assembled and lifted separately.
+/// @param[in,out] b The vector to be assembled. It will not be zeroed
+/// before assembly.
+/// @param[in] L The linear form
+/// @param[in] a The bilinear form. Its test space must be the test
+/// space of `L`.
+/// @param[in] x_dofmap Mesh geometry dofmap
+/// @param[in] x Mesh coordinates
+/// @param[in] constants_L Constants that appear in `L`
+/// @param[in] coefficients_L Coefficients that appear in `L`
+/// @param[in] constants_a Constants that appear in `a`
+/// @param[in] coefficients_a Coefficients that appear in `a`
+/// @param[in] bc_values1 The boundary condition 'values'
+/// @param[in] bc_markers1 The indices (columns of A, rows of x) to
+/// which bcs belong
+/// @param[in] x0 The array used in the lifting, typically a 'current
+/// solution' in a Newton method
+/// @param[in] scale Scaling to apply
+template <typename T, std::floating_point U>
+void assemble_system_rhs(
+    std::span<T> b, const Form<T, U>& L, const Form<T, U>& a,
+    mdspan2_t x_dofmap, std::span<const scalar_value_type_t<T>> x,
+    std::span<const T> constants_L,
+    const std::map<std::pair<IntegralType, int>,
+                   std::pair<std::span<const T>, int>>& coefficients_L,
+    std::span<const T> constants_a,
+    const std::map<std::pair<IntegralType, int>,
+                   std::pair<std::span<const T>, int>>& coefficients_a,
+    std::span<const T> bc_values1, std::span<const std::int8_t> bc_markers1,
+    std::span<const T> x0, T scale)
+{
+  std::shared_ptr<const mesh::Mesh<U>> mesh = L.mesh();
+  assert(mesh);
+  if (a.mesh() != mesh)
+    throw std::runtime_error("Forms must be defined on the same mesh.");
+
+  // Get dofmaps and elements for the test and trial spaces
+  assert(L.function_spaces().at(0));
+  assert(a.function_spaces().at(0));
+  assert(a.function_spaces().at(1));
+  std::shared_ptr<const fem::DofMap> dofmap
+      = L.function_spaces()[0]->dofmap();
+  assert(dofmap);
+  auto dofmap0 = dofmap->map();
+  const int bs0 = dofmap->bs();
+  auto dofmap1 = a.function_spaces()[1]->dofmap()->map();
+  const int bs1 = a.function_spaces()[1]->dofmap()->bs();
+  auto element0 = L.function_spaces()[0]->element();
+  auto element1 = a.function_spaces()[1]->element();
+  assert(element0);
+  assert(element1);
+
+  // The cell loops can be shared if the test dofmaps are the same. They
+  // are not shared when profiling, so that the kernel calls of each
+  // loop are recorded for its form.
+  const bool fuse = a.function_spaces()[0]->dofmap() == dofmap
+                    and !profiling::enabled();
+
+  const bool needs_transformation_data
+      = element0->needs_dof_transformations()
+        or element1->needs_dof_transformations()
+        or L.needs_facet_permutations() or a.needs_facet_permutations();
+  std::span<const std::uint32_t> cell_info;
+  if (needs_transformation_data)
+  {
+    mesh->topology_mutable()->create_entity_permutations();
+    cell_info = std::span(mesh->topology()->get_cell_permutation_info());
+  }
+
+  const std::function<void(const std::span<T>&,
+                           const std::span<const std::uint32_t>&, std::int32_t,
+                           int)>
+      dof_transform = element0->template get_dof_transformation_function<T>();
+  const std::function<void(const std::span<T>&,
+                           const std::span<const std::uint32_t>&, std::int32_t,
+                           int)>
+      dof_transform_to_transpose
+      = element1->template get_dof_transformation_to_transpose_function<T>();
+
+  // Cell integrals
+  const std::vector<int> ids = a.integral_ids(IntegralType::cell);
+  std::vector<int> fused;
+  for (int i : L.integral_ids(IntegralType::cell))
+  {
+    auto fn = L.kernel(IntegralType::cell, i);
+    assert(fn);
+    auto& [coeffs, cstride] = coefficients_L.at({IntegralType::cell, i});
+    std::span<const std::int32_t> cells = L.domain(IntegralType::cell, i);
+    profiling::Scope scope(L.name, IntegralType::cell, i, cells.size());
+    if (fuse and std::find(ids.begin(), ids.end(), i) != ids.end()
+        and std::ranges::equal(cells, a.domain(IntegralType::cell, i)))
+    {
+      auto kernel = a.kernel(IntegralType::cell, i);
+      assert(kernel);
+      auto& [coeffs_a, cstride_a]
+          = coefficients_a.at({IntegralType::cell, i});
+      if (bs0 == 1 and bs1 == 1)
+      {
+        _assemble_lifted_cells<T, 1, 1>(
+            b, x_dofmap, x, cells, fn, constants_L, coeffs, cstride, kernel,
+            constants_a, coeffs_a, cstride_a, dof_transform, dofmap0, bs0,
+            dof_transform_to_transpose, dofmap1, bs1, cell_info, bc_values1,
+            bc_markers1, x0, scale);
+      }
+      else if (bs0 == 3 and bs1 == 3)
+      {
+        _assemble_lifted_cells<T, 3, 3>(
+            b, x_dofmap, x, cells, fn, constants_L, coeffs, cstride, kernel,
+            constants_a, coeffs_a, cstride_a, dof_transform, dofmap0, bs0,
+            dof_transform_to_transpose, dofmap1, bs1, cell_info, bc_values1,
+            bc_markers1, x0, scale);
+      }
+      else
+      {
+        _assemble_lifted_cells(
+            b, x_dofmap, x, cells, fn, constants_L, coeffs, cstride, kernel,
+            constants_a, coeffs_a, cstride_a, dof_transform, dofmap0, bs0,
+            dof_transform_to_transpose, dofmap1, bs1, cell_info, bc_values1,
+            bc_markers1, x0, scale);
+      }
+      fused.push_back(i);
+    }
+    else
+    {
+      impl::assemble_cells(dof_transform, b, x_dofmap, x, cells, dofmap0, bs0,
+                           fn, constants_L, coeffs, cstride, cell_info);
+    }
+  }
+
+  for (int i : ids)
+  {
+    if (std::find(fused.begin(), fused.end(), i) != fused.end())
+      continue;
+    auto kernel = a.kernel(IntegralType::cell, i);
+    assert(kernel);
+    auto& [coeffs, cstride] = coefficients_a.at({IntegralType::cell, i});
+    std::span<const std::int32_t> cells = a.domain(IntegralType::cell, i);
+    profiling::Scope scope(a.name, IntegralType::cell, i, cells.size());
+    _lift_bc_cells(b, x_dofmap, x, kernel, cells, dof_transform,
+                   a.function_spaces()[0]->dofmap()->map(), bs0,
+                   dof_transform_to_transpose, dofmap1, bs1, constants_a,
+                   coeffs, cstride, cell_info, bc_values1, bc_markers1, x0,
+                   scale);
+  }
+
+  // Exterior facet integrals
+  for (int i : L.integral_ids(IntegralType::exterior_facet))
+  {
+    auto fn = L.kernel(IntegralType::exterior_facet, i);
+    assert(fn);
+    auto& [coeffs, cstride]
+        = coefficients_L.at({IntegralType::exterior_facet, i});
+    std::span<const std::int32_t> facets
+        = L.domain(IntegralType::exterior_facet, i);
+    profiling::Scope scope(L.name, IntegralType::exterior_facet, i,
+                           facets.size() / 2);
+    impl::assemble_exterior_facets(dof_transform, b, x_dofmap, x, facets,
+                                   dofmap0, bs0, fn, constants_L, coeffs,
+                                   cstride, cell_info);
+  }
+
+  for (int i : a.integral_ids(IntegralType::exterior_facet))
+  {
+    auto kernel = a.kernel(IntegralType::exterior_facet, i);
+    assert(kernel);
+    auto& [coeffs, cstride]
+        = coefficients_a.at({IntegralType::exterior_facet, i});
+    std::span<const std::int32_t> facets
+        = a.domain(IntegralType::exterior_facet, i);
+    profiling::Scope scope(a.name, IntegralType::exterior_facet, i,
+                           facets.size() / 2);
+    _lift_bc_exterior_facets(
+        b, x_dofmap, x, kernel, facets, dof_transform,
+        a.function_spaces()[0]->dofmap()->map(), bs0,
+        dof_transform_to_transpose, dofmap1, bs1, constants_a, coeffs, cstride,
+        cell_info, bc_values1, bc_markers1, x0, scale);
+  }
+
+  // Interior facet integrals
+  if (L.num_integrals(IntegralType::interior_facet) > 0
+      or a.num_integrals(IntegralType::interior_facet) > 0)
+  {
+    std::function<std::uint8_t(std::size_t)> get_perm;
+    if (L.needs_facet_permutations() or a.needs_facet_permutations())
+    {
+      mesh->topology_mutable()->create_entity_permutations();
+      const std::vector<std::uint8_t>& perms
+          = mesh->topology()->get_facet_permutations();
+      get_perm = [&perms](std::size_t i) { return perms[i]; };
+    }
+    else
+      get_perm = [](std::size_t) { return 0; };
+
+    auto cell_types = mesh->topology()->cell_types();
+    if (cell_types.size() > 1)
+      throw std::runtime_error("Multiple cell types in the assembler");
+    int num_cell_facets = mesh::cell_num_entities(cell_types.back(),
+                                                  mesh->topology()->dim() - 1);
+    for (int i : L.integral_ids(IntegralType::interior_facet))
+    {
+      auto fn = L.kernel(IntegralType::interior_facet, i);
+      assert(fn);
+      auto& [coeffs, cstride]
+          = coefficients_L.at({IntegralType::interior_facet, i});
+      std::span<const std::int32_t> facets
+          = L.domain(IntegralType::interior_facet, i);
+      profiling::Scope scope(L.name, IntegralType::interior_facet, i,
+                             facets.size() / 4);
+      impl::assemble_interior_facets(dof_transform, b, x_dofmap, x,
+                                     num_cell_facets, facets, *dofmap, fn,
+                                     constants_L, coeffs, cstride, cell_info,
+                                     get_perm);
+    }
+
+    for (int i : a.integral_ids(IntegralType::interior_facet))
+    {
+      auto kernel = a.kernel(IntegralType::interior_facet, i);
+      assert(kernel);
+      auto& [coeffs, cstride]
+          = coefficients_a.at({IntegralType::interior_facet, i});
+      std::span<const std::int32_t> facets
+          = a.domain(IntegralType::interior_facet, i);
+      profiling::Scope scope(a.name, IntegralType::interior_facet, i,
+                             facets.size() / 4);
+      _lift_bc_interior_facets(
+          b, x_dofmap, x, num_cell_facets, kernel, facets, dof_transform,
+          a.function_spaces()[0]->dofmap()->map(), bs0,
+          dof_transform_to_transpose, dofmap1, bs1, constants_a, coeffs,
+          cstride, cell_info, get_perm, bc_values1, bc_markers1, x0, scale);
+    }
   }
 }
 } // namespace dolfinx::fem::impl
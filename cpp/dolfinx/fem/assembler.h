@@ -6,6 +6,7 @@
 
 #pragma once
 
+#include "assemble_condensed_impl.h"
 #include "assemble_matrix_impl.h"
 #include "assemble_scalar_impl.h"
 #include "assemble_vector_impl.h"
@@ -13,6 +14,7 @@
 #include <concepts>
 #include <cstdint>
 #include <dolfinx/common/types.h>
+#include <functional>
 #include <memory>
 #include <span>
 #include <vector>
@@ -54,27 +56,35 @@ make_coefficients_span(const std::map<std::pair<IntegralType, int>,
 /// @param[in] M The form (functional) to assemble
 /// @param[in] constants The constants that appear in `M`
 /// @param[in] coefficients The coefficients that appear in `M`
+/// @param[in] num_threads Number of threads used for assembly
 /// @return The contribution to the form (functional) from the local
 /// process
 template <typename T, std::floating_point U>
 T assemble_scalar(
     const Form<T, U>& M, std::span<const T> constants,
     const std::map<std::pair<IntegralType, int>,
-                   std::pair<std::span<const T>, int>>& coefficients)
+                   std::pair<std::span<const T>, int>>& coefficients,
+    int num_threads = 1)
 {
   std::shared_ptr<const mesh::Mesh<U>> mesh = M.mesh();
   assert(mesh);
-  if constexpr (std::is_same_v<U, scalar_value_type_t<T>>)
+  if (auto geometry = M.geometry())
+  {
+    return impl::assemble_scalar(M, geometry->first, geometry->second,
+                                 constants, coefficients, num_threads);
+  }
+  else if constexpr (std::is_same_v<U, scalar_value_type_t<T>>)
   {
     return impl::assemble_scalar(M, mesh->geometry().dofmap(),
-                                 mesh->geometry().x(), constants, coefficients);
+                                 mesh->geometry().x(), constants, coefficients,
+                                 num_threads);
   }
   else
   {
     auto x = mesh->geometry().x();
     std::vector<scalar_value_type_t<T>> _x(x.begin(), x.end());
     return impl::assemble_scalar(M, mesh->geometry().dofmap(), _x, constants,
-                                 coefficients);
+                                 coefficients, num_threads);
   }
 }
 
@@ -93,6 +103,65 @@ T assemble_scalar(const Form<T, U>& M)
                          make_coefficients_span(coefficients));
 }
 
+/// @brief Assemble several functionals into scalars.
+///
+/// The functionals must be defined on the same mesh. Integrals of
+/// different functionals over the same integration domain (the same
+/// integral type and entities) are assembled in a single pass over
+/// the domain, such that the cell geometry is gathered once for all
+/// of them.
+/// @note Caller is responsible for accumulation across processes.
+/// @param[in] M The forms (functionals) to assemble
+/// @param[in] constants The constants that appear in each form
+/// @param[in] coefficients The coefficients that appear in each form
+/// @param[in] num_threads Number of threads used for assembly
+/// @return The contribution to each form (functional) from the local
+/// process
+template <typename T, std::floating_point U>
+std::vector<T> assemble_scalars(
+    const std::vector<std::reference_wrapper<const Form<T, U>>>& M,
+    const std::vector<std::span<const T>>& constants,
+    const std::vector<std::map<std::pair<IntegralType, int>,
+                               std::pair<std::span<const T>, int>>>&
+        coefficients,
+    int num_threads = 1)
+{
+  if (M.empty())
+    return {};
+  if (constants.size() != M.size() or coefficients.size() != M.size())
+  {
+    throw std::runtime_error(
+        "Constants and coefficients must be provided for each form.");
+  }
+
+  std::shared_ptr<const mesh::Mesh<U>> mesh = M.front().get().mesh();
+  assert(mesh);
+  if (std::any_of(M.begin(), M.end(), [&mesh](auto& form)
+                  { return form.get().mesh() != mesh; }))
+  {
+    throw std::runtime_error("Functionals must be defined on the same mesh.");
+  }
+
+  if (auto geometry = M.front().get().geometry())
+  {
+    return impl::assemble_scalars(M, geometry->first, geometry->second,
+                                  constants, coefficients, num_threads);
+  }
+  else if constexpr (std::is_same_v<U, scalar_value_type_t<T>>)
+  {
+    return impl::assemble_scalars(M, mesh->geometry().dofmap(),
+                                  mesh->geometry().x(), constants,
+                                  coefficients, num_threads);
+  }
+  else
+  {
+    auto x = mesh->geometry().x();
+    std::vector<scalar_value_type_t<T>> _x(x.begin(), x.end());
+    return impl::assemble_scalars(M, mesh->geometry().dofmap(), _x, constants,
+                                  coefficients, num_threads);
+  }
+}
+
 // -- Vectors ----------------------------------------------------------------
 
 /// @brief Assemble linear form into a vector.
@@ -105,13 +174,17 @@ T assemble_scalar(const Form<T, U>& M)
 /// @param[in] L The linear forms to assemble into b
 /// @param[in] constants The constants that appear in `L`
 /// @param[in] coefficients The coefficients that appear in `L`
+/// @param[in] num_threads Number of threads used for assembly. Cells
+/// and facets that share a degree-of-freedom are never assembled
+/// concurrently.
 template <typename T, std::floating_point U>
 void assemble_vector(
     std::span<T> b, const Form<T, U>& L, std::span<const T> constants,
     const std::map<std::pair<IntegralType, int>,
-                   std::pair<std::span<const T>, int>>& coefficients)
+                   std::pair<std::span<const T>, int>>& coefficients,
+    int num_threads = 1)
 {
-  impl::assemble_vector(b, L, constants, coefficients);
+  impl::assemble_vector(b, L, constants, coefficients, num_threads);
 }
 
 /// @brief Assemble linear form into a vector
@@ -128,6 +201,40 @@ void assemble_vector(std::span<T> b, const Form<T, U>& L)
                   make_coefficients_span(coefficients));
 }
 
+/// @brief Assemble a linear form into multiple vectors, one for each
+/// set of constants and coefficients.
+///
+/// The mesh and the dofmaps are traversed once, and the element
+/// kernel is called for each right-hand side on every cell or facet.
+/// This is more efficient than assembling the vectors one by one when
+/// a form is assembled for many (load) cases.
+///
+/// @param[in,out] b Row-major array of shape `(num_rhs, n)`, where `n`
+/// is the size of a vector for `L`. It will not be zeroed before
+/// assembly.
+/// @param[in] L The linear form to assemble
+/// @param[in] constants Row-major array of shape `(num_rhs,
+/// num_constants)` with the constants for each right-hand side
+/// @param[in] coefficients The coefficients that appear in `L`. The
+/// array for each integral holds `num_rhs` contiguous blocks, each
+/// packed as for assemble_vector.
+/// @param[in] num_rhs Number of right-hand sides
+/// @param[in] num_threads Number of threads used for assembly
+template <typename T, std::floating_point U>
+void assemble_vectors(
+    std::span<T> b, const Form<T, U>& L, std::span<const T> constants,
+    const std::map<std::pair<IntegralType, int>,
+                   std::pair<std::span<const T>, int>>& coefficients,
+    int num_rhs, int num_threads = 1)
+{
+  if (num_rhs < 1)
+    throw std::runtime_error("Number of right-hand sides must be positive.");
+  if (b.size() % num_rhs != 0 or constants.size() % num_rhs != 0)
+    throw std::runtime_error("Data size is not a multiple of the number of "
+                             "right-hand sides.");
+  impl::assemble_vector(b, L, constants, coefficients, num_threads, num_rhs);
+}
+
 // FIXME: clarify how x0 is used
 // FIXME: if bcs entries are set
 
@@ -233,6 +340,90 @@ void apply_lifting(
   apply_lifting(b, a, _constants, _coeffs, bcs1, x0, scale);
 }
 
+/// @brief Assemble a linear form into a vector and modify it to account
+/// for Dirichlet boundary conditions, such that:
+///
+///   b <- b + L - scale * A (g - x0)
+///
+/// where `A` is the matrix generated by `a`. This is equivalent to
+/// calling assemble_vector and then apply_lifting, but cell integrals
+/// of `L` and `a` with the same integration domain are executed in one
+/// pass over the cells.
+///
+/// Ghost contributions are not accumulated (not sent to owner). Caller
+/// is responsible for calling VecGhostUpdateBegin/End.
+///
+/// @param[in,out] b The vector to be assembled. It will not be zeroed
+/// before assembly.
+/// @param[in] L The linear form to assemble
+/// @param[in] a The bilinear form that generates `A`. It must have the
+/// same test space as `L`.
+/// @param[in] constants_L Constants that appear in `L`
+/// @param[in] coefficients_L Coefficients that appear in `L`
+/// @param[in] constants_a Constants that appear in `a`
+/// @param[in] coefficients_a Coefficients that appear in `a`
+/// @param[in] bcs Boundary conditions on the trial space of `a`
+/// @param[in] x0 The array used in the lifting. If empty, it is treated
+/// as zero.
+/// @param[in] scale Scaling to apply
+template <typename T, std::floating_point U>
+void assemble_system_rhs(
+    std::span<T> b, const Form<T, U>& L, const Form<T, U>& a,
+    std::span<const T> constants_L,
+    const std::map<std::pair<IntegralType, int>,
+                   std::pair<std::span<const T>, int>>& coefficients_L,
+    std::span<const T> constants_a,
+    const std::map<std::pair<IntegralType, int>,
+                   std::pair<std::span<const T>, int>>& coefficients_a,
+    const std::vector<std::shared_ptr<const DirichletBC<T, U>>>& bcs,
+    std::span<const T> x0, T scale)
+{
+  auto V1 = a.function_spaces().at(1);
+  assert(V1);
+  auto map1 = V1->dofmap()->index_map;
+  assert(map1);
+  const int bs1 = V1->dofmap()->index_map_bs();
+  const int crange = bs1 * (map1->size_local() + map1->num_ghosts());
+  std::vector<std::int8_t> bc_markers1(crange, false);
+  std::vector<T> bc_values1(crange, 0.0);
+  for (const std::shared_ptr<const DirichletBC<T, U>>& bc : bcs)
+  {
+    bc->mark_dofs(bc_markers1);
+    bc->dof_values(bc_values1);
+  }
+
+  std::shared_ptr<const mesh::Mesh<U>> mesh = L.mesh();
+  assert(mesh);
+  if (auto geometry = L.geometry())
+  {
+    impl::assemble_system_rhs(b, L, a, geometry->first, geometry->second,
+                              constants_L, coefficients_L, constants_a,
+                              coefficients_a, std::span<const T>(bc_values1),
+                              std::span<const std::int8_t>(bc_markers1), x0,
+                              scale);
+  }
+  else if constexpr (std::is_same_v<U, scalar_value_type_t<T>>)
+  {
+    impl::assemble_system_rhs(b, L, a, mesh->geometry().dofmap(),
+                              mesh->geometry().x(), constants_L,
+                              coefficients_L, constants_a, coefficients_a,
+                              std::span<const T>(bc_values1),
+                              std::span<const std::int8_t>(bc_markers1), x0,
+                              scale);
+  }
+  else
+  {
+    auto x = mesh->geometry().x();
+    std::vector<scalar_value_type_t<T>> _x(x.begin(), x.end());
+    impl::assemble_system_rhs(b, L, a, mesh->geometry().dofmap(),
+                              std::span<const scalar_value_type_t<T>>(_x),
+                              constants_L, coefficients_L, constants_a,
+                              coefficients_a, std::span<const T>(bc_values1),
+                              std::span<const std::int8_t>(bc_markers1), x0,
+                              scale);
+  }
+}
+
 // -- Matrices ---------------------------------------------------------------
 
 /// @brief Assemble bilinear form into a matrix. Matrix must already be
@@ -247,6 +438,9 @@ void apply_lifting(
 /// @param[in] dof_marker1 Boundary condition markers for the columns.
 /// If bc[i] is true then rows i in A will be zeroed. The index i is a
 /// local index.
+/// @param[in] num_threads Number of threads used for assembly. Cells
+/// and facets that share a row are never assembled concurrently, but
+/// `mat_add` must otherwise be safe to call from multiple threads.
 template <typename T, std::floating_point U>
 void assemble_matrix(
     la::MatSet<T> auto mat_add, const Form<T, U>& a,
@@ -254,23 +448,29 @@ void assemble_matrix(
     const std::map<std::pair<IntegralType, int>,
                    std::pair<std::span<const T>, int>>& coefficients,
     std::span<const std::int8_t> dof_marker0,
-    std::span<const std::int8_t> dof_marker1)
+    std::span<const std::int8_t> dof_marker1, int num_threads = 1)
 
 {
   std::shared_ptr<const mesh::Mesh<U>> mesh = a.mesh();
   assert(mesh);
-  if constexpr (std::is_same_v<U, scalar_value_type_t<T>>)
+  if (auto geometry = a.geometry())
+  {
+    impl::assemble_matrix(mat_add, a, geometry->first, geometry->second,
+                          constants, coefficients, dof_marker0, dof_marker1,
+                          num_threads);
+  }
+  else if constexpr (std::is_same_v<U, scalar_value_type_t<T>>)
   {
     impl::assemble_matrix(mat_add, a, mesh->geometry().dofmap(),
                           mesh->geometry().x(), constants, coefficients,
-                          dof_marker0, dof_marker1);
+                          dof_marker0, dof_marker1, num_threads);
   }
   else
   {
     auto x = mesh->geometry().x();
     std::vector<scalar_value_type_t<T>> _x(x.begin(), x.end());
     impl::assemble_matrix(mat_add, a, mesh->geometry().dofmap(), _x, constants,
-                          coefficients, dof_marker0, dof_marker1);
+                          coefficients, dof_marker0, dof_marker1, num_threads);
   }
 }
 
@@ -281,12 +481,14 @@ void assemble_matrix(
 /// @param[in] coefficients Coefficients that appear in `a`
 /// @param[in] bcs Boundary conditions to apply. For boundary condition
 ///  dofs the row and column are zeroed. The diagonal  entry is not set.
+/// @param[in] num_threads Number of threads used for assembly
 template <typename T, std::floating_point U>
 void assemble_matrix(
     auto mat_add, const Form<T, U>& a, std::span<const T> constants,
     const std::map<std::pair<IntegralType, int>,
                    std::pair<std::span<const T>, int>>& coefficients,
-    const std::vector<std::shared_ptr<const DirichletBC<T, U>>>& bcs)
+    const std::vector<std::shared_ptr<const DirichletBC<T, U>>>& bcs,
+    int num_threads = 1)
 {
   // Index maps for dof ranges
   auto map0 = a.function_spaces().at(0)->dofmap()->index_map;
@@ -319,7 +521,7 @@ void assemble_matrix(
 
   // Assemble
   assemble_matrix(mat_add, a, constants, coefficients, dof_marker0,
-                  dof_marker1);
+                  dof_marker1, num_threads);
 }
 
 /// Assemble bilinear form into a matrix
@@ -424,6 +626,207 @@ void set_diagonal(
   }
 }
 
+/// @brief Assemble the diagonal of the matrix of a bilinear form into a
+/// vector, without assembling the matrix.
+///
+/// Rows and columns for Dirichlet boundary conditions are treated as
+/// in assemble_matrix, and the diagonal entry of locally owned rows
+/// with a boundary condition applied is set to `diagonal`. The test
+/// and trial spaces of `a` must be the same.
+///
+/// @param[in,out] d The vector to assemble the diagonal into (local
+/// degrees-of-freedom, including ghosts). It will not be zeroed before
+/// assembly, and ghost contributions are not accumulated.
+/// @param[in] a The bilinear form
+/// @param[in] constants Constants that appear in `a`
+/// @param[in] coefficients Coefficients that appear in `a`
+/// @param[in] bcs Boundary conditions to apply
+/// @param[in] diagonal Value of the diagonal for rows with a boundary
+/// condition applied
+template <typename T, std::floating_point U>
+void assemble_diagonal(
+    std::span<T> d, const Form<T, U>& a, std::span<const T> constants,
+    const std::map<std::pair<IntegralType, int>,
+                   std::pair<std::span<const T>, int>>& coefficients,
+    const std::vector<std::shared_ptr<const DirichletBC<T, U>>>& bcs,
+    T diagonal = 1.0)
+{
+  assert(a.rank() == 2);
+  auto V = a.function_spaces().at(0);
+  assert(V);
+  if (V->dofmap() != a.function_spaces().at(1)->dofmap())
+    throw std::runtime_error("Test and trial spaces must be the same.");
+
+  // Add the diagonal entries of each element matrix. The row and column
+  // indices are blocked, and element matrices are row-major.
+  const int bs = V->dofmap()->bs();
+  auto add_diagonal
+      = [d, bs](std::span<const std::int32_t> rows,
+                std::span<const std::int32_t> cols, std::span<const T> vals)
+  {
+    const std::size_t ncols = bs * cols.size();
+    for (std::size_t i = 0; i < rows.size(); ++i)
+    {
+      for (std::size_t j = 0; j < cols.size(); ++j)
+      {
+        if (rows[i] == cols[j])
+        {
+          for (int k = 0; k < bs; ++k)
+            d[bs * rows[i] + k] += vals[(bs * i + k) * ncols + bs * j + k];
+        }
+      }
+    }
+    return 0;
+  };
+  assemble_matrix(add_diagonal, a, constants, coefficients, bcs);
+
+  // Set diagonal for rows with a boundary condition (unblocked indices)
+  auto set_entry
+      = [d](std::span<const std::int32_t> rows, std::span<const std::int32_t>,
+            std::span<const T> vals)
+  {
+    d[rows.front()] = vals.front();
+    return 0;
+  };
+  set_diagonal(set_entry, *V, bcs, diagonal);
+}
+
+// -- Static condensation ----------------------------------------------------
+
+/// @brief Assemble the Schur complement of a 2x2 block system in which
+/// one block of unknowns is cell-local (e.g. discontinuous or bubble
+/// spaces).
+///
+/// The cell-local unknowns are eliminated cell-by-cell, and
+/// `-A_gl A_ll^{-1} A_lg` and `-A_gl A_ll^{-1} b_l` are added to the
+/// matrix and vector of the global space. The contributions of
+/// `a[g][g]` and `L[g]` are not assembled; they should be added with
+/// ::assemble_matrix and ::assemble_vector. Only cell integrals are
+/// supported in the blocks that involve the cell-local space.
+///
+/// Dirichlet conditions may only be applied on the global space. The
+/// constrained rows and columns of the Schur complement are zeroed and
+/// the lifting is added to `b`. The diagonal entry is not set, and `b`
+/// is neither scattered nor are boundary values set.
+///
+/// @param[in] mat_add The function for adding values into the matrix
+/// @param[in,out] b The vector (including ghost entries) to add the
+/// condensed right-hand side into. May be empty.
+/// @param[in] a The 2x2 blocks of the bilinear form. `a[g][g]` is not
+/// used and may be `nullptr`.
+/// @param[in] L The blocks of the linear form. Either entry may be
+/// `nullptr`.
+/// @param[in] local Index (0 or 1) of the cell-local space
+/// @param[in] bcs Boundary conditions on the global space
+template <typename T, std::floating_point U>
+void assemble_condensed(
+    la::MatSet<T> auto mat_add, std::span<T> b,
+    const std::vector<std::vector<const Form<T, U>*>>& a,
+    const std::vector<const Form<T, U>*>& L, int local,
+    const std::vector<std::shared_ptr<const DirichletBC<T, U>>>& bcs)
+{
+  if (local != 0 and local != 1)
+    throw std::runtime_error("Index of the cell-local space must be 0 or 1.");
+  const int g = 1 - local;
+  if (a.size() != 2 or a[0].size() != 2 or a[1].size() != 2 or !a[local][local]
+      or !a[local][g] or !a[g][local])
+  {
+    throw std::runtime_error(
+        "Static condensation requires the a_ll, a_lg and a_gl blocks.");
+  }
+
+  // Boundary condition markers and values on the global space
+  auto V = a[local][g]->function_spaces().at(1);
+  std::vector<std::int8_t> bc_marker;
+  std::vector<T> bc_values;
+  auto map = V->dofmap()->index_map;
+  assert(map);
+  const std::int32_t dim
+      = V->dofmap()->index_map_bs() * (map->size_local() + map->num_ghosts());
+  for (auto& bc : bcs)
+  {
+    assert(bc);
+    if (V->contains(*bc->function_space()))
+    {
+      bc_marker.resize(dim, false);
+      bc_values.resize(dim, 0);
+      bc->mark_dofs(bc_marker);
+      bc->set(std::span(bc_values));
+    }
+    else if (!a[local][local]->function_spaces().at(0)->contains(
+                 *bc->function_space()))
+    {
+      throw std::runtime_error("Boundary conditions on the cell-local space "
+                               "are not supported by static condensation.");
+    }
+  }
+
+  std::shared_ptr<const mesh::Mesh<U>> mesh = a[local][local]->mesh();
+  assert(mesh);
+  if constexpr (std::is_same_v<U, scalar_value_type_t<T>>)
+  {
+    impl::assemble_condensed(mat_add, b, a, L, local, mesh->geometry().dofmap(),
+                             mesh->geometry().x(),
+                             std::span<const std::int8_t>(bc_marker),
+                             std::span<const T>(bc_values));
+  }
+  else
+  {
+    auto x = mesh->geometry().x();
+    std::vector<scalar_value_type_t<T>> _x(x.begin(), x.end());
+    impl::assemble_condensed(mat_add, b, a, L, local, mesh->geometry().dofmap(),
+                             std::span<const scalar_value_type_t<T>>(_x),
+                             std::span<const std::int8_t>(bc_marker),
+                             std::span<const T>(bc_values));
+  }
+}
+
+/// @brief Recover the cell-local unknowns of a statically condensed
+/// system from the solution on the global space.
+///
+/// On each owned cell, `u_l = A_ll^{-1} (b_l - A_lg u_g)` is computed
+/// and inserted into `u_l`. Ghost entries of `u_l` are not updated.
+///
+/// @param[in,out] u_l The cell-local solution
+/// @param[in] u_g The global solution (including up-to-date ghost
+/// entries)
+/// @param[in] a The 2x2 blocks of the bilinear form
+/// @param[in] L The blocks of the linear form. Either entry may be
+/// `nullptr`.
+/// @param[in] local Index (0 or 1) of the cell-local space
+template <typename T, std::floating_point U>
+void backsubstitute_condensed(
+    std::span<T> u_l, std::span<const T> u_g,
+    const std::vector<std::vector<const Form<T, U>*>>& a,
+    const std::vector<const Form<T, U>*>& L, int local)
+{
+  if (local != 0 and local != 1)
+    throw std::runtime_error("Index of the cell-local space must be 0 or 1.");
+  const int g = 1 - local;
+  if (a.size() != 2 or a[0].size() != 2 or a[1].size() != 2 or !a[local][local]
+      or !a[local][g])
+  {
+    throw std::runtime_error(
+        "Back-substitution requires the a_ll and a_lg blocks.");
+  }
+
+  std::shared_ptr<const mesh::Mesh<U>> mesh = a[local][local]->mesh();
+  assert(mesh);
+  if constexpr (std::is_same_v<U, scalar_value_type_t<T>>)
+  {
+    impl::backsubstitute_condensed(
+        u_l, u_g, a, L, local, mesh->geometry().dofmap(), mesh->geometry().x());
+  }
+  else
+  {
+    auto x = mesh->geometry().x();
+    std::vector<scalar_value_type_t<T>> _x(x.begin(), x.end());
+    impl::backsubstitute_condensed(u_l, u_g, a, L, local,
+                                   mesh->geometry().dofmap(),
+                                   std::span<const scalar_value_type_t<T>>(_x));
+  }
+}
+
 // -- Setting bcs ------------------------------------------------------------
 
 // FIXME: Move these function elsewhere?
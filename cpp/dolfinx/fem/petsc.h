@@ -47,53 +47,26 @@ Mat create_matrix(const Form<PetscScalar, T>& a,
   return la::petsc::create_matrix(a.mesh()->comm(), pattern, type);
 }
 
-/// Initialise a monolithic matrix for an array of bilinear forms
-/// @param[in] a Rectangular array of bilinear forms. The `a(i, j)` form
-/// will correspond to the `(i, j)` block in the returned matrix
+/// @brief Initialise a monolithic matrix with a given sparsity
+/// pattern.
+/// @param[in] pattern Finalised sparsity pattern of the stacked
+/// operator, e.g. from fem::create_sparsity_pattern for a rectangular
+/// array of bilinear forms
+/// @param[in] V Function spaces of the block rows (`V[0]`) and block
+/// columns (`V[1]`)
 /// @param[in] type The type of PETSc Mat. If empty the PETSc default is
 /// used.
-/// @return A sparse matrix  with a layout and sparsity that matches the
-/// bilinear forms. The caller is responsible for destroying the Mat
+/// @return A sparse matrix with the layout of the blocks and sparsity
+/// of `pattern`. The caller is responsible for destroying the Mat
 /// object.
 template <std::floating_point T>
 Mat create_matrix_block(
-    const std::vector<std::vector<const Form<PetscScalar, T>*>>& a,
+    const la::SparsityPattern& pattern,
+    const std::array<std::vector<std::shared_ptr<const FunctionSpace<T>>>, 2>&
+        V,
     const std::string& type = std::string())
 {
-  // Extract and check row/column ranges
-  std::array<std::vector<std::shared_ptr<const FunctionSpace<T>>>, 2> V
-      = fem::common_function_spaces(extract_function_spaces(a));
-  std::array<std::vector<int>, 2> bs_dofs;
-  for (std::size_t i = 0; i < 2; ++i)
-  {
-    for (auto& _V : V[i])
-      bs_dofs[i].push_back(_V->dofmap()->bs());
-  }
-
-  // Build sparsity pattern for each block
-  std::shared_ptr<const mesh::Mesh<T>> mesh;
-  std::vector<std::vector<std::unique_ptr<la::SparsityPattern>>> patterns(
-      V[0].size());
-  for (std::size_t row = 0; row < V[0].size(); ++row)
-  {
-    for (std::size_t col = 0; col < V[1].size(); ++col)
-    {
-      if (const Form<PetscScalar, T>* form = a[row][col]; form)
-      {
-        patterns[row].push_back(std::make_unique<la::SparsityPattern>(
-            create_sparsity_pattern(*form)));
-        if (!mesh)
-          mesh = form->mesh();
-      }
-      else
-        patterns[row].push_back(nullptr);
-    }
-  }
-
-  if (!mesh)
-    throw std::runtime_error("Could not find a Mesh.");
-
-  // Compute offsets for the fields
+  // Index maps of the fields
   std::array<std::vector<std::pair<
                  std::reference_wrapper<const common::IndexMap>, int>>,
              2>
@@ -107,20 +80,11 @@ Mat create_matrix_block(
     }
   }
 
-  // Create merged sparsity pattern
-  std::vector<std::vector<const la::SparsityPattern*>> p(V[0].size());
-  for (std::size_t row = 0; row < V[0].size(); ++row)
-    for (std::size_t col = 0; col < V[1].size(); ++col)
-      p[row].push_back(patterns[row][col].get());
-
-  la::SparsityPattern pattern(mesh->comm(), p, maps, bs_dofs);
-  pattern.finalize();
-
   // FIXME: Add option to pass customised local-to-global map to PETSc
   // Mat constructor
 
   // Initialise matrix
-  Mat A = la::petsc::create_matrix(mesh->comm(), pattern, type);
+  Mat A = la::petsc::create_matrix(pattern.comm(), pattern, type);
 
   // Create row and column local-to-global maps (field0, field1, field2,
   // etc), i.e. ghosts of field0 appear before owned indices of field1
@@ -178,6 +142,25 @@ Mat create_matrix_block(
   return A;
 }
 
+/// Initialise a monolithic matrix for an array of bilinear forms
+/// @param[in] a Rectangular array of bilinear forms. The `a(i, j)` form
+/// will correspond to the `(i, j)` block in the returned matrix
+/// @param[in] type The type of PETSc Mat. If empty the PETSc default is
+/// used.
+/// @return A sparse matrix  with a layout and sparsity that matches the
+/// bilinear forms. The caller is responsible for destroying the Mat
+/// object.
+template <std::floating_point T>
+Mat create_matrix_block(
+    const std::vector<std::vector<const Form<PetscScalar, T>*>>& a,
+    const std::string& type = std::string())
+{
+  la::SparsityPattern pattern = fem::create_sparsity_pattern(a);
+  pattern.finalize();
+  return create_matrix_block(
+      pattern, fem::common_function_spaces(extract_function_spaces(a)), type);
+}
+
 /// @brief Create nested (MatNest) matrix.
 ///
 /// @note The caller is responsible for destroying the Mat object.
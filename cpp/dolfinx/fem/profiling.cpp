@@ -0,0 +1,145 @@
+// Copyright (C) 2023 The FEniCS Project
+//
+// This file is part of DOLFINx (https://www.fenicsproject.org)
+//
+// SPDX-License-Identifier:    LGPL-3.0-or-later
+
+#include "profiling.h"
+#include "Form.h"
+#include <atomic>
+#include <dolfinx/common/MPI.h>
+#include <iostream>
+#include <mutex>
+
+using namespace dolfinx;
+using namespace dolfinx::fem;
+
+namespace
+{
+std::atomic<bool> _enabled = false;
+std::mutex _mutex;
+std::map<std::tuple<std::string, IntegralType, int>,
+         profiling::IntegralProfile>
+    _profiles;
+
+std::string integral_type_name(IntegralType type)
+{
+  switch (type)
+  {
+  case IntegralType::cell:
+    return "cell";
+  case IntegralType::exterior_facet:
+    return "exterior_facet";
+  case IntegralType::interior_facet:
+    return "interior_facet";
+  case IntegralType::vertex:
+    return "vertex";
+  default:
+    throw std::runtime_error("Unknown integral type");
+  }
+}
+} // namespace
+
+//-----------------------------------------------------------------------------
+void profiling::enable(bool on) { _enabled = on; }
+//-----------------------------------------------------------------------------
+bool profiling::enabled() { return _enabled; }
+//-----------------------------------------------------------------------------
+void profiling::reset()
+{
+  std::scoped_lock lock(_mutex);
+  for (auto it = _profiles.begin(); it != _profiles.end();)
+  {
+    if (it->second.flops_per_call > 0)
+    {
+      it->second = {.flops_per_call = it->second.flops_per_call};
+      ++it;
+    }
+    else
+      it = _profiles.erase(it);
+  }
+}
+//-----------------------------------------------------------------------------
+void profiling::set_flops(const std::string& form, IntegralType type, int id,
+                          double flops)
+{
+  std::scoped_lock lock(_mutex);
+  _profiles[{form, type, id}].flops_per_call = flops;
+}
+//-----------------------------------------------------------------------------
+std::map<std::tuple<std::string, IntegralType, int>,
+         profiling::IntegralProfile>
+profiling::profiles()
+{
+  std::scoped_lock lock(_mutex);
+  return _profiles;
+}
+//-----------------------------------------------------------------------------
+Table profiling::table()
+{
+  Table table("Assembly profile");
+  for (auto& [key, p] : profiling::profiles())
+  {
+    if (p.num_entities == 0)
+      continue;
+
+    auto& [form, type, id] = key;
+    const std::string row
+        = form + " " + integral_type_name(type) + " " + std::to_string(id);
+
+    // NB: Integer values are not reduced by Table::reduce
+    table.set(row, "entities", static_cast<double>(p.num_entities));
+    table.set(row, "kernel", p.kernel);
+    table.set(row, "packing", p.packing);
+    table.set(row, "insertion", p.insertion);
+    table.set(row, "FLOP", p.flops_per_call * p.num_calls);
+  }
+
+  return table;
+}
+//-----------------------------------------------------------------------------
+void profiling::list_profiles(MPI_Comm comm, Table::Reduction reduction)
+{
+  Table table = profiling::table().reduce(comm, reduction);
+  const std::string str = "\n" + table.str();
+  if (dolfinx::MPI::rank(comm) == 0)
+    std::cout << str << std::endl;
+}
+//-----------------------------------------------------------------------------
+profiling::ThreadTimes& profiling::thread_times()
+{
+  static thread_local ThreadTimes times;
+  return times;
+}
+//-----------------------------------------------------------------------------
+profiling::Scope::Scope(const std::string& form, IntegralType type, int id,
+                        std::size_t num_entities)
+    : _enabled(profiling::enabled()), _form(form), _type(type), _id(id),
+      _num_entities(num_entities)
+{
+  if (_enabled)
+  {
+    _t0 = thread_times();
+    _start = std::chrono::steady_clock::now();
+  }
+}
+//-----------------------------------------------------------------------------
+profiling::Scope::~Scope()
+{
+  if (!_enabled)
+    return;
+
+  std::chrono::duration<double> dt = std::chrono::steady_clock::now() - _start;
+  const ThreadTimes& t1 = thread_times();
+  const double kernel = t1.kernel - _t0.kernel;
+  const double insertion = t1.insertion - _t0.insertion;
+
+  std::scoped_lock lock(_mutex);
+  IntegralProfile& p = _profiles[{_form, _type, _id}];
+  p.num_entities += _num_entities;
+  p.num_calls += t1.num_calls - _t0.num_calls;
+  p.kernel += kernel;
+  p.insertion += insertion;
+  p.packing += std::max(dt.count() - kernel - insertion, 0.0);
+}
+//-----------------------------------------------------------------------------
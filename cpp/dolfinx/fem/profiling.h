@@ -0,0 +1,184 @@
+// Copyright (C) 2023 The FEniCS Project
+//
+// This file is part of DOLFINx (https://www.fenicsproject.org)
+//
+// SPDX-License-Identifier:    LGPL-3.0-or-later
+
+#pragma once
+
+#include <chrono>
+#include <cstdint>
+#include <dolfinx/common/Table.h>
+#include <functional>
+#include <map>
+#include <mpi.h>
+#include <span>
+#include <string>
+#include <tuple>
+
+namespace dolfinx::fem
+{
+enum class IntegralType : std::int8_t;
+}
+
+/// @brief Opt-in profiling of assembly by integral.
+///
+/// When profiling is enabled, the assemblers record for each form (see
+/// Form::name), integral type and integral (subdomain) id the number
+/// of entities assembled and the time spent in the kernels, in
+/// insertion into matrices and in packing, i.e. everything else in the
+/// loop over entities such as gathering geometry data, applying dof
+/// transformations and boundary conditions, and adding to vectors.
+/// Lifting of boundary conditions (apply_lifting and the lifting in
+/// assemble_system_rhs) is recorded for the bilinear form, in the same
+/// rows as its matrix assembly. Timing adds overhead to each kernel
+/// call, so profiling is disabled by default.
+namespace dolfinx::fem::profiling
+{
+/// Assembly data for one integral of a form
+struct IntegralProfile
+{
+  /// Number of entities assembled
+  std::int64_t num_entities = 0;
+
+  /// Number of kernel calls
+  std::int64_t num_calls = 0;
+
+  /// Time (seconds) in kernels
+  double kernel = 0;
+
+  /// Time (seconds) in the loop over entities that is not spent in
+  /// kernels or insertion into matrices
+  double packing = 0;
+
+  /// Time (seconds) in insertion into matrices
+  double insertion = 0;
+
+  /// Estimated number of floating point operations per kernel call, or
+  /// zero if not known (see set_flops)
+  double flops_per_call = 0;
+};
+
+/// Enable or disable profiling
+void enable(bool on = true);
+
+/// Return true if profiling is enabled
+bool enabled();
+
+/// Remove all recorded data, apart from the FLOP estimates
+void reset();
+
+/// @brief Set the estimated number of floating point operations of a
+/// kernel call, e.g. as estimated by the form compiler.
+/// @param[in] form The name of the form
+/// @param[in] type The integral type
+/// @param[in] id The integral id
+/// @param[in] flops Number of operations per kernel call
+void set_flops(const std::string& form, IntegralType type, int id,
+               double flops);
+
+/// Return the data recorded on this process
+std::map<std::tuple<std::string, IntegralType, int>, IntegralProfile>
+profiles();
+
+/// @brief Return the data recorded on this process in a Table.
+///
+/// The table has one row for each integral and the columns `entities`,
+/// `kernel`, `packing`, `insertion` (times in seconds) and `FLOP`. It
+/// can be reduced across processes with Table::reduce.
+Table table();
+
+/// @brief Print the table of recorded data, reduced across processes.
+/// @param[in] comm MPI communicator
+/// @param[in] reduction Type of reduction
+void list_profiles(MPI_Comm comm,
+                   Table::Reduction reduction = Table::Reduction::max);
+
+/// Times accumulated by the calling thread
+struct ThreadTimes
+{
+  /// Time in kernels
+  double kernel = 0;
+
+  /// Number of kernel calls
+  std::int64_t num_calls = 0;
+
+  /// Time in insertion into matrices
+  double insertion = 0;
+};
+
+/// Return the times accumulated by the calling thread
+ThreadTimes& thread_times();
+
+/// @brief Record the time of a loop over the entities of an integral.
+///
+/// The time between construction and destruction, and the kernel and
+/// insertion time accumulated by the calling thread in that period,
+/// are added to the data for the integral. Does nothing if profiling
+/// is disabled.
+class Scope
+{
+public:
+  /// @brief Start timing
+  /// @param[in] form Name of the form
+  /// @param[in] type Integral type
+  /// @param[in] id Integral id
+  /// @param[in] num_entities Number of entities in the loop
+  Scope(const std::string& form, IntegralType type, int id,
+        std::size_t num_entities);
+
+  Scope(const Scope&) = delete;
+  Scope& operator=(const Scope&) = delete;
+
+  /// Stop timing and record the data
+  ~Scope();
+
+private:
+  bool _enabled;
+  const std::string& _form;
+  IntegralType _type;
+  int _id;
+  std::size_t _num_entities;
+  ThreadTimes _t0;
+  std::chrono::steady_clock::time_point _start;
+};
+
+/// @brief Wrap a kernel such that the time of each call is added to
+/// the thread times.
+template <typename... Args>
+std::function<void(Args...)> timed_kernel(std::function<void(Args...)> kernel)
+{
+  return [kernel = std::move(kernel)](Args... args)
+  {
+    auto t0 = std::chrono::steady_clock::now();
+    kernel(args...);
+    std::chrono::duration<double> dt = std::chrono::steady_clock::now() - t0;
+    ThreadTimes& times = thread_times();
+    times.kernel += dt.count();
+    ++times.num_calls;
+  };
+}
+
+/// @brief Wrap a function for inserting into a matrix such that the
+/// time of each call is added to the thread times if profiling was
+/// enabled when the wrapper was created.
+auto timed_insertion(auto mat_set)
+{
+  return [mat_set, on = enabled()](std::span<const std::int32_t> rows,
+                                   std::span<const std::int32_t> cols,
+                                   const auto& data) mutable
+  {
+    if (!on)
+    {
+      mat_set(rows, cols, data);
+      return;
+    }
+
+    auto t0 = std::chrono::steady_clock::now();
+    mat_set(rows, cols, data);
+    std::chrono::duration<double> dt = std::chrono::steady_clock::now() - t0;
+    thread_times().insertion += dt.count();
+  };
+}
+
+} // namespace dolfinx::fem::profiling
@@ -17,6 +17,8 @@
 #include "sparsitybuild.h"
 #include <array>
 #include <concepts>
+#include <dolfinx/common/MPI.h>
+#include <dolfinx/common/ThreadPool.h>
 #include <dolfinx/common/types.h>
 #include <dolfinx/la/SparsityPattern.h>
 #include <dolfinx/mesh/Topology.h>
@@ -24,6 +26,7 @@
 #include <dolfinx/mesh/utils.h>
 #include <functional>
 #include <memory>
+#include <numeric>
 #include <set>
 #include <span>
 #include <stdexcept>
@@ -123,6 +126,65 @@ concept FEkernel = std::is_invocable_v<U, T*, const T*, const T*,
                                        const scalar_value_type_t<T>*,
                                        const int*, const std::uint8_t*>;
 
+namespace impl
+{
+/// @brief Call a function for the entities of an integration domain,
+/// optionally using multiple threads.
+///
+/// With more than one thread, the colours of `a.colouring(type, i)`
+/// are processed in turn. The entities of a colour do not share test
+/// space degrees-of-freedom and are split into `num_threads` chunks
+/// that are processed concurrently by the threads of
+/// common::ThreadPool::pool(), so accumulation into vectors and
+/// matrices is free of data races. An exception thrown by `f` is
+/// rethrown on the calling thread.
+///
+/// @param[in] a The form
+/// @param[in] type Integral domain type
+/// @param[in] i Integral ID, i.e. (sub)domain index
+/// @param[in] num_threads Number of threads
+/// @param[in] f Function that is called with the positions in
+/// `a.domain(type, i)` of the entities to process. An empty span
+/// denotes all entities.
+///
+/// Each call to `f` is recorded as a profiling::Scope for the integral.
+template <typename T, std::floating_point U, typename F>
+void for_each_colour(const Form<T, U>& a, IntegralType type, int i,
+                     int num_threads, F&& f)
+{
+  if (num_threads <= 1)
+  {
+    // Number of entries in the domain data for each entity
+    const std::size_t stride = type == IntegralType::exterior_facet   ? 2
+                               : type == IntegralType::interior_facet ? 4
+                                                                      : 1;
+    profiling::Scope scope(a.name, type, i, a.domain(type, i).size() / stride);
+    f(std::span<const std::int32_t>());
+    return;
+  }
+
+  auto g = [&a, &f, type, i](std::span<const std::int32_t> positions)
+  {
+    profiling::Scope scope(a.name, type, i, positions.size());
+    f(positions);
+  };
+
+  const graph::AdjacencyList<std::int32_t>& colouring = a.colouring(type, i);
+  for (std::int32_t c = 0; c < colouring.num_nodes(); ++c)
+  {
+    std::span<const std::int32_t> positions = colouring.links(c);
+    const int n = std::min<std::size_t>(num_threads, positions.size());
+    common::ThreadPool::pool().run(
+        n,
+        [&g, positions, n](int t)
+        {
+          auto [p0, p1] = dolfinx::MPI::local_range(t, positions.size(), n);
+          g(positions.subspan(p0, p1 - p0));
+        });
+  }
+}
+} // namespace impl
+
 /// @brief Extract test (0) and trial (1) function spaces pairs for each
 /// bilinear form for a rectangular array of forms.
 ///
@@ -236,6 +298,72 @@ la::SparsityPattern create_sparsity_pattern(const Form<T, U>& a)
   return pattern;
 }
 
+/// @brief Create a sparsity pattern for a rectangular array of forms.
+/// @note The pattern is not finalised, i.e. the caller is responsible
+/// for calling SparsityPattern::finalize.
+/// @param[in] a Rectangular array of bilinear forms. The `a(i, j)` form
+/// will correspond to the `(i, j)` block in the pattern.
+/// @return The sparsity pattern of the stacked (monolithic) operator
+template <typename T, std::floating_point U>
+la::SparsityPattern
+create_sparsity_pattern(const std::vector<std::vector<const Form<T, U>*>>& a)
+{
+  // Extract and check row/column ranges
+  std::array<std::vector<std::shared_ptr<const FunctionSpace<U>>>, 2> V
+      = fem::common_function_spaces(extract_function_spaces(a));
+  std::array<std::vector<int>, 2> bs_dofs;
+  for (std::size_t i = 0; i < 2; ++i)
+  {
+    for (auto& _V : V[i])
+      bs_dofs[i].push_back(_V->dofmap()->bs());
+  }
+
+  // Build sparsity pattern for each block
+  std::shared_ptr<const mesh::Mesh<U>> mesh;
+  std::vector<std::vector<std::unique_ptr<la::SparsityPattern>>> patterns(
+      V[0].size());
+  for (std::size_t row = 0; row < V[0].size(); ++row)
+  {
+    for (std::size_t col = 0; col < V[1].size(); ++col)
+    {
+      if (const Form<T, U>* form = a[row][col]; form)
+      {
+        patterns[row].push_back(std::make_unique<la::SparsityPattern>(
+            create_sparsity_pattern(*form)));
+        if (!mesh)
+          mesh = form->mesh();
+      }
+      else
+        patterns[row].push_back(nullptr);
+    }
+  }
+
+  if (!mesh)
+    throw std::runtime_error("Could not find a Mesh.");
+
+  // Compute offsets for the fields
+  std::array<std::vector<std::pair<
+                 std::reference_wrapper<const common::IndexMap>, int>>,
+             2>
+      maps;
+  for (std::size_t d = 0; d < 2; ++d)
+  {
+    for (auto space : V[d])
+    {
+      maps[d].emplace_back(*space->dofmap()->index_map,
+                           space->dofmap()->index_map_bs());
+    }
+  }
+
+  // Create merged sparsity pattern
+  std::vector<std::vector<const la::SparsityPattern*>> p(V[0].size());
+  for (std::size_t row = 0; row < V[0].size(); ++row)
+    for (std::size_t col = 0; col < V[1].size(); ++col)
+      p[row].push_back(patterns[row][col].get());
+
+  return la::SparsityPattern(mesh->comm(), p, maps, bs_dofs);
+}
+
 /// Create an ElementDofLayout from a ufcx_dofmap
 ElementDofLayout create_element_dof_layout(const ufcx_dofmap& dofmap,
                                            const mesh::CellType cell_type,
@@ -949,23 +1077,31 @@ allocate_coefficient_storage(const Form<T, U>& form)
   return coeffs;
 }
 
-/// @brief Pack coefficients of a Form for a given integral type and
-/// domain id
+/// @brief Pack selected coefficients of a Form for a given integral
+/// type and domain id.
+///
+/// Only the entries of `c` that belong to the selected coefficients
+/// are modified, which allows data for coefficients that have changed
+/// to be re-packed into an existing array.
+///
 /// @param[in] form The Form
 /// @param[in] integral_type Type of integral
 /// @param[in] id The id of the integration domain
-/// @param[in] c The coefficient array
+/// @param[in,out] c The coefficient array
 /// @param[in] cstride The coefficient stride
+/// @param[in] indices Indices (positions in `form.coefficients()`) of
+/// the coefficients to pack
 template <typename T, std::floating_point U>
 void pack_coefficients(const Form<T, U>& form, IntegralType integral_type,
-                       int id, std::span<T> c, int cstride)
+                       int id, std::span<T> c, int cstride,
+                       std::span<const int> indices)
 {
   // Get form coefficient offsets and dofmaps
   const std::vector<std::shared_ptr<const Function<T, U>>>& coefficients
       = form.coefficients();
   const std::vector<int> offsets = form.coefficient_offsets();
 
-  if (!coefficients.empty())
+  if (!indices.empty())
   {
     std::span<const std::uint32_t> cell_info
         = impl::get_cell_orientation_info(coefficients);
@@ -978,7 +1114,7 @@ void pack_coefficients(const Form<T, U>& form, IntegralType integral_type,
 
       // Iterate over coefficients
       std::span<const std::int32_t> cells = form.domain(IntegralType::cell, id);
-      for (std::size_t coeff = 0; coeff < coefficients.size(); ++coeff)
+      for (int coeff : indices)
       {
         impl::pack_coefficient_entity(c, cstride, *coefficients[coeff],
                                       cell_info, cells, 1, fetch_cell,
@@ -994,7 +1130,7 @@ void pack_coefficients(const Form<T, U>& form, IntegralType integral_type,
       // Iterate over coefficients
       std::span<const std::int32_t> facets
           = form.domain(IntegralType::exterior_facet, id);
-      for (std::size_t coeff = 0; coeff < coefficients.size(); ++coeff)
+      for (int coeff : indices)
       {
         impl::pack_coefficient_entity(c, cstride, *coefficients[coeff],
                                       cell_info, facets, 2, fetch_cell,
@@ -1011,7 +1147,7 @@ void pack_coefficients(const Form<T, U>& form, IntegralType integral_type,
       // Iterate over coefficients
       std::span<const std::int32_t> facets
           = form.domain(IntegralType::interior_facet, id);
-      for (std::size_t coeff = 0; coeff < coefficients.size(); ++coeff)
+      for (int coeff : indices)
       {
         // Pack coefficient ['+']
         impl::pack_coefficient_entity(c, 2 * cstride, *coefficients[coeff],
@@ -1031,6 +1167,23 @@ void pack_coefficients(const Form<T, U>& form, IntegralType integral_type,
   }
 }
 
+/// @brief Pack coefficients of a Form for a given integral type and
+/// domain id
+/// @param[in] form The Form
+/// @param[in] integral_type Type of integral
+/// @param[in] id The id of the integration domain
+/// @param[in] c The coefficient array
+/// @param[in] cstride The coefficient stride
+template <typename T, std::floating_point U>
+void pack_coefficients(const Form<T, U>& form, IntegralType integral_type,
+                       int id, std::span<T> c, int cstride)
+{
+  std::vector<int> indices(form.coefficients().size());
+  std::iota(indices.begin(), indices.end(), 0);
+  pack_coefficients(form, integral_type, id, c, cstride,
+                    std::span<const int>(indices));
+}
+
 /// @brief Create Expression from UFC
 template <typename T, typename U = dolfinx::scalar_value_type_t<T>>
 Expression<T, U> create_expression(
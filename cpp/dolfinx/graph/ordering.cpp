@@ -11,6 +11,7 @@
 #include <dolfinx/common/log.h>
 #include <dolfinx/graph/AdjacencyList.h>
 #include <limits>
+#include <numeric>
 #include <span>
 
 using namespace dolfinx;
@@ -380,3 +381,68 @@ graph::reorder_gps(const graph::AdjacencyList<std::int32_t>& graph)
   return r;
 }
 //-----------------------------------------------------------------------------
+graph::AdjacencyList<std::int32_t>
+graph::colour_greedy(const graph::AdjacencyList<std::int32_t>& resources)
+{
+  const std::int32_t n = resources.num_nodes();
+  const std::vector<std::int32_t>& data = resources.array();
+  const std::int32_t num_resources
+      = data.empty() ? 0 : *std::max_element(data.begin(), data.end()) + 1;
+
+  // Build resource-to-node adjacency
+  std::vector<std::int32_t> offsets(num_resources + 1, 0);
+  for (std::int32_t r : data)
+    ++offsets[r + 1];
+  std::partial_sum(offsets.begin(), offsets.end(), offsets.begin());
+  std::vector<std::int32_t> nodes(offsets.back());
+  {
+    std::vector<std::int32_t> pos(offsets.begin(), std::prev(offsets.end()));
+    for (std::int32_t i = 0; i < n; ++i)
+      for (std::int32_t r : resources.links(i))
+        nodes[pos[r]++] = i;
+  }
+
+  // Assign to each node the lowest colour not used by a node sharing a
+  // resource. 'marker[c] == i' flags colour c as taken for node i.
+  std::vector<std::int32_t> colour(n, -1);
+  std::vector<std::int32_t> marker;
+  std::int32_t num_colours = 0;
+  for (std::int32_t i = 0; i < n; ++i)
+  {
+    for (std::int32_t r : resources.links(i))
+    {
+      for (std::int32_t j = offsets[r]; j < offsets[r + 1]; ++j)
+      {
+        if (std::int32_t c = colour[nodes[j]]; c >= 0)
+          marker[c] = i;
+      }
+    }
+
+    std::int32_t c = 0;
+    while (c < num_colours and marker[c] == i)
+      ++c;
+    if (c == num_colours)
+    {
+      marker.push_back(-1);
+      ++num_colours;
+    }
+    colour[i] = c;
+  }
+
+  // Group nodes by colour
+  std::vector<std::int32_t> c_offsets(num_colours + 1, 0);
+  for (std::int32_t c : colour)
+    ++c_offsets[c + 1];
+  std::partial_sum(c_offsets.begin(), c_offsets.end(), c_offsets.begin());
+  std::vector<std::int32_t> c_nodes(n);
+  {
+    std::vector<std::int32_t> pos(c_offsets.begin(),
+                                  std::prev(c_offsets.end()));
+    for (std::int32_t i = 0; i < n; ++i)
+      c_nodes[pos[colour[i]]++] = i;
+  }
+
+  return graph::AdjacencyList<std::int32_t>(std::move(c_nodes),
+                                            std::move(c_offsets));
+}
+//-----------------------------------------------------------------------------
@@ -26,4 +26,20 @@ class AdjacencyList;
 std::vector<std::int32_t>
 reorder_gps(const graph::AdjacencyList<std::int32_t>& graph);
 
+/// @brief Colour nodes such that nodes of the same colour do not share
+/// a resource.
+///
+/// Nodes are coloured greedily in order, each node taking the lowest
+/// colour that is not used by a node it shares a resource with. A
+/// typical use is to colour mesh cells by the degrees-of-freedom they
+/// write to, which allows the cells of one colour to be assembled
+/// concurrently.
+///
+/// @param[in] resources The resources (e.g., degree-of-freedom indices)
+/// for each node
+/// @return Adjacency list where the links of node `c` are the nodes
+/// with colour `c`, in increasing order
+graph::AdjacencyList<std::int32_t>
+colour_greedy(const graph::AdjacencyList<std::int32_t>& resources);
+
 } // namespace dolfinx::graph
\ No newline at end of file
@@ -7,10 +7,14 @@
 #pragma once
 
 #include "SparsityPattern.h"
+#include "Vector.h"
 #include "matrix_csr_impl.h"
+#include <algorithm>
 #include <dolfinx/common/IndexMap.h>
 #include <dolfinx/common/MPI.h>
+#include <dolfinx/common/ThreadPool.h>
 #include <dolfinx/graph/AdjacencyList.h>
+#include <memory>
 #include <mpi.h>
 #include <numeric>
 #include <span>
@@ -29,6 +33,18 @@ enum class BlockMode : int
                /// matrix has a block size of (1, 1).
 };
 
+/// @brief Modes for storing the entries of a matrix
+enum class StorageMode : int
+{
+  general = 0,  /// All entries in the sparsity pattern are stored.
+  symmetric = 1 /// Only the upper triangle of a symmetric matrix is
+                /// stored, i.e. entries with a global column index that
+                /// is greater than or equal to the global row index. In
+                /// the compact block mode, blocks on the diagonal are
+                /// stored in full. Values that are set in, or added to,
+                /// the lower triangle are ignored.
+};
+
 /// Distributed sparse matrix
 ///
 /// The matrix storage format is compressed sparse row. The matrix is
@@ -173,7 +189,12 @@ public:
   /// matrix entry is individual. In the "expanded" case, the sparsity
   /// is expanded for every entry in the block, and the block size of
   /// the matrix is set to (1, 1).
-  MatrixCSR(const SparsityPattern& p, BlockMode mode = BlockMode::compact);
+  /// @param[in] storage Storage mode. With StorageMode::symmetric,
+  /// only the upper triangle of the sparsity pattern is stored, which
+  /// requires the row and column block sizes and the row and column
+  /// ownership ranges to be the same.
+  MatrixCSR(const SparsityPattern& p, BlockMode mode = BlockMode::compact,
+            StorageMode storage = StorageMode::general);
 
   /// Move constructor
   /// @todo Check handling of MPI_Request
@@ -205,25 +226,10 @@ public:
     auto set_fn = [](value_type& y, const value_type& x) { y = x; };
 
     assert(x.size() == rows.size() * cols.size() * BS0 * BS1);
-    if (_bs[0] == BS0 and _bs[1] == BS1)
-    {
-      impl::insert_csr<BS0, BS1>(_data, _cols, _row_ptr, x, rows, cols, set_fn,
-                                 _index_maps[0]->size_local());
-    }
-    else if (_bs[0] == 1 and _bs[1] == 1)
-    {
-      // Set blocked data in a regular CSR matrix (_bs[0]=1, _bs[1]=1) with
-      // correct sparsity
-      impl::insert_blocked_csr<BS0, BS1>(_data, _cols, _row_ptr, x, rows, cols,
-                                         set_fn, _index_maps[0]->size_local());
-    }
+    if (_storage == StorageMode::symmetric)
+      insert<BS0, BS1, true>(x, rows, cols, set_fn, num_owned_rows());
     else
-    {
-      assert(BS0 == 1 and BS1 == 1);
-      // Set non-blocked data in a blocked CSR matrix (BS0=1, BS1=1)
-      impl::insert_nonblocked_csr(_data, _cols, _row_ptr, x, rows, cols, set_fn,
-                                  _index_maps[0]->size_local(), _bs[0], _bs[1]);
-    }
+      insert<BS0, BS1, false>(x, rows, cols, set_fn, num_owned_rows());
   }
 
   /// @brief Accumulate values in the matrix
@@ -248,24 +254,10 @@ public:
     auto add_fn = [](value_type& y, const value_type& x) { y += x; };
 
     assert(x.size() == rows.size() * cols.size() * BS0 * BS1);
-    if (_bs[0] == BS0 and _bs[1] == BS1)
-    {
-      impl::insert_csr<BS0, BS1>(_data, _cols, _row_ptr, x, rows, cols, add_fn,
-                                 _row_ptr.size());
-    }
-    else if (_bs[0] == 1 and _bs[1] == 1)
-    {
-      // Add blocked data to a regular CSR matrix (_bs[0]=1, _bs[1]=1)
-      impl::insert_blocked_csr<BS0, BS1>(_data, _cols, _row_ptr, x, rows, cols,
-                                         add_fn, _row_ptr.size());
-    }
+    if (_storage == StorageMode::symmetric)
+      insert<BS0, BS1, true>(x, rows, cols, add_fn, _row_ptr.size());
     else
-    {
-      assert(BS0 == 1 and BS1 == 1);
-      // Add non-blocked data to a blocked CSR matrix (BS0=1, BS1=1)
-      impl::insert_nonblocked_csr(_data, _cols, _row_ptr, x, rows, cols, add_fn,
-                                  _row_ptr.size(), _bs[0], _bs[1]);
-    }
+      insert<BS0, BS1, false>(x, rows, cols, add_fn, _row_ptr.size());
   }
 
   /// Number of local rows excluding ghost rows
@@ -311,9 +303,37 @@ public:
 
   /// @brief Compute the Frobenius norm squared across all processes
   /// @note This does not include ghost rows.
+  /// @note With symmetric storage, the entries in the (not stored)
+  /// lower triangle are included.
   /// @note MPI Collective
   double squared_norm() const;
 
+  /// @brief Compute the matrix-vector product \f$y \leftarrow y +
+  /// Ax\f$.
+  ///
+  /// The ghost values of `x` are updated by this function, overlapping
+  /// communication with computation for the columns that are owned.
+  /// With symmetric storage, the product with the upper triangle and
+  /// its transpose is computed in a single pass over the matrix
+  /// entries.
+  ///
+  /// @note Only the owned entries of `y` are updated. The matrix must
+  /// be finalised.
+  /// @note MPI Collective
+  /// @param[in,out] x Vector to apply the matrix to. It must use the
+  /// column index map of the matrix (`index_map(1)`) and have block
+  /// size `block_size()[1]`.
+  /// @param[in,out] y Vector to accumulate the product into. The size
+  /// of the owned part must be the number of owned rows times
+  /// `block_size()[0]`.
+  /// @param[in] num_threads Number of threads. The owned rows are split
+  /// into contiguous ranges, one per thread, that are processed by the
+  /// threads of common::ThreadPool::pool(). Fewer threads are used if
+  /// there are less than 1024 rows per thread. Threading is not used
+  /// with symmetric storage, for which the transposed entries of
+  /// different rows are added to the same entries of `y`.
+  void mult(Vector<value_type>& x, Vector<value_type>& y, int num_threads = 1);
+
   /// @brief Index maps for the row and column space.
   ///
   /// The row IndexMap contains ghost entries for rows which may be
@@ -358,13 +378,47 @@ public:
   /// @return block sizes for rows and columns
   const std::array<int, 2>& block_size() const { return _bs; }
 
+  /// Storage mode
+  StorageMode storage_mode() const { return _storage; }
+
 private:
+  // Insert data with the matrix and data block sizes dispatched to
+  // the appropriate implementation
+  template <int BS0, int BS1, bool UPPER, typename OP>
+  void insert(std::span<const value_type> x, std::span<const std::int32_t> rows,
+              std::span<const std::int32_t> cols, OP op,
+              std::int32_t local_size)
+  {
+    if (_bs[0] == BS0 and _bs[1] == BS1)
+    {
+      impl::insert_csr<BS0, BS1, UPPER>(_data, _cols, _row_ptr, x, rows, cols,
+                                        op, local_size);
+    }
+    else if (_bs[0] == 1 and _bs[1] == 1)
+    {
+      // Insert blocked data in a regular CSR matrix (_bs[0]=1,
+      // _bs[1]=1) with correct sparsity
+      impl::insert_blocked_csr<BS0, BS1, UPPER>(_data, _cols, _row_ptr, x, rows,
+                                                cols, op, local_size);
+    }
+    else
+    {
+      assert(BS0 == 1 and BS1 == 1);
+      // Insert non-blocked data in a blocked CSR matrix (BS0=1, BS1=1)
+      impl::insert_nonblocked_csr<UPPER>(_data, _cols, _row_ptr, x, rows, cols,
+                                         op, local_size, _bs[0], _bs[1]);
+    }
+  }
+
   // Maps for the distribution of the ows and columns
   std::array<std::shared_ptr<const common::IndexMap>, 2> _index_maps;
 
   // Block mode (compact or expanded)
   BlockMode _block_mode;
 
+  // Storage mode (general or symmetric)
+  StorageMode _storage;
+
   // Block sizes
   std::array<int, 2> _bs;
 
@@ -398,13 +452,19 @@ private:
   // Temporary stores for finalize data during non-blocking communication
   container_type _ghost_value_data;
   container_type _ghost_value_data_in;
+
+  // Work vector for the contributions of the transposed upper triangle
+  // to unowned rows in `mult` (symmetric storage only)
+  std::unique_ptr<Vector<value_type>> _mult_work;
 };
 //-----------------------------------------------------------------------------
 template <class U, class V, class W, class X>
-MatrixCSR<U, V, W, X>::MatrixCSR(const SparsityPattern& p, BlockMode mode)
+MatrixCSR<U, V, W, X>::MatrixCSR(const SparsityPattern& p, BlockMode mode,
+                                 StorageMode storage)
     : _index_maps({p.index_map(0),
                    std::make_shared<common::IndexMap>(p.column_index_map())}),
-      _block_mode(mode), _bs({p.block_size(0), p.block_size(1)}),
+      _block_mode(mode), _storage(storage),
+      _bs({p.block_size(0), p.block_size(1)}),
       _data(p.num_nonzeros() * _bs[0] * _bs[1], 0),
       _cols(p.graph().first.begin(), p.graph().first.end()),
       _row_ptr(p.graph().second.begin(), p.graph().second.end()),
@@ -472,6 +532,54 @@ MatrixCSR<U, V, W, X>::MatrixCSR(const SparsityPattern& p, BlockMode mode)
                    std::back_inserter(_off_diagonal_offset), std::plus{});
   }
 
+  if (_storage == StorageMode::symmetric)
+  {
+    if (_bs[0] != _bs[1]
+        or _index_maps[0]->local_range() != _index_maps[1]->local_range())
+    {
+      throw std::runtime_error(
+          "Symmetric storage requires the same row and column block size "
+          "and parallel distribution.");
+    }
+
+    // Remove the lower triangle (by global index) from the sparsity
+    const std::int64_t offset = _index_maps[0]->local_range()[0];
+    const std::int32_t size_local = _index_maps[0]->size_local();
+    const std::vector<std::int64_t>& ghosts0 = _index_maps[0]->ghosts();
+    const std::vector<std::int64_t>& ghosts1 = _index_maps[1]->ghosts();
+    column_container_type new_cols;
+    new_cols.reserve(_cols.size() / 2 + _row_ptr.size());
+    rowptr_container_type new_row_ptr = {0};
+    new_row_ptr.reserve(_row_ptr.size());
+    rowptr_container_type new_off_diagonal_offset;
+    new_off_diagonal_offset.reserve(_off_diagonal_offset.size());
+    for (std::size_t i = 0; i < _row_ptr.size() - 1; ++i)
+    {
+      const std::int64_t row
+          = i < std::size_t(size_local) ? offset + i : ghosts0[i - size_local];
+      std::int64_t num_owned = 0;
+      for (auto j = _row_ptr[i]; j < _row_ptr[i + 1]; ++j)
+      {
+        const std::int32_t c = _cols[j];
+        const std::int64_t col
+            = c < size_local ? offset + c : ghosts1[c - size_local];
+        if (col >= row)
+        {
+          new_cols.push_back(c);
+          if (c < size_local)
+            ++num_owned;
+        }
+      }
+      new_off_diagonal_offset.push_back(new_row_ptr.back() + num_owned);
+      new_row_ptr.push_back(new_cols.size());
+    }
+    _cols = std::move(new_cols);
+    _row_ptr = std::move(new_row_ptr);
+    _off_diagonal_offset = std::move(new_off_diagonal_offset);
+    _data.resize(_cols.size() * _bs[0] * _bs[1]);
+    _data.shrink_to_fit();
+  }
+
   // Some short-hand
   const std::array local_size
       = {_index_maps[0]->size_local(), _index_maps[1]->size_local()};
@@ -636,6 +744,22 @@ MatrixCSR<U, V, W, X>::to_dense() const
               = _data[j * _bs[0] * _bs[1] + i0 * _bs[1] + i1];
         }
 
+  // Fill in the lower triangle for owned columns
+  if (_storage == StorageMode::symmetric)
+  {
+    const std::int32_t size_local = _index_maps[0]->size_local();
+    const int bs = _bs[0];
+    for (std::int32_t r = 0; r < size_local; ++r)
+      for (auto j = _row_ptr[r]; j < _off_diagonal_offset[r]; ++j)
+        if (std::int32_t c = _cols[j]; c != r)
+          for (int i0 = 0; i0 < bs; ++i0)
+            for (int i1 = 0; i1 < bs; ++i1)
+            {
+              A[(c * bs + i1) * ncols * bs + r * bs + i0]
+                  = _data[j * bs * bs + i0 * bs + i1];
+            }
+  }
+
   return A;
 }
 //-----------------------------------------------------------------------------
@@ -713,13 +837,120 @@ double MatrixCSR<U, V, W, X>::squared_norm() const
   const std::size_t num_owned_rows = _index_maps[0]->size_local();
   const int bs2 = _bs[0] * _bs[1];
   assert(num_owned_rows < _row_ptr.size());
-  double norm_sq_local = std::accumulate(
-      _data.cbegin(), std::next(_data.cbegin(), _row_ptr[num_owned_rows] * bs2),
-      double(0), [](auto norm, value_type y) { return norm + std::norm(y); });
+  double norm_sq_local = 0;
+  if (_storage == StorageMode::symmetric)
+  {
+    // Entries off the diagonal also appear in the lower triangle
+    for (std::size_t r = 0; r < num_owned_rows; ++r)
+    {
+      for (auto j = _row_ptr[r]; j < _row_ptr[r + 1]; ++j)
+      {
+        const double w = std::size_t(_cols[j]) == r ? 1.0 : 2.0;
+        for (int k = 0; k < bs2; ++k)
+          norm_sq_local += w * std::norm(_data[j * bs2 + k]);
+      }
+    }
+  }
+  else
+  {
+    norm_sq_local = std::accumulate(
+        _data.cbegin(),
+        std::next(_data.cbegin(), _row_ptr[num_owned_rows] * bs2), double(0),
+        [](auto norm, value_type y) { return norm + std::norm(y); });
+  }
   double norm_sq;
   MPI_Allreduce(&norm_sq_local, &norm_sq, 1, MPI_DOUBLE, MPI_SUM, _comm.comm());
   return norm_sq;
 }
 //-----------------------------------------------------------------------------
+template <typename U, typename V, typename W, typename X>
+void MatrixCSR<U, V, W, X>::mult(Vector<value_type>& x, Vector<value_type>& y,
+                                 int num_threads)
+{
+  const std::int32_t nrows = _index_maps[0]->size_local();
+  const int bs0 = _bs[0];
+  const int bs1 = _bs[1];
+  assert(x.bs() == bs1);
+  assert(x.index_map()->size_local() == _index_maps[1]->size_local());
+  assert(x.index_map()->num_ghosts() == _index_maps[1]->num_ghosts());
+
+  const bool symmetric = _storage == StorageMode::symmetric;
+  std::span<value_type> w;
+  if (symmetric)
+  {
+    if (!_mult_work)
+      _mult_work = std::make_unique<Vector<value_type>>(_index_maps[1], bs1);
+    _mult_work->set(0);
+    w = _mult_work->mutable_array();
+  }
+
+  // Compute the product for entries [j0[r], j1[r]) of rows [r0, r1).
+  // With symmetric storage, the transposed entries (off the diagonal)
+  // are added to y (owned columns) or w (ghost columns).
+  std::span<value_type> _y = y.mutable_array();
+  auto spmv_rows = [&](std::span<const value_type> _x,
+                       const rowptr_container_type& j0, std::size_t shift0,
+                       const rowptr_container_type& j1, std::size_t shift1,
+                       std::int32_t r0, std::int32_t r1)
+  {
+    for (std::int32_t r = r0; r < r1; ++r)
+    {
+      for (auto j = j0[r + shift0]; j < j1[r + shift1]; ++j)
+      {
+        const std::int32_t c = _cols[j];
+        const value_type* Aj = _data.data() + j * bs0 * bs1;
+        for (int i0 = 0; i0 < bs0; ++i0)
+          for (int i1 = 0; i1 < bs1; ++i1)
+            _y[r * bs0 + i0] += Aj[i0 * bs1 + i1] * _x[c * bs1 + i1];
+
+        if (symmetric and c != r)
+        {
+          std::span<value_type> z = c < nrows ? _y : w;
+          for (int i0 = 0; i0 < bs0; ++i0)
+            for (int i1 = 0; i1 < bs1; ++i1)
+              z[c * bs1 + i1] += Aj[i0 * bs1 + i1] * _x[r * bs0 + i0];
+        }
+      }
+    }
+  };
+
+  // Use at most one thread per 1024 rows, below which the product is
+  // too cheap to benefit from threads
+  const int n = symmetric ? 1 : std::min(num_threads, nrows / 1024);
+  auto spmv = [&](std::span<const value_type> _x,
+                  const rowptr_container_type& j0, std::size_t shift0,
+                  const rowptr_container_type& j1, std::size_t shift1)
+  {
+    if (n <= 1)
+      spmv_rows(_x, j0, shift0, j1, shift1, 0, nrows);
+    else
+    {
+      common::ThreadPool::pool().run(
+          n,
+          [&](int t)
+          {
+            auto [r0, r1] = dolfinx::MPI::local_range(t, nrows, n);
+            spmv_rows(_x, j0, shift0, j1, shift1, r0, r1);
+          });
+    }
+  };
+
+  // Columns that are owned, while ghost values of x are updated
+  x.scatter_fwd_begin();
+  spmv(x.array(), _row_ptr, 0, _off_diagonal_offset, 0);
+  x.scatter_fwd_end();
+
+  // Columns that are ghosts
+  spmv(x.array(), _off_diagonal_offset, 0, _row_ptr, 1);
+
+  // Send transposed contributions to the owners of the ghost columns
+  if (symmetric)
+  {
+    _mult_work->scatter_rev(std::plus<value_type>());
+    std::transform(w.begin(), std::next(w.begin(), nrows * bs1), _y.begin(),
+                   _y.begin(), std::plus<value_type>());
+  }
+}
+//-----------------------------------------------------------------------------
 
 } // namespace dolfinx::la
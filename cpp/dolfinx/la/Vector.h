@@ -54,7 +54,7 @@ public:
   Vector(const Vector& x)
       : _map(x._map), _scatterer(x._scatterer), _bs(x._bs),
         _request(1, MPI_REQUEST_NULL), _buffer_local(x._buffer_local),
-        _buffer_remote(x._buffer_remote), _x(x._x)
+        _buffer_remote(x._buffer_remote), _x(x._x), _state(x._state)
   {
   }
 
@@ -64,7 +64,8 @@ public:
         _bs(std::move(x._bs)),
         _request(std::exchange(x._request, {MPI_REQUEST_NULL})),
         _buffer_local(std::move(x._buffer_local)),
-        _buffer_remote(std::move(x._buffer_remote)), _x(std::move(x._x))
+        _buffer_remote(std::move(x._buffer_remote)), _x(std::move(x._x)),
+        _state(x._state)
   {
   }
 
@@ -76,7 +77,11 @@ public:
 
   /// Set all entries (including ghosts)
   /// @param[in] v The value to set all entries to (on calling rank)
-  void set(value_type v) { std::fill(_x.begin(), _x.end(), v); }
+  void set(value_type v)
+  {
+    std::fill(_x.begin(), _x.end(), v);
+    ++_state;
+  }
 
   /// Begin scatter of local data from owner to ghosts on other ranks
   /// @note Collective MPI operation
@@ -114,6 +119,7 @@ public:
 
     unpack(_buffer_remote, _scatterer->remote_indices(), x_remote,
            [](auto /*a*/, auto b) { return b; });
+    ++_state;
   }
 
   /// Scatter local data to ghost positions on other ranks
@@ -163,6 +169,7 @@ public:
         out[idx[i]] = op(out[idx[i]], in[i]);
     };
     unpack(_buffer_local, _scatterer->local_indices(), x_local, op);
+    ++_state;
   }
 
   /// Scatter ghost data to owner. This process may receive data from
@@ -190,7 +197,25 @@ public:
   }
 
   /// Get local part of the vector
-  std::span<value_type> mutable_array() { return std::span(_x); }
+  /// @note Increases the modification state of the vector
+  std::span<value_type> mutable_array()
+  {
+    ++_state;
+    return std::span(_x);
+  }
+
+  /// @brief Modification state of the vector.
+  ///
+  /// The state is increased whenever the vector entries can be
+  /// modified, i.e. by mutable_array(), set() and the scatter
+  /// operations. It can be used to detect whether data that is derived
+  /// from the vector, e.g. packed coefficients, is out of date.
+  /// Modifying the vector through a pointer that was obtained before
+  /// the state was last inspected requires a call to increase_state().
+  std::uint64_t state() const { return _state; }
+
+  /// @brief Increase the modification state of the vector, see state().
+  void increase_state() { ++_state; }
 
 private:
   // Map describing the data layout
@@ -210,6 +235,9 @@ private:
 
   // Vector data
   container_type _x;
+
+  // Modification state
+  std::uint64_t _state = 0;
 };
 
 /// Compute the inner product of two vectors. The two vectors must have
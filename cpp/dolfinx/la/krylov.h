@@ -0,0 +1,659 @@
+// Copyright (C) 2023 The FEniCS Project
+//
+// This file is part of DOLFINx (https://www.fenicsproject.org)
+//
+// SPDX-License-Identifier:    LGPL-3.0-or-later
+
+#pragma once
+
+#include "MatrixCSR.h"
+#include "Vector.h"
+#include "utils.h"
+#include <algorithm>
+#include <cmath>
+#include <complex>
+#include <functional>
+#include <memory>
+#include <span>
+#include <stdexcept>
+#include <type_traits>
+#include <utility>
+#include <vector>
+
+/// @brief Iterative solvers and preconditioners for la::MatrixCSR and
+/// la::Vector.
+///
+/// The solvers operate on the owned entries of distributed vectors and
+/// do not depend on PETSc. Operators and preconditioners are callables
+/// `f(x, y)` that compute `y = Op x` for vectors `x` and `y` with the
+/// same parallel layout as the right-hand side.
+namespace dolfinx::la::krylov
+{
+
+/// Convergence information of an iterative solve
+struct SolverInfo
+{
+  /// Number of iterations
+  int iterations = 0;
+
+  /// Norm of the final residual
+  double residual_norm = 0;
+
+  /// True if the convergence tolerance was reached
+  bool converged = false;
+};
+
+namespace impl
+{
+/// Owned part of a vector
+template <typename T>
+std::span<T> owned(Vector<T>& x)
+{
+  return x.mutable_array().first(x.bs() * x.index_map()->size_local());
+}
+
+/// Owned part of a vector (const version)
+template <typename T>
+std::span<const T> owned(const Vector<T>& x)
+{
+  return x.array().first(x.bs() * x.index_map()->size_local());
+}
+
+/// Complex conjugate (identity for real types)
+template <typename T>
+T conj(T v)
+{
+  if constexpr (std::is_floating_point_v<T>)
+    return v;
+  else
+    return std::conj(v);
+}
+
+/// y <- y + a x
+template <typename T>
+void axpy(Vector<T>& y, T a, const Vector<T>& x)
+{
+  std::span<T> _y = owned(y);
+  std::span<const T> _x = owned(x);
+  for (std::size_t i = 0; i < _y.size(); ++i)
+    _y[i] += a * _x[i];
+}
+
+/// y <- x + a y
+template <typename T>
+void aypx(Vector<T>& y, T a, const Vector<T>& x)
+{
+  std::span<T> _y = owned(y);
+  std::span<const T> _x = owned(x);
+  for (std::size_t i = 0; i < _y.size(); ++i)
+    _y[i] = _x[i] + a * _y[i];
+}
+
+/// y <- x
+template <typename T>
+void copy(Vector<T>& y, const Vector<T>& x)
+{
+  std::span<const T> _x = owned(x);
+  std::copy(_x.begin(), _x.end(), owned(y).begin());
+}
+
+/// r <- b - A x
+template <typename T, typename Op>
+void residual(Op& A, const Vector<T>& x, const Vector<T>& b, Vector<T>& r)
+{
+  A(x, r);
+  aypx(r, T(-1), b);
+}
+
+/// @brief Extract the `n x n` diagonal blocks of the owned rows of a
+/// matrix, with rows and columns counted as scalar (unblocked) indices.
+/// @return Row-major blocks, one after another
+template <typename T>
+std::vector<T> diagonal_blocks(const MatrixCSR<T>& A, int n)
+{
+  const std::array<int, 2> bs = A.block_size();
+  if (bs[0] != bs[1])
+    throw std::runtime_error("Diagonal blocks require a square block size.");
+  const std::int32_t nrows = A.index_map(0)->size_local();
+  if ((nrows * bs[0]) % n != 0)
+  {
+    throw std::runtime_error(
+        "Number of owned rows is not a multiple of the block size.");
+  }
+
+  const bool symmetric = A.storage_mode() == StorageMode::symmetric;
+  const auto& row_ptr = A.row_ptr();
+  const auto& cols = A.cols();
+  const auto& data = A.values();
+  std::vector<T> blocks(nrows * bs[0] * n, 0);
+  for (std::int32_t r = 0; r < nrows; ++r)
+  {
+    for (auto j = row_ptr[r]; j < A.off_diag_offset()[r]; ++j)
+    {
+      for (int i0 = 0; i0 < bs[0]; ++i0)
+      {
+        for (int i1 = 0; i1 < bs[1]; ++i1)
+        {
+          const std::int32_t p = r * bs[0] + i0;
+          const std::int32_t q = cols[j] * bs[1] + i1;
+          if (p / n != q / n)
+            continue;
+          const T v = data[(j * bs[0] + i0) * bs[1] + i1];
+          T* block = blocks.data() + (p / n) * n * n;
+          block[(p % n) * n + q % n] = v;
+          if (symmetric)
+            block[(q % n) * n + p % n] = v;
+        }
+      }
+    }
+  }
+
+  return blocks;
+}
+} // namespace impl
+
+/// @brief Create an operator `y = A x` from a matrix.
+///
+/// The owned entries of `x` are copied into a work vector with the
+/// column layout of the matrix, so `x` and `y` may use any index map
+/// with the same owned size as the matrix rows.
+/// @param[in] A The matrix. It must be finalised and outlive the
+/// operator.
+/// @param[in] num_threads Number of threads used in the product
+template <typename T>
+std::function<void(const Vector<T>&, Vector<T>&)>
+matrix_operator(MatrixCSR<T>& A, int num_threads = 1)
+{
+  auto w = std::make_shared<Vector<T>>(A.index_map(1), A.block_size()[1]);
+  return [&A, w, num_threads](const Vector<T>& x, Vector<T>& y)
+  {
+    impl::copy(*w, x);
+    y.set(0);
+    A.mult(*w, y, num_threads);
+  };
+}
+
+/// @brief Identity preconditioner
+template <typename T>
+struct Identity
+{
+  /// Apply the preconditioner, `y = x`
+  void operator()(const Vector<T>& x, Vector<T>& y) const
+  {
+    impl::copy(y, x);
+  }
+};
+
+/// @brief Jacobi (diagonal) preconditioner
+template <typename T>
+class Jacobi
+{
+public:
+  /// @brief Create a Jacobi preconditioner
+  /// @param[in] A The matrix. The diagonal is copied, so `A` may be
+  /// destroyed after construction.
+  Jacobi(const MatrixCSR<T>& A) : _diag(impl::diagonal_blocks(A, 1))
+  {
+    for (auto& d : _diag)
+    {
+      if (d == T(0))
+        throw std::runtime_error("Zero on the matrix diagonal.");
+      d = T(1) / d;
+    }
+  }
+
+  /// Apply the preconditioner, `y = D^{-1} x`
+  void operator()(const Vector<T>& x, Vector<T>& y) const
+  {
+    std::span<const T> _x = impl::owned(x);
+    std::span<T> _y = impl::owned(y);
+    for (std::size_t i = 0; i < _y.size(); ++i)
+      _y[i] = _diag[i] * _x[i];
+  }
+
+  /// Inverse of the matrix diagonal (owned rows)
+  std::span<const T> inverse_diagonal() const { return _diag; }
+
+private:
+  std::vector<T> _diag;
+};
+
+/// @brief Point-block Jacobi preconditioner.
+///
+/// The dense diagonal blocks of size `n x n` (in scalar rows and
+/// columns) are inverted, e.g. with `n` the number of components of a
+/// vector-valued field.
+template <typename T>
+class BlockJacobi
+{
+public:
+  /// @brief Create a block Jacobi preconditioner
+  /// @param[in] A The matrix. The diagonal blocks are copied.
+  /// @param[in] block_size Size of the diagonal blocks. If not
+  /// positive, the block size of the matrix is used.
+  BlockJacobi(const MatrixCSR<T>& A, int block_size = 0)
+      : _n(block_size > 0 ? block_size : A.block_size()[0]),
+        _blocks(impl::diagonal_blocks(A, _n))
+  {
+    // Invert each block by solving for the columns of the identity
+    const std::size_t size = _n * _n;
+    std::vector<int> perm(_n);
+    std::vector<T> Dinv(size);
+    for (std::size_t b = 0; b < _blocks.size() / size; ++b)
+    {
+      std::span<T> D(_blocks.data() + b * size, size);
+      la::impl::lu_factor<T>(D, perm);
+      std::fill(Dinv.begin(), Dinv.end(), 0);
+      for (int i = 0; i < _n; ++i)
+        Dinv[i * _n + i] = 1;
+      la::impl::lu_solve<T>(D, perm, Dinv, _n);
+      std::copy(Dinv.begin(), Dinv.end(), D.begin());
+    }
+  }
+
+  /// Apply the preconditioner, `y = D^{-1} x`
+  void operator()(const Vector<T>& x, Vector<T>& y) const
+  {
+    std::span<const T> _x = impl::owned(x);
+    std::span<T> _y = impl::owned(y);
+    for (std::size_t b = 0; b < _y.size() / _n; ++b)
+    {
+      const T* D = _blocks.data() + b * _n * _n;
+      for (int i = 0; i < _n; ++i)
+      {
+        T yi = 0;
+        for (int j = 0; j < _n; ++j)
+          yi += D[i * _n + j] * _x[b * _n + j];
+        _y[b * _n + i] = yi;
+      }
+    }
+  }
+
+  /// Size of the diagonal blocks
+  int block_size() const { return _n; }
+
+private:
+  int _n;
+  std::vector<T> _blocks;
+};
+
+/// @brief Jacobi-scaled Chebyshev polynomial preconditioner.
+///
+/// Applies `degree` steps of the Chebyshev iteration for `A y = x`,
+/// starting from `y = 0`, on the interval `[lmin, lmax]` that is
+/// assumed to contain the eigenvalues of `D^{-1} A`. If the bounds are
+/// not given, `lmax` is estimated by power iteration and the interval
+/// `[0.1 lmax, 1.1 lmax]` is used.
+template <typename T>
+class Chebyshev
+{
+public:
+  /// @brief Create a Chebyshev preconditioner
+  /// @param[in] A The matrix. It must outlive the preconditioner.
+  /// @param[in] degree Polynomial degree (number of matrix products
+  /// plus one)
+  /// @param[in] bounds Eigenvalue bounds of the Jacobi-scaled matrix.
+  /// The bounds are estimated if `bounds[1] <= bounds[0]`.
+  /// @param[in] num_threads Number of threads used in matrix products
+  Chebyshev(MatrixCSR<T>& A, int degree = 3,
+            std::array<double, 2> bounds = {0, 0}, int num_threads = 1)
+      : _A(matrix_operator(A, num_threads)), _jacobi(A), _degree(degree),
+        _bounds(bounds),
+        _r(std::make_shared<Vector<T>>(A.index_map(0), A.block_size()[0])),
+        _d(std::make_shared<Vector<T>>(A.index_map(0), A.block_size()[0]))
+  {
+    if (degree < 1)
+      throw std::runtime_error("Chebyshev degree must be positive.");
+    if (_bounds[1] <= _bounds[0])
+    {
+      const double lmax = estimate_max_eigenvalue(10);
+      _bounds = {0.1 * lmax, 1.1 * lmax};
+    }
+  }
+
+  /// Apply the preconditioner, `y = p(A) x`
+  void operator()(const Vector<T>& x, Vector<T>& y) const
+  {
+    const double theta = 0.5 * (_bounds[1] + _bounds[0]);
+    const double delta = 0.5 * (_bounds[1] - _bounds[0]);
+    const double sigma = theta / delta;
+    double rho = 1.0 / sigma;
+
+    // d = D^{-1} x / theta, y = d
+    Vector<T>& r = *_r;
+    Vector<T>& d = *_d;
+    _jacobi(x, d);
+    std::span<T> d_array = impl::owned(d);
+    std::transform(d_array.begin(), d_array.end(), d_array.begin(),
+                   [theta](auto v) { return v / T(theta); });
+    impl::copy(y, d);
+
+    for (int k = 1; k < _degree; ++k)
+    {
+      // r = D^{-1} (x - A y)
+      impl::residual(_A, y, x, r);
+      _jacobi(r, r);
+
+      const double rho_new = 1.0 / (2.0 * sigma - rho);
+      std::span<const T> r_array = impl::owned(std::as_const(r));
+      for (std::size_t i = 0; i < d_array.size(); ++i)
+      {
+        d_array[i] = T(rho_new * rho) * d_array[i]
+                     + T(2.0 * rho_new / delta) * r_array[i];
+      }
+      impl::axpy(y, T(1), d);
+      rho = rho_new;
+    }
+  }
+
+  /// Eigenvalue interval of the Jacobi-scaled matrix
+  std::array<double, 2> bounds() const { return _bounds; }
+
+private:
+  // Estimate the largest eigenvalue of D^{-1} A by power iteration
+  double estimate_max_eigenvalue(int num_iterations) const
+  {
+    Vector<T>& v = *_r;
+    Vector<T>& w = *_d;
+    std::span<T> v_array = impl::owned(v);
+    const std::int64_t offset = v.bs() * v.index_map()->local_range()[0];
+    for (std::size_t i = 0; i < v_array.size(); ++i)
+      v_array[i] = T(1.0 + 0.5 * std::sin(double(offset + i)));
+
+    double lmax = 0;
+    for (int k = 0; k < num_iterations; ++k)
+    {
+      const double vnorm = la::norm(v);
+      if (vnorm == 0)
+        break;
+      for (auto& vi : v_array)
+        vi /= T(vnorm);
+      _A(v, w);
+      _jacobi(w, w);
+      lmax = std::real(la::inner_product(v, w));
+      impl::copy(v, w);
+    }
+
+    return lmax;
+  }
+
+  std::function<void(const Vector<T>&, Vector<T>&)> _A;
+  Jacobi<T> _jacobi;
+  int _degree;
+  std::array<double, 2> _bounds;
+
+  // Work vectors
+  std::shared_ptr<Vector<T>> _r, _d;
+};
+
+/// @brief Preconditioned conjugate gradient method.
+///
+/// The operator and the preconditioner must be symmetric (Hermitian)
+/// and positive definite.
+/// @param[in] A The operator
+/// @param[in] M The preconditioner
+/// @param[in,out] x Initial guess on entry and solution on exit
+/// @param[in] b The right-hand side
+/// @param[in] rtol Relative tolerance on the residual norm (relative to
+/// the norm of `b`)
+/// @param[in] atol Absolute tolerance on the residual norm
+/// @param[in] max_it Maximum number of iterations
+/// @return Convergence information
+template <typename T, typename Op, typename Prec>
+SolverInfo cg(Op&& A, Prec&& M, Vector<T>& x, const Vector<T>& b,
+              double rtol, double atol, int max_it)
+{
+  const double tol = std::max(rtol * la::norm(b), atol);
+  Vector<T> r(b), z(b), p(b), q(b);
+  impl::residual(A, x, b, r);
+
+  SolverInfo info;
+  info.residual_norm = la::norm(r);
+  if (info.residual_norm <= tol)
+  {
+    info.converged = true;
+    return info;
+  }
+
+  M(r, z);
+  impl::copy(p, z);
+  T rz = la::inner_product(r, z);
+  while (info.iterations < max_it)
+  {
+    ++info.iterations;
+    A(p, q);
+    const T alpha = rz / la::inner_product(p, q);
+    impl::axpy(x, alpha, p);
+    impl::axpy(r, -alpha, q);
+
+    info.residual_norm = la::norm(r);
+    if (info.residual_norm <= tol)
+    {
+      info.converged = true;
+      break;
+    }
+
+    M(r, z);
+    const T rz_new = la::inner_product(r, z);
+    impl::aypx(p, rz_new / rz, z);
+    rz = rz_new;
+  }
+
+  return info;
+}
+
+/// @brief Restarted GMRES method with right preconditioning.
+///
+/// The residual norm that is monitored is the norm of the true
+/// (unpreconditioned) residual.
+/// @param[in] A The operator
+/// @param[in] M The preconditioner
+/// @param[in,out] x Initial guess on entry and solution on exit
+/// @param[in] b The right-hand side
+/// @param[in] rtol Relative tolerance on the residual norm (relative to
+/// the norm of `b`)
+/// @param[in] atol Absolute tolerance on the residual norm
+/// @param[in] max_it Maximum number of iterations
+/// @param[in] restart Number of iterations between restarts
+/// @return Convergence information
+template <typename T, typename Op, typename Prec>
+SolverInfo gmres(Op&& A, Prec&& M, Vector<T>& x, const Vector<T>& b,
+                 double rtol, double atol, int max_it, int restart = 30)
+{
+  const double tol = std::max(rtol * la::norm(b), atol);
+  restart = std::max(restart, 1);
+
+  // Krylov basis, Hessenberg matrix (column-major, (m + 1) x m), Givens
+  // rotations and rotated residual
+  std::vector<Vector<T>> V(restart + 1, b);
+  std::vector<T> H((restart + 1) * restart), s(restart), g(restart + 1);
+  std::vector<double> c(restart);
+  Vector<T> z(b), w(b);
+
+  SolverInfo info;
+  while (true)
+  {
+    impl::residual(A, x, b, V[0]);
+    const double beta = la::norm(V[0]);
+    info.residual_norm = beta;
+    if (beta <= tol)
+    {
+      info.converged = true;
+      break;
+    }
+    if (info.iterations >= max_it)
+      break;
+
+    for (auto& v : impl::owned(V[0]))
+      v /= T(beta);
+    std::fill(g.begin(), g.end(), T(0));
+    g[0] = beta;
+
+    int k = 0;
+    for (; k < restart and info.iterations < max_it; ++k)
+    {
+      ++info.iterations;
+
+      // Arnoldi step (modified Gram-Schmidt)
+      M(V[k], z);
+      A(z, w);
+      T* h = H.data() + k * (restart + 1);
+      for (int i = 0; i <= k; ++i)
+      {
+        h[i] = la::inner_product(V[i], w);
+        impl::axpy(w, -h[i], V[i]);
+      }
+      const double wnorm = la::norm(w);
+      h[k + 1] = wnorm;
+      if (wnorm > 0)
+      {
+        impl::copy(V[k + 1], w);
+        for (auto& v : impl::owned(V[k + 1]))
+          v /= T(wnorm);
+      }
+
+      // Apply previous rotations to the new column
+      for (int i = 0; i < k; ++i)
+      {
+        const T hi = T(c[i]) * h[i] + s[i] * h[i + 1];
+        h[i + 1] = -impl::conj(s[i]) * h[i] + T(c[i]) * h[i + 1];
+        h[i] = hi;
+      }
+
+      // Compute and apply new rotation to eliminate h[k + 1]
+      const double a = std::abs(h[k]);
+      const double rho = std::sqrt(a * a + wnorm * wnorm);
+      if (rho == 0)
+      {
+        c[k] = 1;
+        s[k] = 0;
+      }
+      else if (a == 0)
+      {
+        c[k] = 0;
+        s[k] = 1;
+      }
+      else
+      {
+        c[k] = a / rho;
+        s[k] = (h[k] / T(a)) * T(wnorm / rho);
+      }
+      h[k] = T(c[k]) * h[k] + s[k] * h[k + 1];
+      h[k + 1] = 0;
+      g[k + 1] = -impl::conj(s[k]) * g[k];
+      g[k] = T(c[k]) * g[k];
+
+      info.residual_norm = std::abs(g[k + 1]);
+      if (info.residual_norm <= tol or wnorm == 0)
+      {
+        ++k;
+        break;
+      }
+    }
+
+    // Solve the upper triangular system H y = g and update the
+    // solution, x <- x + M^{-1} V y
+    std::vector<T> y(k);
+    for (int i = k - 1; i >= 0; --i)
+    {
+      T yi = g[i];
+      for (int j = i + 1; j < k; ++j)
+        yi -= H[j * (restart + 1) + i] * y[j];
+      y[i] = yi / H[i * (restart + 1) + i];
+    }
+    w.set(0);
+    for (int i = 0; i < k; ++i)
+      impl::axpy(w, y[i], V[i]);
+    M(w, z);
+    impl::axpy(x, T(1), z);
+  }
+
+  return info;
+}
+
+/// @brief Preconditioned BiCGStab method (right preconditioning).
+/// @param[in] A The operator
+/// @param[in] M The preconditioner
+/// @param[in,out] x Initial guess on entry and solution on exit
+/// @param[in] b The right-hand side
+/// @param[in] rtol Relative tolerance on the residual norm (relative to
+/// the norm of `b`)
+/// @param[in] atol Absolute tolerance on the residual norm
+/// @param[in] max_it Maximum number of iterations
+/// @return Convergence information
+template <typename T, typename Op, typename Prec>
+SolverInfo bicgstab(Op&& A, Prec&& M, Vector<T>& x, const Vector<T>& b,
+                    double rtol, double atol, int max_it)
+{
+  const double tol = std::max(rtol * la::norm(b), atol);
+  Vector<T> r(b), r0(b), p(b), v(b), phat(b), s(b), shat(b), t(b);
+  impl::residual(A, x, b, r);
+  impl::copy(r0, r);
+  p.set(0);
+  v.set(0);
+
+  SolverInfo info;
+  info.residual_norm = la::norm(r);
+  if (info.residual_norm <= tol)
+  {
+    info.converged = true;
+    return info;
+  }
+
+  T rho = 1, alpha = 1, omega = 1;
+  while (info.iterations < max_it)
+  {
+    ++info.iterations;
+    const T rho_new = la::inner_product(r0, r);
+    if (rho_new == T(0))
+      break;
+
+    // p = r + beta (p - omega v)
+    const T beta = (rho_new / rho) * (alpha / omega);
+    impl::axpy(p, -omega, v);
+    impl::aypx(p, beta, r);
+
+    M(p, phat);
+    A(phat, v);
+    alpha = rho_new / la::inner_product(r0, v);
+
+    // s = r - alpha v
+    impl::copy(s, r);
+    impl::axpy(s, -alpha, v);
+    const double snorm = la::norm(s);
+    if (snorm <= tol)
+    {
+      impl::axpy(x, alpha, phat);
+      info.residual_norm = snorm;
+      info.converged = true;
+      break;
+    }
+
+    M(s, shat);
+    A(shat, t);
+    const T tt = la::inner_product(t, t);
+    if (tt == T(0))
+      break;
+    omega = la::inner_product(t, s) / tt;
+    impl::axpy(x, alpha, phat);
+    impl::axpy(x, omega, shat);
+
+    // r = s - omega t
+    impl::copy(r, s);
+    impl::axpy(r, -omega, t);
+    info.residual_norm = la::norm(r);
+    if (info.residual_norm <= tol)
+    {
+      info.converged = true;
+      break;
+    }
+    if (omega == T(0))
+      break;
+
+    rho = rho_new;
+  }
+
+  return info;
+}
+
+} // namespace dolfinx::la::krylov
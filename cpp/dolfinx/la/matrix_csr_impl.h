@@ -20,6 +20,10 @@ namespace impl
 ///
 /// @tparam BS0 Row block size (of both matrix and data)
 /// @tparam BS1 Column block size (of both matrix and data)
+/// @tparam UPPER If `true`, entries that are not in the sparsity
+/// pattern are ignored. This is used for matrices that store only the
+/// upper triangle (see StorageMode::symmetric), where the pattern does
+/// not contain the lower triangle.
 /// @tparam OP The operation (usually "set" or "add")
 /// @param[out] data The CSR matrix data
 /// @param[in] cols The CSR column indices
@@ -45,8 +49,8 @@ namespace impl
 /// 8  9  | 10 11
 /// 12 13 | 14 15
 ///
-template <int BS0, int BS1, typename OP, typename U, typename V, typename W,
-          typename X, typename Y>
+template <int BS0, int BS1, bool UPPER = false, typename OP, typename U,
+          typename V, typename W, typename X, typename Y>
 void insert_csr(U&& data, const V& cols, const W& row_ptr, const X& x,
                 const Y& xrows, const Y& xcols, OP op,
                 typename Y::value_type local_size);
@@ -59,6 +63,8 @@ void insert_csr(U&& data, const V& cols, const W& row_ptr, const X& x,
 ///
 /// @tparam BS0 Row block size of Data
 /// @tparam BS1 Column block size of Data
+/// @tparam UPPER If `true`, entries that are not in the sparsity
+/// pattern are ignored (see `insert_csr`)
 /// @tparam OP The operation (usually "set" or "add")
 /// @param[out] data The CSR matrix data
 /// @param[in] cols The CSR column indices
@@ -71,8 +77,8 @@ void insert_csr(U&& data, const V& cols, const W& row_ptr, const X& x,
 /// @param[in] local_size The maximum row index that can be set. Used
 /// when debugging is own to check that rows beyond a permitted range
 /// are not being set.
-template <int BS0, int BS1, typename OP, typename U, typename V, typename W,
-          typename X, typename Y>
+template <int BS0, int BS1, bool UPPER = false, typename OP, typename U,
+          typename V, typename W, typename X, typename Y>
 void insert_blocked_csr(U&& data, const V& cols, const W& row_ptr, const X& x,
                         const Y& xrows, const Y& xcols, OP op,
                         typename Y::value_type local_size);
@@ -81,6 +87,8 @@ void insert_blocked_csr(U&& data, const V& cols, const W& row_ptr, const X& x,
 /// 1)
 /// @note Matrix sparsity must be correct to accept the data
 /// @note see `insert_csr` for data layout
+/// @tparam UPPER If `true`, entries that are not in the sparsity
+/// pattern are ignored (see `insert_csr`)
 /// @param[out] data The CSR matrix data
 /// @param[in] cols The CSR column indices
 /// @param[in] row_ptr The pointer to the ith row in the CSR data
@@ -94,8 +102,8 @@ void insert_blocked_csr(U&& data, const V& cols, const W& row_ptr, const X& x,
 /// are not being set.
 /// @param[in] bs0 Row block size of Matrix
 /// @param[in] bs1 Column block size of Matrix
-template <typename OP, typename U, typename V, typename W, typename X,
-          typename Y>
+template <bool UPPER = false, typename OP, typename U, typename V, typename W,
+          typename X, typename Y>
 void insert_nonblocked_csr(U&& data, const V& cols, const W& row_ptr,
                            const X& x, const Y& xrows, const Y& xcols, OP op,
                            typename Y::value_type local_size, int bs0, int bs1);
@@ -103,8 +111,8 @@ void insert_nonblocked_csr(U&& data, const V& cols, const W& row_ptr,
 } // namespace impl
 
 //-----------------------------------------------------------------------------
-template <int BS0, int BS1, typename OP, typename U, typename V, typename W,
-          typename X, typename Y>
+template <int BS0, int BS1, bool UPPER, typename OP, typename U, typename V,
+          typename W, typename X, typename Y>
 void impl::insert_csr(U&& data, const V& cols, const W& row_ptr, const X& x,
                       const Y& xrows, const Y& xcols, OP op,
                       [[maybe_unused]] typename Y::value_type local_size)
@@ -129,6 +137,11 @@ void impl::insert_csr(U&& data, const V& cols, const W& row_ptr, const X& x,
     {
       // Find position of column index
       auto it = std::lower_bound(cit0, cit1, xcols[c]);
+      if constexpr (UPPER)
+      {
+        if (it == cit1 or *it != xcols[c])
+          continue;
+      }
       assert(*it == xcols[c]);
       assert(it != cit1);
 
@@ -148,8 +161,8 @@ void impl::insert_csr(U&& data, const V& cols, const W& row_ptr, const X& x,
 }
 //-----------------------------------------------------------------------------
 // Insert with block insertion into a regular CSR (block size 1)
-template <int BS0, int BS1, typename OP, typename U, typename V, typename W,
-          typename X, typename Y>
+template <int BS0, int BS1, bool UPPER, typename OP, typename U, typename V,
+          typename W, typename X, typename Y>
 void impl::insert_blocked_csr(U&& data, const V& cols, const W& row_ptr,
                               const X& x, const Y& xrows, const Y& xcols, OP op,
                               [[maybe_unused]]
@@ -176,6 +189,19 @@ void impl::insert_blocked_csr(U&& data, const V& cols, const W& row_ptr,
       auto cit1 = std::next(cols.begin(), row_ptr[row + i + 1]);
       for (std::size_t c = 0; c < nc; ++c)
       {
+        if constexpr (UPPER)
+        {
+          // Part of a block on the diagonal of the matrix may be in
+          // the lower triangle, so look up each column of the block
+          for (int j = 0; j < BS1; ++j)
+          {
+            auto it = std::lower_bound(cit0, cit1, xcols[c] * BS1 + j);
+            if (it != cit1 and *it == xcols[c] * BS1 + j)
+              op(data[std::distance(cols.begin(), it)], xr[c * BS1 + j]);
+          }
+          continue;
+        }
+
         // Find position of column index
         auto it = std::lower_bound(cit0, cit1, xcols[c] * BS1);
         assert(*it == xcols[c] * BS1);
@@ -191,8 +217,8 @@ void impl::insert_blocked_csr(U&& data, const V& cols, const W& row_ptr,
 }
 //-----------------------------------------------------------------------------
 // Add individual entries in block-CSR storage
-template <typename OP, typename U, typename V, typename W, typename X,
-          typename Y>
+template <bool UPPER, typename OP, typename U, typename V, typename W,
+          typename X, typename Y>
 void impl::insert_nonblocked_csr(U&& data, const V& cols, const W& row_ptr,
                                  const X& x, const Y& xrows, const Y& xcols,
                                  OP op,
@@ -223,6 +249,11 @@ void impl::insert_nonblocked_csr(U&& data, const V& cols, const W& row_ptr,
       // Find position of column index
       auto cdiv = std::div(xcols[c], bs1);
       auto it = std::lower_bound(cit0, cit1, cdiv.quot);
+      if constexpr (UPPER)
+      {
+        if (it == cit1 or *it != cdiv.quot)
+          continue;
+      }
       assert(it != cit1);
       assert(*it == cdiv.quot);
 
@@ -6,9 +6,16 @@
 
 #pragma once
 
+#include <algorithm>
+#include <cmath>
+#include <complex>
 #include <concepts>
 #include <cstdint>
+#include <iterator>
 #include <span>
+#include <stdexcept>
+#include <utility>
+#include <vector>
 
 namespace dolfinx::la
 {
@@ -27,4 +34,88 @@ template <class U, class T>
 concept MatSet
     = std::invocable<U, std::span<const std::int32_t>,
                      std::span<const std::int32_t>, std::span<const T>>;
+
+namespace impl
+{
+/// @brief In-place LU factorisation with partial pivoting of a dense
+/// row-major `n x n` matrix.
+/// @param[in,out] A The matrix. On exit it holds the L and U factors.
+/// @param[out] perm The row permutation (size `n`)
+template <typename T>
+void lu_factor(std::span<T> A, std::span<int> perm)
+{
+  const int n = perm.size();
+  for (int i = 0; i < n; ++i)
+    perm[i] = i;
+
+  for (int k = 0; k < n; ++k)
+  {
+    // Find pivot
+    int p = k;
+    for (int i = k + 1; i < n; ++i)
+    {
+      if (std::abs(A[i * n + k]) > std::abs(A[p * n + k]))
+        p = i;
+    }
+
+    if (A[p * n + k] == T(0))
+      throw std::runtime_error("Singular matrix in LU factorisation.");
+
+    if (p != k)
+    {
+      std::swap_ranges(std::next(A.begin(), k * n),
+                       std::next(A.begin(), (k + 1) * n),
+                       std::next(A.begin(), p * n));
+      std::swap(perm[k], perm[p]);
+    }
+
+    for (int i = k + 1; i < n; ++i)
+    {
+      A[i * n + k] /= A[k * n + k];
+      for (int j = k + 1; j < n; ++j)
+        A[i * n + j] -= A[i * n + k] * A[k * n + j];
+    }
+  }
+}
+
+/// @brief Solve `A X = B` in-place using the factors computed by
+/// lu_factor.
+/// @param[in] LU The LU factors of the `n x n` matrix
+/// @param[in] perm The row permutation
+/// @param[in,out] B Row-major `n x m` right-hand side. On exit it holds
+/// the solution.
+/// @param[in] m Number of right-hand side columns
+template <typename T>
+void lu_solve(std::span<const T> LU, std::span<const int> perm, std::span<T> B,
+              int m)
+{
+  const int n = perm.size();
+
+  // Apply row permutation
+  std::vector<T> Bp(B.size());
+  for (int i = 0; i < n; ++i)
+  {
+    std::copy_n(std::next(B.begin(), perm[i] * m), m,
+                std::next(Bp.begin(), i * m));
+  }
+
+  // Forward substitution (L has unit diagonal)
+  for (int i = 0; i < n; ++i)
+    for (int k = 0; k < i; ++k)
+      for (int j = 0; j < m; ++j)
+        Bp[i * m + j] -= LU[i * n + k] * Bp[k * m + j];
+
+  // Backward substitution
+  for (int i = n - 1; i >= 0; --i)
+  {
+    for (int k = i + 1; k < n; ++k)
+      for (int j = 0; j < m; ++j)
+        Bp[i * m + j] -= LU[i * n + k] * Bp[k * m + j];
+    for (int j = 0; j < m; ++j)
+      Bp[i * m + j] /= LU[i * n + i];
+  }
+
+  std::copy(Bp.begin(), Bp.end(), B.begin());
+}
+} // namespace impl
 } // namespace dolfinx::la
@@ -7,6 +7,7 @@
 #pragma once
 
 #include "Topology.h"
+#include <algorithm>
 #include <basix/mdspan.hpp>
 #include <concepts>
 #include <cstdint>
@@ -21,6 +22,7 @@
 #include <functional>
 #include <memory>
 #include <span>
+#include <tuple>
 #include <utility>
 #include <vector>
 
@@ -109,10 +111,69 @@ public:
   /// @brief Access geometry degrees-of-freedom data (non-const
   /// version).
   ///
+  /// @note Call increase_state() after modifying the data.
   /// @return The flattened row-major geometry data, where the shape is
   /// (num_points, 3)
   std::span<T> x() { return _x; }
 
+  /// @brief Modification state of the geometry degrees-of-freedom
+  /// data.
+  ///
+  /// The state can be used to detect whether data derived from the
+  /// geometry, e.g. cell_geometry(), is out of date. It is not
+  /// increased by writes through x(), which must be followed by a call
+  /// to increase_state().
+  std::uint64_t state() const { return _state; }
+
+  /// @brief Increase the modification state of the geometry, see
+  /// state().
+  void increase_state() { ++_state; }
+
+  /// @brief Geometry data with the coordinates of each cell stored
+  /// contiguously.
+  ///
+  /// Returns a dofmap and a coordinate array that can be used in place
+  /// of dofmap() and x(), e.g. by the assemblers. The coordinates of
+  /// the nodes of a cell are consecutive rows of the array, and are
+  /// converted to the scalar type `X`. This improves memory locality
+  /// and avoids a conversion of the coordinates in each use if `X` and
+  /// `T` differ. The data is built on first use, shared by all users
+  /// of the geometry, and rebuilt if state() has changed.
+  ///
+  /// @note Not thread-safe if the data needs to be (re)built.
+  /// @return The dofmap and the flattened row-major coordinate data,
+  /// where the shape is (num_cells * num_dofs_per_cell, 3)
+  template <std::floating_point X>
+  std::pair<std::experimental::mdspan<
+                const std::int32_t,
+                std::experimental::dextents<std::size_t, 2>>,
+            std::span<const X>>
+  cell_geometry() const
+  {
+    auto x_dofmap = dofmap();
+    CellGeometry<X>& cache = std::get<CellGeometry<X>>(_cell_geometry);
+    if (cache.state != _state or cache.dofmap.size() != x_dofmap.size())
+    {
+      std::span<const std::int32_t> dofs(x_dofmap.data_handle(),
+                                         x_dofmap.size());
+      cache.x.resize(3 * dofs.size());
+      cache.dofmap.resize(dofs.size());
+      for (std::size_t pos = 0; pos < dofs.size(); ++pos)
+      {
+        std::copy_n(std::next(_x.begin(), 3 * dofs[pos]), 3,
+                    std::next(cache.x.begin(), 3 * pos));
+        cache.dofmap[pos] = pos;
+      }
+      cache.state = _state;
+    }
+
+    return {std::experimental::mdspan<
+                const std::int32_t,
+                std::experimental::dextents<std::size_t, 2>>(
+                cache.dofmap.data(), x_dofmap.extent(0), x_dofmap.extent(1)),
+            std::span<const X>(cache.x)};
+  }
+
   /// @brief The elements that describes the geometry maps.
   ///
   /// @return The coordinate/geometry elements
@@ -143,6 +204,21 @@ private:
 
   // Global indices as provided on Geometry creation
   std::vector<std::int64_t> _input_global_indices;
+
+  // Modification state of _x
+  std::uint64_t _state = 0;
+
+  // Cell-wise copy of the geometry in scalar type X, see
+  // cell_geometry()
+  template <std::floating_point X>
+  struct CellGeometry
+  {
+    std::uint64_t state = 0;
+    std::vector<std::int32_t> dofmap;
+    std::vector<X> x;
+  };
+  mutable std::tuple<CellGeometry<float>, CellGeometry<double>>
+      _cell_geometry;
 };
 
 /// @brief Build Geometry from input data.
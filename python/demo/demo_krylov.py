@@ -0,0 +1,122 @@
+# ---
+# jupyter:
+#   jupytext:
+#     text_representation:
+#       extension: .py
+#       format_name: light
+#       format_version: '1.5'
+#       jupytext_version: 1.13.6
+# ---
+
+# # Iterative solvers without PETSc
+#
+# This demo ({download}`demo_krylov.py`) shows:
+#
+# - How to solve a linear system assembled into a
+#   {py:class}`MatrixCSR <dolfinx.la.MatrixCSRMetaClass>` with the
+#   Krylov solvers and preconditioners in {py:mod}`dolfinx.la`
+# - How the native solvers compare with PETSc on the same matrices
+#
+# The solvers in {py:mod}`dolfinx.la` (conjugate gradients, GMRES and
+# BiCGStab, with Jacobi, point-block Jacobi and Chebyshev
+# preconditioners) do not depend on PETSc. The matrix-vector product
+# overlaps the update of ghost values with the product of the owned
+# columns, and can use multiple threads on each MPI rank.
+#
+# PETSc is used in this demo only for comparison.
+
+# +
+import time
+
+import numpy as np
+
+import ufl
+from dolfinx import fem, la, mesh
+
+from mpi4py import MPI
+from petsc4py import PETSc
+
+# -
+
+# We solve a reaction-diffusion problem for a scalar and for a
+# vector-valued field, such that the matrix has block size one and two,
+# respectively.
+
+# +
+msh = mesh.create_unit_cube(MPI.COMM_WORLD, 16, 16, 16)
+
+
+def create_system(V):
+    """Assemble a reaction-diffusion operator and a right-hand side"""
+    u, v = ufl.TrialFunction(V), ufl.TestFunction(V)
+    f = 1.0 if V.num_sub_spaces == 0 else ufl.as_vector([1.0] * V.num_sub_spaces)
+    a = fem.form(ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx + ufl.inner(u, v) * ufl.dx)
+    L = fem.form(ufl.inner(f, v) * ufl.dx)
+    A = fem.assemble_matrix(a)
+    A.finalize()
+    b = fem.assemble_vector(L)
+    b.scatter_reverse(la.InsertMode.add)
+    return A, b
+
+# -
+
+# The function below times a solver. The time is the maximum over all
+# ranks.
+
+
+def timed(solve):
+    """Run solve() and return its result and wall time"""
+    msh.comm.Barrier()
+    t0 = time.perf_counter()
+    result = solve()
+    t = msh.comm.allreduce(time.perf_counter() - t0, op=MPI.MAX)
+    return result, t
+
+# For each matrix, the system is solved with the conjugate gradient
+# method and a Jacobi preconditioner, with the native solver on one and
+# two threads and with PETSc. The same tolerance is used in both
+# cases.
+
+
+# +
+rtol = 1.0e-8
+for V in (fem.FunctionSpace(msh, ("Lagrange", 1)), fem.VectorFunctionSpace(msh, ("Lagrange", 1))):
+    A, b = create_system(V)
+    results = {}
+
+    # Native solvers
+    M = la.jacobi(A)
+    for num_threads in (1, 2):
+        x = la.vector(b.index_map, b.bs, dtype=b.array.dtype)
+        info, t = timed(lambda: la.cg(A, b, x, M, rtol=rtol, num_threads=num_threads))
+        assert info.converged
+        results[f"dolfinx.la ({num_threads} thread(s))"] = (info.iterations, t, x)
+
+    # PETSc on a copy of the same matrix
+    A_petsc = la.create_petsc_matrix(A)
+    b_petsc = la.create_petsc_vector_wrap(b)
+    x_petsc = A_petsc.createVecRight()
+    ksp = PETSc.KSP().create(msh.comm)
+    ksp.setOperators(A_petsc)
+    ksp.setType("cg")
+    ksp.getPC().setType("jacobi")
+    ksp.setNormType(PETSc.KSP.NormType.UNPRECONDITIONED)
+    ksp.setTolerances(rtol=rtol, atol=1.0e-50, max_it=1000)
+    _, t = timed(lambda: ksp.solve(b_petsc, x_petsc))
+    assert ksp.getConvergedReason() > 0
+    results["PETSc"] = (ksp.getIterationNumber(), t, x_petsc.array_r)
+
+    # Print the timings and check that the solutions agree
+    n = V.dofmap.index_map.size_local * V.dofmap.index_map_bs
+    if msh.comm.rank == 0:
+        print(f"Block size {V.dofmap.index_map_bs}, {V.dofmap.index_map.size_global} nodes")
+        for name, (its, t, _) in results.items():
+            print(f"  {name:<28} iterations: {its:4d}, time: {t:.4f} s")
+    for its, t, x in results.values():
+        x = x.array[:n] if isinstance(x, la.VectorMetaClass) else x
+        assert np.allclose(x, x_petsc.array_r, rtol=1.0e-6)
+
+    ksp.destroy()
+    A_petsc.destroy()
+    x_petsc.destroy()
+# -
@@ -291,17 +291,18 @@ def nested_iterative_solver():
 # (non-nested) matrices. We first create a helper function for
 # assembling the linear operators and the RHS vector.
 
-def block_operators():
+def block_operators(layout):
     """Return block operators and block RHS vector for the Stokes
     problem"""
 
     # Assembler matrix operator, preconditioner and RHS vector into
-    # single objects but preserving block structure
-    A = fem.petsc.assemble_matrix_block(a, bcs=bcs)
+    # single objects but preserving block structure. The block layout
+    # (index maps, index sets and offsets of the blocks) is shared.
+    A = fem.petsc.assemble_matrix_block(a, bcs=bcs, layout=layout)
     A.assemble()
-    P = fem.petsc.assemble_matrix_block(a_p, bcs=bcs)
+    P = fem.petsc.assemble_matrix_block(a_p, bcs=bcs, layout=layout)
     P.assemble()
-    b = fem.petsc.assemble_vector_block(L, a, bcs=bcs)
+    b = fem.petsc.assemble_vector_block(L, a, bcs=bcs, layout=layout)
 
     # Set the nullspace for pressure (since pressure is determined only
     # up to a constant)
@@ -323,27 +324,21 @@ def block_iterative_solver():
     """Solve the Stokes problem using blocked matrices and an iterative
     solver."""
 
-    # Assembler the operators and RHS vector
-    A, P, b = block_operators()
-
-    # Build PETSc index sets for each field (global dof indices for each
-    # field)
-    V_map = V.dofmap.index_map
-    Q_map = Q.dofmap.index_map
-    offset_u = V_map.local_range[0] * V.dofmap.index_map_bs + Q_map.local_range[0]
-    offset_p = offset_u + V_map.size_local * V.dofmap.index_map_bs
-    is_u = PETSc.IS().createStride(V_map.size_local * V.dofmap.index_map_bs, offset_u, 1, comm=PETSc.COMM_SELF)
-    is_p = PETSc.IS().createStride(Q_map.size_local, offset_p, 1, comm=PETSc.COMM_SELF)
+    # Create the block layout and assemble the operators and RHS vector
+    layout = fem.petsc.BlockLayout(a)
+    A, P, b = block_operators(layout)
 
     # Create a MINRES Krylov solver and a block-diagonal preconditioner
-    # using PETSc's additive fieldsplit preconditioner
+    # using PETSc's additive fieldsplit preconditioner. The fields are
+    # defined by the PETSc index sets (global dof indices) of the
+    # blocks in the layout.
     ksp = PETSc.KSP().create(msh.comm)
     ksp.setOperators(A, P)
     ksp.setTolerances(rtol=1e-9)
     ksp.setType("minres")
     ksp.getPC().setType("fieldsplit")
     ksp.getPC().setFieldSplitType(PETSc.PC.CompositeType.ADDITIVE)
-    ksp.getPC().setFieldSplitIS(("u", is_u), ("p", is_p))
+    layout.set_fieldsplit(ksp.getPC(), ["u", "p"])
 
     # Configure velocity and pressure sub-solvers
     ksp_u, ksp_p = ksp.getPC().getFieldSplitSubKSP()
@@ -368,7 +363,7 @@ def block_iterative_solver():
 
     # Create Functions to split u and p
     u, p = Function(V), Function(Q)
-    offset = V_map.size_local * V.dofmap.index_map_bs
+    offset = layout.offsets[1]
     u.x.array[:offset] = x.array_r[:offset]
     p.x.array[:(len(x.array_r) - offset)] = x.array_r[offset:]
 
@@ -392,7 +387,7 @@ def block_direct_solver():
     solver."""
 
     # Assembler the block operator and RHS vector
-    A, _, b = block_operators()
+    A, _, b = block_operators(fem.petsc.BlockLayout(a))
 
     # Create a solver
     ksp = PETSc.KSP().create(msh.comm)
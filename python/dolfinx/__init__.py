@@ -24,24 +24,42 @@ del sys
 # sys.setdlopenflags(stored_dlopen_flags)
 # del sys
 
+import importlib as _importlib
 import sys
 
-from petsc4py import PETSc as _PETSc
-
-default_scalar_type = _PETSc.ScalarType
-
 # Initialise logging
 from dolfinx.common import (TimingType, git_commit_hash, has_debug, has_kahip,
                             has_parmetis, list_timings, timing)
 
 from dolfinx import common
 from dolfinx import cpp as _cpp
-from dolfinx import fem, geometry, graph, io, jit, la, log, mesh, nls, plot
 from dolfinx.cpp import __version__
 
 _cpp.common.init_logging(sys.argv)
 del _cpp, sys
 
+# Submodules are imported on first access. The time spent importing
+# each submodule is recorded as the Timer "Import dolfinx.<name>".
+_submodules = ["fem", "geometry", "graph", "io", "jit", "la", "log", "mesh", "nls", "plot"]
+
+
+def __getattr__(name):
+    if name in _submodules:
+        with common.Timer(f"Import dolfinx.{name}"):
+            return _importlib.import_module(f"dolfinx.{name}")
+    elif name == "default_scalar_type":
+        # Importing petsc4py initialises PETSc
+        from petsc4py import PETSc as _PETSc
+        global default_scalar_type
+        default_scalar_type = _PETSc.ScalarType
+        return default_scalar_type
+    raise AttributeError(f"module 'dolfinx' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_submodules) | {"default_scalar_type"})
+
+
 def get_include(user=False):
     import os
     d = os.path.dirname(__file__)
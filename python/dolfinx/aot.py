@@ -0,0 +1,102 @@
+# Copyright (C) 2023 The FEniCS Project
+#
+# This file is part of DOLFINx (https://www.fenicsproject.org)
+#
+# SPDX-License-Identifier:    LGPL-3.0-or-later
+"""Ahead-of-time (AOT) compilation of forms, expressions and elements.
+
+A problem definition script is run and every object that is passed to
+:func:`dolfinx.jit.ffcx_jit` is compiled into an output directory,
+together with a manifest that maps object signatures to the compiled
+modules::
+
+    python -m dolfinx.aot problem.py --output-dir aot
+
+At runtime, setting the JIT option ``aot_dir`` (or the environment
+variable ``DOLFINX_AOT_DIR``) to the output directory makes
+:func:`dolfinx.jit.ffcx_jit` load these objects directly, without code
+generation, compilation or inspection of the JIT cache. Objects that
+are not in the manifest are compiled just-in-time as usual.
+
+"""
+
+import argparse
+import json
+import runpy
+import sys
+import typing
+from pathlib import Path
+
+from dolfinx import jit
+
+from mpi4py import MPI
+
+__all__ = ["build"]
+
+
+def build(path: str, output_dir: typing.Union[str, Path], run_module: bool = False,
+          argv: typing.Sequence[str] = ()) -> dict:
+    """Run a problem definition and compile all JIT objects ahead-of-time.
+
+    Args:
+        path: Python script to run, or a module name if ``run_module``
+            is ``True``.
+        output_dir: Directory for the compiled modules and the manifest.
+            An existing manifest is extended.
+        run_module: Interpret ``path`` as a module name.
+        argv: Command line arguments passed to the problem definition.
+
+    Returns:
+        Manifest entries for the objects compiled by the problem
+        definition.
+
+    """
+    output_dir = Path(output_dir).resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_file = output_dir.joinpath("manifest.json")
+    try:
+        with open(manifest_file) as f:
+            objects = json.load(f)["objects"]
+    except FileNotFoundError:
+        objects = {}
+
+    recorder: dict = {"dir": output_dir, "objects": {}}
+    jit._aot_recorder = recorder
+    sys_argv = sys.argv
+    sys.argv = [path] + list(argv)
+    try:
+        if run_module:
+            runpy.run_module(path, run_name="__main__", alter_sys=True)
+        else:
+            runpy.run_path(path, run_name="__main__")
+    finally:
+        jit._aot_recorder = None
+        sys.argv = sys_argv
+
+    objects.update(recorder["objects"])
+    if MPI.COMM_WORLD.rank == 0:
+        with open(manifest_file, "w") as f:
+            json.dump({"objects": objects}, f, indent=2)
+    MPI.COMM_WORLD.Barrier()
+    jit._aot_manifest.cache_clear()
+
+    return recorder["objects"]
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m dolfinx.aot",
+                                     description="Compile the forms, expressions and elements "
+                                     "of a DOLFINx program ahead-of-time.")
+    parser.add_argument("-m", "--module", action="store_true", help="run a module instead of a script")
+    parser.add_argument("-o", "--output-dir", default="dolfinx_aot", help="output directory")
+    parser.add_argument("path", help="problem definition script (or module with -m)")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments passed to the problem definition")
+    args = parser.parse_args(argv)
+
+    objects = build(args.path, args.output_dir, run_module=args.module, argv=args.args)
+    if MPI.COMM_WORLD.rank == 0:
+        print(f"Compiled {len(objects)} object(s) into {Path(args.output_dir).resolve()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,16 +9,26 @@ from dolfinx.cpp.fem import transpose_dofmap  # noqa
 from dolfinx.cpp.fem import (IntegralType,
                              create_nonmatching_meshes_interpolation_data)
 from dolfinx.cpp.fem import create_sparsity_pattern as _create_sparsity_pattern
-from dolfinx.fem import petsc
+from dolfinx.fem import profiling
 from dolfinx.fem.assemble import (apply_lifting, assemble_matrix,
-                                  assemble_scalar, assemble_vector, set_bc)
+                                  assemble_scalar, assemble_scalars,
+                                  assemble_vector, assemble_vectors, set_bc,
+                                  sparsity_pattern_cache)
 from dolfinx.fem.bcs import (DirichletBCMetaClass, bcs_by_block, dirichletbc,
                              locate_dofs_geometrical, locate_dofs_topological)
 from dolfinx.fem.dofmap import DofMap
 from dolfinx.fem.forms import FormMetaClass, extract_function_spaces, form
 from dolfinx.fem.function import (Constant, Expression, Function,
                                   FunctionSpace, TensorFunctionSpace,
-                                  VectorFunctionSpace)
+                                  VectorFunctionSpace, create_expressions)
+
+
+def __getattr__(name):
+    # Import the PETSc interface (and petsc4py) on first access
+    if name == "petsc":
+        import importlib
+        return importlib.import_module("dolfinx.fem.petsc")
+    raise AttributeError(f"module 'dolfinx.fem' has no attribute '{name}'")
 
 
 def create_sparsity_pattern(a: FormMetaClass):
@@ -35,11 +45,12 @@ def create_sparsity_pattern(a: FormMetaClass):
 
 
 __all__ = [
-    "Constant", "Expression", "Function",
+    "Constant", "Expression", "Function", "create_expressions",
     "FunctionSpace", "TensorFunctionSpace",
-    "VectorFunctionSpace", "create_sparsity_pattern",
-    "assemble_scalar", "assemble_matrix", "assemble_vector", "apply_lifting", "set_bc",
+    "VectorFunctionSpace", "create_sparsity_pattern", "sparsity_pattern_cache",
+    "assemble_scalar", "assemble_scalars", "assemble_matrix", "assemble_vector", "assemble_vectors",
+    "apply_lifting", "set_bc",
     "DirichletBCMetaClass", "dirichletbc", "bcs_by_block", "DofMap", "FormMetaClass",
     "form", "IntegralType",
     "locate_dofs_geometrical", "locate_dofs_topological",
-    "extract_function_spaces", "petsc", "create_nonmatching_meshes_interpolation_data"]
+    "extract_function_spaces", "petsc", "profiling", "create_nonmatching_meshes_interpolation_data"]
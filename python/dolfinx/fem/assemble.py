@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import collections
 import functools
+import hashlib
 import typing
 
 import numpy as np
@@ -16,11 +17,14 @@ import numpy as np
 import dolfinx
 from dolfinx import cpp as _cpp
 from dolfinx import la
+from dolfinx.cpp.fem import IntegralType
 from dolfinx.cpp.fem import pack_coefficients as _pack_coefficients
 from dolfinx.cpp.fem import pack_constants as _pack_constants
 from dolfinx.fem.bcs import DirichletBCMetaClass
 from dolfinx.fem.forms import FormMetaClass, form_types
 
+from mpi4py import MPI
+
 
 def pack_constants(form: typing.Union[FormMetaClass,
                                       typing.Sequence[FormMetaClass]]) -> typing.Union[np.ndarray,
@@ -81,6 +85,29 @@ def pack_coefficients(form: typing.Union[FormMetaClass, typing.Sequence[FormMeta
 
     return _pack(form)
 
+
+def _packed_coefficients(form: FormMetaClass):
+    """Packed coefficients of a form for use by an assembler. Forms with
+    ``cache_coefficients`` set only re-pack coefficients that have been
+    modified since the last call (see
+    :meth:`FormMetaClass.packed_coefficients`)."""
+    if getattr(form, "cache_coefficients", False):
+        return form.packed_coefficients()
+    else:
+        return _pack_coefficients(form)
+
+
+def _packed_constants(form: FormMetaClass):
+    """Packed constants of a form for use by an assembler. Forms with
+    ``cache_coefficients`` set only re-pack the constants if a constant
+    has been modified since the last call (see
+    :meth:`FormMetaClass.packed_constants`)."""
+    if getattr(form, "cache_coefficients", False):
+        return form.packed_constants()
+    else:
+        return _pack_constants(form)
+
+
 # -- Vector and matrix instantiation -----------------------------------------
 
 
@@ -90,16 +117,125 @@ def create_vector(L: FormMetaClass) -> la.VectorMetaClass:
     return la.vector(dofmap.index_map, dofmap.index_map_bs, dtype=L.dtype)
 
 
-def create_matrix(a: FormMetaClass) -> la.MatrixCSRMetaClass:
-    """Create a sparse matrix that is compatible with a given bilinear form"""
-    sp = dolfinx.fem.create_sparsity_pattern(a)
-    sp.finalize()
-    return la.matrix_csr(sp, dtype=a.dtype)
+class SparsityPatternCacheInfo(typing.NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class SparsityPatternCache:
+    """Cache of finalised sparsity patterns for bilinear forms.
+
+    Building a sparsity pattern requires a pass over all integration
+    entities and communication of off-process entries, which is often
+    more costly than assembling the matrix. Bilinear forms with the same
+    mesh, test and trial spaces, and integration domains (e.g. forms
+    with different coefficients, or a form that is re-compiled) share
+    one finalised pattern.
+
+    Cached patterns hold references to the mesh and the function spaces.
+    Call :meth:`clear` to release them, e.g. after the mesh has been
+    refined.
+
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self._entries: collections.OrderedDict[tuple, _cpp.la.SparsityPattern] = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self.maxsize = maxsize
+
+    @property
+    def maxsize(self) -> int:
+        """Maximum number of cached patterns. Zero disables the cache."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int):
+        self._maxsize = maxsize
+        while len(self._entries) > max(maxsize, 0):
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def key(a: FormMetaClass) -> tuple:
+        """Cache key for a bilinear form. The key depends on the mesh,
+        the argument function spaces and the integration domains of
+        ``a``, but not on its scalar type, coefficients or kernels.
+
+        The integration domains of a form do not change, so their hash
+        is computed once and stored by the form."""
+        domains = getattr(a, "_sparsity_domains", None)
+        if domains is None:
+            domains = []
+            for itg_type in a.integral_types:
+                for i in a.integral_ids(itg_type):
+                    if itg_type in (IntegralType.cell, IntegralType.exterior_facet,
+                                    IntegralType.interior_facet):
+                        entities = np.ascontiguousarray(a.domains(itg_type, i))
+                        domains.append((itg_type, i, hashlib.sha1(entities.tobytes()).hexdigest()))
+                    else:
+                        domains.append((itg_type, i, None))
+            domains = tuple(domains)
+            if hasattr(a, "_sparsity_domains"):
+                a._sparsity_domains = domains
+        return (a.mesh, *a.function_spaces, domains)
+
+    def get(self, a: FormMetaClass) -> _cpp.la.SparsityPattern:
+        """Return the finalised sparsity pattern for a bilinear form,
+        building and caching it if it is not in the cache.
+
+        Note:
+            The returned pattern is shared and must not be modified.
+
+        """
+        key = self.key(a)
+        try:
+            pattern = self._entries[key]
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return pattern
+        except KeyError:
+            self._misses += 1
+
+        pattern = dolfinx.fem.create_sparsity_pattern(a)
+        pattern.finalize()
+        if self.maxsize > 0:
+            self._entries[key] = pattern
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return pattern
+
+    def cache_info(self) -> SparsityPatternCacheInfo:
+        """Hit and miss statistics, in the style of :func:`functools.lru_cache`."""
+        return SparsityPatternCacheInfo(self._hits, self._misses, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        """Remove all cached patterns and reset the statistics."""
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+
+
+# Sparsity patterns used by create_matrix. Set
+# sparsity_pattern_cache.maxsize = 0 to disable.
+sparsity_pattern_cache = SparsityPatternCache()
+
+
+def create_matrix(a: FormMetaClass, storage: la.StorageMode = la.StorageMode.general) -> la.MatrixCSRMetaClass:
+    """Create a sparse matrix that is compatible with a given bilinear
+    form. The sparsity pattern is taken from
+    :data:`sparsity_pattern_cache`.
+
+    With ``storage=StorageMode.symmetric`` only the upper triangle is
+    stored, and assembly of ``a`` (which must be symmetric) inserts
+    only the upper triangle."""
+    return la.matrix_csr(sparsity_pattern_cache.get(a), dtype=a.dtype, storage=storage)
 
 
 # -- Scalar assembly ---------------------------------------------------------
 
-def assemble_scalar(M: FormMetaClass, constants=None, coeffs=None):
+def assemble_scalar(M: FormMetaClass, constants=None, coeffs=None, num_threads: int = 1):
     """Assemble functional. The returned value is local and not
     accumulated across processes.
 
@@ -109,6 +245,7 @@ def assemble_scalar(M: FormMetaClass, constants=None, coeffs=None):
             any required constants will be computed.
         coeffs: Coefficients that appear in the form. If not provided,
             any required coefficients will be computed.
+        num_threads: Number of threads used for assembly.
 
     Return:
         The computed scalar on the calling rank.
@@ -122,21 +259,63 @@ def assemble_scalar(M: FormMetaClass, constants=None, coeffs=None):
         of this function is typically summed across all MPI ranks.
 
     """
-    constants = constants or _pack_constants(M)
-    coeffs = coeffs or _pack_coefficients(M)
-    return _cpp.fem.assemble_scalar(M, constants, coeffs)
+    constants = _packed_constants(M) if constants is None else constants
+    coeffs = _packed_coefficients(M) if coeffs is None else coeffs
+    return _cpp.fem.assemble_scalar(M, constants, coeffs, num_threads)
+
+
+def assemble_scalars(M: typing.Sequence[FormMetaClass], constants=None, coeffs=None,
+                     num_threads: int = 1) -> np.ndarray:
+    """Assemble several functionals and sum them across processes.
+
+    The functionals must be defined on the same mesh and have the same
+    scalar type. Integrals of different functionals over the same
+    integration domain (e.g., all cell integrals over the whole mesh,
+    or all exterior facet integrals over the same facet tag) are
+    computed in one pass over the domain, and the values of all
+    functionals are summed across processes with a single reduction.
+
+    Args:
+        M: The functionals to compute.
+        constants: Constants for each functional. If not provided, or
+            if an entry is ``None``, the required constants will be
+            computed.
+        coeffs: Coefficients for each functional. If not provided, or
+            if an entry is ``None``, the required coefficients will be
+            computed.
+        num_threads: Number of threads used for assembly.
+
+    Return:
+        The value of each functional on the whole domain.
+
+    Note:
+        This is more efficient than calling :func:`assemble_scalar` and
+        reducing the result for each functional when many functionals
+        are computed, e.g. for post-processing.
+
+    """
+    if len(M) == 0:
+        return np.zeros(0)
+    constants = [None] * len(M) if constants is None else constants
+    coeffs = [None] * len(M) if coeffs is None else coeffs
+    constants = [c if c is not None else _packed_constants(form) for form, c in zip(M, constants)]
+    coeffs = [c if c is not None else _packed_coefficients(form) for form, c in zip(M, coeffs)]
+    values = _cpp.fem.assemble_scalars(M, constants, coeffs, num_threads)
+    M[0].mesh.comm.Allreduce(MPI.IN_PLACE, values, op=MPI.SUM)
+    return values
 
 
 # -- Vector assembly ---------------------------------------------------------
 
 @functools.singledispatch
 def assemble_vector(L: typing.Any,
-                    constants=None, coeffs=None):
-    return _assemble_vector_form(L, constants, coeffs)
+                    constants=None, coeffs=None, num_threads: int = 1):
+    return _assemble_vector_form(L, constants, coeffs, num_threads)
 
 
 @assemble_vector.register(FormMetaClass)
-def _assemble_vector_form(L: form_types, constants=None, coeffs=None) -> la.VectorMetaClass:
+def _assemble_vector_form(L: form_types, constants=None, coeffs=None,
+                          num_threads: int = 1) -> la.VectorMetaClass:
     """Assemble linear form into a new Vector.
 
     Args:
@@ -145,6 +324,9 @@ def _assemble_vector_form(L: form_types, constants=None, coeffs=None) -> la.Vect
             any required constants will be computed.
         coeffs: Coefficients that appear in the form. If not provided,
             any required coefficients will be computed.
+        num_threads: Number of threads used for assembly. Cells and
+            facets that share a degree-of-freedom are never assembled
+            concurrently, so accumulation is free of data races.
 
     Return:
         The assembled vector for the calling rank.
@@ -163,14 +345,15 @@ def _assemble_vector_form(L: form_types, constants=None, coeffs=None) -> la.Vect
     """
     b = create_vector(L)
     b.array[:] = 0
-    constants = constants or _pack_constants(L)
-    coeffs = coeffs or _pack_coefficients(L)
-    _assemble_vector_array(b.array, L, constants, coeffs)
+    constants = _packed_constants(L) if constants is None else constants
+    coeffs = _packed_coefficients(L) if coeffs is None else coeffs
+    _assemble_vector_array(b.array, L, constants, coeffs, num_threads)
     return b
 
 
 @assemble_vector.register(np.ndarray)
-def _assemble_vector_array(b: np.ndarray, L: FormMetaClass, constants=None, coeffs=None):
+def _assemble_vector_array(b: np.ndarray, L: FormMetaClass, constants=None, coeffs=None,
+                           num_threads: int = 1):
     """Assemble linear form into a new Vector.
 
     Args:
@@ -181,6 +364,9 @@ def _assemble_vector_array(b: np.ndarray, L: FormMetaClass, constants=None, coef
             any required constants will be computed.
         coeffs: Coefficients that appear in the form. If not provided,
             any required coefficients will be computed.
+        num_threads: Number of threads used for assembly. Cells and
+            facets that share a degree-of-freedom are never assembled
+            concurrently, so accumulation is free of data races.
 
     Note:
         Passing `constants` and `coefficients` is a performance
@@ -195,9 +381,87 @@ def _assemble_vector_array(b: np.ndarray, L: FormMetaClass, constants=None, coef
 
     """
 
-    constants = _pack_constants(L) if constants is None else constants
-    coeffs = _pack_coefficients(L) if coeffs is None else coeffs
-    _cpp.fem.assemble_vector(b, L, constants, coeffs)
+    constants = _packed_constants(L) if constants is None else constants
+    coeffs = _packed_coefficients(L) if coeffs is None else coeffs
+    _cpp.fem.assemble_vector(b, L, constants, coeffs, num_threads)
+    return b
+
+
+def _stack_coefficients(coeffs) -> dict:
+    """Stack a sequence of packed form coefficients into arrays of shape
+    ``(num_rhs, num_entities, cstride)``"""
+    if isinstance(coeffs, collections.abc.Mapping):
+        return {key: np.ascontiguousarray(c) for key, c in coeffs.items()}
+    elif len(coeffs) == 0:
+        return {}
+    else:
+        return {key: np.stack([c[key] for c in coeffs]) for key in coeffs[0]}
+
+
+def assemble_vectors(L: FormMetaClass, constants=None, coeffs=None,
+                     num_threads: int = 1) -> np.ndarray:
+    """Assemble a linear form for multiple sets of coefficients and
+    constants.
+
+    The mesh is traversed once and the form kernel is executed for each
+    right-hand side on every cell/facet, which is cheaper than
+    assembling the vectors one at a time.
+
+    Args:
+        L: The linear form to assemble.
+        constants: Packed constants for each right-hand side, as a
+            sequence of arrays or an array of shape ``(num_rhs,
+            num_constants)``. If not provided, the current constants of
+            ``L`` are used for all right-hand sides.
+        coeffs: Packed coefficients for each right-hand side, either a
+            sequence of packed coefficients (see
+            :func:`pack_coefficients`) or a dictionary that maps
+            ``(integral_type, id)`` to an array of shape ``(num_rhs,
+            num_entities, cstride)``. If not provided, the current
+            coefficients of ``L`` are used for all right-hand sides.
+        num_threads: Number of threads used for assembly.
+
+    Returns:
+        Array of shape ``(num_rhs, n)``, where row ``i`` is the vector
+        for the ``i``-th set of coefficients and constants and ``n`` is
+        the number of degrees-of-freedom (including ghosts) on the
+        calling rank.
+
+    Note:
+        Ghost contributions are not accumulated on the owning
+        processes. :func:`apply_lifting` and :func:`set_bc` accept the
+        returned array and modify all rows.
+
+    """
+    if coeffs is None and constants is None:
+        raise ValueError("Coefficients or constants for each right-hand side are required.")
+    if constants is not None:
+        num_rhs = len(constants)
+    elif isinstance(coeffs, collections.abc.Mapping):
+        if not coeffs:
+            raise ValueError("Constants are required to determine the number of right-hand sides.")
+        num_rhs = len(next(iter(coeffs.values())))
+    else:
+        num_rhs = len(coeffs)
+    if coeffs is not None:
+        sizes = [len(c) for c in coeffs.values()] if isinstance(coeffs, collections.abc.Mapping) else [len(coeffs)]
+        if any(size != num_rhs for size in sizes):
+            raise ValueError("The number of coefficient and constant sets must be the same.")
+
+    if constants is None:
+        constants = np.tile(_packed_constants(L), (num_rhs, 1))
+    if coeffs is None:
+        coeffs = {key: np.ascontiguousarray(np.broadcast_to(c, (num_rhs, ) + c.shape))
+                  for key, c in _packed_coefficients(L).items()}
+    else:
+        coeffs = _stack_coefficients(coeffs)
+
+    dofmap = L.function_spaces[0].dofmap
+    n = dofmap.index_map_bs * (dofmap.index_map.size_local + dofmap.index_map.num_ghosts)
+    b = np.zeros((num_rhs, n), dtype=L.dtype)
+    if num_rhs == 0:
+        return b
+    _cpp.fem.assemble_vectors(b, L, np.asarray(constants, dtype=L.dtype), coeffs, num_threads)
     return b
 
 # -- Matrix assembly ---------------------------------------------------------
@@ -206,14 +470,15 @@ def _assemble_vector_array(b: np.ndarray, L: FormMetaClass, constants=None, coef
 @functools.singledispatch
 def assemble_matrix(a: typing.Any,
                     bcs: typing.Optional[typing.List[DirichletBCMetaClass]] = None,
-                    diagonal: float = 1.0, constants=None, coeffs=None):
-    return _assemble_matrix_form(a, bcs, diagonal, constants, coeffs)
+                    diagonal: float = 1.0, constants=None, coeffs=None, num_threads: int = 1):
+    return _assemble_matrix_form(a, bcs, diagonal, constants, coeffs, num_threads)
 
 
 @assemble_matrix.register
 def _assemble_matrix_csr(A: la.MatrixCSRMetaClass, a: form_types,
                          bcs: typing.Optional[typing.List[DirichletBCMetaClass]] = None,
-                         diagonal: float = 1.0, constants=None, coeffs=None) -> la.MatrixCSRMetaClass:
+                         diagonal: float = 1.0, constants=None, coeffs=None,
+                         num_threads: int = 1) -> la.MatrixCSRMetaClass:
     """Assemble bilinear form into a matrix.
 
         Args:
@@ -226,6 +491,9 @@ def _assemble_matrix_csr(A: la.MatrixCSRMetaClass, a: form_types,
             any required constants will be computed.
         coeffs: Coefficients that appear in the form. If not provided,
             any required coefficients will be computed.
+        num_threads: Number of threads used for assembly. Cells and
+            facets that share a matrix row are never assembled
+            concurrently, so insertion is free of data races.
 
     Note:
         The returned matrix is not finalised, i.e. ghost values are not
@@ -233,9 +501,9 @@ def _assemble_matrix_csr(A: la.MatrixCSRMetaClass, a: form_types,
 
     """
     bcs = [] if bcs is None else bcs
-    constants = _pack_constants(a) if constants is None else constants
-    coeffs = _pack_coefficients(a) if coeffs is None else coeffs
-    _cpp.fem.assemble_matrix(A, a, constants, coeffs, bcs)
+    constants = _packed_constants(a) if constants is None else constants
+    coeffs = _packed_coefficients(a) if coeffs is None else coeffs
+    _cpp.fem.assemble_matrix(A, a, constants, coeffs, bcs, num_threads)
 
     # If matrix is a 'diagonal'block, set diagonal entry for constrained
     # dofs
@@ -247,7 +515,7 @@ def _assemble_matrix_csr(A: la.MatrixCSRMetaClass, a: form_types,
 @assemble_matrix.register(FormMetaClass)
 def _assemble_matrix_form(a: form_types, bcs: typing.Optional[typing.List[DirichletBCMetaClass]] = None,
                           diagonal: float = 1.0,
-                          constants=None, coeffs=None) -> la.MatrixCSRMetaClass:
+                          constants=None, coeffs=None, num_threads: int = 1) -> la.MatrixCSRMetaClass:
     """Assemble bilinear form into a matrix.
 
     Args:
@@ -260,6 +528,7 @@ def _assemble_matrix_form(a: form_types, bcs: typing.Optional[typing.List[Dirich
             any required constants will be computed.
         coeffs: Coefficients that appear in the form. If not provided,
             any required coefficients will be computed.
+        num_threads: Number of threads used for assembly.
 
     Returns:
         Matrix representation of the bilinear form ``a``.
@@ -271,7 +540,7 @@ def _assemble_matrix_form(a: form_types, bcs: typing.Optional[typing.List[Dirich
     """
     bcs = [] if bcs is None else bcs
     A: la.MatrixCSRMetaClass = create_matrix(a)
-    _assemble_matrix_csr(A, a, bcs, diagonal, constants, coeffs)
+    _assemble_matrix_csr(A, a, bcs, diagonal, constants, coeffs, num_threads)
     return A
 
 
@@ -296,15 +565,29 @@ def apply_lifting(b: np.ndarray, a: typing.List[FormMetaClass],
     but the trial space may differ. If x0 is not supplied, then it is
     treated as zero.
 
+    If ``b`` is a 2D array, e.g. from :func:`assemble_vectors`, each
+    row is modified. The lifting term is computed once and applied to
+    all rows, unless ``x0`` holds 2D arrays with a row for each row of
+    ``b``.
+
     Note:
         Ghost contributions are not accumulated (not sent to owner).
         Caller is responsible for calling VecGhostUpdateBegin/End.
 
     """
     x0 = [] if x0 is None else x0
-    constants = [form and _pack_constants(form) for form in a] if constants is None else constants
-    coeffs = [{} if form is None else _pack_coefficients(form) for form in a] if coeffs is None else coeffs
-    _cpp.fem.apply_lifting(b, a, constants, coeffs, bcs, x0, scale)
+    constants = [form and _packed_constants(form) for form in a] if constants is None else constants
+    coeffs = [{} if form is None else _packed_coefficients(form) for form in a] if coeffs is None else coeffs
+    if b.ndim == 1:
+        _cpp.fem.apply_lifting(b, a, constants, coeffs, bcs, x0, scale)
+    elif all(np.ndim(_x0) == 1 for _x0 in x0):
+        db = np.zeros(b.shape[1], dtype=b.dtype)
+        _cpp.fem.apply_lifting(db, a, constants, coeffs, bcs, x0, scale)
+        b += db
+    else:
+        for i, _b in enumerate(b):
+            _x0 = [_x[i] if np.ndim(_x) == 2 else _x for _x in x0]
+            _cpp.fem.apply_lifting(_b, a, constants, coeffs, bcs, _x0, scale)
 
 
 def set_bc(b: np.ndarray, bcs: typing.List[DirichletBCMetaClass],
@@ -314,5 +597,14 @@ def set_bc(b: np.ndarray, bcs: typing.List[DirichletBCMetaClass],
     not required unless ghost entries need to be updated to the boundary
     condition value.
 
+    If ``b`` is a 2D array, e.g. from :func:`assemble_vectors`, the
+    boundary condition values are inserted into each row. ``x0`` can
+    then be a 2D array with a row for each row of ``b``.
+
     """
-    _cpp.fem.set_bc(b, bcs, x0, scale)
+    if b.ndim == 1:
+        _cpp.fem.set_bc(b, bcs, x0, scale)
+    else:
+        for i, _b in enumerate(b):
+            _x0 = x0[i] if x0 is not None and x0.ndim == 2 else x0
+            _cpp.fem.set_bc(_b, bcs, _x0, scale)
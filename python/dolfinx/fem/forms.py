@@ -12,7 +12,7 @@ import typing
 
 import numpy as np
 import ufl
-from dolfinx.fem import IntegralType
+from dolfinx.fem import IntegralType, profiling
 from dolfinx.fem.function import FunctionSpace
 
 from dolfinx import cpp as _cpp
@@ -47,8 +47,24 @@ class FormMetaClass:
 
         self._code = code
         self._ufcx_form = form
+        self._coefficients = coeffs
+        self._packed_coefficients = None
+        self._coefficient_states: list[typing.Optional[int]] = []
+        self._constants = constants
+        self._packed_constants: typing.Optional[np.ndarray] = None
+        self._constant_states: list[typing.Optional[int]] = []
+        self._sparsity_domains: typing.Optional[tuple] = None
+
+        # Estimated number of floating point operations of each kernel,
+        # see profiling
+        self._flops: dict[tuple[IntegralType, int], float] = {}
+
+        # Re-use packed coefficients and constants in the assemblers,
+        # see packed_coefficients and packed_constants
+        self.cache_coefficients = False
         super().__init__(ffi.cast("uintptr_t", ffi.addressof(self._ufcx_form)),
-                         V, coeffs, constants, subdomains, mesh)  # type: ignore
+                         V, [getattr(c, "_cpp_object", c) for c in coeffs],
+                         [getattr(c, "_cpp_object", c) for c in constants], subdomains, mesh)  # type: ignore
 
     @property
     def ufcx_form(self):
@@ -75,11 +91,82 @@ class FormMetaClass:
         """Mesh on which this form is defined"""
         return super().mesh  # type: ignore
 
+    @property
+    def name(self) -> str:
+        """Name of the form in profiling data"""
+        return super().name  # type: ignore
+
+    @name.setter
+    def name(self, name: str):
+        super(FormMetaClass, type(self)).name.__set__(self, name)  # type: ignore
+        profiling._set_flops(name, self._flops)
+
     @property
     def integral_types(self):
         """Integral types in the form"""
         return super().integral_types  # type: ignore
 
+    def packed_coefficients(self) -> dict[tuple[IntegralType, int], np.ndarray]:
+        """Packed coefficient data for the form, updated only where needed.
+
+        The packed data is cached by the form. A coefficient is re-packed
+        only if the modification state of its degree-of-freedom vector
+        (see ``Function.x.state``) has changed since it was last packed.
+        Coefficients whose PETSc vector (``Function.vector``) has been
+        accessed are re-packed on every call.
+
+        The assemblers use this function, instead of packing all
+        coefficients, only if ``cache_coefficients`` is set to ``True``
+        for the form. The state of a vector is increased when its array
+        is accessed (``Function.x.array``), by scatters, by
+        :meth:`Function.interpolate` and by the solves of
+        :class:`dolfinx.fem.petsc.LinearProblem` and
+        :class:`dolfinx.fem.petsc.NonlinearProblem`. Other writes
+        through an array or PETSc vector that was obtained earlier
+        (e.g. with :func:`dolfinx.la.create_petsc_vector_wrap`) must be
+        followed by a call to ``Function.x.increase_state()``.
+
+        Returns:
+            Packed coefficients, owned by the form. The arrays must not
+            be modified.
+
+        Note:
+            Use :func:`dolfinx.fem.pack_coefficients` for packed data
+            that is owned by the caller.
+
+        """
+        states = [None if getattr(c, "_petsc_x", None) is not None else c.x.state
+                  for c in self._coefficients]
+        if self._packed_coefficients is None:
+            self._packed_coefficients = _cpp.fem.pack_coefficients(self)
+        else:
+            stale = [i for i, (s0, s1) in enumerate(zip(self._coefficient_states, states))
+                     if s0 is None or s0 != s1]
+            if stale:
+                _cpp.fem.pack_coefficients(self, self._packed_coefficients, stale)
+        self._coefficient_states = states
+        return self._packed_coefficients
+
+    def packed_constants(self) -> np.ndarray:
+        """Packed constant data for the form, updated only where needed.
+
+        The packed data is cached by the form, and is re-packed only if
+        the modification state of a constant (see ``Constant.state``)
+        has changed since it was last packed. Like
+        :meth:`packed_coefficients`, the assemblers use this function
+        only if ``cache_coefficients`` is set to ``True`` for the form.
+
+        Returns:
+            Packed constants, owned by the form. The array must not be
+            modified.
+
+        """
+        states = [getattr(c, "state", None) for c in self._constants]
+        if self._packed_constants is None or None in states or states != self._constant_states:
+            self._packed_constants = _cpp.fem.pack_constants(self)
+        self._constant_states = states
+        return self._packed_constants
+
 
 form_types = typing.Union[FormMetaClass, _cpp.fem.Form_float32, _cpp.fem.Form_float64,
                           _cpp.fem.Form_complex64, _cpp.fem.Form_complex128]
@@ -99,7 +186,10 @@ def form(form: typing.Union[ufl.Form, typing.Iterable[ufl.Form]], dtype: np.dtyp
         form: A UFL form or list(s) of UFL forms
         dtype: Scalar type to use for the compiled form
         form_compiler_options: See :func:`ffcx_jit <dolfinx.jit.ffcx_jit>`
-        jit_options:See :func:`ffcx_jit <dolfinx.jit.ffcx_jit>`
+        jit_options: See :func:`ffcx_jit <dolfinx.jit.ffcx_jit>`. If
+            ``compile_workers`` is not 1, the forms in an array of forms
+            are compiled concurrently by several C compiler processes
+            (see :func:`dolfinx.jit.precompile`).
 
     Returns:
         Compiled finite element Form
@@ -151,23 +241,21 @@ def form(form: typing.Union[ufl.Form, typing.Iterable[ufl.Form]], dtype: np.dtyp
         # Prepare coefficients data. For every coefficient in form take
         # its C++ object.
         original_coeffs = form.coefficients()
-        coeffs = [original_coeffs[ufcx_form.original_coefficient_position[i]
-                                  ]._cpp_object for i in range(ufcx_form.num_coefficients)]
-        constants = [c._cpp_object for c in form.constants()]
+        coeffs = [original_coeffs[ufcx_form.original_coefficient_position[i]]
+                  for i in range(ufcx_form.num_coefficients)]
+        constants = form.constants()
 
         # NOTE Could remove this and let the user convert meshtags by
         # calling compute_integration_domains themselves
         def get_integration_domains(integral_type, subdomain):
-            """Get integration domains from subdomain data"""
+            """Get integration domains from subdomain data. The domains
+            computed from mesh tags are cached on the tags and shared
+            by all forms."""
             if subdomain is None:
                 return []
             else:
                 try:
-                    if integral_type in (IntegralType.exterior_facet, IntegralType.interior_facet):
-                        tdim = subdomain.topology.dim
-                        subdomain._cpp_object.topology.create_connectivity(tdim - 1, tdim)
-                        subdomain._cpp_object.topology.create_connectivity(tdim, tdim - 1)
-                    return _cpp.fem.compute_integration_domains(integral_type, subdomain._cpp_object)
+                    return subdomain.integration_domains(integral_type)
                 except AttributeError:
                     return subdomain
 
@@ -175,7 +263,13 @@ def form(form: typing.Union[ufl.Form, typing.Iterable[ufl.Form]], dtype: np.dtyp
         subdomains = {_ufl_to_dolfinx_domain[key]: get_integration_domains(
             _ufl_to_dolfinx_domain[key], subdomain_data[0]) for (key, subdomain_data) in sd.get(domain).items()}
 
-        return formcls(ufcx_form, V, coeffs, constants, subdomains, mesh, module.ffi, code)
+        f = formcls(ufcx_form, V, coeffs, constants, subdomains, mesh, module.ffi, code)
+
+        # Default name for profiling data, can be changed by the user
+        if profiling.enabled():
+            f._flops = profiling._count_flops(form, form_compiler_options)
+        f.name = f"form_{form.signature()[:8]}"
+        return f
 
     def _create_form(form):
         """Recursively convert ufl.Forms to dolfinx.fem.Form, otherwise
@@ -186,6 +280,21 @@ def form(form: typing.Union[ufl.Form, typing.Iterable[ufl.Form]], dtype: np.dtyp
             return list(map(lambda sub_form: _create_form(sub_form), form))
         return form
 
+    def _extract_ufl_forms(form):
+        """Recursively extract all ufl.Forms in a (nested) list"""
+        if isinstance(form, ufl.Form):
+            return [form]
+        elif isinstance(form, collections.abc.Iterable):
+            return [f for sub_form in form for f in _extract_ufl_forms(sub_form)]
+        return []
+
+    # Compile the forms in an array of forms concurrently
+    ufl_forms = _extract_ufl_forms(form)
+    if len(ufl_forms) > 1:
+        mesh = ufl_forms[0].ufl_domain().ufl_cargo()
+        jit.precompile(mesh.comm, ufl_forms, form_compiler_options=form_compiler_options,
+                       jit_options=jit_options)
+
     return _create_form(form)
 
 
@@ -52,16 +52,38 @@ class Constant(ufl.Constant):
                 raise RuntimeError("Unsupported dtype")
         except AttributeError:
             raise AttributeError("Constant value must have a dtype attribute.")
+        self._state = 0
 
     @property
     def value(self):
-        """The value of the constant"""
+        """The value of the constant. Increases the modification state
+        (see :attr:`state`), since the returned array is writeable."""
+        self._state += 1
         return self._cpp_object.value
 
     @value.setter
     def value(self, v):
+        self._state += 1
         np.copyto(self._cpp_object.value, np.asarray(v))
 
+    @property
+    def state(self) -> int:
+        """Modification state of the constant.
+
+        The state is increased whenever the value can be modified, i.e.
+        by setting or accessing :attr:`value`. It is used to detect
+        whether packed constant data is out of date. Modifying the value
+        through an array that was obtained before the state was last
+        inspected requires a call to :meth:`increase_state`.
+
+        """
+        return self._state
+
+    def increase_state(self) -> None:
+        """Increase the modification state of the constant, see
+        :attr:`state`."""
+        self._state += 1
+
     @property
     def dtype(self) -> np.dtype:
         return self._cpp_object.dtype
@@ -71,19 +93,64 @@ class Constant(ufl.Constant):
             raise TypeError(
                 "Cannot evaluate a nonscalar expression to a scalar value.")
         else:
-            return float(self.value)
+            return float(self._cpp_object.value)
 
     def __complex__(self):
         if self.ufl_shape or self.ufl_free_indices:
             raise TypeError(
                 "Cannot evaluate a nonscalar expression to a scalar value.")
         else:
-            return complex(self.value)
+            return complex(self._cpp_object.value)
+
+
+def _fuse_expressions(ufl_expression, X: np.ndarray):
+    """Fuse a list or dict of expressions into one vector-valued
+    expression of all their components.
+
+    Returns:
+        The names (``None`` for a single expression) and shapes of the
+        expressions, and the (expression, points) object compiled by
+        :func:`dolfinx.jit.ffcx_jit`.
+
+    """
+    assert X.ndim < 3
+    num_points = X.shape[0] if X.ndim == 2 else 1
+    _X = np.reshape(X, (num_points, -1))
+
+    names: typing.Optional[list]
+    if isinstance(ufl_expression, dict):
+        names = list(ufl_expression.keys())
+        expressions = list(ufl_expression.values())
+    elif isinstance(ufl_expression, (list, tuple)):
+        names = list(range(len(ufl_expression)))
+        expressions = list(ufl_expression)
+    else:
+        names = None
+        expressions = [ufl_expression]
+    shapes = [e.ufl_shape for e in expressions]
+    if names is not None:
+        ufl_expression = ufl.as_vector([e[idx] if e.ufl_shape else e
+                                        for e in expressions for idx in np.ndindex(e.ufl_shape)])
+    return names, shapes, (ufl_expression, _X)
+
+
+def _set_scalar_type(form_compiler_options: dict, dtype):
+    """Set the FFCx scalar type of an Expression"""
+    if dtype == np.float32:
+        form_compiler_options["scalar_type"] = "float"
+    if dtype == np.float64:
+        form_compiler_options["scalar_type"] = "double"
+    elif dtype == np.complex128:
+        form_compiler_options["scalar_type"] = "double _Complex"
+    else:
+        raise RuntimeError(
+            f"Unsupported scalar type {dtype} for Expression.")
 
 
 class Expression:
-    def __init__(self, ufl_expression: ufl.core.expr.Expr, X: np.ndarray,
-                 form_compiler_options: dict = {}, jit_options: dict = {},
+    def __init__(self, ufl_expression: typing.Union[ufl.core.expr.Expr, typing.Sequence[ufl.core.expr.Expr],
+                                                    typing.Dict[str, ufl.core.expr.Expr]],
+                 X: np.ndarray, form_compiler_options: dict = {}, jit_options: dict = {},
                  dtype=default_scalar_type):
         """Create DOLFINx Expression.
 
@@ -96,8 +163,16 @@ class Expression:
         gradient can then be used as input to a non-FEniCS function that
         calculates a material constitutive model.
 
+        Several expressions that are evaluated at the same points can
+        be passed as a list or dict. They are compiled into a single
+        kernel and evaluated in one pass over the cells, sharing the
+        geometry and coefficient data. The values of the individual
+        expressions can be extracted with :meth:`split` or
+        :meth:`eval_split`.
+
         Args:
-            ufl_expression: Pure UFL expression
+            ufl_expression: Pure UFL expression, or list or dict of
+                pure UFL expressions
             X: Array of points of shape `(num_points, tdim)` on the
                 reference element.
             form_compiler_options: Options used in FFCx compilation of
@@ -112,27 +187,16 @@ class Expression:
 
         """
 
-        assert X.ndim < 3
-        num_points = X.shape[0] if X.ndim == 2 else 1
-        _X = np.reshape(X, (num_points, -1))
+        self._ufl_expression = ufl_expression
+        self._names, self._shapes, (ufl_expression, _X) = _fuse_expressions(ufl_expression, X)
 
         mesh = extract_unique_domain(ufl_expression).ufl_cargo()
 
         # Compile UFL expression with JIT
-        if dtype == np.float32:
-            form_compiler_options["scalar_type"] = "float"
-        if dtype == np.float64:
-            form_compiler_options["scalar_type"] = "double"
-        elif dtype == np.complex128:
-            form_compiler_options["scalar_type"] = "double _Complex"
-        else:
-            raise RuntimeError(
-                f"Unsupported scalar type {dtype} for Expression.")
-
+        _set_scalar_type(form_compiler_options, dtype)
         self._ufcx_expression, module, self._code = jit.ffcx_jit(mesh.comm, (ufl_expression, _X),
                                                                  form_compiler_options=form_compiler_options,
                                                                  jit_options=jit_options)
-        self._ufl_expression = ufl_expression
 
         # Prepare coefficients data. For every coefficient in form take
         # its C++ object.
@@ -197,13 +261,66 @@ class Expression:
 
         return values
 
+    def split(self, values: np.ndarray) -> dict:
+        """Split the values of fused expressions.
+
+        Args:
+            values: Values computed by :meth:`eval` for an Expression
+                created from a list or dict of UFL expressions.
+
+        Returns:
+            Dict, keyed by expression name (or index in the list), of
+            views into ``values`` with shape `(num_cells, num_points,
+            *value_shape)`. If the expressions have an argument, the
+            last axis is the argument degree-of-freedom.
+
+        """
+        if self._names is None:
+            raise RuntimeError("Expression was not created from a list or dict of expressions.")
+        num_points = self.X().shape[0]
+        _values = values.reshape(values.shape[0], num_points, self.value_size, -1)
+        split = {}
+        offset = 0
+        for name, shape in zip(self._names, self._shapes):
+            size = int(np.prod(shape, dtype=int))
+            v = _values[:, :, offset:offset + size, :]
+            if self.argument_function_space is None:
+                split[name] = v.reshape(values.shape[0], num_points, *shape)
+            else:
+                split[name] = v.reshape(values.shape[0], num_points, *shape, -1)
+            offset += size
+        return split
+
+    def eval_split(self, cells: np.ndarray, structured: bool = False) -> typing.Union[dict, np.ndarray]:
+        """Evaluate fused expressions in cells.
+
+        All expressions are evaluated in a single pass over the cells.
+
+        Args:
+            cells: Cells to evaluate the expressions in.
+            structured: If ``True``, return a NumPy structured array with
+                one record per cell and one field per expression.
+                Otherwise, return a dict of arrays (see :meth:`split`).
+
+        Returns:
+            Values of the expressions.
+
+        """
+        values = self.split(self.eval(cells))
+        if not structured:
+            return values
+        out = np.empty(len(cells), dtype=[(str(name), self.dtype, v.shape[1:]) for name, v in values.items()])
+        for name, v in values.items():
+            out[str(name)] = v
+        return out
+
     def X(self) -> np.ndarray:
         """Evaluation points on the reference cell"""
         return self._cpp_object.X()
 
     @property
     def ufl_expression(self):
-        """Original UFL Expression"""
+        """Original UFL Expression (or list or dict of expressions)"""
         return self._ufl_expression
 
     @property
@@ -231,6 +348,36 @@ class Expression:
         return self._cpp_object.dtype
 
 
+def create_expressions(expressions: typing.Sequence[typing.Tuple[typing.Any, np.ndarray]],
+                       form_compiler_options: dict = {}, jit_options: dict = {},
+                       dtype=default_scalar_type) -> typing.List[Expression]:
+    """Create several Expressions.
+
+    The expressions are compiled concurrently by several C compiler
+    processes if the JIT option ``compile_workers`` is not 1 (see
+    :func:`dolfinx.jit.precompile`).
+
+    Args:
+        expressions: List of (UFL expression, points) pairs, see
+            :class:`Expression`.
+        form_compiler_options: See :class:`Expression`.
+        jit_options: See :class:`Expression`.
+        dtype: Scalar type of the Expressions.
+
+    Returns:
+        List of Expressions.
+
+    """
+    objects = [_fuse_expressions(e, X)[2] for e, X in expressions]
+    if len(objects) > 1:
+        options = dict(form_compiler_options)
+        _set_scalar_type(options, dtype)
+        mesh = extract_unique_domain(objects[0][0]).ufl_cargo()
+        jit.precompile(mesh.comm, objects, form_compiler_options=options, jit_options=jit_options)
+    return [Expression(e, X, form_compiler_options=form_compiler_options, jit_options=jit_options, dtype=dtype)
+            for e, X in expressions]
+
+
 class Function(ufl.Coefficient):
     """A finite element function that is represented by a function space
     (domain, element and dofmap) and a vector holding the
@@ -376,6 +523,10 @@ class Function(ufl.Coefficient):
             x = _cpp.fem.interpolation_coords(self._V.element, self._V.mesh.geometry, cells)
             self._cpp_object.interpolate(np.asarray(u(x), dtype=self.dtype), cells)
 
+        # Data derived from the degrees-of-freedom, e.g. packed
+        # coefficients, is out of date
+        self.x.increase_state()
+
     def copy(self) -> Function:
         """Create a copy of the Function. The FunctionSpace is shared and the
         degree-of-freedom vector is copied.
@@ -387,7 +538,7 @@ class Function(ufl.Coefficient):
     def vector(self):
         """PETSc vector holding the degrees-of-freedom."""
         if self._petsc_x is None:
-            self._petsc_x = _cpp.la.petsc.create_vector_wrap(self.x)
+            self._petsc_x = la.create_petsc_vector_wrap(self.x)
         return self._petsc_x
 
     @property
@@ -17,53 +17,168 @@ import functools
 import os
 import typing
 
+import numpy as np
+
 import ufl
 from dolfinx import cpp as _cpp
 from dolfinx import la
-from dolfinx.cpp.fem import pack_coefficients as _pack_coefficients
 from dolfinx.cpp.fem import pack_constants as _pack_constants
 from dolfinx.fem import assemble
+from dolfinx.fem.assemble import (SparsityPatternCache, _packed_coefficients,
+                                  _packed_constants, sparsity_pattern_cache)
 from dolfinx.fem.bcs import DirichletBCMetaClass
 from dolfinx.fem.bcs import bcs_by_block as _bcs_by_block
 from dolfinx.fem.forms import FormMetaClass
 from dolfinx.fem.forms import extract_function_spaces as _extract_spaces
 from dolfinx.fem.forms import form as _create_form
 from dolfinx.fem.forms import form_types
+from dolfinx.fem.function import Constant as _Constant
 from dolfinx.fem.function import Function as _Function
+from dolfinx.fem.function import FunctionSpace as _FunctionSpace
 
 import petsc4py
 import petsc4py.lib
 from petsc4py import PETSc
 
 
-def _extract_function_spaces(a: typing.List[typing.List[FormMetaClass]]):
-    """From a rectangular array of bilinear forms, extract the function
-    spaces for each block row and block column.
+# -- Block layout ------------------------------------------------------------
+
+class BlockLayout:
+    """Layout of the blocks of a monolithic (blocked) system.
+
+    The layout holds the index maps of the row and column blocks of a
+    rectangular array of bilinear forms, the local PETSc index sets of
+    each block and the offsets of the blocks in a monolithic vector.
+    It can be created once and passed to :func:`assemble_matrix_block`
+    and :func:`assemble_vector_block` to avoid rebuilding this data for
+    every assembly, e.g. in each Newton iteration. A layout can be
+    shared by arrays of forms with different non-zero blocks on the same
+    spaces, e.g. an operator and its preconditioner.
+
+    Example::
+
+        layout = BlockLayout(a)
+        A = assemble_matrix_block(a, bcs=bcs, layout=layout)
+        P = assemble_matrix_block(a_p, bcs=bcs, layout=layout)
+        b = assemble_vector_block(L, a, bcs=bcs, layout=layout)
+        layout.set_fieldsplit(ksp.getPC(), ["u", "p"])
 
     """
 
-    assert len({len(cols) for cols in a}) == 1, "Array of function spaces is not rectangular"
+    def __init__(self, a: typing.List[typing.List[form_types]],
+                 row_spaces: typing.Optional[typing.Sequence[_FunctionSpace]] = None,
+                 col_spaces: typing.Optional[typing.Sequence[_FunctionSpace]] = None):
+        """Create the layout for a rectangular array of bilinear forms.
+
+        Args:
+            a: A rectangular array of bilinear forms.
+            row_spaces: Test function space of each block row. Required
+                if a row of ``a`` contains no form.
+            col_spaces: Trial function space of each block column.
+                Required if a column of ``a`` contains no form.
+
+        """
+        def spaces(index, V):
+            V = _extract_spaces(a, index) if V is None else V
+            return [getattr(_V, "_cpp_object", _V) for _V in V]
+
+        self.row_spaces = spaces(0, row_spaces)
+        self.col_spaces = spaces(1, col_spaces)
+        if any(V is None for V in self.row_spaces + self.col_spaces):
+            raise RuntimeError("Each block row and column must contain at least one form,"
+                               " or its function space must be passed to BlockLayout.")
+        self.check(a)
+        self._pattern_keys = self._block_keys(a)
+        self._pattern: typing.Optional[_cpp.la.SparsityPattern] = None
+
+        self.row_maps = [(V.dofmap.index_map, V.dofmap.index_map_bs) for V in self.row_spaces]
+        self.col_maps = [(V.dofmap.index_map, V.dofmap.index_map_bs) for V in self.col_spaces]
+        self._is_rows: typing.Optional[typing.List[PETSc.IS]] = None
+        self._is_cols: typing.Optional[typing.List[PETSc.IS]] = None
+
+        # Offsets of the owned entries of each row block in a monolithic
+        # vector on this process
+        sizes = [imap.size_local * bs for imap, bs in self.row_maps]
+        self.offsets = np.concatenate(([0], np.cumsum(sizes, dtype=np.int64)))
+        self._fieldsplit_is: typing.Optional[typing.List[PETSc.IS]] = None
 
-    # Extract (V0, V1) pair for each block in 'a'
-    def fn(form):
-        return form.function_spaces if form is not None else None
-    from functools import partial
-    Vblock: typing.Iterable = map(partial(map, fn), a)
+    @property
+    def is_rows(self) -> typing.List[PETSc.IS]:
+        """Local index sets of the row blocks in a monolithic matrix."""
+        if self._is_rows is None:
+            self._is_rows = _cpp.la.petsc.create_index_sets(self.row_maps)
+        return self._is_rows
 
-    # Compute spaces for each row/column block
-    rows: typing.List[typing.Set] = [set() for i in range(len(a))]
-    cols: typing.List[typing.Set] = [set() for i in range(len(a[0]))]
-    for i, Vrow in enumerate(Vblock):
-        for j, V in enumerate(Vrow):
-            if V is not None:
-                rows[i].add(V[0])
-                cols[j].add(V[1])
+    @property
+    def is_cols(self) -> typing.List[PETSc.IS]:
+        """Local index sets of the column blocks in a monolithic matrix."""
+        if self._is_cols is None:
+            self._is_cols = _cpp.la.petsc.create_index_sets(self.col_maps)
+        return self._is_cols
+
+    def check(self, a: typing.List[typing.List[form_types]]) -> None:
+        """Check that an array of bilinear forms has the blocks of this
+        layout, i.e. that each form is defined on the spaces of its block
+        row and column. Raises a ValueError if it has not. Forms may be
+        None in any block."""
+        if len(a) != len(self.row_spaces) or any(len(a_row) != len(self.col_spaces) for a_row in a):
+            raise ValueError(f"Expected a {len(self.row_spaces)} x {len(self.col_spaces)} array of forms.")
+        for i, a_row in enumerate(a):
+            for j, a_sub in enumerate(a_row):
+                if a_sub is not None and (a_sub.function_spaces[0] != self.row_spaces[i]
+                                          or a_sub.function_spaces[1] != self.col_spaces[j]):
+                    raise ValueError(f"Form in block ({i}, {j}) is not defined on the spaces of the layout.")
+
+    @staticmethod
+    def _block_keys(a: typing.List[typing.List[form_types]]) -> typing.List[typing.List[typing.Optional[tuple]]]:
+        """Sparsity pattern key (see :meth:`SparsityPatternCache.key`)
+        of each block of ``a``."""
+        return [[None if a_sub is None else SparsityPatternCache.key(a_sub) for a_sub in a_row] for a_row in a]
+
+    def create_matrix(self, a: typing.List[typing.List[form_types]]) -> PETSc.Mat:
+        """Create a monolithic PETSc matrix for an array of bilinear
+        forms with the blocks of this layout. The sparsity pattern is
+        that of ``a``, which may have a different set of non-zero
+        blocks than the forms that the layout was created from.
+
+        The sparsity pattern of the forms that the layout was created
+        from is built on first use and kept by the layout. It is re-used
+        for any ``a`` with the same non-zero blocks, each with the same
+        mesh, function spaces and integration domains."""
+        self.check(a)
+        if self._block_keys(a) != self._pattern_keys:
+            return _cpp.fem.petsc.create_matrix_block(a)
+        if self._pattern is None:
+            self._pattern = _cpp.fem.create_sparsity_pattern(a)
+            self._pattern.finalize()
+        return _cpp.fem.petsc.create_matrix_block(self._pattern, [self.row_spaces, self.col_spaces])
+
+    def create_vector(self) -> PETSc.Vec:
+        """Create a monolithic PETSc vector for the row blocks."""
+        return _cpp.fem.petsc.create_vector_block(self.row_maps)
+
+    def field_index_sets(self) -> typing.List[PETSc.IS]:
+        """Index sets of the owned rows of each row block in the global
+        numbering of a monolithic matrix, e.g. for PETSc fieldsplit
+        preconditioners."""
+        if self._fieldsplit_is is None:
+            start = sum(imap.local_range[0] * bs for imap, bs in self.row_maps)
+            self._fieldsplit_is = [
+                PETSc.IS().createStride(int(self.offsets[i + 1] - self.offsets[i]),
+                                        int(start + self.offsets[i]), 1, comm=PETSc.COMM_SELF)
+                for i in range(len(self.row_maps))]
+        return self._fieldsplit_is
+
+    def set_fieldsplit(self, pc: PETSc.PC, names: typing.Optional[typing.Sequence[str]] = None) -> None:
+        """Set the fields of a fieldsplit preconditioner to the row blocks.
 
-    rows = [e for row in rows for e in row]
-    cols = [e for col in cols for e in col]
-    assert len(rows) == len(a)
-    assert len(cols) == len(a[0])
-    return rows, cols
+        Args:
+            pc: A PETSc preconditioner of type ``fieldsplit``.
+            names: Name of each field. Defaults to the block index.
+
+        """
+        names = [str(i) for i in range(len(self.row_maps))] if names is None else names
+        pc.setFieldSplitIS(*zip(names, self.field_index_sets()))
 
 
 # -- Vector instantiation ----------------------------------------------------
@@ -126,11 +241,16 @@ def create_matrix(a: form_types, mat_type=None) -> PETSc.Mat:
     Returns:
         A PETSc matrix with a layout that is compatible with `a`.
 
+    Note:
+        The sparsity pattern is taken from
+        :data:`dolfinx.fem.sparsity_pattern_cache`.
+
     """
+    sp = sparsity_pattern_cache.get(a)
     if mat_type is None:
-        return _cpp.fem.petsc.create_matrix(a)
+        return _cpp.la.petsc.create_matrix(a.mesh.comm, sp)
     else:
-        return _cpp.fem.petsc.create_matrix(a, mat_type)
+        return _cpp.la.petsc.create_matrix(a.mesh.comm, sp, mat_type)
 
 
 def create_matrix_block(a: typing.List[typing.List[form_types]]) -> PETSc.Mat:
@@ -159,15 +279,100 @@ def create_matrix_nest(a: typing.List[typing.List[form_types]]) -> PETSc.Mat:
     return _cpp.fem.petsc.create_matrix_nest(a)
 
 
+class _MatrixFreeContext:
+    """Python context for a PETSc shell matrix that applies the action
+    of a bilinear form with Dirichlet boundary conditions applied."""
+
+    def __init__(self, a: ufl.Form, bcs: typing.List[DirichletBCMetaClass],
+                 form_compiler_options: dict, jit_options: dict):
+        V = a.arguments()[-1].ufl_function_space()
+        self._w = _Function(V)
+        self._M = _create_form(ufl.action(a, self._w), form_compiler_options=form_compiler_options,
+                               jit_options=jit_options)
+        self._ufl_a = a
+        self._a = None
+        self._options = (form_compiler_options, jit_options)
+        self._bcs = bcs
+
+        index_map, bs = V.dofmap.index_map, V.dofmap.index_map_bs
+        self.size_local, self.size_global = index_map.size_local * bs, index_map.size_global * bs
+        self._y = la.vector(index_map, bs, dtype=self._M.dtype)
+
+        # Constrained degrees-of-freedom, all and owned
+        dofs = [bc.dof_indices() for bc in bcs]
+        self._bc_dofs = np.unique(np.concatenate([d for d, _ in dofs] + [np.zeros(0, dtype=np.int32)]))
+        self._bc_dofs_owned = self._bc_dofs[self._bc_dofs < self.size_local]
+
+    def _accumulate(self, y: PETSc.Vec):
+        """Accumulate ghost contributions in the work vector and copy
+        owned entries to y"""
+        self._y.scatter_reverse(la.InsertMode.add)
+        y.array[:] = self._y.array[:self.size_local]
+
+    def mult(self, A: PETSc.Mat, x: PETSc.Vec, y: PETSc.Vec):
+        """Compute y = Ax"""
+        w = self._w.x
+        w.array[:self.size_local] = x.array_r
+        w.scatter_forward()
+        w.array[self._bc_dofs] = 0
+
+        self._y.array[:] = 0
+        assemble.assemble_vector(self._y.array, self._M)
+        self._accumulate(y)
+
+        # Identity rows for constrained degrees-of-freedom
+        y.array[self._bc_dofs_owned] = x.array_r[self._bc_dofs_owned]
+
+    def getDiagonal(self, A: PETSc.Mat, d: PETSc.Vec):
+        """Compute the diagonal of A"""
+        if self._a is None:
+            self._a = _create_form(self._ufl_a, form_compiler_options=self._options[0],
+                                   jit_options=self._options[1])
+        self._y.array[:] = 0
+        _cpp.fem.assemble_diagonal(self._y.array, self._a, _packed_constants(self._a),
+                                   _packed_coefficients(self._a), self._bcs, 1.0)
+        self._accumulate(d)
+
+
+def create_matrix_free(a: ufl.Form, bcs: typing.List[DirichletBCMetaClass] = [],
+                       form_compiler_options: dict = {}, jit_options: dict = {}) -> PETSc.Mat:
+    """Create a matrix-free PETSc operator (``MATSHELL``) for a bilinear
+    form.
+
+    The matrix is never assembled. Matrix-vector products assemble the
+    action of ``a`` on the input vector, and the diagonal (e.g. for
+    Jacobi preconditioning) is assembled without assembling the matrix.
+    The operator is the same as the matrix from :func:`assemble_matrix`
+    with ``bcs`` and a unit diagonal for constrained
+    degrees-of-freedom.
+
+    Args:
+        a: A bilinear UFL form with the same test and trial space.
+        bcs: Dirichlet boundary conditions.
+        form_compiler_options: See :func:`ffcx_jit <dolfinx.jit.ffcx_jit>`.
+        jit_options: See :func:`ffcx_jit <dolfinx.jit.ffcx_jit>`.
+
+    Returns:
+        PETSc matrix of type ``python``, with the context available via
+        ``getPythonContext()``.
+
+    """
+    ctx = _MatrixFreeContext(a, bcs, form_compiler_options, jit_options)
+    sizes = (ctx.size_local, ctx.size_global)
+    A = PETSc.Mat().createPython((sizes, sizes), ctx, comm=ctx._w.function_space.mesh.comm)
+    A.setUp()
+    return A
+
+
 # -- Vector assembly ---------------------------------------------------------
 
 @functools.singledispatch
-def assemble_vector(L: typing.Any, constants=None, coeffs=None) -> PETSc.Vec:
-    return _assemble_vector_form(L, constants, coeffs)
+def assemble_vector(L: typing.Any, constants=None, coeffs=None, num_threads: int = 1) -> PETSc.Vec:
+    return _assemble_vector_form(L, constants, coeffs, num_threads)
 
 
 @assemble_vector.register(FormMetaClass)
-def _assemble_vector_form(L: form_types, constants=None, coeffs=None) -> PETSc.Vec:
+def _assemble_vector_form(L: form_types, constants=None, coeffs=None, num_threads: int = 1) -> PETSc.Vec:
     """Assemble linear form into a new PETSc vector.
 
     Note:
@@ -176,6 +381,7 @@ def _assemble_vector_form(L: form_types, constants=None, coeffs=None) -> PETSc.V
 
     Args:
         L: A linear form.
+        num_threads: Number of threads used for assembly.
 
     Returns:
         An assembled vector.
@@ -184,12 +390,13 @@ def _assemble_vector_form(L: form_types, constants=None, coeffs=None) -> PETSc.V
     b = la.create_petsc_vector(L.function_spaces[0].dofmap.index_map,
                                L.function_spaces[0].dofmap.index_map_bs)
     with b.localForm() as b_local:
-        assemble._assemble_vector_array(b_local.array_w, L, constants, coeffs)
+        assemble._assemble_vector_array(b_local.array_w, L, constants, coeffs, num_threads)
     return b
 
 
 @assemble_vector.register(PETSc.Vec)
-def _assemble_vector_vec(b: PETSc.Vec, L: form_types, constants=None, coeffs=None) -> PETSc.Vec:
+def _assemble_vector_vec(b: PETSc.Vec, L: form_types, constants=None, coeffs=None,
+                         num_threads: int = 1) -> PETSc.Vec:
     """Assemble linear form into an existing PETSc vector.
 
     Note:
@@ -200,23 +407,25 @@ def _assemble_vector_vec(b: PETSc.Vec, L: form_types, constants=None, coeffs=Non
     Args:
         b: Vector to assemble the contribution of the linear form into.
         L: A linear form to assemble into `b`.
+        num_threads: Number of threads used for assembly.
 
     Returns:
         An assembled vector.
 
     """
     with b.localForm() as b_local:
-        assemble._assemble_vector_array(b_local.array_w, L, constants, coeffs)
+        assemble._assemble_vector_array(b_local.array_w, L, constants, coeffs, num_threads)
     return b
 
 
 @functools.singledispatch
-def assemble_vector_nest(L: typing.Any, constants=None, coeffs=None) -> PETSc.Vec:
-    return _assemble_vector_nest_forms(L, constants, coeffs)
+def assemble_vector_nest(L: typing.Any, constants=None, coeffs=None, num_threads: int = 1) -> PETSc.Vec:
+    return _assemble_vector_nest_forms(L, constants, coeffs, num_threads)
 
 
 @assemble_vector_nest.register(list)
-def _assemble_vector_nest_forms(L: typing.List[form_types], constants=None, coeffs=None) -> PETSc.Vec:
+def _assemble_vector_nest_forms(L: typing.List[form_types], constants=None, coeffs=None,
+                                num_threads: int = 1) -> PETSc.Vec:
     """Assemble linear forms into a new nested PETSc (VecNest) vector.
     The returned vector is not finalised, i.e. ghost values are not
     accumulated on the owning processes.
@@ -228,11 +437,12 @@ def _assemble_vector_nest_forms(L: typing.List[form_types], constants=None, coef
     for b_sub in b.getNestSubVecs():
         with b_sub.localForm() as b_local:
             b_local.set(0.0)
-    return _assemble_vector_nest_vec(b, L, constants, coeffs)
+    return _assemble_vector_nest_vec(b, L, constants, coeffs, num_threads)
 
 
 @assemble_vector_nest.register
-def _assemble_vector_nest_vec(b: PETSc.Vec, L: typing.List[form_types], constants=None, coeffs=None) -> PETSc.Vec:
+def _assemble_vector_nest_vec(b: PETSc.Vec, L: typing.List[form_types], constants=None, coeffs=None,
+                              num_threads: int = 1) -> PETSc.Vec:
     """Assemble linear forms into a nested PETSc (VecNest) vector. The
     vector is not zeroed before assembly and it is not finalised, i.e.
     ghost values are not accumulated on the owning processes.
@@ -242,7 +452,7 @@ def _assemble_vector_nest_vec(b: PETSc.Vec, L: typing.List[form_types], constant
     coeffs = [None] * len(L) if coeffs is None else coeffs
     for b_sub, L_sub, const, coeff in zip(b.getNestSubVecs(), L, constants, coeffs):
         with b_sub.localForm() as b_local:
-            assemble._assemble_vector_array(b_local.array_w, L_sub, const, coeff)
+            assemble._assemble_vector_array(b_local.array_w, L_sub, const, coeff, num_threads)
     return b
 
 
@@ -254,18 +464,21 @@ def assemble_vector_block(L: typing.List[form_types],
                           x0: typing.Optional[PETSc.Vec] = None,
                           scale: float = 1.0,
                           constants_L=None, coeffs_L=None,
-                          constants_a=None, coeffs_a=None) -> PETSc.Vec:
+                          constants_a=None, coeffs_a=None, num_threads: int = 1,
+                          layout: typing.Optional[BlockLayout] = None) -> PETSc.Vec:
     """Assemble linear forms into a monolithic vector. The vector is not
     finalised, i.e. ghost values are not accumulated.
 
+    A :class:`BlockLayout` with the blocks of ``a`` can be passed to
+    re-use the block index maps and offsets.
+
     """
-    maps = [(form.function_spaces[0].dofmap.index_map,
-             form.function_spaces[0].dofmap.index_map_bs) for form in L]
-    b = _cpp.fem.petsc.create_vector_block(maps)
+    layout = BlockLayout(a) if layout is None else layout
+    b = layout.create_vector()
     with b.localForm() as b_local:
         b_local.set(0.0)
     return _assemble_vector_block_vec(b, L, a, bcs, x0, scale, constants_L, coeffs_L,
-                                      constants_a, coeffs_a)
+                                      constants_a, coeffs_a, num_threads, layout)
 
 
 @assemble_vector_block.register
@@ -276,14 +489,21 @@ def _assemble_vector_block_vec(b: PETSc.Vec,
                                x0: typing.Optional[PETSc.Vec] = None,
                                scale: float = 1.0,
                                constants_L=None, coeffs_L=None,
-                               constants_a=None, coeffs_a=None) -> PETSc.Vec:
+                               constants_a=None, coeffs_a=None, num_threads: int = 1,
+                               layout: typing.Optional[BlockLayout] = None) -> PETSc.Vec:
     """Assemble linear forms into a monolithic vector. The vector is not
     zeroed and it is not finalised, i.e. ghost values are not
     accumulated.
 
+    A :class:`BlockLayout` with the blocks of ``a`` can be passed to
+    re-use the block index maps and offsets.
+
     """
-    maps = [(form.function_spaces[0].dofmap.index_map,
-             form.function_spaces[0].dofmap.index_map_bs) for form in L]
+    if layout is None:
+        layout = BlockLayout(a)
+    else:
+        layout.check(a)
+    maps = layout.row_maps
     if x0 is not None:
         x0_local = _cpp.la.petsc.get_local_vectors(x0, maps)
         x0_sub = x0_local
@@ -291,67 +511,124 @@ def _assemble_vector_block_vec(b: PETSc.Vec,
         x0_local = []
         x0_sub = [None] * len(maps)
 
-    constants_L = [form and _pack_constants(form) for form in L] if constants_L is None else constants_L
-    coeffs_L = [{} if form is None else _pack_coefficients(
+    constants_L = [form and _packed_constants(form) for form in L] if constants_L is None else constants_L
+    coeffs_L = [{} if form is None else _packed_coefficients(
         form) for form in L] if coeffs_L is None else coeffs_L
-    constants_a = [[form and _pack_constants(form) for form in forms]
+    constants_a = [[form and _packed_constants(form) for form in forms]
                    for forms in a] if constants_a is None else constants_a
-    coeffs_a = [[{} if form is None else _pack_coefficients(
+    coeffs_a = [[{} if form is None else _packed_coefficients(
         form) for form in forms] for forms in a] if coeffs_a is None else coeffs_a
 
-    bcs1 = _bcs_by_block(_extract_spaces(a, 1), bcs)
+    bcs1 = _bcs_by_block(layout.col_spaces, bcs)
     b_local = _cpp.la.petsc.get_local_vectors(b, maps)
     for b_sub, L_sub, a_sub, const_L, coeff_L, const_a, coeff_a in zip(b_local, L, a,
                                                                        constants_L, coeffs_L,
                                                                        constants_a, coeffs_a):
-        _cpp.fem.assemble_vector(b_sub, L_sub, const_L, coeff_L)
+        _cpp.fem.assemble_vector(b_sub, L_sub, const_L, coeff_L, num_threads)
         _cpp.fem.apply_lifting(b_sub, a_sub, const_a, coeff_a, bcs1, x0_local, scale)
 
     _cpp.la.petsc.scatter_local_vectors(b, b_local, maps)
     b.ghostUpdate(addv=PETSc.InsertMode.ADD, mode=PETSc.ScatterMode.REVERSE)
 
-    bcs0 = _bcs_by_block(_extract_spaces(L), bcs)
-    offset = 0
+    bcs0 = _bcs_by_block(layout.row_spaces, bcs)
     b_array = b.getArray(readonly=False)
-    for submap, bc, _x0 in zip(maps, bcs0, x0_sub):
-        size = submap[0].size_local * submap[1]
-        _cpp.fem.set_bc(b_array[offset: offset + size], bc, _x0, scale)
-        offset += size
+    for i, (bc, _x0) in enumerate(zip(bcs0, x0_sub)):
+        _cpp.fem.set_bc(b_array[layout.offsets[i]: layout.offsets[i + 1]], bc, _x0, scale)
 
     return b
 
 
+def assemble_vectors(L: form_types, constants=None, coeffs=None,
+                     a: typing.Optional[form_types] = None,
+                     bcs: typing.List[DirichletBCMetaClass] = [],
+                     scale: float = 1.0, num_threads: int = 1) -> PETSc.Mat:
+    """Assemble a linear form for multiple sets of coefficients and
+    constants into the columns of a dense PETSc matrix.
+
+    The mesh is traversed once for all right-hand sides (see
+    :func:`dolfinx.fem.assemble_vectors`). If ``a`` is supplied, the
+    Dirichlet boundary conditions ``bcs`` are applied to every column,
+    i.e. lifting is applied, ghost contributions are accumulated and
+    the boundary condition values are set.
+
+    Args:
+        L: The linear form to assemble.
+        constants: Packed constants for each right-hand side, see
+            :func:`dolfinx.fem.assemble_vectors`.
+        coeffs: Packed coefficients for each right-hand side, see
+            :func:`dolfinx.fem.assemble_vectors`.
+        a: Bilinear form used to lift the boundary conditions.
+        bcs: Dirichlet boundary conditions.
+        scale: Scaling of the boundary condition values.
+        num_threads: Number of threads used for assembly.
+
+    Returns:
+        Dense matrix with one column for each right-hand side, e.g. for
+        use with ``KSP.matSolve``.
+
+    """
+    b = assemble.assemble_vectors(L, constants, coeffs, num_threads)
+    if a is not None:
+        assemble.apply_lifting(b, [a], [bcs], scale=scale)
+
+    # Accumulate ghost contributions for each right-hand side
+    dofmap = L.function_spaces[0].dofmap
+    bs = dofmap.index_map_bs
+    size_local = dofmap.index_map.size_local * bs
+    x = la.vector(dofmap.index_map, bs, dtype=b.dtype)
+    for _b in b:
+        x.array[:] = _b
+        x.scatter_reverse(la.InsertMode.add)
+        _b[:size_local] = x.array[:size_local]
+
+    b_owned = np.ascontiguousarray(b[:, :size_local])
+    if a is not None:
+        assemble.set_bc(b_owned, bcs, scale=scale)
+
+    # Owned rows of b, column-major
+    size_global = dofmap.index_map.size_global * bs
+    B = PETSc.Mat().createDense(((size_local, size_global), (PETSc.DECIDE, b.shape[0])),
+                                array=b_owned, comm=L.mesh.comm)
+    B.assemble()
+    return B
+
+
 # -- Matrix assembly ---------------------------------------------------------
 @functools.singledispatch
 def assemble_matrix(a: typing.Any, bcs: typing.List[DirichletBCMetaClass] = [],
                     diagonal: float = 1.0,
-                    constants=None, coeffs=None) -> PETSc.Mat:
-    return _assemble_matrix_form(a, bcs, diagonal, constants, coeffs)
+                    constants=None, coeffs=None, num_threads: int = 1) -> PETSc.Mat:
+    return _assemble_matrix_form(a, bcs, diagonal, constants, coeffs, num_threads)
 
 
 @assemble_matrix.register(FormMetaClass)
 def _assemble_matrix_form(a: form_types, bcs: typing.List[DirichletBCMetaClass] = [],
                           diagonal: float = 1.0,
-                          constants=None, coeffs=None) -> PETSc.Mat:
+                          constants=None, coeffs=None, num_threads: int = 1) -> PETSc.Mat:
     """Assemble bilinear form into a matrix. The returned matrix is not
     finalised, i.e. ghost values are not accumulated.
 
     """
-    A = _cpp.fem.petsc.create_matrix(a)
-    _assemble_matrix_mat(A, a, bcs, diagonal, constants, coeffs)
+    A = create_matrix(a)
+    _assemble_matrix_mat(A, a, bcs, diagonal, constants, coeffs, num_threads)
     return A
 
 
 @assemble_matrix.register
 def _assemble_matrix_mat(A: PETSc.Mat, a: form_types, bcs: typing.List[DirichletBCMetaClass] = [],
-                         diagonal: float = 1.0, constants=None, coeffs=None) -> PETSc.Mat:
+                         diagonal: float = 1.0, constants=None, coeffs=None,
+                         num_threads: int = 1) -> PETSc.Mat:
     """Assemble bilinear form into a matrix. The returned matrix is not
     finalised, i.e. ghost values are not accumulated.
 
+    With ``num_threads`` greater than one, element tensors are computed
+    concurrently and their insertion into the PETSc matrix is
+    serialised.
+
     """
-    constants = _pack_constants(a) if constants is None else constants
-    coeffs = _pack_coefficients(a) if coeffs is None else coeffs
-    _cpp.fem.petsc.assemble_matrix(A, a, constants, coeffs, bcs)
+    constants = _packed_constants(a) if constants is None else constants
+    coeffs = _packed_coefficients(a) if coeffs is None else coeffs
+    _cpp.fem.petsc.assemble_matrix(A, a, constants, coeffs, bcs, num_threads=num_threads)
     if a.function_spaces[0] is a.function_spaces[1]:
         A.assemblyBegin(PETSc.Mat.AssemblyType.FLUSH)
         A.assemblyEnd(PETSc.Mat.AssemblyType.FLUSH)
@@ -364,27 +641,27 @@ def _assemble_matrix_mat(A: PETSc.Mat, a: form_types, bcs: typing.List[Dirichlet
 def assemble_matrix_nest(a: typing.List[typing.List[form_types]],
                          bcs: typing.List[DirichletBCMetaClass] = [], mat_types=[],
                          diagonal: float = 1.0,
-                         constants=None, coeffs=None) -> PETSc.Mat:
+                         constants=None, coeffs=None, num_threads: int = 1) -> PETSc.Mat:
     """Assemble bilinear forms into matrix"""
     A = _cpp.fem.petsc.create_matrix_nest(a, mat_types)
-    _assemble_matrix_nest_mat(A, a, bcs, diagonal, constants, coeffs)
+    _assemble_matrix_nest_mat(A, a, bcs, diagonal, constants, coeffs, num_threads)
     return A
 
 
 @assemble_matrix_nest.register
 def _assemble_matrix_nest_mat(A: PETSc.Mat, a: typing.List[typing.List[form_types]],
                               bcs: typing.List[DirichletBCMetaClass] = [], diagonal: float = 1.0,
-                              constants=None, coeffs=None) -> PETSc.Mat:
+                              constants=None, coeffs=None, num_threads: int = 1) -> PETSc.Mat:
     """Assemble bilinear forms into matrix"""
-    constants = [[form and _pack_constants(form) for form in forms]
+    constants = [[form and _packed_constants(form) for form in forms]
                  for forms in a] if constants is None else constants
-    coeffs = [[{} if form is None else _pack_coefficients(
+    coeffs = [[{} if form is None else _packed_coefficients(
         form) for form in forms] for forms in a] if coeffs is None else coeffs
     for i, (a_row, const_row, coeff_row) in enumerate(zip(a, constants, coeffs)):
         for j, (a_block, const, coeff) in enumerate(zip(a_row, const_row, coeff_row)):
             if a_block is not None:
                 Asub = A.getNestSubMatrix(i, j)
-                _assemble_matrix_mat(Asub, a_block, bcs, diagonal, const, coeff)
+                _assemble_matrix_mat(Asub, a_block, bcs, diagonal, const, coeff, num_threads)
             elif i == j:
                 for bc in bcs:
                     row_forms = [row_form for row_form in a_row if row_form is not None]
@@ -401,33 +678,42 @@ def _assemble_matrix_nest_mat(A: PETSc.Mat, a: typing.List[typing.List[form_type
 def assemble_matrix_block(a: typing.List[typing.List[form_types]],
                           bcs: typing.List[DirichletBCMetaClass] = [],
                           diagonal: float = 1.0,
-                          constants=None, coeffs=None) -> PETSc.Mat:  # type: ignore
-    """Assemble bilinear forms into matrix"""
-    A = _cpp.fem.petsc.create_matrix_block(a)
-    return _assemble_matrix_block_mat(A, a, bcs, diagonal, constants, coeffs)
+                          constants=None, coeffs=None, num_threads: int = 1,
+                          layout: typing.Optional[BlockLayout] = None) -> PETSc.Mat:  # type: ignore
+    """Assemble bilinear forms into matrix. A :class:`BlockLayout` with
+    the blocks of ``a`` can be passed to re-use the block index sets,
+    and the sparsity pattern if ``a`` has the non-zero blocks of the
+    forms that the layout was created from. The matrix has the sparsity
+    pattern of ``a``."""
+    A = _cpp.fem.petsc.create_matrix_block(a) if layout is None else layout.create_matrix(a)
+    return _assemble_matrix_block_mat(A, a, bcs, diagonal, constants, coeffs, num_threads, layout)
 
 
 @assemble_matrix_block.register
 def _assemble_matrix_block_mat(A: PETSc.Mat, a: typing.List[typing.List[form_types]],
                                bcs: typing.List[DirichletBCMetaClass] = [], diagonal: float = 1.0,
-                               constants=None, coeffs=None) -> PETSc.Mat:
-    """Assemble bilinear forms into matrix"""
+                               constants=None, coeffs=None, num_threads: int = 1,
+                               layout: typing.Optional[BlockLayout] = None) -> PETSc.Mat:
+    """Assemble bilinear forms into matrix. A :class:`BlockLayout` with
+    the blocks of ``a`` can be passed to re-use the block index sets."""
 
-    constants = [[form and _pack_constants(form) for form in forms]
+    constants = [[form and _packed_constants(form) for form in forms]
                  for forms in a] if constants is None else constants
-    coeffs = [[{} if form is None else _pack_coefficients(
+    coeffs = [[{} if form is None else _packed_coefficients(
         form) for form in forms] for forms in a] if coeffs is None else coeffs
 
-    V = _extract_function_spaces(a)
-    is_rows = _cpp.la.petsc.create_index_sets([(Vsub.dofmap.index_map, Vsub.dofmap.index_map_bs) for Vsub in V[0]])
-    is_cols = _cpp.la.petsc.create_index_sets([(Vsub.dofmap.index_map, Vsub.dofmap.index_map_bs) for Vsub in V[1]])
+    if layout is None:
+        layout = BlockLayout(a)
+    else:
+        layout.check(a)
+    is_rows, is_cols = layout.is_rows, layout.is_cols
 
     # Assemble form
     for i, a_row in enumerate(a):
         for j, a_sub in enumerate(a_row):
             if a_sub is not None:
                 Asub = A.getLocalSubMatrix(is_rows[i], is_cols[j])
-                _cpp.fem.petsc.assemble_matrix(Asub, a_sub, constants[i][j], coeffs[i][j], bcs, True)
+                _cpp.fem.petsc.assemble_matrix(Asub, a_sub, constants[i][j], coeffs[i][j], bcs, True, num_threads)
                 A.restoreLocalSubMatrix(is_rows[i], is_cols[j], Asub)
             elif i == j:
                 for bc in bcs:
@@ -476,9 +762,9 @@ def apply_lifting_nest(b: PETSc.Vec, a: typing.List[typing.List[form_types]],
     x0 = [] if x0 is None else x0.getNestSubVecs()
     bcs1 = _bcs_by_block(_extract_spaces(a, 1), bcs)
 
-    constants = [[form and _pack_constants(form) for form in forms]
+    constants = [[form and _packed_constants(form) for form in forms]
                  for forms in a] if constants is None else constants
-    coeffs = [[{} if form is None else _pack_coefficients(
+    coeffs = [[{} if form is None else _packed_coefficients(
         form) for form in forms] for forms in a] if coeffs is None else coeffs
     for b_sub, a_sub, const, coeff in zip(b.getNestSubVecs(), a, constants, coeffs):
         apply_lifting(b_sub, a_sub, bcs1, x0, scale, const, coeff)
@@ -502,6 +788,238 @@ def set_bc_nest(b: PETSc.Vec, bcs: typing.List[typing.List[DirichletBCMetaClass]
         set_bc(b_sub, bc, x_sub, scale)
 
 
+def assemble_system_rhs(L: form_types, a: form_types, bcs: typing.List[DirichletBCMetaClass] = [],
+                        x0: typing.Optional[PETSc.Vec] = None, scale: float = 1.0,
+                        b: typing.Optional[PETSc.Vec] = None) -> PETSc.Vec:
+    """Assemble a right-hand side vector with Dirichlet boundary conditions applied.
+
+    The returned vector is
+
+        b = L - scale * A (g - x0)
+
+    in the rows without a Dirichlet condition, and ``b = scale * (g -
+    x0)`` in the rows with a Dirichlet condition, where ``A`` is the
+    matrix of ``a`` and ``g`` holds the boundary values. This is the
+    same result as :func:`assemble_vector`, :func:`apply_lifting`, a
+    reverse ghost update and :func:`set_bc`, but the cell integrals of
+    ``L`` and ``a`` are executed in a single pass over the cells, and
+    the cached packed coefficients of ``L`` and ``a`` are used.
+
+    Args:
+        L: The linear form.
+        a: The bilinear form. It must have the same test space as ``L``.
+        bcs: Boundary conditions on the trial space of ``a``.
+        x0: Vector used in the lifting, e.g. the current solution in a
+            Newton method. If not provided, it is treated as zero.
+        scale: Scaling of the boundary condition contributions.
+        b: Vector to assemble into. It is zeroed before assembly. If
+            not provided, a new vector is created.
+
+    Returns:
+        The assembled vector, with ghost values accumulated on the
+        owning processes.
+
+    """
+    if b is None:
+        b = create_vector(L)
+    with contextlib.ExitStack() as stack:
+        b_local = stack.enter_context(b.localForm())
+        b_local.set(0.0)
+        x0_local = None if x0 is None else stack.enter_context(x0.localForm()).array_r
+        _cpp.fem.assemble_system_rhs(b_local.array_w, L, a, _packed_constants(L), _packed_coefficients(L),
+                                     _packed_constants(a), _packed_coefficients(a), bcs, x0_local, scale)
+    b.ghostUpdate(addv=PETSc.InsertMode.ADD, mode=PETSc.ScatterMode.REVERSE)
+    set_bc(b, bcs, x0, scale)
+    return b
+
+
+# -- Static condensation -----------------------------------------------------
+
+def assemble_condensed(a_blocks: typing.List[typing.List[form_types]],
+                       L_blocks: typing.List[form_types], local_space_index: int,
+                       bcs: typing.List[DirichletBCMetaClass] = [],
+                       diagonal: float = 1.0) -> typing.Tuple[PETSc.Mat, PETSc.Vec]:
+    """Assemble a 2x2 block system with the cell-local unknowns eliminated.
+
+    One of the two spaces must be cell-local, e.g. a discontinuous or a
+    bubble space, such that its unknowns can be eliminated cell-by-cell.
+    The cell-local unknowns are eliminated inside the assembly loop and
+    only the Schur complement on the other (global) space is assembled,
+    i.e. ``S = A_gg - A_gl inv(A_ll) A_lg`` and
+    ``r = b_g - A_gl inv(A_ll) b_l``.
+
+    The cell-local solution is recovered with
+    :func:`backsubstitute_condensed`.
+
+    Note:
+        Only cell integrals are supported in the blocks that involve the
+        cell-local space. Boundary conditions may only be applied to the
+        global space.
+
+    Args:
+        a_blocks: The 2x2 blocks of the bilinear form. The global block
+            ``a_blocks[g][g]`` may be ``None``.
+        L_blocks: The blocks of the linear form. Either entry may be
+            ``None``.
+        local_space_index: Block index (0 or 1) of the cell-local space.
+        bcs: Boundary conditions on the global space.
+        diagonal: Value set on the diagonal of constrained rows.
+
+    Returns:
+        The assembled Schur complement matrix and right-hand side
+        vector. Both are finalised and boundary conditions are applied.
+
+    """
+    g = 1 - local_space_index
+    a_gg, L_g = a_blocks[g][g], L_blocks[g]
+    V = a_blocks[local_space_index][g].function_spaces[1]
+    A = _cpp.fem.petsc.create_matrix_condensed(V, a_gg)
+    b = la.create_petsc_vector(V.dofmap.index_map, V.dofmap.index_map_bs)
+    with b.localForm() as b_local:
+        b_local.set(0.0)
+        _cpp.fem.petsc.assemble_condensed(A, b_local.array_w, a_blocks, L_blocks, local_space_index, bcs)
+        if L_g is not None:
+            assemble._assemble_vector_array(b_local.array_w, L_g)
+    if a_gg is not None:
+        _cpp.fem.petsc.assemble_matrix(A, a_gg, _packed_constants(a_gg), _packed_coefficients(a_gg), bcs)
+        apply_lifting(b, [a_gg], bcs=[bcs])
+
+    # Flush to enable switch from add to set in the matrix
+    A.assemble(PETSc.Mat.AssemblyType.FLUSH)
+    _cpp.fem.petsc.insert_diagonal(A, V, bcs, diagonal)
+    A.assemble()
+
+    b.ghostUpdate(addv=PETSc.InsertMode.ADD, mode=PETSc.ScatterMode.REVERSE)
+    set_bc(b, bcs)
+    return A, b
+
+
+def backsubstitute_condensed(a_blocks: typing.List[typing.List[form_types]],
+                             L_blocks: typing.List[form_types], local_space_index: int,
+                             u_global: _Function, u_local: _Function) -> _Function:
+    """Recover the cell-local unknowns of a system assembled with
+    :func:`assemble_condensed`.
+
+    Args:
+        a_blocks: The 2x2 blocks of the bilinear form.
+        L_blocks: The blocks of the linear form.
+        local_space_index: Block index (0 or 1) of the cell-local space.
+        u_global: Solution on the global space.
+        u_local: Function that the cell-local solution is written to.
+
+    Returns:
+        The cell-local solution ``u_local``.
+
+    """
+    u_global.x.scatter_forward()
+    _cpp.fem.backsubstitute_condensed(u_local.x.array, u_global.x.array, a_blocks, L_blocks,
+                                      local_space_index)
+    u_local.x.scatter_forward()
+    return u_local
+
+
+# -- Mixed-precision solvers -------------------------------------------------
+
+class RefinementInfo(typing.NamedTuple):
+    """Convergence information of a mixed-precision solve"""
+    iterations: int
+    inner_iterations: int
+    residual_norm: float
+    converged: bool
+    fallback: bool
+
+
+_mixed_precision_defaults = {"solver": "cg", "preconditioner": "jacobi", "rtol": 1.0e-4,
+                             "max_it": 200, "num_threads": 1}
+
+
+class _MixedPrecisionContext:
+    """Python context for a PETSc preconditioner that approximately
+    solves the correction equation with a single precision matrix and a
+    solver from :mod:`dolfinx.la`.
+
+    The coefficients and constants of the bilinear form are replaced by
+    single precision copies, which are updated before each assembly.
+    The residual is scaled by its norm before it is rounded to single
+    precision, to avoid underflow close to convergence."""
+
+    def __init__(self, a: ufl.Form, bcs: typing.List[DirichletBCMetaClass], options: dict,
+                 form_compiler_options: dict, jit_options: dict):
+        unknown = set(options) - set(_mixed_precision_defaults)
+        if unknown:
+            raise ValueError(f"Unknown mixed-precision option(s): {', '.join(sorted(unknown))}.")
+        options = {**_mixed_precision_defaults, **options}
+        solvers = {"cg": la.cg, "gmres": la.gmres, "bicgstab": la.bicgstab}
+        preconditioners = {"jacobi": la.jacobi, "block_jacobi": la.block_jacobi, "chebyshev": la.chebyshev,
+                           "none": None}
+        try:
+            self._solve = solvers[options["solver"]]
+            self._create_preconditioner = preconditioners[options["preconditioner"]]
+        except KeyError as e:
+            raise ValueError(f"Unknown mixed-precision solver or preconditioner {e}.")
+        self._rtol, self._max_it = options["rtol"], options["max_it"]
+        self._num_threads = options["num_threads"]
+
+        dtype = np.complex64 if np.issubdtype(PETSc.ScalarType, np.complexfloating) else np.float32
+        mesh = a.arguments()[0].ufl_function_space().mesh
+        self._coefficients = [(c, _Function(c.function_space, dtype=dtype)) for c in a.coefficients()]
+        self._constants = [(c, _Constant(mesh, c.value.astype(dtype))) for c in a.constants()]
+        a = ufl.replace(a, dict(self._coefficients + self._constants))
+        self._a = _create_form(a, dtype=dtype, form_compiler_options=dict(form_compiler_options),
+                               jit_options=jit_options)
+        self._A = assemble.create_matrix(self._a)
+        self._M = None
+
+        V = self._a.function_spaces[0]
+        index_map, bs = V.dofmap.index_map, V.dofmap.index_map_bs
+        self.size_local = index_map.size_local * bs
+        self._r = la.vector(index_map, bs, dtype=dtype)
+        self._e = la.vector(index_map, bs, dtype=dtype)
+
+        # Constrained degrees-of-freedom, as markers and owned indices
+        dofs = np.concatenate([bc.dof_indices()[0] for bc in bcs] + [np.zeros(0, dtype=np.int32)])
+        self._bc_markers = np.zeros(self._r.array.size, dtype=np.int8)
+        self._bc_markers[dofs] = 1
+        self._bc_dofs_owned = np.flatnonzero(self._bc_markers[:self.size_local]).astype(np.int32)
+
+        self.iterations = 0
+        self.failed = False
+
+    def assemble(self):
+        """Assemble the single precision matrix and preconditioner"""
+        for c, c32 in self._coefficients:
+            c32.x.array[:] = c.x.array
+        for c, c32 in self._constants:
+            c32.value = c.value
+
+        self._A.set(0)
+        _cpp.fem.assemble_matrix(self._A, self._a, _packed_constants(self._a), _packed_coefficients(self._a),
+                                 self._bc_markers, self._bc_markers, self._num_threads)
+        _cpp.fem.insert_diagonal(self._A, self._bc_dofs_owned, 1.0)
+        self._A.finalize()
+        if self._create_preconditioner is not None:
+            self._M = self._create_preconditioner(self._A)
+
+    def apply(self, pc: PETSc.PC, x: PETSc.Vec, y: PETSc.Vec):
+        """Compute y ~= A^{-1} x in single precision"""
+        scale = x.norm()
+        if scale == 0.0:
+            y.zeroEntries()
+            return
+
+        self._r.array[:self.size_local] = x.array_r / scale
+        self._e.array[:] = 0
+        info = self._solve(self._A, self._r, self._e, self._M, rtol=self._rtol, max_it=self._max_it,
+                           num_threads=self._num_threads)
+        self.iterations += info.iterations
+
+        e = self._e.array[:self.size_local]
+        if not np.isfinite(e).all():
+            self.failed = True
+            raise RuntimeError("Single precision solve did not return a finite correction.")
+        y.array[:] = scale * e
+
+
 class LinearProblem:
     """Class for solving a linear variational problem of the form :math:`a(u, v) = L(v) \\,  \\forall v \\in V`
     using PETSc as a linear algebra backend.
@@ -509,7 +1027,9 @@ class LinearProblem:
     """
 
     def __init__(self, a: ufl.Form, L: ufl.Form, bcs: typing.List[DirichletBCMetaClass] = [],
-                 u: typing.Optional[_Function] = None, petsc_options={}, form_compiler_options={}, jit_options={}):
+                 u: typing.Optional[_Function] = None, petsc_options={}, form_compiler_options={}, jit_options={},
+                 matrix_free: bool = False, assemble_A: str = "always",
+                 mixed_precision: typing.Union[bool, dict] = False):
         """Initialize solver for a linear variational problem.
 
         Args:
@@ -528,6 +1048,40 @@ class LinearProblem:
                 code generated by FFCx. See `python/dolfinx/jit.py` for
                 all available options. Takes priority over all other
                 option values.
+            matrix_free: Use a matrix-free operator (see
+                :func:`create_matrix_free`) instead of an assembled
+                matrix. Only preconditioners that do not require the
+                matrix entries, e.g. ``jacobi``, can be used.
+            assemble_A: When :meth:`solve` assembles the matrix.
+                ``"always"`` assembles on every call, ``"once"`` on the
+                first call only, and ``"on_change"`` when a
+                coefficient or constant in ``a``, or the mesh geometry,
+                has been modified since the last assembly. Writes
+                through retained coefficient or geometry arrays must be
+                followed by ``x.increase_state()`` or
+                ``mesh.geometry.increase_state()`` to be detected. If
+                the matrix is not re-assembled the PETSc
+                preconditioner, e.g. an LU factorisation, is re-used.
+            mixed_precision: Solve with mixed-precision iterative
+                refinement. ``True``, or a dict of options for the
+                single precision solver (see below). The matrix is
+                assembled in single precision and only used by the
+                preconditioner, which approximately solves for a
+                correction with a solver from :mod:`dolfinx.la`. The
+                residual is computed in double precision with a
+                matrix-free operator (see :func:`create_matrix_free`).
+                By default the outer iteration is PETSc ``richardson``
+                with a relative tolerance of ``1e-10``, which can be
+                changed with ``petsc_options``. If the outer iteration
+                does not converge, the system is solved again with a
+                double precision matrix and a PETSc solver that can be
+                configured with options prefixed by ``fallback_``, e.g.
+                ``fallback_ksp_type``. See :attr:`refinement_info` for
+                convergence statistics. The options are ``solver``
+                (``"cg"``, ``"gmres"`` or ``"bicgstab"``),
+                ``preconditioner`` (``"jacobi"``, ``"block_jacobi"``,
+                ``"chebyshev"`` or ``"none"``), ``rtol`` and ``max_it``
+                of the single precision solver, and ``num_threads``.
 
         Example::
 
@@ -536,8 +1090,23 @@ class LinearProblem:
                                                    "pc_type": "lu",
                                                    "pc_factor_mat_solver_type": "mumps"})
         """
+        if assemble_A not in ("always", "once", "on_change"):
+            raise ValueError(f"Unknown matrix assembly policy '{assemble_A}'.")
         self._a = _create_form(a, form_compiler_options=form_compiler_options, jit_options=jit_options)
-        self._A = create_matrix(self._a)
+        self._matrix_free = matrix_free
+        self._assemble_A = assemble_A
+        self._A_state: typing.Optional[tuple] = None
+        self._mixed_precision: typing.Optional[_MixedPrecisionContext] = None
+        self._fallback: typing.Optional[typing.Tuple[PETSc.KSP, PETSc.Mat]] = None
+        self._refinement_info: typing.Optional[RefinementInfo] = None
+        if mixed_precision is not False:
+            options = {} if mixed_precision is True else mixed_precision
+            self._mixed_precision = _MixedPrecisionContext(a, bcs, options, form_compiler_options, jit_options)
+        if matrix_free or self._mixed_precision is not None:
+            self._A = create_matrix_free(a, bcs, form_compiler_options=form_compiler_options,
+                                         jit_options=jit_options)
+        else:
+            self._A = create_matrix(self._a)
 
         self._L = _create_form(L, form_compiler_options=form_compiler_options, jit_options=jit_options)
         self._b = create_vector(self._L)
@@ -560,6 +1129,16 @@ class LinearProblem:
         problem_prefix = f"dolfinx_solve_{id(self)}"
         self._solver.setOptionsPrefix(problem_prefix)
 
+        # Iterative refinement with a single precision preconditioner,
+        # unless changed by the PETSc options
+        if self._mixed_precision is not None:
+            self._solver.setType(PETSc.KSP.Type.RICHARDSON)
+            self._solver.setNormType(PETSc.KSP.NormType.UNPRECONDITIONED)
+            self._solver.setTolerances(rtol=1.0e-10, max_it=50)
+            pc = self._solver.getPC()
+            pc.setType(PETSc.PC.Type.PYTHON)
+            pc.setPythonContext(self._mixed_precision)
+
         # Set PETSc options
         opts = PETSc.Options()
         opts.prefixPush(problem_prefix)
@@ -575,35 +1154,96 @@ class LinearProblem:
         self._b.setFromOptions()
 
     def __del__(self):
+        if self._fallback is not None:
+            for obj in self._fallback:
+                obj.destroy()
         self._solver.destroy()
         self._A.destroy()
         self._b.destroy()
         self._x.destroy()
 
+    def _operator_state(self) -> tuple:
+        """State of the data that the matrix depends on. A coefficient
+        whose PETSc vector has been accessed has no state, since changes
+        made through PETSc cannot be tracked."""
+        coefficients = tuple(None if getattr(c, "_petsc_x", None) is not None else c.x.state
+                             for c in self._a._coefficients)
+        constants = _pack_constants(self._a)
+        return (self._a.mesh.geometry.state, coefficients, constants.tobytes(), tuple(map(id, self.bcs)))
+
+    def _operator_changed(self) -> bool:
+        """Update the operator state and return `True` if the matrix
+        must be assembled."""
+        if self._assemble_A == "always":
+            return True
+        elif self._assemble_A == "once":
+            changed = self._A_state is None
+            self._A_state = ()
+            return changed
+        state = self._operator_state()
+        changed = self._A_state is None or None in state[1] or state != self._A_state
+        self._A_state = state
+        return changed
+
     def solve(self) -> _Function:
         """Solve the problem."""
 
         # Assemble lhs
-        self._A.zeroEntries()
-        _assemble_matrix_mat(self._A, self._a, bcs=self.bcs)
-        self._A.assemble()
-
-        # Assemble rhs
-        with self._b.localForm() as b_loc:
-            b_loc.set(0)
-        assemble_vector(self._b, self._L)
+        if self._mixed_precision is not None:
+            if self._operator_changed():
+                self._mixed_precision.assemble()
+        elif not self._matrix_free and self._operator_changed():
+            self._A.zeroEntries()
+            _assemble_matrix_mat(self._A, self._a, bcs=self.bcs)
+            self._A.assemble()
 
-        # Apply boundary conditions to the rhs
-        apply_lifting(self._b, [self._a], bcs=[self.bcs])
-        self._b.ghostUpdate(addv=PETSc.InsertMode.ADD, mode=PETSc.ScatterMode.REVERSE)
-        set_bc(self._b, self.bcs)
+        # Assemble rhs and apply boundary conditions
+        assemble_system_rhs(self._L, self._a, self.bcs, b=self._b)
 
         # Solve linear system and update ghost values in the solution
-        self._solver.solve(self._b, self._x)
+        if self._mixed_precision is not None:
+            self._solve_mixed_precision()
+        else:
+            self._solver.solve(self._b, self._x)
+
+        # The solve writes to u through the wrapped PETSc vector
+        self.u.x.increase_state()
         self.u.x.scatter_forward()
 
         return self.u
 
+    def _solve_mixed_precision(self):
+        """Solve with iterative refinement, and in double precision if
+        the refinement does not converge."""
+        ctx = self._mixed_precision
+        ctx.iterations, ctx.failed = 0, False
+        try:
+            self._solver.solve(self._b, self._x)
+        except (PETSc.Error, RuntimeError):
+            # Raised by the preconditioner for a non-finite correction
+            ctx.failed = True
+        solver = self._solver
+        converged = not ctx.failed and self._solver.getConvergedReason() > 0
+        if not converged:
+            if self._fallback is None:
+                A = create_matrix(self._a)
+                ksp = PETSc.KSP().create(self.u.function_space.mesh.comm)
+                ksp.setOperators(A)
+                ksp.setOptionsPrefix(f"{self._solver.getOptionsPrefix()}fallback_")
+                ksp.setFromOptions()
+                self._fallback = (ksp, A)
+            solver, A = self._fallback
+            A.zeroEntries()
+            _assemble_matrix_mat(A, self._a, bcs=self.bcs)
+            A.assemble()
+            rtol, atol, divtol, _ = self._solver.getTolerances()
+            solver.setTolerances(rtol=rtol, atol=atol, divtol=divtol)
+            solver.solve(self._b, self._x)
+            converged = solver.getConvergedReason() > 0
+
+        self._refinement_info = RefinementInfo(self._solver.getIterationNumber(), ctx.iterations,
+                                               solver.getResidualNorm(), converged, solver is not self._solver)
+
     @property
     def L(self) -> FormMetaClass:
         """The compiled linear form"""
@@ -629,6 +1269,13 @@ class LinearProblem:
         """Linear solver object"""
         return self._solver
 
+    @property
+    def refinement_info(self) -> typing.Optional[RefinementInfo]:
+        """Convergence information of the last mixed-precision solve, or
+        ``None``. The residual norm is that of the double precision
+        solver if the fallback was used."""
+        return self._refinement_info
+
 
 class NonlinearProblem:
     """Nonlinear problem class for solving the non-linear problem
@@ -638,7 +1285,8 @@ class NonlinearProblem:
     """
 
     def __init__(self, F: ufl.form.Form, u: _Function, bcs: typing.List[DirichletBCMetaClass] = [],
-                 J: ufl.form.Form = None, form_compiler_options={}, jit_options={}):
+                 J: ufl.form.Form = None, form_compiler_options={}, jit_options={},
+                 matrix_free: bool = False):
         """Initialize solver for solving a non-linear problem using Newton's method, :math:`dF/du(u) du = -F(u)`.
 
         Args:
@@ -653,6 +1301,9 @@ class NonlinearProblem:
                 code generated by FFCx. See ``python/dolfinx/jit.py``
                 for all available options. Takes priority over all
                 other option values.
+            matrix_free: Use a matrix-free Jacobian operator (see
+                :func:`create_matrix_free`) instead of an assembled
+                matrix.
 
         Example::
 
@@ -671,6 +1322,10 @@ class NonlinearProblem:
         self._a = _create_form(J, form_compiler_options=form_compiler_options,
                                jit_options=jit_options)
         self.bcs = bcs
+        self._u = u
+        self._J = J
+        self._matrix_free = matrix_free
+        self._options = (form_compiler_options, jit_options)
 
     @property
     def L(self) -> FormMetaClass:
@@ -682,6 +1337,15 @@ class NonlinearProblem:
         """Compiled bilinear form (the Jacobian form)"""
         return self._a
 
+    def create_matrix(self) -> PETSc.Mat:
+        """Create a matrix for the Jacobian, or a matrix-free operator if
+        the problem is matrix-free"""
+        if self._matrix_free:
+            return create_matrix_free(self._J, self.bcs, form_compiler_options=self._options[0],
+                                      jit_options=self._options[1])
+        else:
+            return create_matrix(self._a)
+
     def form(self, x: PETSc.Vec):
         """This function is called before the residual or Jacobian is
         computed. This is usually used to update ghost values.
@@ -692,6 +1356,9 @@ class NonlinearProblem:
         """
         x.ghostUpdate(addv=PETSc.InsertMode.INSERT, mode=PETSc.ScatterMode.FORWARD)
 
+        # The Newton update writes to u through its PETSc vector
+        self._u.x.increase_state()
+
     def F(self, x: PETSc.Vec, b: PETSc.Vec):
         """Assemble the residual F into the vector b.
 
@@ -700,15 +1367,8 @@ class NonlinearProblem:
             b: Vector to assemble the residual into
 
         """
-        # Reset the residual vector
-        with b.localForm() as b_local:
-            b_local.set(0.0)
-        assemble_vector(b, self._L)
-
-        # Apply boundary condition
-        apply_lifting(b, [self._a], bcs=[self.bcs], x0=[x], scale=-1.0)
-        b.ghostUpdate(addv=PETSc.InsertMode.ADD, mode=PETSc.ScatterMode.REVERSE)
-        set_bc(b, self.bcs, x, -1.0)
+        # Assemble the residual and apply boundary conditions
+        assemble_system_rhs(self._L, self._a, self.bcs, x0=x, scale=-1.0, b=b)
 
     def J(self, x: PETSc.Vec, A: PETSc.Mat):
         """Assemble the Jacobian matrix.
@@ -717,6 +1377,9 @@ class NonlinearProblem:
             x: The vector containing the latest solution
 
         """
+        if A.getType() == PETSc.Mat.Type.PYTHON:
+            # Matrix-free operators use the latest solution in products
+            return
         A.zeroEntries()
         _assemble_matrix_mat(A, self._a, self.bcs)
         A.assemble()
@@ -0,0 +1,161 @@
+# Copyright (C) 2023 The FEniCS Project
+#
+# This file is part of DOLFINx (https://www.fenicsproject.org)
+#
+# SPDX-License-Identifier:    LGPL-3.0-or-later
+"""Profiling of assembly by integral.
+
+When profiling is enabled, the assemblers record for each form,
+integral type and integral (subdomain) id the number of entities
+assembled and the time spent in the kernels, in insertion into matrices
+and in packing, i.e. the rest of the loop over entities (gathering
+geometry data, applying dof transformations and boundary conditions,
+and adding to vectors). Forms are identified by their ``name``, which
+defaults to a prefix of the UFL form signature and can be changed, e.g.
+``a.name = "stiffness"``. For forms that are created while profiling is
+enabled, the number of floating point operations of each kernel is
+estimated with FFCx, if supported by the installed version. Timing
+adds overhead to each kernel call, so profiling is disabled by
+default::
+
+    profiling.enable()
+    A = assemble_matrix(a)
+    b = assemble_vector(L)
+    profiling.list_profiles(comm)
+    rows = profiling.table(comm)
+
+"""
+
+from __future__ import annotations
+
+import collections
+import typing
+
+import numpy as np
+
+import ufl
+from dolfinx import cpp as _cpp
+from dolfinx.common import Reduction
+from dolfinx.cpp.fem import IntegralType
+
+__all__ = ["IntegralProfile", "enable", "disable", "enabled", "reset", "table", "list_profiles"]
+
+
+class IntegralProfile(typing.NamedTuple):
+    """Assembly data for one integral of a form. Times are in seconds."""
+    form: str
+    integral_type: IntegralType
+    id: int
+    num_entities: float
+    kernel: float
+    packing: float
+    insertion: float
+    flops: float
+
+
+def enable():
+    """Enable profiling of assembly."""
+    _cpp.fem.profiling.enable(True)
+
+
+def disable():
+    """Disable profiling of assembly."""
+    _cpp.fem.profiling.enable(False)
+
+
+def enabled() -> bool:
+    """Return ``True`` if profiling of assembly is enabled."""
+    return _cpp.fem.profiling.enabled()
+
+
+def reset():
+    """Remove the recorded data. FLOP estimates are kept."""
+    _cpp.fem.profiling.reset()
+
+
+def table(comm, reduction=Reduction.max) -> typing.List[IntegralProfile]:
+    """Return the recorded data, reduced across processes.
+
+    Args:
+        comm: MPI communicator.
+        reduction: Reduction that is applied to each value (as in
+            :func:`dolfinx.common.list_timings`).
+
+    Returns:
+        Data for each integral that has been assembled on any process,
+        sorted by form name, integral type and id. The FLOP count is
+        zero if no estimate is available.
+
+    """
+    local = {}
+    for (form, integral_type, i), (n, calls, kernel, packing, insertion, flops) in \
+            _cpp.fem.profiling.profiles().items():
+        if n > 0:
+            local[(form, int(integral_type), i)] = np.array([n, kernel, packing, insertion, flops * calls])
+
+    reduced: typing.Dict[typing.Tuple[str, int, int], np.ndarray] = {}
+    for data in comm.allgather(local):
+        for key, values in data.items():
+            if key not in reduced:
+                reduced[key] = values
+            elif reduction == Reduction.max:
+                reduced[key] = np.maximum(reduced[key], values)
+            elif reduction == Reduction.min:
+                reduced[key] = np.minimum(reduced[key], values)
+            else:
+                reduced[key] = reduced[key] + values
+    if reduction == Reduction.average:
+        reduced = {key: values / comm.size for key, values in reduced.items()}
+
+    return [IntegralProfile(form, IntegralType(integral_type), i, *values)
+            for (form, integral_type, i), values in sorted(reduced.items())]
+
+
+def list_profiles(comm, reduction=Reduction.max):
+    """Print a table of the recorded data on rank zero, reduced across
+    processes (see :func:`table`)."""
+    _cpp.fem.profiling.list_profiles(comm, reduction)
+
+
+_ufl_integral_types = {"cell": IntegralType.cell, "exterior_facet": IntegralType.exterior_facet,
+                       "interior_facet": IntegralType.interior_facet, "vertex": IntegralType.vertex}
+
+
+def _count_flops(form: ufl.Form, form_compiler_options: dict) -> typing.Dict[typing.Tuple[IntegralType, int], float]:
+    """Estimate with FFCx the number of floating point operations of
+    each kernel of a form. Returns an empty dictionary if the installed
+    FFCx does not support estimates."""
+    try:
+        from ffcx.codegeneration.flop_count import count_flops
+    except ImportError:
+        return {}
+
+    # Integrals by type and subdomain id. Integrals over the whole
+    # domain are also part of the kernel of each subdomain.
+    integrals: typing.Dict[str, typing.Dict[int, list]] = collections.defaultdict(
+        lambda: collections.defaultdict(list))
+    for integral in form.integrals():
+        subdomain_id = integral.subdomain_id()
+        if subdomain_id in ("everywhere", "otherwise"):
+            ids: typing.Iterable[int] = (-1,)
+        elif isinstance(subdomain_id, tuple):
+            ids = subdomain_id
+        else:
+            ids = (subdomain_id,)
+        for i in ids:
+            integrals[integral.integral_type()][i].append(integral)
+
+    flops = {}
+    for integral_type, by_id in integrals.items():
+        for i, group in by_id.items():
+            if i >= 0:
+                group = group + by_id.get(-1, [])
+            flops[(_ufl_integral_types[integral_type], i)] = sum(count_flops(ufl.Form(group), form_compiler_options))
+    return flops
+
+
+def _set_flops(name: str, flops: typing.Dict[typing.Tuple[IntegralType, int], float]):
+    """Register estimates of the number of floating point operations of
+    each kernel of the form with the given name."""
+    for (integral_type, i), n in flops.items():
+        _cpp.fem.profiling.set_flops(name, integral_type, i, n)
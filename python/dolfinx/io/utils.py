@@ -6,6 +6,8 @@
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 """IO module for input data and post-processing file output"""
 
+from __future__ import annotations
+
 import typing
 
 import numpy as np
@@ -17,11 +19,13 @@ import ufl
 from dolfinx import cpp as _cpp
 from dolfinx.cpp.io import perm_gmsh as cell_perm_gmsh  # noqa F401
 from dolfinx.cpp.io import perm_vtk as cell_perm_vtk  # noqa F401
-from dolfinx.fem import Function
 from dolfinx.mesh import GhostMode, Mesh, MeshTags
 
 from mpi4py import MPI as _MPI
 
+if typing.TYPE_CHECKING:
+    from dolfinx.fem import Function
+
 __all__ = ["VTKFile", "XDMFFile", "cell_perm_gmsh", "cell_perm_vtk",
            "distribute_entity_data"]
 
@@ -5,19 +5,38 @@
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 """Just-in-time (JIT) compilation using FFCx"""
 
+import collections
+import concurrent.futures
+import contextlib
 import functools
+import importlib.util
+import io
 import json
+import logging
+import multiprocessing
 import os
+import re
+import socket
+import sys
+import threading
+import time
+import types
 from pathlib import Path
-from typing import Optional
+from typing import Any, NamedTuple, Optional
 
+import cffi
+import cffi.ffiplatform
 import ffcx
 import ffcx.codegeneration.jit
+import ffcx.naming
 import ufl
 
+from dolfinx import common, log
+
 from mpi4py import MPI
 
-__all__ = ["ffcx_jit", "get_options"]
+__all__ = ["ffcx_jit", "get_options", "precompile", "registry", "cache_info", "cache_stats",
+           "cache_prune", "cache_clear", "timing_report", "timing_report_clear"]
 
 DOLFINX_DEFAULT_JIT_OPTIONS = {
     "cache_dir":
@@ -33,9 +52,29 @@ DOLFINX_DEFAULT_JIT_OPTIONS = {
     "cffi_libraries":
         (None, "Extra libraries to link"),
     "timeout":
-        (10, "Timeout for JIT compilation")
+        (10, "Timeout for JIT compilation"),
+    "mpi_strategy":
+        ("root", "Parallel compilation strategy. 'root': compile on rank 0 and wait on all ranks. "
+         "'cache': all ranks look in the cache first and one process per cache directory compiles on a miss."),
+    "compile_workers":
+        (0, "Maximum number of C compiler processes used to compile lists of forms and expressions "
+         "concurrently, see precompile. Use 0 for os.cpu_count() and 1 to compile one object at a time."),
+    "aot_dir":
+        (os.getenv("DOLFINX_AOT_DIR"),
+         "Directory with ahead-of-time compiled objects, see dolfinx.aot. "
+         "Default can be set using DOLFINX_AOT_DIR environment variable."),
+    "cache_size_limit":
+        (0, "Maximum size (MB) of the compiled modules in the JIT cache. Least recently used modules "
+         "are evicted when the limit is exceeded. Use 0 for no limit.")
 }
 
+# Options that are used by DOLFINx and are not passed on to FFCx
+_DOLFINX_ONLY_OPTIONS = ("mpi_strategy", "compile_workers", "aot_dir", "cache_size_limit")
+
+# Recorder used by dolfinx.aot. When not None, objects are compiled into
+# the recorder directory and their module and names are recorded.
+_aot_recorder: Optional[dict] = None
+
 
 def mpi_jit_decorator(local_jit, *args, **kwargs):
     """A decorator for jit compilation.
@@ -46,6 +85,13 @@ def mpi_jit_decorator(local_jit, *args, **kwargs):
     in the cache, it will call the jit compiler on the remaining
     processes, which will then use the cached module.
 
+    If the JIT option ``mpi_strategy`` is ``"cache"`` and the first
+    argument is a UFL object, all processes instead look in the cache
+    first. Only on a cache miss does one process per (physical) cache
+    directory compile, with the other processes waiting for the
+    compiled module to appear. No collective communication is
+    performed in this mode.
+
     """
 
     @functools.wraps(local_jit)
@@ -55,6 +101,15 @@ def mpi_jit_decorator(local_jit, *args, **kwargs):
         if comm.size == 1:
             return local_jit(*args, **kwargs)
 
+        # Look in the cache on all processes, and compile on one process
+        # per cache directory on a miss
+        p_jit = get_options(kwargs.get("jit_options"))
+        if p_jit["mpi_strategy"] == "cache" and len(args) > 0 and _is_ufl_object(args[0]):
+            key = _signature(args[0], kwargs.get("form_compiler_options", {}), p_jit)
+            return _cache_first_jit(local_jit, key, p_jit["cache_dir"], *args, **kwargs)
+        elif p_jit["mpi_strategy"] not in ("root", "cache"):
+            raise ValueError(f"Unknown JIT mpi_strategy: {p_jit['mpi_strategy']}")
+
         # Default status (0 == ok, 1 == fail)
         status = 0
 
@@ -67,12 +122,8 @@ def mpi_jit_decorator(local_jit, *args, **kwargs):
                 status = 1
                 error_msg = str(e)
 
-        # TODO: This would have lower overhead if using the dijitso.jit
-        # features to inject a waiting callback instead of waiting out
-        # here. That approach allows all processes to first look in the
-        # cache, introducing a barrier only on cache miss. There's also
-        # a sketch in dijitso of how to make only one process per
-        # physical cache directory do the compilation.
+        # NOTE: See the 'cache' mpi_strategy for a mode that avoids the
+        # collective wait below
 
         # Wait for the compiling process to finish and get status
         # TODO: Would be better to broadcast the status from root but
@@ -96,6 +147,837 @@ def mpi_jit_decorator(local_jit, *args, **kwargs):
     return mpi_jit
 
 
+def _is_ufl_object(ufl_object) -> bool:
+    """Check if an object can be compiled by :func:`ffcx_jit`."""
+    return isinstance(ufl_object, (ufl.Form, ufl.FiniteElementBase, ufl.Mesh)) or (
+        isinstance(ufl_object, tuple) and isinstance(ufl_object[0], ufl.core.expr.Expr))
+
+
+def _signature(ufl_object, form_compiler_options: dict, jit_options: dict) -> str:
+    """Compute a signature for a UFL object that identifies the compiled
+    module for the given compiler options."""
+    p_ffcx = ffcx.get_options(form_compiler_options)
+    tag = str(sorted(p_ffcx.items())) + str(jit_options["cffi_extra_compile_args"]) + str(jit_options["cffi_debug"])
+    return ffcx.naming.compute_signature([ufl_object], tag)
+
+
+class _FileLock:
+    """Exclusive lock held by creating a file in a (possibly shared)
+    directory.
+
+    The lock file records the host name and process id of the holder,
+    and the holder refreshes the modification time of the file while
+    it holds the lock. A lock is stale if its holder ran on this host
+    and no longer exists, or if the lock file has not been refreshed
+    for ``stale_after`` seconds (e.g. the holder ran on another host
+    and was killed). Stale locks are removed by processes waiting for
+    the lock.
+
+    """
+
+    def __init__(self, path: Path, heartbeat: float = 2.0, stale_after: float = 30.0):
+        self._path = Path(path)
+        self._heartbeat = heartbeat
+        self._stale_after = stale_after
+        self._stop: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def acquire(self) -> bool:
+        """Try to acquire the lock without waiting. A stale lock is
+        removed first. Returns ``True`` if the lock was acquired."""
+        self.remove_if_stale()
+        try:
+            fd = os.open(self._path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w") as f:
+            f.write(f"{socket.gethostname()} {os.getpid()}")
+
+        # Refresh the modification time while the lock is held
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._refresh, args=(self._stop, ), daemon=True)
+        self._thread.start()
+        return True
+
+    def release(self) -> None:
+        """Release the lock."""
+        if self._stop is not None:
+            self._stop.set()
+            self._thread.join()
+            self._stop, self._thread = None, None
+        self._path.unlink(missing_ok=True)
+
+    def locked(self) -> bool:
+        """Return ``True`` if the lock is held by any process."""
+        return self._path.exists()
+
+    def stale(self) -> bool:
+        """Return ``True`` if the lock is held by a process that no
+        longer holds it."""
+        try:
+            mtime = self._path.stat().st_mtime
+            holder = self._path.read_text().split()
+        except FileNotFoundError:
+            return False
+        if len(holder) == 2 and holder[0] == socket.gethostname():
+            try:
+                os.kill(int(holder[1]), 0)
+            except ProcessLookupError:
+                return True
+            except (PermissionError, ValueError):
+                pass
+            else:
+                return False
+        return time.time() - mtime > self._stale_after
+
+    def remove_if_stale(self) -> None:
+        """Remove the lock file if the lock is stale."""
+        if self.stale():
+            # Rename before removing, such that a lock that is
+            # acquired by another process in the meantime is not
+            # removed
+            tmp = self._path.with_name(f"{self._path.name}.{socket.gethostname()}.{os.getpid()}.stale")
+            try:
+                os.replace(self._path, tmp)
+                tmp.unlink()
+            except FileNotFoundError:
+                pass
+
+    def wait(self, poll: float = 0.05) -> None:
+        """Wait until the lock is released or becomes stale."""
+        while self.locked() and not self.stale():
+            time.sleep(poll)
+
+    def __enter__(self):
+        self._path.parent.mkdir(exist_ok=True, parents=True)
+        while not self.acquire():
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+    def _refresh(self, stop: threading.Event) -> None:
+        while not stop.wait(self._heartbeat):
+            try:
+                os.utime(self._path)
+            except FileNotFoundError:
+                return
+
+
+def _cache_first_jit(local_jit, key: str, cache_dir: Path, *args, **kwargs):
+    """Call the JIT compiler, compiling on only one process per cache
+    directory.
+
+    A process that finds the ready marker for ``key`` in the cache
+    directory calls ``local_jit`` directly (reading the cache). On a
+    miss, the process that acquires the lock compiles while the other
+    processes wait for the lock to be released, after which they read
+    the ready (or failed) marker. Failure is therefore reported on all
+    processes without requiring communication. If the compiling
+    process is killed, its lock becomes stale and a waiting process
+    takes over the compilation.
+
+    """
+    cache_dir = Path(cache_dir)
+    ready = cache_dir.joinpath(f"dolfinx_{key}.ready")
+    if ready.exists():
+        return local_jit(*args, **kwargs)
+
+    cache_dir.mkdir(exist_ok=True, parents=True)
+    lock = _FileLock(cache_dir.joinpath(f"dolfinx_{key}.lock"))
+    failed = cache_dir.joinpath(f"dolfinx_{key}.failed")
+    start = time.time()
+    while True:
+        if lock.acquire():
+            # This process holds the lock and compiles
+            try:
+                failed.unlink(missing_ok=True)
+                output = local_jit(*args, **kwargs)
+            except Exception as e:
+                failed.write_text(str(e))
+                raise RuntimeError(f"Failed just-in-time compilation of form: {e}")
+            else:
+                ready.touch()
+                return output
+            finally:
+                lock.release()
+
+        # Another process is compiling. Wait for it to finish, or for
+        # its lock to become stale, in which case this process tries to
+        # take over.
+        lock.wait()
+        if ready.exists():
+            return local_jit(*args, **kwargs)
+        elif failed.exists() and failed.stat().st_mtime >= start:
+            raise RuntimeError(f"Failed just-in-time compilation of form: {failed.read_text()}")
+
+
+class RegistryInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class Registry:
+    """In-memory registry of compiled objects.
+
+    Maps the signature of a UFL object (which includes the scalar type
+    and compiler options) to the loaded compiled object and module.
+    Creating a structurally identical form, element or expression a
+    second time then avoids inspecting the disk cache and re-importing
+    the compiled module. The least recently used entries are evicted
+    when the registry holds more than ``maxsize`` entries.
+
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self._entries: collections.OrderedDict[str, Any] = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self.maxsize = maxsize
+
+    @property
+    def maxsize(self) -> int:
+        """Maximum number of entries. Zero disables the registry."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int):
+        self._maxsize = maxsize
+        while len(self._entries) > max(maxsize, 0):
+            self._entries.popitem(last=False)
+
+    def lookup(self, key: str) -> Optional[Any]:
+        """Return the entry for ``key``, or ``None`` if not present."""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def insert(self, key: str, value: Any) -> None:
+        """Insert an entry, evicting the least recently used entries if
+        the registry is full."""
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def cache_info(self) -> RegistryInfo:
+        """Hit and miss statistics, in the style of :func:`functools.lru_cache`."""
+        return RegistryInfo(self._hits, self._misses, self.maxsize, len(self._entries))
+
+    def cache_clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+
+
+# Registry of compiled objects used by ffcx_jit. Set registry.maxsize =
+# 0 to disable.
+registry = Registry()
+
+
+def _ffcx_compile(ufl_object, p_ffcx: dict, p_jit: dict):
+    """Compile a UFL object with the FFCx JIT compiler. ``p_jit`` holds
+    the options that are passed on to FFCx."""
+    if isinstance(ufl_object, ufl.Form):
+        return ffcx.codegeneration.jit.compile_forms([ufl_object], options=p_ffcx, **p_jit)
+    elif isinstance(ufl_object, ufl.FiniteElementBase):
+        return ffcx.codegeneration.jit.compile_elements([ufl_object], options=p_ffcx, **p_jit)
+    elif isinstance(ufl_object, ufl.Mesh):
+        return ffcx.codegeneration.jit.compile_coordinate_maps([ufl_object], options=p_ffcx, **p_jit)
+    elif isinstance(ufl_object, tuple) and isinstance(ufl_object[0], ufl.core.expr.Expr):
+        return ffcx.codegeneration.jit.compile_expressions([ufl_object], options=p_ffcx, **p_jit)
+    else:
+        raise TypeError(type(ufl_object))
+
+
+@contextlib.contextmanager
+def _deferred_c_compilation(jobs: list):
+    """Let FFCx generate the C source of the modules it compiles, but
+    append the C compilation of each module to ``jobs`` instead of
+    running it.
+
+    FFCx claims the module in the cache as usual. The ready marker is
+    written (or the source is marked as failed) once the job has run.
+
+    """
+    module = ffcx.codegeneration.jit
+    compile_objects, load_objects = module._compile_objects, module._load_objects
+
+    def generate_objects(decl, ufl_objects, object_names, module_name, options, cache_dir,
+                         cffi_extra_compile_args, cffi_verbose, cffi_debug, cffi_libraries):
+        import ffcx.compiler
+        _, code_body = ffcx.compiler.compile_ufl_objects(ufl_objects, prefix=module_name, options=options)
+        kwargs = {"include_dirs": [ffcx.codegeneration.get_include_path()],
+                  "extra_compile_args": cffi_extra_compile_args, "libraries": cffi_libraries}
+        ffibuilder = cffi.FFI()
+        ffibuilder.set_source(module_name, code_body, **kwargs)
+        ffibuilder.cdef(decl)
+        with contextlib.redirect_stdout(io.StringIO()):
+            ffibuilder.emit_c_code(str(Path(cache_dir, module_name + ".c")))
+        extension = cffi.ffiplatform.get_extension(module_name + ".c", module_name, **kwargs)
+        jobs.append((module_name, extension, cffi_debug))
+        return code_body
+
+    module._compile_objects = generate_objects
+    module._load_objects = lambda cache_dir, module_name, names: ([None] * len(names), None)
+    try:
+        yield
+    finally:
+        module._compile_objects, module._load_objects = compile_objects, load_objects
+
+
+@contextlib.contextmanager
+def _hidden_main_module():
+    """Hide the ``__main__`` module from processes started with the
+    ``spawn`` method, which would otherwise execute the main script of
+    this process on start-up."""
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+def _compile_c(cache_dir: Path, jobs: list, workers: int) -> list:
+    """Run the C compilation ``jobs`` recorded by
+    :func:`_deferred_c_compilation` on a pool of ``workers`` processes.
+    Returns the names of the modules that were compiled."""
+    compiled = []
+    if len(jobs) == 0:
+        return compiled
+
+    # The worker processes only run the C compiler through CFFI, and do
+    # not import DOLFINx or initialise MPI
+    context = multiprocessing.get_context("spawn")
+    with _hidden_main_module(), concurrent.futures.ProcessPoolExecutor(
+            min(workers, len(jobs)), mp_context=context, initializer=os.chdir, initargs=(str(cache_dir), )) as pool:
+        futures = [(module_name, pool.submit(cffi.ffiplatform.compile, ".", extension, 0, debug))
+                   for module_name, extension, debug in jobs]
+        for module_name, future in futures:
+            c_filename = cache_dir.joinpath(module_name + ".c")
+            try:
+                future.result()
+                open(c_filename.with_suffix(".c.cached"), "x").close()
+                compiled.append(module_name)
+            except Exception:
+                # FFCx compiles the module again (and reports the error)
+                # when it is next requested
+                with contextlib.suppress(OSError):
+                    os.replace(c_filename, c_filename.with_suffix(".c.failed"))
+    return compiled
+
+
+def precompile(comm, ufl_objects, form_compiler_options: dict = {}, jit_options: dict = {}) -> None:
+    """Compile UFL objects into the JIT cache concurrently.
+
+    FFCx generates the C code of the objects that are not already in
+    the :data:`registry` or in the JIT cache in this process. The
+    generated modules are then compiled concurrently by a pool of up to
+    ``compile_workers`` (see :data:`DOLFINX_DEFAULT_JIT_OPTIONS`) C
+    compiler processes, and loaded into the :data:`registry`.
+    Subsequent calls to :func:`ffcx_jit` for these objects return the
+    compiled objects without compiling. Compilation errors are not
+    raised by this function, but by the subsequent call to
+    :func:`ffcx_jit`.
+
+    The compiler processes are started with the ``spawn`` method, since
+    forking an MPI process is unsafe with most MPI implementations.
+
+    In parallel, the objects are in addition distributed over the
+    processes of ``comm`` that run on the same node as rank 0, and
+    therefore share its cache directory. The compiler processes are
+    divided between these processes, and all processes then wait on a
+    barrier.
+
+    This function is collective.
+
+    Args:
+        comm: MPI communicator.
+        ufl_objects: Objects to compile, e.g. a list of ``ufl.Form``.
+        form_compiler_options: See :func:`ffcx_jit`.
+        jit_options: See :func:`ffcx_jit`.
+
+    """
+    p_jit = get_options(jit_options)
+    if p_jit["compile_workers"] == 1 or _aot_recorder is not None:
+        return
+    workers = p_jit["compile_workers"] if p_jit["compile_workers"] > 0 else (os.cpu_count() or 1)
+
+    # Unique objects that are not in the registry
+    p_ffcx = ffcx.get_options(form_compiler_options)
+    objects = {}
+    for ufl_object in ufl_objects:
+        key = _signature(ufl_object, p_ffcx, p_jit)
+        if key not in registry:
+            objects.setdefault(key, ufl_object)
+    if comm.allreduce(len(objects), op=MPI.MAX) < 2:
+        return
+
+    # Processes on the node of rank 0 share the objects and the
+    # compiler processes
+    if comm.size > 1:
+        node = MPI.Get_processor_name()
+        root_node = comm.bcast(node, root=0)
+        ranks = [rank for rank, name in enumerate(comm.allgather(node)) if name == root_node]
+        if comm.rank in ranks:
+            objects = dict(list(objects.items())[ranks.index(comm.rank)::len(ranks)])
+            workers = max(workers // len(ranks), 1)
+        else:
+            objects = {}
+
+    # Generate code in this process, compile the C code in the worker
+    # processes, and load the compiled modules
+    p_local = {option: value for option, value in p_jit.items() if option not in _DOLFINX_ONLY_OPTIONS}
+    jobs: list = []
+    with _deferred_c_compilation(jobs):
+        for ufl_object in objects.values():
+            try:
+                _ffcx_compile(ufl_object, p_ffcx, p_local)
+            except Exception:
+                pass
+    cache_dir = Path(p_jit["cache_dir"])
+    compiled = _compile_c(cache_dir, jobs, workers)
+    for key, ufl_object in objects.items():
+        try:
+            r = ffcx_jit.__wrapped__(ufl_object, form_compiler_options=p_ffcx, jit_options=p_jit)
+        except Exception:
+            # The error is raised when the object is compiled by
+            # ffcx_jit
+            continue
+        if r[1].__name__ in compiled:
+            _cache_insert(cache_dir, key, r[0], r[1], p_jit["cache_size_limit"])
+    if comm.size > 1:
+        comm.Barrier()
+
+
+def _module_entry(compiled_object, module) -> dict:
+    """Manifest entry with the module and symbol names of a compiled
+    object (or tuple of compiled objects)."""
+    ffi, lib = module.ffi, module.lib
+    objects = compiled_object if isinstance(compiled_object, tuple) else (compiled_object, )
+    addresses = [int(ffi.cast("uintptr_t", ffi.addressof(obj))) for obj in objects]
+    symbols = {}
+    for name in dir(lib):
+        try:
+            symbols[int(ffi.cast("uintptr_t", ffi.addressof(lib, name)))] = name
+        except (AttributeError, TypeError, ffi.error):
+            pass
+    return {"module": module.__name__, "file": Path(module.__file__).name,
+            "names": [symbols[address] for address in addresses]}
+
+
+@functools.lru_cache(maxsize=None)
+def _aot_manifest(aot_dir: str) -> dict:
+    """Load the manifest of an ahead-of-time compiled directory."""
+    try:
+        with open(Path(aot_dir, "manifest.json")) as f:
+            return json.load(f)["objects"]
+    except FileNotFoundError:
+        return {}
+
+
+@functools.lru_cache(maxsize=None)
+def _load_module(directory: str, module_name: str, filename: str):
+    """Import a compiled module from a file."""
+    spec = importlib.util.spec_from_file_location(module_name, Path(directory, filename))
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"Unable to find module {module_name} in {directory}.")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_entry(directory, entry: dict):
+    """Load the compiled object(s) described by a manifest or cache
+    index entry."""
+    module = _load_module(str(directory), entry["module"], entry["file"])
+    objects = tuple(getattr(module.lib, name) for name in entry["names"])
+    return (objects[0] if len(objects) == 1 else objects, module, (None, None))
+
+
+def _aot_load(aot_dir, key: str):
+    """Return the ahead-of-time compiled object with signature ``key``,
+    or ``None`` if it has not been compiled ahead-of-time."""
+    entry = _aot_manifest(str(aot_dir)).get(key)
+    return None if entry is None else _load_entry(aot_dir, entry)
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    compile_time: float
+
+
+class _CacheStatistics:
+    """JIT cache statistics for this process."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.compile_time = 0.0
+
+
+_cache_statistics = _CacheStatistics()
+
+
+def cache_info() -> CacheInfo:
+    """Return the number of JIT cache hits and misses (compilations),
+    and the total compilation time, for this process."""
+    return CacheInfo(_cache_statistics.hits, _cache_statistics.misses, _cache_statistics.compile_time)
+
+
+# Index of the JIT cache directory. Maps object signatures to the
+# compiled module, the object names in the module and the size of the
+# module files. The index is a file with one JSON record per line, and
+# new modules are appended. The file is only rewritten when modules are
+# evicted. The last access time of a module is the modification time of
+# its shared library, which is updated when the module is used (at most
+# once every _ACCESS_INTERVAL seconds per process).
+_CACHE_INDEX = "dolfinx_cache_index.jsonl"
+_ACCESS_INTERVAL = 60.0
+
+# In-memory copy of the cache index for each cache directory, with the
+# inode of the index file and the number of bytes that have been read
+_cache_index: dict[Path, tuple[int, int, dict]] = {}
+
+# Time at which the access time of a cached module was last updated
+_last_access: dict[Path, float] = {}
+
+
+def _read_cache_index(cache_dir: Path) -> dict:
+    """Return the cache index, reading only the records that have been
+    appended to the index file since it was last read."""
+    path = cache_dir.joinpath(_CACHE_INDEX)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        _cache_index.pop(cache_dir, None)
+        return {}
+    inode, offset, index = _cache_index.get(cache_dir, (st.st_ino, 0, {}))
+    if inode != st.st_ino or st.st_size < offset:
+        # Index file has been rewritten
+        offset, index = 0, {}
+    if st.st_size > offset:
+        try:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return index
+        # Read complete records only
+        end = data.rfind(b"\n") + 1
+        index = dict(index)
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+                index[record.pop("key")] = record
+            except (json.JSONDecodeError, KeyError):
+                pass
+        offset += end
+    _cache_index[cache_dir] = (st.st_ino, offset, index)
+    return index
+
+
+class _CacheIndexLock(_FileLock):
+    """Exclusive lock for modifying the cache index of a directory."""
+
+    def __init__(self, cache_dir: Path):
+        super().__init__(cache_dir.joinpath(_CACHE_INDEX + ".lock"))
+
+
+def _append_cache_index(cache_dir: Path, key: str, entry: dict) -> None:
+    """Append a record to the cache index file (lock must be held)."""
+    with open(cache_dir.joinpath(_CACHE_INDEX), "a") as f:
+        f.write(json.dumps({"key": key, **entry}) + "\n")
+
+
+def _write_cache_index(cache_dir: Path, index: dict) -> None:
+    """Atomically replace the cache index file (lock must be held)."""
+    tmp = cache_dir.joinpath(f"{_CACHE_INDEX}.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        for key, entry in index.items():
+            f.write(json.dumps({"key": key, **entry}) + "\n")
+    os.replace(tmp, cache_dir.joinpath(_CACHE_INDEX))
+
+
+def _module_files(cache_dir: Path, entry: dict) -> list[Path]:
+    """Files in the cache directory that belong to a compiled module."""
+    module = entry["module"]
+    return [cache_dir.joinpath(entry["file"])] + [cache_dir.joinpath(module + suffix) for suffix in (
+        ".c", ".c.cached", ".c.failed", ".o")]
+
+
+def _touch(cache_dir: Path, key: str) -> None:
+    """Record an access to the module of a cached object. Called for
+    every use of a cached object, including registry hits."""
+    now = time.time()
+    if now - _last_access.get(cache_dir.joinpath(key), 0.0) < _ACCESS_INTERVAL:
+        return
+    _last_access[cache_dir.joinpath(key)] = now
+    entry = _read_cache_index(cache_dir).get(key)
+    if entry is not None:
+        try:
+            os.utime(cache_dir.joinpath(entry["file"]))
+        except FileNotFoundError:
+            pass
+
+
+def _cache_lookup(cache_dir: Path, key: str):
+    """Load a compiled object using the cache index, or return ``None``
+    on a miss."""
+    entry = _read_cache_index(cache_dir).get(key)
+    if entry is None:
+        return None
+    try:
+        r = _load_entry(cache_dir, entry)
+    except (ImportError, OSError, AttributeError):
+        # Module has been removed from the cache
+        return None
+    _touch(cache_dir, key)
+    return r
+
+
+def _cache_insert(cache_dir: Path, key: str, compiled_object, module, size_limit: float) -> None:
+    """Add a compiled module to the cache index and evict least recently
+    used modules if the cache exceeds ``size_limit`` (MB)."""
+    entry = _module_entry(compiled_object, module)
+    entry["size"] = sum(f.stat().st_size for f in _module_files(cache_dir, entry) if f.exists())
+    with _CacheIndexLock(cache_dir):
+        index = _read_cache_index(cache_dir)
+        if index.get(key) != entry:
+            _append_cache_index(cache_dir, key, entry)
+            index = _read_cache_index(cache_dir)
+            if size_limit > 0 and sum(e["size"] for e in index.values()) > size_limit * 1024**2:
+                _write_cache_index(cache_dir, _prune(cache_dir, index, size_limit, keep=key))
+    _touch(cache_dir, key)
+
+
+def _prune(cache_dir: Path, index: dict, size_limit: float, keep: Optional[str] = None) -> dict:
+    """Remove least recently used modules until the total size of the
+    indexed modules is at most ``size_limit`` (MB). Returns the new
+    index (lock must be held)."""
+
+    def atime(key):
+        try:
+            return cache_dir.joinpath(index[key]["file"]).stat().st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+    size = sum(entry["size"] for entry in index.values())
+    index = dict(index)
+    for key in sorted(index.keys(), key=atime):
+        if size <= size_limit * 1024**2:
+            break
+        if key == keep:
+            continue
+        entry = index.pop(key)
+        for f in _module_files(cache_dir, entry) + [cache_dir.joinpath(f"dolfinx_{key}.ready")]:
+            f.unlink(missing_ok=True)
+        size -= entry["size"]
+    return index
+
+
+def cache_stats(cache_dir: Optional[Path] = None) -> dict:
+    """Return statistics of a JIT cache directory.
+
+    Args:
+        cache_dir: Cache directory. Defaults to the ``cache_dir`` JIT
+            option.
+
+    Returns:
+        Number of indexed modules, their total size and the total size
+        of all files in the cache directory (in bytes).
+
+    """
+    cache_dir = get_options()["cache_dir"] if cache_dir is None else Path(cache_dir)
+    index = _read_cache_index(cache_dir)
+    total = sum(f.stat().st_size for f in cache_dir.iterdir() if f.is_file()) if cache_dir.exists() else 0
+    return {"cache_dir": str(cache_dir), "num_modules": len(index),
+            "indexed_size": sum(entry["size"] for entry in index.values()), "total_size": total}
+
+
+def cache_prune(size_limit: Optional[float] = None, cache_dir: Optional[Path] = None) -> None:
+    """Evict least recently used modules from a JIT cache directory.
+
+    Args:
+        size_limit: Maximum size (MB) of the indexed modules. Defaults
+            to the ``cache_size_limit`` JIT option.
+        cache_dir: Cache directory. Defaults to the ``cache_dir`` JIT
+            option.
+
+    """
+    p_jit = get_options()
+    cache_dir = p_jit["cache_dir"] if cache_dir is None else Path(cache_dir)
+    size_limit = p_jit["cache_size_limit"] if size_limit is None else size_limit
+    if size_limit <= 0 or not cache_dir.exists():
+        return
+    with _CacheIndexLock(cache_dir):
+        _write_cache_index(cache_dir, _prune(cache_dir, _read_cache_index(cache_dir), size_limit))
+
+
+def cache_clear(cache_dir: Optional[Path] = None) -> None:
+    """Remove all compiled modules from a JIT cache directory.
+
+    Modules that are being compiled, and the locks and markers of
+    objects that are being compiled by other processes, are kept, such
+    that the cache can be cleared while other jobs use it.
+
+    Args:
+        cache_dir: Cache directory. Defaults to the ``cache_dir`` JIT
+            option.
+
+    """
+    cache_dir = get_options()["cache_dir"] if cache_dir is None else Path(cache_dir)
+    if not cache_dir.exists():
+        return
+    with _CacheIndexLock(cache_dir):
+        # A module with a C file but no ready marker is being compiled.
+        # The ready marker is removed last.
+        for module in {f.name.split(".")[0] for f in cache_dir.glob("libffcx_*")}:
+            ready = cache_dir.joinpath(module + ".c.cached")
+            if ready.exists():
+                for f in cache_dir.glob(module + ".*"):
+                    if f != ready:
+                        f.unlink(missing_ok=True)
+                ready.unlink(missing_ok=True)
+            else:
+                cache_dir.joinpath(module + ".c.failed").unlink(missing_ok=True)
+
+        # Markers of objects whose lock is held by a live process are
+        # kept
+        for lock in cache_dir.glob("dolfinx_*.lock"):
+            if lock.name != _CACHE_INDEX + ".lock":
+                _FileLock(lock).remove_if_stale()
+        for marker in [*cache_dir.glob("dolfinx_*.ready"), *cache_dir.glob("dolfinx_*.failed")]:
+            if not marker.with_suffix(".lock").exists():
+                marker.unlink(missing_ok=True)
+        _write_cache_index(cache_dir, {})
+    _cache_index.pop(cache_dir, None)
+
+
+class JITTiming(NamedTuple):
+    signature: str
+    kind: str
+    module: str
+    phases: dict[str, float]
+    total: float
+
+
+# Time spent in each JIT phase, for each compiled object signature
+_timings: dict[str, JITTiming] = {}
+
+# FFCx log messages with the time of a compilation phase
+_ffcx_phases = {re.compile(r"Compiler stage 1 finished in ([0-9.eE+-]+)"): "ffcx analysis",
+                re.compile(r"Compiler stage 2 finished in ([0-9.eE+-]+)"): "ffcx representation",
+                re.compile(r"Compiler stage 3 finished in ([0-9.eE+-]+)"): "ffcx code generation",
+                re.compile(r"Compiler stage 4 finished in ([0-9.eE+-]+)"): "ffcx formatting",
+                re.compile(r"JIT C compiler finished in ([0-9.eE+-]+)"): "c compiler"}
+
+
+@contextlib.contextmanager
+def _phase(phases: dict[str, float], name: str):
+    """Time a JIT phase using a :class:`dolfinx.common.Timer` and add
+    the wall time to ``phases``."""
+    with common.Timer(f"JIT: {name}") as t:
+        yield
+        phases[name] = phases.get(name, 0.0) + t.elapsed()[0]
+
+
+class _FFCxTimingHandler(logging.Handler):
+    """Logging handler that extracts phase timings from FFCx log
+    messages, and forwards messages that would otherwise have been
+    emitted."""
+
+    def __init__(self, phases: dict[str, float], level: int, propagate: bool, parent):
+        super().__init__()
+        self._phases = phases
+        self._level = level
+        self._propagate = propagate
+        self._parent = parent
+
+    def emit(self, record):
+        msg = record.getMessage()
+        for pattern, name in _ffcx_phases.items():
+            m = pattern.search(msg)
+            if m is not None:
+                self._phases[name] = self._phases.get(name, 0.0) + float(m.group(1))
+        if record.levelno >= self._level and self._propagate and self._parent is not None:
+            self._parent.handle(record)
+
+
+@contextlib.contextmanager
+def _capture_ffcx_timings(phases: dict[str, float]):
+    """Record the FFCx compilation phase timings in ``phases``."""
+    logger = logging.getLogger("ffcx")
+    level, propagate = logger.level, logger.propagate
+    handler = _FFCxTimingHandler(phases, logger.getEffectiveLevel(), propagate, logger.parent)
+    logger.addHandler(handler)
+    logger.setLevel(min(logger.getEffectiveLevel(), logging.INFO))
+    logger.propagate = False
+    try:
+        yield
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+        logger.propagate = propagate
+
+
+def _record_timings(key: str, ufl_object, module, phases: dict[str, float]) -> None:
+    """Accumulate the phase timings for a compiled object."""
+    if isinstance(ufl_object, ufl.Form):
+        kind = "form"
+    elif isinstance(ufl_object, ufl.FiniteElementBase):
+        kind = "element"
+    elif isinstance(ufl_object, ufl.Mesh):
+        kind = "coordinate map"
+    else:
+        kind = "expression"
+    previous = _timings.get(key)
+    if previous is not None:
+        phases = {name: previous.phases.get(name, 0.0) + phases.get(name, 0.0)
+                  for name in previous.phases.keys() | phases.keys()}
+    total = sum(phases[name] for name in ("signature", "load", "ffcx") if name in phases)
+    _timings[key] = JITTiming(key, kind, module.__name__, phases, total)
+
+
+def timing_report() -> list[JITTiming]:
+    """Return the time spent in each JIT phase for each compiled object,
+    with the most expensive objects first.
+
+    The phases are ``signature`` (UFL signature computation), ``load``
+    (loading from the ahead-of-time directory or the cache index) and
+    ``ffcx`` (FFCx compilation, including loading the module). When
+    FFCx generates code, ``ffcx`` is broken down into ``ffcx
+    analysis`` (UFL analysis), ``ffcx representation``, ``ffcx code
+    generation``, ``ffcx formatting`` and ``c compiler``. The phase
+    totals over all objects are also recorded as
+    :class:`dolfinx.common.Timer` timings ``JIT: <phase>``, see
+    :func:`dolfinx.common.list_timings`.
+
+    """
+    return sorted(_timings.values(), key=lambda t: t.total, reverse=True)
+
+
+def timing_report_clear() -> None:
+    """Clear the JIT timing report."""
+    _timings.clear()
+
+
 @functools.lru_cache(maxsize=None)
 def _load_options():
     """Loads options from JSON files."""
@@ -190,6 +1072,14 @@ def ffcx_jit(ufl_object, form_compiler_options={}, jit_options={}):
         on the first call. Subsequent calls to this function use this
         cache.
 
+        Compiled objects are held in the in-memory
+        :data:`registry`, keyed by the signature of ``ufl_object`` and
+        the compiler options. Compiling a structurally identical object
+        again returns the registered object. If the ``aot_dir`` option
+        is set, objects compiled ahead-of-time by :mod:`dolfinx.aot`
+        are loaded from this directory before falling back to JIT
+        compilation.
+
         Example `dolfinx_jit_options.json` file:
 
             **{ "cffi_extra_compile_args": ["-O2", "-march=native" ],  "cffi_verbose": True }**
@@ -199,17 +1089,89 @@ def ffcx_jit(ufl_object, form_compiler_options={}, jit_options={}):
     p_ffcx = ffcx.get_options(form_compiler_options)
     p_jit = get_options(jit_options)
 
+    phases: dict[str, float] = {}
+    with _phase(phases, "signature"):
+        key = _signature(ufl_object, p_ffcx, p_jit) if _is_ufl_object(ufl_object) else None
+
+    # Return compiled object from the in-memory registry, the
+    # ahead-of-time compiled objects or the JIT cache index if present
+    cache_dir, size_limit = p_jit["cache_dir"], p_jit["cache_size_limit"]
+    if key is not None and _aot_recorder is None:
+        r = registry.lookup(key)
+        if r is not None:
+            if cache_dir is not None:
+                _touch(Path(cache_dir), key)
+            return r
+        with _phase(phases, "load"):
+            if p_jit["aot_dir"] is not None:
+                r = _aot_load(p_jit["aot_dir"], key)
+            if r is None:
+                r = _cache_lookup(cache_dir, key)
+                if r is not None:
+                    _cache_statistics.hits += 1
+                    log.log(log.LogLevel.INFO, f"JIT cache hit (index): {key}")
+        if r is not None:
+            registry.insert(key, r)
+            _record_timings(key, ufl_object, r[1], phases)
+            return r
+
+    if _aot_recorder is not None:
+        p_jit["cache_dir"] = _aot_recorder["dir"]
+    for option in _DOLFINX_ONLY_OPTIONS:
+        p_jit.pop(option)
+
     # Switch on type and compile, returning cffi object
-    if isinstance(ufl_object, ufl.Form):
-        r = ffcx.codegeneration.jit.compile_forms([ufl_object], options=p_ffcx, **p_jit)
-    elif isinstance(ufl_object, ufl.FiniteElementBase):
-        r = ffcx.codegeneration.jit.compile_elements([ufl_object], options=p_ffcx, **p_jit)
-    elif isinstance(ufl_object, ufl.Mesh):
-        r = ffcx.codegeneration.jit.compile_coordinate_maps(
-            [ufl_object], options=p_ffcx, **p_jit)
-    elif isinstance(ufl_object, tuple) and isinstance(ufl_object[0], ufl.core.expr.Expr):
-        r = ffcx.codegeneration.jit.compile_expressions([ufl_object], options=p_ffcx, **p_jit)
+    with _phase(phases, "ffcx"), _capture_ffcx_timings(phases):
+        r = _ffcx_compile(ufl_object, p_ffcx, p_jit)
+
+    output = (r[0][0], r[1], r[2])
+
+    # FFCx returns no code if the module was found in the cache
+    elapsed = phases["ffcx"]
+    if output[2][0] is None:
+        _cache_statistics.hits += 1
+        log.log(log.LogLevel.INFO, f"JIT cache hit: {key} ({elapsed:.3f} s)")
     else:
-        raise TypeError(type(ufl_object))
+        _cache_statistics.misses += 1
+        _cache_statistics.compile_time += elapsed
+        log.log(log.LogLevel.INFO, f"JIT cache miss: {key}, compiled in {elapsed:.3f} s")
+
+    if key is not None:
+        registry.insert(key, output)
+        if _aot_recorder is not None:
+            _aot_recorder["objects"][key] = _module_entry(output[0], output[1])
+        elif cache_dir is not None and output[2][0] is not None:
+            # Only the process that compiled the module adds it to the
+            # cache index
+            _cache_insert(Path(cache_dir), key, output[0], output[1], size_limit)
+        _record_timings(key, ufl_object, output[1], phases)
+    return output
+
+
+def main(argv: Optional[list[str]] = None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m dolfinx.jit", description="Manage the DOLFINx JIT cache.")
+    parser.add_argument("--cache-dir", default=None, help="cache directory (default: 'cache_dir' JIT option)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("stats", help="show cache statistics")
+    prune = subparsers.add_parser("prune", help="evict least recently used modules")
+    prune.add_argument("--max-size", type=float, default=None,
+                       help="maximum cache size in MB (default: 'cache_size_limit' JIT option)")
+    subparsers.add_parser("clear", help="remove all compiled modules")
+    args = parser.parse_args(argv)
+
+    cache_dir = None if args.cache_dir is None else Path(args.cache_dir)
+    if args.command == "stats":
+        stats = cache_stats(cache_dir)
+        print(f"Cache directory:  {stats['cache_dir']}")
+        print(f"Indexed modules:  {stats['num_modules']}")
+        print(f"Indexed size:     {stats['indexed_size'] / 1024**2:.1f} MB")
+        print(f"Total size:       {stats['total_size'] / 1024**2:.1f} MB")
+    elif args.command == "prune":
+        cache_prune(args.max_size, cache_dir)
+    elif args.command == "clear":
+        cache_clear(cache_dir)
+
 
-    return (r[0][0], r[1], r[2])
+if __name__ == "__main__":
+    main()
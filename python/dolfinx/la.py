@@ -9,15 +9,15 @@
 import numpy as np
 
 from dolfinx import cpp as _cpp
-from dolfinx.cpp.la import Norm, InsertMode, BlockMode
-from dolfinx.cpp.la.petsc import create_vector as create_petsc_vector
+from dolfinx.cpp.la import Norm, InsertMode, BlockMode, StorageMode, SolverInfo
 
-__all__ = ["orthonormalize", "is_orthonormal", "create_petsc_vector", "matrix_csr", "vector",
-           "MatrixCSRMetaClass", "Norm", "InsertMode", "VectorMetaClass", ]
+__all__ = ["orthonormalize", "is_orthonormal", "create_petsc_vector", "create_petsc_matrix", "matrix_csr",
+           "vector", "MatrixCSRMetaClass", "Norm", "InsertMode", "StorageMode", "VectorMetaClass",
+           "SolverInfo", "cg", "gmres", "bicgstab", "jacobi", "block_jacobi", "chebyshev"]
 
 
 class MatrixCSRMetaClass:
-    def __init__(self, sp, bm):
+    def __init__(self, sp, bm, storage):
         """A distributed sparse matrix that uses compressed sparse row storage.
 
         Args:
@@ -25,6 +25,7 @@ class MatrixCSRMetaClass:
             of the matrix the parallel distribution of the matrix
             bm: The block mode (compact or expanded). Relevant only if
             block size is greater than one.
+            storage: The storage mode (general or symmetric).
 
         Note:
             Objects of this type should be created using
@@ -32,10 +33,11 @@ class MatrixCSRMetaClass:
             initialiser.
 
         """
-        super().__init__(sp, bm)
+        super().__init__(sp, bm, storage)
 
 
-def matrix_csr(sp, block_mode=BlockMode.compact, dtype=np.float64) -> MatrixCSRMetaClass:
+def matrix_csr(sp, block_mode=BlockMode.compact, dtype=np.float64,
+               storage=StorageMode.general) -> MatrixCSRMetaClass:
     """Create a distributed sparse matrix.
 
     The matrix uses compressed sparse row storage.
@@ -43,7 +45,12 @@ def matrix_csr(sp, block_mode=BlockMode.compact, dtype=np.float64) -> MatrixCSRM
     Args:
         sp: The sparsity pattern that defines the nonzero structure of
         the matrix the parallel distribution of the matrix.
+        block_mode: The block mode (compact or expanded).
         dtype: The scalar type.
+        storage: The storage mode. ``StorageMode.symmetric`` stores
+            only the upper triangle of a symmetric matrix. Values that
+            are inserted in the lower triangle, e.g. by
+            :func:`dolfinx.fem.assemble_matrix`, are ignored.
 
     Returns:
         A sparse matrix.
@@ -61,7 +68,7 @@ def matrix_csr(sp, block_mode=BlockMode.compact, dtype=np.float64) -> MatrixCSRM
         raise NotImplementedError(f"Type {dtype} not supported.")
 
     matrixcls = type("MatrixCSR", (MatrixCSRMetaClass, ftype), {})
-    return matrixcls(sp, block_mode)
+    return matrixcls(sp, block_mode, storage)
 
 
 class VectorMetaClass:
@@ -113,6 +120,22 @@ def vector(map, bs=1, dtype=np.float64) -> VectorMetaClass:
     return vectorcls(map, bs)
 
 
+def create_petsc_vector(map, bs: int):
+    """Create a distributed PETSc vector.
+
+    Args:
+        map: Index map that describes the size and parallel layout of
+            the vector to create.
+        bs: Block size of the vector.
+
+    Returns:
+        A PETSc vector with ghost entries.
+
+    """
+    from petsc4py import PETSc  # noqa: F401 (initialises PETSc)
+    return _cpp.la.petsc.create_vector(map, bs)
+
+
 def create_petsc_vector_wrap(x: VectorMetaClass):
     """Wrap a distributed DOLFINx vector as a PETSc vector.
 
@@ -127,9 +150,169 @@ def create_petsc_vector_wrap(x: VectorMetaClass):
         object.
 
     """
+    from petsc4py import PETSc  # noqa: F401 (initialises PETSc)
     return _cpp.la.petsc.create_vector_wrap(x)
 
 
+def create_petsc_matrix(A: MatrixCSRMetaClass):
+    """Create a PETSc matrix with the entries of a sparse matrix.
+
+    The owned rows of ``A`` are copied into a PETSc ``aij`` matrix, a
+    ``baij`` matrix if the block size of ``A`` is greater than one, or
+    an ``sbaij`` matrix if ``A`` uses symmetric storage.
+
+    Args:
+        A: The matrix to copy. It must be finalised.
+
+    Returns:
+        An assembled PETSc matrix.
+
+    """
+    from petsc4py import PETSc
+    bs = A.block_size
+    im0, im1 = A.index_map(0), A.index_map(1)
+    n = im0.size_local
+    indptr = A.indptr[:n + 1]
+    nnz = indptr[-1]
+    cols = im1.local_to_global(A.indices[:nnz])
+    data = A.data[:nnz * bs[0] * bs[1]].reshape(nnz, bs[0] * bs[1])
+
+    # PETSc requires the columns of each row to be sorted by global index
+    perm = np.lexsort((cols, np.repeat(np.arange(n), np.diff(indptr))))
+    csr = (indptr.astype(PETSc.IntType), cols[perm].astype(PETSc.IntType),
+           data[perm].ravel().astype(PETSc.ScalarType))
+
+    sizes = ((n * bs[0], im0.size_global * bs[0]), (im1.size_local * bs[1], im1.size_global * bs[1]))
+    if A.storage_mode == StorageMode.symmetric:
+        B = PETSc.Mat().createSBAIJ(sizes, bs[0], csr=csr, comm=im0.comm)
+    elif bs[0] == 1 and bs[1] == 1:
+        B = PETSc.Mat().createAIJ(sizes, csr=csr, comm=im0.comm)
+    elif bs[0] == bs[1]:
+        B = PETSc.Mat().createBAIJ(sizes, bs[0], csr=csr, comm=im0.comm)
+    else:
+        raise NotImplementedError("Matrices with different row and column block sizes are not supported.")
+    B.assemble()
+    return B
+
+
+# -- Iterative solvers -------------------------------------------------------
+
+
+def _scalar_type_class(name: str, dtype):
+    """Return the C++ class ``name`` for the scalar type ``dtype``."""
+    try:
+        return getattr(_cpp.la, f"{name}_{np.dtype(dtype).name}")
+    except AttributeError:
+        raise NotImplementedError(f"Type {dtype} not supported.")
+
+
+def jacobi(A: MatrixCSRMetaClass):
+    """Create a Jacobi (diagonal) preconditioner.
+
+    Args:
+        A: The matrix. It must be finalised.
+
+    Returns:
+        A preconditioner for use with :func:`cg`, :func:`gmres` and
+        :func:`bicgstab`.
+
+    """
+    return _scalar_type_class("Jacobi", A.dtype)(A)
+
+
+def block_jacobi(A: MatrixCSRMetaClass, block_size: int = 0):
+    """Create a point-block Jacobi preconditioner.
+
+    The dense diagonal blocks of the matrix are inverted.
+
+    Args:
+        A: The matrix. It must be finalised.
+        block_size: Size of the diagonal blocks in scalar rows, e.g.
+            the number of components of a vector-valued field. If not
+            positive, the block size of ``A`` is used.
+
+    Returns:
+        A preconditioner for use with :func:`cg`, :func:`gmres` and
+        :func:`bicgstab`.
+
+    """
+    return _scalar_type_class("BlockJacobi", A.dtype)(A, block_size)
+
+
+def chebyshev(A: MatrixCSRMetaClass, degree: int = 3, bounds=None, num_threads: int = 1):
+    """Create a Jacobi-scaled Chebyshev polynomial preconditioner.
+
+    Args:
+        A: The matrix. It must be finalised.
+        degree: Degree of the polynomial.
+        bounds: Lower and upper bound of the eigenvalues of the
+            Jacobi-scaled matrix. If not provided, the largest
+            eigenvalue is estimated and ``(0.1 lmax, 1.1 lmax)`` is
+            used.
+        num_threads: Number of threads used for matrix-vector products.
+
+    Returns:
+        A preconditioner for use with :func:`cg`, :func:`gmres` and
+        :func:`bicgstab`.
+
+    """
+    bounds = (0.0, 0.0) if bounds is None else bounds
+    return _scalar_type_class("Chebyshev", A.dtype)(A, degree, bounds, num_threads)
+
+
+def cg(A: MatrixCSRMetaClass, b: VectorMetaClass, x: VectorMetaClass, M=None, rtol: float = 1.0e-8,
+       atol: float = 1.0e-50, max_it: int = 1000, num_threads: int = 1) -> SolverInfo:
+    """Solve ``A x = b`` with the preconditioned conjugate gradient method.
+
+    The solvers in this module do not use PETSc. The operator ``A`` and
+    the preconditioner ``M`` must be symmetric (Hermitian) positive
+    definite. The iteration stops when the residual norm is less than
+    ``max(rtol * |b|, atol)``.
+
+    Args:
+        A: The matrix. It must be finalised.
+        b: The right-hand side. The owned entries must be up-to-date.
+        x: Initial guess, and solution on return. Ghost entries are not
+            updated.
+        M: Preconditioner, see :func:`jacobi`, :func:`block_jacobi` and
+            :func:`chebyshev`.
+        rtol: Relative tolerance.
+        atol: Absolute tolerance.
+        max_it: Maximum number of iterations.
+        num_threads: Number of threads used for matrix-vector products.
+
+    Returns:
+        Convergence information.
+
+    """
+    return _cpp.la.cg(A, b, x, M, rtol, atol, max_it, num_threads)
+
+
+def gmres(A: MatrixCSRMetaClass, b: VectorMetaClass, x: VectorMetaClass, M=None, rtol: float = 1.0e-8,
+          atol: float = 1.0e-50, max_it: int = 1000, restart: int = 30, num_threads: int = 1) -> SolverInfo:
+    """Solve ``A x = b`` with the restarted GMRES method.
+
+    The method uses right preconditioning, so that the convergence
+    test is on the true residual norm. See :func:`cg` for the
+    arguments.
+
+    Args:
+        restart: Number of iterations between restarts.
+
+    """
+    return _cpp.la.gmres(A, b, x, M, rtol, atol, max_it, restart, num_threads)
+
+
+def bicgstab(A: MatrixCSRMetaClass, b: VectorMetaClass, x: VectorMetaClass, M=None, rtol: float = 1.0e-8,
+             atol: float = 1.0e-50, max_it: int = 1000, num_threads: int = 1) -> SolverInfo:
+    """Solve ``A x = b`` with the (right) preconditioned BiCGStab method.
+
+    See :func:`cg` for the arguments.
+
+    """
+    return _cpp.la.bicgstab(A, b, x, M, rtol, atol, max_it, num_threads)
+
+
 def orthonormalize(basis):
     """Orthogoalise set of PETSc vectors in-place"""
     for i, x in enumerate(basis):
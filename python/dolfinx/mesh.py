@@ -16,6 +16,7 @@ import basix
 import basix.ufl
 import ufl
 from dolfinx import cpp as _cpp
+from dolfinx.cpp.fem import IntegralType
 from dolfinx.cpp.mesh import (CellType, DiagonalType, GhostMode,
                               build_dual_graph, cell_dim,
                               create_cell_partitioner, exterior_facet_indices,
@@ -297,6 +298,8 @@ class MeshTags:
 
         """
         self._cpp_object = meshtags
+        self._integration_domains: typing.Dict[IntegralType,
+                                               typing.List[typing.Tuple[int, npt.NDArray[np.int32]]]] = {}
 
     def ufl_id(self) -> int:
         return id(self)
@@ -341,6 +344,43 @@ class MeshTags:
         """
         return self._cpp_object.find(value)
 
+    def integration_domains(self, integral_type: IntegralType) -> typing.List[typing.Tuple[int, npt.NDArray[np.int32]]]:
+        """Get the integration entities for each tag value.
+
+        For cell integrals the entities are cells, for exterior facet
+        integrals `(cell, local facet)` pairs and for interior facet
+        integrals pairs of `(cell, local facet)` pairs (see
+        :func:`dolfinx.cpp.fem.compute_integration_domains`). The data
+        is computed on the first call for an integral type and re-used
+        by all forms that are created with these tags.
+
+        Args:
+            integral_type: Integral type.
+
+        Return:
+            List of `(tag value, entities)` pairs, sorted by tag value.
+            The entity arrays are read-only.
+
+        Note:
+            The cached data is not updated if the tagged entities or
+            values are modified after the first call.
+
+        """
+        try:
+            return self._integration_domains[integral_type]
+        except KeyError:
+            if integral_type in (IntegralType.exterior_facet, IntegralType.interior_facet):
+                tdim = self.topology.dim
+                self.topology.create_connectivity(tdim - 1, tdim)
+                self.topology.create_connectivity(tdim, tdim - 1)
+            domains = []
+            for value, entities in _cpp.fem.compute_integration_domains(integral_type, self._cpp_object):
+                entities = np.asarray(entities, dtype=np.int32)
+                entities.setflags(write=False)
+                domains.append((value, entities))
+            self._integration_domains[integral_type] = domains
+            return domains
+
 
 def meshtags(mesh: Mesh, dim: int, entities: npt.NDArray[np.int32],
              values: typing.Union[np.ndarray, int, float]) -> MeshTags:
@@ -5,6 +5,12 @@
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 """Tools for solving nonlinear problems."""
 
-from dolfinx.nls import petsc
-
 __all__ = ["petsc"]
+
+
+def __getattr__(name):
+    # Import the PETSc interface (and petsc4py) on first access
+    if name == "petsc":
+        import importlib
+        return importlib.import_module("dolfinx.nls.petsc")
+    raise AttributeError(f"module 'dolfinx.nls' has no attribute '{name}'")
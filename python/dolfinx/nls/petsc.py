@@ -29,7 +29,10 @@ class NewtonSolver(_cpp.nls.petsc.NewtonSolver):
 
         # Create matrix and vector to be used for assembly
         # of the non-linear problem
-        self._A = fem.petsc.create_matrix(problem.a)
+        if hasattr(problem, "create_matrix"):
+            self._A = problem.create_matrix()
+        else:
+            self._A = fem.petsc.create_matrix(problem.a)
         self.setJ(problem.J, self._A)
         self._b = fem.petsc.create_vector(problem.L)
         self.setF(problem.F, self._b)
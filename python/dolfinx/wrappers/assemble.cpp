@@ -23,7 +23,9 @@
 #include <dolfinx/la/SparsityPattern.h>
 #include <dolfinx/la/petsc.h>
 #include <dolfinx/mesh/Mesh.h>
+#include <functional>
 #include <memory>
+#include <mutex>
 #include <petsc4py/petsc4py.h>
 #include <pybind11/complex.h>
 #include <pybind11/functional.h>
@@ -59,6 +61,20 @@ py_to_cpp_coeffs(const std::map<std::pair<dolfinx::fem::IntegralType, int>,
   return c;
 }
 
+/// Wrap a matrix insertion function such that concurrent calls, e.g.
+/// from threaded assembly, are serialised
+template <typename F>
+auto serialise(F set_fn, std::mutex& mutex)
+{
+  return [set_fn, &mutex](const std::span<const std::int32_t>& rows,
+                          const std::span<const std::int32_t>& cols,
+                          const std::span<const PetscScalar>& vals) mutable
+  {
+    std::scoped_lock lock(mutex);
+    return set_fn(rows, cols, vals);
+  };
+}
+
 // Declare assembler function that have multiple scalar types
 template <typename T, typename U>
 void declare_assembly_functions(py::module& m)
@@ -92,6 +108,22 @@ void declare_assembly_functions(py::module& m)
         return c;
       },
       py::arg("form"), "Pack coefficients for a Form.");
+  m.def(
+      "pack_coefficients",
+      [](const dolfinx::fem::Form<T, U>& form,
+         std::map<std::pair<dolfinx::fem::IntegralType, int>,
+                  py::array_t<T, py::array::c_style>>& coeffs,
+         const std::vector<int>& indices)
+      {
+        for (auto& [key, c] : coeffs)
+        {
+          dolfinx::fem::pack_coefficients<T>(
+              form, key.first, key.second,
+              std::span<T>(c.mutable_data(), c.size()), c.shape(1), indices);
+        }
+      },
+      py::arg("form"), py::arg("coeffs"), py::arg("indices"),
+      "Re-pack selected coefficients for a Form into existing arrays.");
   m.def(
       "pack_constants",
       [](const dolfinx::fem::Form<T, U>& form) {
@@ -110,15 +142,53 @@ void declare_assembly_functions(py::module& m)
       [](const dolfinx::fem::Form<T, U>& M,
          const py::array_t<T, py::array::c_style>& constants,
          const std::map<std::pair<dolfinx::fem::IntegralType, int>,
-                        py::array_t<T, py::array::c_style>>& coefficients)
+                        py::array_t<T, py::array::c_style>>& coefficients,
+         int num_threads)
       {
         return dolfinx::fem::assemble_scalar<T>(
             M, std::span(constants.data(), constants.size()),
-            py_to_cpp_coeffs(coefficients));
+            py_to_cpp_coeffs(coefficients), num_threads);
       },
       py::arg("M"), py::arg("constants"), py::arg("coefficients"),
+      py::arg("num_threads") = 1,
       "Assemble functional over mesh with provided constants and "
       "coefficients");
+  m.def(
+      "assemble_scalars",
+      [](const std::vector<std::shared_ptr<const dolfinx::fem::Form<T, U>>>& M,
+         const std::vector<py::array_t<T, py::array::c_style>>& constants,
+         const std::vector<
+             std::map<std::pair<dolfinx::fem::IntegralType, int>,
+                      py::array_t<T, py::array::c_style>>>& coefficients,
+         int num_threads)
+      {
+        if (constants.size() != M.size() or coefficients.size() != M.size())
+        {
+          throw std::runtime_error(
+              "Constants and coefficients must be provided for each form.");
+        }
+
+        std::vector<std::reference_wrapper<const dolfinx::fem::Form<T, U>>>
+            forms;
+        std::vector<std::span<const T>> _constants;
+        std::vector<std::map<std::pair<dolfinx::fem::IntegralType, int>,
+                             std::pair<std::span<const T>, int>>>
+            _coeffs;
+        for (std::size_t i = 0; i < M.size(); ++i)
+        {
+          assert(M[i]);
+          forms.push_back(*M[i]);
+          _constants.emplace_back(constants[i].data(), constants[i].size());
+          _coeffs.push_back(py_to_cpp_coeffs(coefficients[i]));
+        }
+
+        return dolfinx_wrappers::as_pyarray(dolfinx::fem::assemble_scalars(
+            forms, _constants, _coeffs, num_threads));
+      },
+      py::arg("M"), py::arg("constants"), py::arg("coefficients"),
+      py::arg("num_threads") = 1,
+      "Assemble functionals over mesh with provided constants and "
+      "coefficients in a single pass over each integration domain");
   // Vector
   m.def(
       "assemble_vector",
@@ -126,16 +196,59 @@ void declare_assembly_functions(py::module& m)
          const dolfinx::fem::Form<T, U>& L,
          const py::array_t<T, py::array::c_style>& constants,
          const std::map<std::pair<dolfinx::fem::IntegralType, int>,
-                        py::array_t<T, py::array::c_style>>& coefficients)
+                        py::array_t<T, py::array::c_style>>& coefficients,
+         int num_threads)
       {
         dolfinx::fem::assemble_vector<T>(
             std::span(b.mutable_data(), b.size()), L,
             std::span(constants.data(), constants.size()),
-            py_to_cpp_coeffs(coefficients));
+            py_to_cpp_coeffs(coefficients), num_threads);
       },
       py::arg("b"), py::arg("L"), py::arg("constants"), py::arg("coeffs"),
+      py::arg("num_threads") = 1,
       "Assemble linear form into an existing vector with pre-packed constants "
       "and coefficients");
+  m.def(
+      "assemble_vectors",
+      [](py::array_t<T, py::array::c_style> b,
+         const dolfinx::fem::Form<T, U>& L,
+         const py::array_t<T, py::array::c_style>& constants,
+         const std::map<std::pair<dolfinx::fem::IntegralType, int>,
+                        py::array_t<T, py::array::c_style>>& coefficients,
+         int num_threads)
+      {
+        if (b.ndim() != 2)
+          throw std::runtime_error("Expected a 2D array for b.");
+        const int num_rhs = b.shape(0);
+        if (constants.ndim() != 2 or constants.shape(0) != num_rhs)
+        {
+          throw std::runtime_error(
+              "Constants must have shape (num_rhs, num_constants).");
+        }
+
+        // Coefficient arrays have shape (num_rhs, num_entities, cstride)
+        using Key_t = std::pair<dolfinx::fem::IntegralType, int>;
+        std::map<Key_t, std::pair<std::span<const T>, int>> coeffs;
+        for (auto& [key, c] : coefficients)
+        {
+          if (c.ndim() != 3 or c.shape(0) != num_rhs)
+          {
+            throw std::runtime_error("Coefficients must have shape (num_rhs, "
+                                     "num_entities, cstride).");
+          }
+          coeffs.emplace(key, std::pair(std::span(c.data(), c.size()),
+                                        static_cast<int>(c.shape(2))));
+        }
+
+        dolfinx::fem::assemble_vectors<T>(
+            std::span(b.mutable_data(), b.size()), L,
+            std::span(constants.data(), constants.size()), coeffs, num_rhs,
+            num_threads);
+      },
+      py::arg("b"), py::arg("L"), py::arg("constants"), py::arg("coeffs"),
+      py::arg("num_threads") = 1,
+      "Assemble linear form into multiple vectors, one for each row of "
+      "pre-packed constants and coefficients");
   // MatrixCSR
   m.def(
       "assemble_matrix",
@@ -144,7 +257,8 @@ void declare_assembly_functions(py::module& m)
          const std::map<std::pair<dolfinx::fem::IntegralType, int>,
                         py::array_t<T, py::array::c_style>>& coefficients,
          const std::vector<
-             std::shared_ptr<const dolfinx::fem::DirichletBC<T, U>>>& bcs)
+             std::shared_ptr<const dolfinx::fem::DirichletBC<T, U>>>& bcs,
+         int num_threads)
       {
         const std::array<int, 2> data_bs
             = {a.function_spaces().at(0)->dofmap()->index_map_bs(),
@@ -159,27 +273,82 @@ void declare_assembly_functions(py::module& m)
           dolfinx::fem::assemble_matrix(
               A.mat_add_values(), a,
               std::span(constants.data(), constants.size()),
-              py_to_cpp_coeffs(coefficients), bcs);
+              py_to_cpp_coeffs(coefficients), bcs, num_threads);
         }
         else if (data_bs[0] == 2)
         {
           auto mat_add = A.template mat_add_values<2, 2>();
           dolfinx::fem::assemble_matrix(
               mat_add, a, std::span(constants.data(), constants.size()),
-              py_to_cpp_coeffs(coefficients), bcs);
+              py_to_cpp_coeffs(coefficients), bcs, num_threads);
         }
         else if (data_bs[0] == 3)
         {
           auto mat_add = A.template mat_add_values<3, 3>();
           dolfinx::fem::assemble_matrix(
               mat_add, a, std::span(constants.data(), constants.size()),
-              py_to_cpp_coeffs(coefficients), bcs);
+              py_to_cpp_coeffs(coefficients), bcs, num_threads);
         }
         else
           throw std::runtime_error("Block size not supported in Python");
       },
       py::arg("A"), py::arg("a"), py::arg("constants"), py::arg("coeffs"),
-      py::arg("bcs"), "Experimental.");
+      py::arg("bcs"), py::arg("num_threads") = 1, "Experimental.");
+  m.def(
+      "assemble_matrix",
+      [](dolfinx::la::MatrixCSR<T>& A, const dolfinx::fem::Form<T, U>& a,
+         const py::array_t<T, py::array::c_style>& constants,
+         const std::map<std::pair<dolfinx::fem::IntegralType, int>,
+                        py::array_t<T, py::array::c_style>>& coefficients,
+         const py::array_t<std::int8_t, py::array::c_style>& rows0,
+         const py::array_t<std::int8_t, py::array::c_style>& rows1,
+         int num_threads)
+      {
+        if (rows0.ndim() != 1 or rows1.ndim() != 1)
+        {
+          throw std::runtime_error(
+              "Expected 1D arrays for boundary condition rows/columns");
+        }
+
+        const std::array<int, 2> data_bs
+            = {a.function_spaces().at(0)->dofmap()->index_map_bs(),
+               a.function_spaces().at(1)->dofmap()->index_map_bs()};
+        if (data_bs[0] != data_bs[1])
+          throw std::runtime_error(
+              "Non-square blocksize unsupported in Python");
+
+        auto assemble = [&](auto mat_add)
+        {
+          dolfinx::fem::assemble_matrix(
+              mat_add, a, std::span(constants.data(), constants.size()),
+              py_to_cpp_coeffs(coefficients),
+              std::span(rows0.data(), rows0.size()),
+              std::span(rows1.data(), rows1.size()), num_threads);
+        };
+
+        if (data_bs[0] == 1)
+          assemble(A.mat_add_values());
+        else if (data_bs[0] == 2)
+          assemble(A.template mat_add_values<2, 2>());
+        else if (data_bs[0] == 3)
+          assemble(A.template mat_add_values<3, 3>());
+        else
+          throw std::runtime_error("Block size not supported in Python");
+      },
+      py::arg("A"), py::arg("a"), py::arg("constants"), py::arg("coeffs"),
+      py::arg("rows0"), py::arg("rows1"), py::arg("num_threads") = 1,
+      "Experimental.");
+  m.def(
+      "insert_diagonal",
+      [](dolfinx::la::MatrixCSR<T>& A,
+         const py::array_t<std::int32_t, py::array::c_style>& rows,
+         T diagonal)
+      {
+        dolfinx::fem::set_diagonal(A.mat_set_values(),
+                                   std::span(rows.data(), rows.size()),
+                                   diagonal);
+      },
+      py::arg("A"), py::arg("rows"), py::arg("diagonal"), "Experimental.");
   m.def(
       "insert_diagonal",
       [](dolfinx::la::MatrixCSR<T>& A, const dolfinx::fem::FunctionSpace<U>& V,
@@ -192,6 +361,25 @@ void declare_assembly_functions(py::module& m)
       },
       py::arg("A"), py::arg("V"), py::arg("bcs"), py::arg("diagonal"),
       "Experimental.");
+  m.def(
+      "assemble_diagonal",
+      [](py::array_t<T, py::array::c_style> d,
+         const dolfinx::fem::Form<T, U>& a,
+         const py::array_t<T, py::array::c_style>& constants,
+         const std::map<std::pair<dolfinx::fem::IntegralType, int>,
+                        py::array_t<T, py::array::c_style>>& coefficients,
+         const std::vector<
+             std::shared_ptr<const dolfinx::fem::DirichletBC<T, U>>>& bcs,
+         T diagonal)
+      {
+        dolfinx::fem::assemble_diagonal<T>(
+            std::span(d.mutable_data(), d.size()), a,
+            std::span(constants.data(), constants.size()),
+            py_to_cpp_coeffs(coefficients), bcs, diagonal);
+      },
+      py::arg("d"), py::arg("a"), py::arg("constants"), py::arg("coeffs"),
+      py::arg("bcs"), py::arg("diagonal") = 1,
+      "Assemble the diagonal of a bilinear form into an existing vector");
   m.def(
       "assemble_matrix",
       [](const std::function<int(const py::array_t<std::int32_t>&,
@@ -250,6 +438,38 @@ void declare_assembly_functions(py::module& m)
       py::arg("b"), py::arg("a"), py::arg("constants"), py::arg("coeffs"),
       py::arg("bcs1"), py::arg("x0"), py::arg("scale"),
       "Modify vector for lifted boundary conditions");
+  m.def(
+      "assemble_system_rhs",
+      [](py::array_t<T, py::array::c_style> b,
+         const dolfinx::fem::Form<T, U>& L, const dolfinx::fem::Form<T, U>& a,
+         const py::array_t<T, py::array::c_style>& constants_L,
+         const std::map<std::pair<dolfinx::fem::IntegralType, int>,
+                        py::array_t<T, py::array::c_style>>& coeffs_L,
+         const py::array_t<T, py::array::c_style>& constants_a,
+         const std::map<std::pair<dolfinx::fem::IntegralType, int>,
+                        py::array_t<T, py::array::c_style>>& coeffs_a,
+         const std::vector<
+             std::shared_ptr<const dolfinx::fem::DirichletBC<T, U>>>& bcs,
+         const py::array_t<T, py::array::c_style>& x0, T scale)
+      {
+        std::span<const T> _x0;
+        if (x0.ndim() == 1)
+          _x0 = std::span(x0.data(), x0.shape(0));
+        else if (x0.ndim() != 0)
+          throw std::runtime_error("Wrong array dimension.");
+
+        dolfinx::fem::assemble_system_rhs<T>(
+            std::span(b.mutable_data(), b.size()), L, a,
+            std::span(constants_L.data(), constants_L.size()),
+            py_to_cpp_coeffs(coeffs_L),
+            std::span(constants_a.data(), constants_a.size()),
+            py_to_cpp_coeffs(coeffs_a), bcs, _x0, scale);
+      },
+      py::arg("b"), py::arg("L"), py::arg("a"), py::arg("constants_L"),
+      py::arg("coeffs_L"), py::arg("constants_a"), py::arg("coeffs_a"),
+      py::arg("bcs"), py::arg("x0") = py::none(), py::arg("scale") = T(1),
+      "Assemble linear form into an existing vector and modify it for "
+      "lifted boundary conditions in one pass over the cells");
   m.def(
       "set_bc",
       [](py::array_t<T, py::array::c_style> b,
@@ -272,6 +492,22 @@ void declare_assembly_functions(py::module& m)
       },
       py::arg("b"), py::arg("bcs"), py::arg("x0") = py::none(),
       py::arg("scale") = T(1));
+
+  // Static condensation
+  m.def(
+      "backsubstitute_condensed",
+      [](py::array_t<T, py::array::c_style> u_l,
+         const py::array_t<T, py::array::c_style>& u_g,
+         const std::vector<std::vector<const dolfinx::fem::Form<T, U>*>>& a,
+         const std::vector<const dolfinx::fem::Form<T, U>*>& L, int local)
+      {
+        dolfinx::fem::backsubstitute_condensed<T>(
+            std::span(u_l.mutable_data(), u_l.size()),
+            std::span(u_g.data(), u_g.size()), a, L, local);
+      },
+      py::arg("u_l"), py::arg("u_g"), py::arg("a"), py::arg("L"),
+      py::arg("local"),
+      "Recover the cell-local unknowns of a statically condensed system");
 }
 
 void petsc_module(py::module& m)
@@ -287,11 +523,26 @@ void petsc_module(py::module& m)
         py::return_value_policy::take_ownership, py::arg("a"),
         py::arg("type") = std::string(),
         "Create a PETSc Mat for bilinear form.");
-  m.def("create_matrix_block",
-        &dolfinx::fem::petsc::create_matrix_block<double>,
-        py::return_value_policy::take_ownership, py::arg("a"),
-        py::arg("type") = std::string(),
-        "Create monolithic sparse matrix for stacked bilinear forms.");
+  m.def(
+      "create_matrix_block",
+      [](const std::vector<
+             std::vector<const dolfinx::fem::Form<PetscScalar, double>*>>& a,
+         const std::string& type)
+      { return dolfinx::fem::petsc::create_matrix_block(a, type); },
+      py::return_value_policy::take_ownership, py::arg("a"),
+      py::arg("type") = std::string(),
+      "Create monolithic sparse matrix for stacked bilinear forms.");
+  m.def(
+      "create_matrix_block",
+      [](const dolfinx::la::SparsityPattern& pattern,
+         const std::array<std::vector<std::shared_ptr<
+                              const dolfinx::fem::FunctionSpace<double>>>,
+                          2>& V,
+         const std::string& type)
+      { return dolfinx::fem::petsc::create_matrix_block(pattern, V, type); },
+      py::return_value_policy::take_ownership, py::arg("pattern"), py::arg("V"),
+      py::arg("type") = std::string(),
+      "Create monolithic sparse matrix with a given sparsity pattern.");
   m.def("create_matrix_nest", &dolfinx::fem::petsc::create_matrix_nest<double>,
         py::return_value_policy::take_ownership, py::arg("a"),
         py::arg("types") = std::vector<std::vector<std::string>>(),
@@ -307,27 +558,38 @@ void petsc_module(py::module& m)
              coefficients,
          const std::vector<std::shared_ptr<
              const dolfinx::fem::DirichletBC<PetscScalar, double>>>& bcs,
-         bool unrolled)
+         bool unrolled, int num_threads)
       {
+        // PETSc matrix insertion is not thread-safe
+        std::mutex mutex;
+        auto assemble = [&](auto set_fn)
+        {
+          if (num_threads > 1)
+          {
+            dolfinx::fem::assemble_matrix(
+                serialise(set_fn, mutex), a,
+                std::span(constants.data(), constants.size()),
+                py_to_cpp_coeffs(coefficients), bcs, num_threads);
+          }
+          else
+          {
+            dolfinx::fem::assemble_matrix(
+                set_fn, a, std::span(constants.data(), constants.size()),
+                py_to_cpp_coeffs(coefficients), bcs);
+          }
+        };
+
         if (unrolled)
         {
-          auto set_fn = dolfinx::la::petsc::Matrix::set_block_expand_fn(
+          assemble(dolfinx::la::petsc::Matrix::set_block_expand_fn(
               A, a.function_spaces()[0]->dofmap()->bs(),
-              a.function_spaces()[1]->dofmap()->bs(), ADD_VALUES);
-          dolfinx::fem::assemble_matrix(
-              set_fn, a, std::span(constants.data(), constants.size()),
-              py_to_cpp_coeffs(coefficients), bcs);
+              a.function_spaces()[1]->dofmap()->bs(), ADD_VALUES));
         }
         else
-        {
-          dolfinx::fem::assemble_matrix(
-              dolfinx::la::petsc::Matrix::set_block_fn(A, ADD_VALUES), a,
-              std::span(constants.data(), constants.size()),
-              py_to_cpp_coeffs(coefficients), bcs);
-        }
+          assemble(dolfinx::la::petsc::Matrix::set_block_fn(A, ADD_VALUES));
       },
       py::arg("A"), py::arg("a"), py::arg("constants"), py::arg("coeffs"),
-      py::arg("bcs"), py::arg("unrolled") = false,
+      py::arg("bcs"), py::arg("unrolled") = false, py::arg("num_threads") = 1,
       "Assemble bilinear form into an existing PETSc matrix");
   m.def(
       "assemble_matrix",
@@ -338,7 +600,7 @@ void petsc_module(py::module& m)
              coefficients,
          const py::array_t<std::int8_t, py::array::c_style>& rows0,
          const py::array_t<std::int8_t, py::array::c_style>& rows1,
-         bool unrolled)
+         bool unrolled, int num_threads)
       {
         if (rows0.ndim() != 1 or rows1.ndim())
         {
@@ -359,14 +621,20 @@ void petsc_module(py::module& m)
         else
           set_fn = dolfinx::la::petsc::Matrix::set_block_fn(A, ADD_VALUES);
 
+        // PETSc matrix insertion is not thread-safe
+        std::mutex mutex;
+        if (num_threads > 1)
+          set_fn = serialise(set_fn, mutex);
+
         dolfinx::fem::assemble_matrix(
             set_fn, a, std::span(constants.data(), constants.size()),
             py_to_cpp_coeffs(coefficients),
             std::span(rows0.data(), rows0.size()),
-            std::span(rows1.data(), rows1.size()));
+            std::span(rows1.data(), rows1.size()), num_threads);
       },
       py::arg("A"), py::arg("a"), py::arg("constants"), py::arg("coeffs"),
-      py::arg("rows0"), py::arg("rows1"), py::arg("unrolled") = false);
+      py::arg("rows0"), py::arg("rows1"), py::arg("unrolled") = false,
+      py::arg("num_threads") = 1);
   m.def(
       "insert_diagonal",
       [](Mat A, const dolfinx::fem::FunctionSpace<double>& V,
@@ -380,6 +648,57 @@ void petsc_module(py::module& m)
       },
       py::arg("A"), py::arg("V"), py::arg("bcs"), py::arg("diagonal"));
 
+  // Static condensation
+  m.def(
+      "create_matrix_condensed",
+      [](const dolfinx::fem::FunctionSpace<double>& V,
+         const dolfinx::fem::Form<PetscScalar, double>* a)
+      {
+        assert(V.mesh());
+        auto mesh = V.mesh();
+        MPI_Comm comm = mesh->comm();
+        std::shared_ptr<const dolfinx::fem::DofMap> dofmap = V.dofmap();
+        assert(dofmap);
+        assert(dofmap->index_map);
+
+        // The Schur complement couples the global dofs of each cell. Add
+        // the cell pattern to the pattern of the global block, if any.
+        dolfinx::la::SparsityPattern sp
+            = a ? dolfinx::fem::create_sparsity_pattern(*a)
+                : dolfinx::la::SparsityPattern(
+                      comm, {dofmap->index_map, dofmap->index_map},
+                      {dofmap->index_map_bs(), dofmap->index_map_bs()});
+        int tdim = mesh->topology()->dim();
+        auto map = mesh->topology()->index_map(tdim);
+        assert(map);
+        std::vector<std::int32_t> c(map->size_local(), 0);
+        std::iota(c.begin(), c.end(), 0);
+        dolfinx::fem::sparsitybuild::cells(sp, c, {*dofmap, *dofmap});
+        sp.finalize();
+        return dolfinx::la::petsc::create_matrix(comm, sp);
+      },
+      py::return_value_policy::take_ownership, py::arg("V"), py::arg("a"),
+      "Create a matrix for the Schur complement of a statically condensed "
+      "system.");
+  m.def(
+      "assemble_condensed",
+      [](Mat A, py::array_t<PetscScalar, py::array::c_style> b,
+         const std::vector<
+             std::vector<const dolfinx::fem::Form<PetscScalar, double>*>>& a,
+         const std::vector<const dolfinx::fem::Form<PetscScalar, double>*>& L,
+         int local,
+         const std::vector<std::shared_ptr<
+             const dolfinx::fem::DirichletBC<PetscScalar, double>>>& bcs)
+      {
+        dolfinx::fem::assemble_condensed(
+            dolfinx::la::petsc::Matrix::set_block_fn(A, ADD_VALUES),
+            std::span(b.mutable_data(), b.size()), a, L, local, bcs);
+      },
+      py::arg("A"), py::arg("b"), py::arg("a"), py::arg("L"), py::arg("local"),
+      py::arg("bcs"),
+      "Add the Schur complement of the cell-local unknowns to an existing "
+      "PETSc matrix and vector");
+
   m.def(
       "discrete_gradient",
       [](const dolfinx::fem::FunctionSpace<double>& V0,
@@ -22,6 +22,7 @@
 #include <dolfinx/fem/FunctionSpace.h>
 #include <dolfinx/fem/dofmapbuilder.h>
 #include <dolfinx/fem/interpolate.h>
+#include <dolfinx/fem/profiling.h>
 #include <dolfinx/fem/sparsitybuild.h>
 #include <dolfinx/fem/utils.h>
 #include <dolfinx/graph/ordering.h>
@@ -466,6 +467,7 @@ void declare_form(py::module& m, const std::string& type)
       .def_property_readonly(
           "needs_facet_permutations",
           &dolfinx::fem::Form<T, double>::needs_facet_permutations)
+      .def_readwrite("name", &dolfinx::fem::Form<T, double>::name)
       .def(
           "domains",
           [](const dolfinx::fem::Form<T, double>& self,
@@ -495,7 +497,15 @@ void declare_form(py::module& m, const std::string& type)
               throw ::std::runtime_error("Integral type unsupported.");
             }
           },
-          py::arg("type"), py::arg("i"));
+          py::arg("type"), py::arg("i"))
+      .def_property("geometry_cache",
+                    &dolfinx::fem::Form<T, double>::geometry_cache,
+                    &dolfinx::fem::Form<T, double>::set_geometry_cache)
+      .def("colouring", &dolfinx::fem::Form<T, double>::colouring,
+           py::return_value_policy::reference_internal, py::arg("type"),
+           py::arg("i"),
+           "Colouring of the entities of an integration domain, used for "
+           "threaded assembly.");
 
   // Form
   std::string pymethod_create_form = std::string("create_form_") + type;
@@ -540,9 +550,16 @@ void declare_form(py::module& m, const std::string& type)
       py::arg("constants"), py::arg("subdomains"), py::arg("mesh"),
       "Create Form from a pointer to ufcx_form.");
 
-  m.def("create_sparsity_pattern",
-        &dolfinx::fem ::create_sparsity_pattern<T, double>, py::arg("a"),
-        "Create a sparsity pattern.");
+  m.def(
+      "create_sparsity_pattern", [](const dolfinx::fem::Form<T, double>& a)
+      { return dolfinx::fem::create_sparsity_pattern(a); }, py::arg("a"),
+      "Create a sparsity pattern.");
+  m.def(
+      "create_sparsity_pattern",
+      [](const std::vector<std::vector<const dolfinx::fem::Form<T, double>*>>&
+             a) { return dolfinx::fem::create_sparsity_pattern(a); },
+      py::arg("a"),
+      "Create a sparsity pattern for a rectangular array of forms.");
 }
 
 template <typename T>
@@ -677,6 +694,39 @@ void fem(py::module& m)
   declare_cmap<float>(m, "float32");
   declare_cmap<double>(m, "float64");
 
+  // dolfinx::fem::profiling
+  py::module profiling
+      = m.def_submodule("profiling", "Profiling of assembly by integral");
+  profiling.def("enable", &dolfinx::fem::profiling::enable,
+                py::arg("on") = true);
+  profiling.def("enabled", &dolfinx::fem::profiling::enabled);
+  profiling.def("reset", &dolfinx::fem::profiling::reset);
+  profiling.def("set_flops", &dolfinx::fem::profiling::set_flops,
+                py::arg("form"), py::arg("type"), py::arg("id"),
+                py::arg("flops"));
+  profiling.def(
+      "profiles",
+      []()
+      {
+        py::dict profiles;
+        for (auto& [key, p] : dolfinx::fem::profiling::profiles())
+        {
+          auto& [form, type, id] = key;
+          profiles[py::make_tuple(form, type, id)]
+              = py::make_tuple(p.num_entities, p.num_calls, p.kernel,
+                               p.packing, p.insertion, p.flops_per_call);
+        }
+        return profiles;
+      },
+      "Recorded data (entities, kernel calls, kernel time, packing time, "
+      "insertion time, FLOP per kernel call) on this process for each "
+      "(form name, integral type, integral id)");
+  profiling.def(
+      "list_profiles",
+      [](const MPICommWrapper comm, dolfinx::Table::Reduction reduction)
+      { dolfinx::fem::profiling::list_profiles(comm.get(), reduction); },
+      py::arg("comm"), py::arg("reduction"));
+
   m.def(
       "create_element_dof_layout",
       [](std::uintptr_t dofmap, const dolfinx::mesh::CellType cell_type,
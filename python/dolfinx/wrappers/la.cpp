@@ -11,8 +11,10 @@
 #include <dolfinx/la/MatrixCSR.h>
 #include <dolfinx/la/SparsityPattern.h>
 #include <dolfinx/la/Vector.h>
+#include <dolfinx/la/krylov.h>
 #include <dolfinx/la/petsc.h>
 #include <dolfinx/la/utils.h>
+#include <cstddef>
 #include <memory>
 #include <petsc4py/petsc4py.h>
 #include <pybind11/complex.h>
@@ -33,6 +35,56 @@ enum class PyInsertMode
   insert
 };
 
+// Declare Krylov solvers for a preconditioner type P. If P is
+// std::nullptr_t, the solvers accept `None` and are unpreconditioned.
+template <typename T, typename P>
+void declare_krylov_solvers(py::module& m)
+{
+  namespace krylov = dolfinx::la::krylov;
+  auto precond = [](const P& M)
+  {
+    if constexpr (std::is_same_v<P, std::nullptr_t>)
+      return krylov::Identity<T>();
+    else
+      return std::cref(M);
+  };
+
+  m.def(
+      "cg",
+      [precond](dolfinx::la::MatrixCSR<T>& A, const dolfinx::la::Vector<T>& b,
+                dolfinx::la::Vector<T>& x, const P& M, double rtol,
+                double atol, int max_it, int num_threads)
+      {
+        return krylov::cg(krylov::matrix_operator(A, num_threads), precond(M),
+                          x, b, rtol, atol, max_it);
+      },
+      py::arg("A"), py::arg("b"), py::arg("x"), py::arg("M"), py::arg("rtol"),
+      py::arg("atol"), py::arg("max_it"), py::arg("num_threads"));
+  m.def(
+      "gmres",
+      [precond](dolfinx::la::MatrixCSR<T>& A, const dolfinx::la::Vector<T>& b,
+                dolfinx::la::Vector<T>& x, const P& M, double rtol,
+                double atol, int max_it, int restart, int num_threads)
+      {
+        return krylov::gmres(krylov::matrix_operator(A, num_threads),
+                             precond(M), x, b, rtol, atol, max_it, restart);
+      },
+      py::arg("A"), py::arg("b"), py::arg("x"), py::arg("M"), py::arg("rtol"),
+      py::arg("atol"), py::arg("max_it"), py::arg("restart"),
+      py::arg("num_threads"));
+  m.def(
+      "bicgstab",
+      [precond](dolfinx::la::MatrixCSR<T>& A, const dolfinx::la::Vector<T>& b,
+                dolfinx::la::Vector<T>& x, const P& M, double rtol,
+                double atol, int max_it, int num_threads)
+      {
+        return krylov::bicgstab(krylov::matrix_operator(A, num_threads),
+                                precond(M), x, b, rtol, atol, max_it);
+      },
+      py::arg("A"), py::arg("b"), py::arg("x"), py::arg("M"), py::arg("rtol"),
+      py::arg("atol"), py::arg("max_it"), py::arg("num_threads"));
+}
+
 // Declare objects that have multiple scalar types
 template <typename T>
 void declare_objects(py::module& m, const std::string& type)
@@ -64,6 +116,8 @@ void declare_objects(py::module& m, const std::string& type)
                                return py::array_t<T>(array.size(), array.data(),
                                                      py::cast(self));
                              })
+      .def_property_readonly("state", &dolfinx::la::Vector<T>::state)
+      .def("increase_state", &dolfinx::la::Vector<T>::increase_state)
       .def("scatter_forward", &dolfinx::la::Vector<T>::scatter_fwd)
       .def(
           "scatter_reverse",
@@ -89,16 +143,22 @@ void declare_objects(py::module& m, const std::string& type)
   py::class_<dolfinx::la::MatrixCSR<T>,
              std::shared_ptr<dolfinx::la::MatrixCSR<T>>>(
       m, pyclass_matrix_name.c_str())
-      .def(py::init([](const dolfinx::la::SparsityPattern& p,
-                       dolfinx::la::BlockMode bm)
-                    { return dolfinx::la::MatrixCSR<T>(p, bm); }),
+      .def(py::init(
+               [](const dolfinx::la::SparsityPattern& p,
+                  dolfinx::la::BlockMode bm, dolfinx::la::StorageMode storage)
+               { return dolfinx::la::MatrixCSR<T>(p, bm, storage); }),
            py::arg("p"),
-           py::arg("block_mode") = dolfinx::la::BlockMode::compact)
+           py::arg("block_mode") = dolfinx::la::BlockMode::compact,
+           py::arg("storage") = dolfinx::la::StorageMode::general)
       .def_property_readonly("dtype", [](const dolfinx::la::MatrixCSR<T>& self)
                              { return py::dtype::of<T>(); })
       .def_property_readonly("block_size",
                              &dolfinx::la::MatrixCSR<T>::block_size)
+      .def_property_readonly("storage_mode",
+                             &dolfinx::la::MatrixCSR<T>::storage_mode)
       .def("squared_norm", &dolfinx::la::MatrixCSR<T>::squared_norm)
+      .def("mult", &dolfinx::la::MatrixCSR<T>::mult, py::arg("x"), py::arg("y"),
+           py::arg("num_threads") = 1)
       .def("index_map", &dolfinx::la::MatrixCSR<T>::index_map)
       .def("add",
            [](dolfinx::la::MatrixCSR<T>& self, const std::vector<T>& x,
@@ -169,6 +229,50 @@ void declare_objects(py::module& m, const std::string& type)
                              })
       .def("finalize_begin", &dolfinx::la::MatrixCSR<T>::finalize_begin)
       .def("finalize_end", &dolfinx::la::MatrixCSR<T>::finalize_end);
+
+  // Preconditioners
+  namespace krylov = dolfinx::la::krylov;
+  std::string pyclass_jacobi_name = std::string("Jacobi_") + type;
+  py::class_<krylov::Jacobi<T>, std::shared_ptr<krylov::Jacobi<T>>>(
+      m, pyclass_jacobi_name.c_str())
+      .def(py::init<const dolfinx::la::MatrixCSR<T>&>(), py::arg("A"))
+      .def(
+          "apply",
+          [](const krylov::Jacobi<T>& self, const dolfinx::la::Vector<T>& x,
+             dolfinx::la::Vector<T>& y) { self(x, y); },
+          py::arg("x"), py::arg("y"));
+  std::string pyclass_block_jacobi_name = std::string("BlockJacobi_") + type;
+  py::class_<krylov::BlockJacobi<T>, std::shared_ptr<krylov::BlockJacobi<T>>>(
+      m, pyclass_block_jacobi_name.c_str())
+      .def(py::init<const dolfinx::la::MatrixCSR<T>&, int>(), py::arg("A"),
+           py::arg("block_size") = 0)
+      .def_property_readonly("block_size", &krylov::BlockJacobi<T>::block_size)
+      .def(
+          "apply",
+          [](const krylov::BlockJacobi<T>& self,
+             const dolfinx::la::Vector<T>& x, dolfinx::la::Vector<T>& y)
+          { self(x, y); },
+          py::arg("x"), py::arg("y"));
+  std::string pyclass_chebyshev_name = std::string("Chebyshev_") + type;
+  py::class_<krylov::Chebyshev<T>, std::shared_ptr<krylov::Chebyshev<T>>>(
+      m, pyclass_chebyshev_name.c_str())
+      .def(py::init<dolfinx::la::MatrixCSR<T>&, int, std::array<double, 2>,
+                    int>(),
+           py::keep_alive<1, 2>(), py::arg("A"), py::arg("degree") = 3,
+           py::arg("bounds") = std::array<double, 2>{0, 0},
+           py::arg("num_threads") = 1)
+      .def_property_readonly("bounds", &krylov::Chebyshev<T>::bounds)
+      .def(
+          "apply",
+          [](const krylov::Chebyshev<T>& self, const dolfinx::la::Vector<T>& x,
+             dolfinx::la::Vector<T>& y) { self(x, y); },
+          py::arg("x"), py::arg("y"));
+
+  // Krylov solvers
+  declare_krylov_solvers<T, std::nullptr_t>(m);
+  declare_krylov_solvers<T, krylov::Jacobi<T>>(m);
+  declare_krylov_solvers<T, krylov::BlockJacobi<T>>(m);
+  declare_krylov_solvers<T, krylov::Chebyshev<T>>(m);
 }
 
 void petsc_module(py::module& m)
@@ -249,6 +353,17 @@ void la(py::module& m)
       .value("compact", dolfinx::la::BlockMode::compact)
       .value("expanded", dolfinx::la::BlockMode::expanded);
 
+  py::enum_<dolfinx::la::StorageMode>(m, "StorageMode")
+      .value("general", dolfinx::la::StorageMode::general)
+      .value("symmetric", dolfinx::la::StorageMode::symmetric);
+
+  py::class_<dolfinx::la::krylov::SolverInfo>(m, "SolverInfo")
+      .def_readonly("iterations",
+                    &dolfinx::la::krylov::SolverInfo::iterations)
+      .def_readonly("residual_norm",
+                    &dolfinx::la::krylov::SolverInfo::residual_norm)
+      .def_readonly("converged", &dolfinx::la::krylov::SolverInfo::converged);
+
   py::enum_<dolfinx::la::Norm>(m, "Norm")
       .value("l1", dolfinx::la::Norm::l1)
       .value("l2", dolfinx::la::Norm::l2)
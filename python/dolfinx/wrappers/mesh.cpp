@@ -154,13 +154,19 @@ void declare_mesh(py::module& m, std::string type)
       .def("index_map", &dolfinx::mesh::Geometry<T>::index_map)
       .def_property_readonly(
           "x",
-          [](const dolfinx::mesh::Geometry<T>& self)
+          [](dolfinx::mesh::Geometry<T>& self)
           {
-            std::array<std::size_t, 2> shape{self.x().size() / 3, 3};
-            return py::array_t<T>(shape, self.x().data(), py::cast(self));
+            std::span<T> x = self.x();
+            std::array<std::size_t, 2> shape{x.size() / 3, 3};
+            return py::array_t<T>(shape, x.data(), py::cast(self));
           },
           "Return coordinates of all geometry points. Each row is the "
-          "coordinate of a point.")
+          "coordinate of a point. Call increase_state after modifying the "
+          "coordinates.")
+      .def_property_readonly("state", &dolfinx::mesh::Geometry<T>::state)
+      .def("increase_state", &dolfinx::mesh::Geometry<T>::increase_state,
+           "Increase the modification state after the coordinates have "
+           "been modified.")
       .def_property_readonly("cmaps", &dolfinx::mesh::Geometry<T>::cmaps,
                              "The coordinate maps")
       .def_property_readonly("input_global_indices",
@@ -6,6 +6,10 @@
 
 import importlib
 import pkgutil
+import subprocess
+import sys
+
+import pytest
 
 
 def collect_pkg_modules_recursive(name):
@@ -32,3 +36,20 @@ def test_all_implemented():
         if hasattr(module, "__all__"):
             for member in module.__all__:
                 assert hasattr(module, member)
+
+
+@pytest.mark.skip_in_parallel
+def test_lazy_import():
+    """Check that importing dolfinx does not import the submodules and
+    their heavy dependencies until they are accessed."""
+    code = ("import sys; import dolfinx; "
+            "assert 'dolfinx.fem' not in sys.modules; "
+            "assert 'ffcx' not in sys.modules; "
+            "assert 'petsc4py.PETSc' not in sys.modules; "
+            "dolfinx.io; "
+            "assert 'dolfinx.fem' not in sys.modules; "
+            "dolfinx.fem; "
+            "assert 'dolfinx.fem.petsc' not in sys.modules; "
+            "dolfinx.fem.petsc; "
+            "assert dolfinx.timing('Import dolfinx.fem')[0] == 1")
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -8,11 +8,14 @@
 import numpy as np
 import pytest
 import ufl
-from dolfinx.fem import (Constant, Function, FunctionSpace, assemble_scalar,
-                         dirichletbc, form)
-from dolfinx.fem.petsc import (apply_lifting, assemble_matrix, assemble_vector,
-                               set_bc)
-from dolfinx.mesh import (GhostMode, Mesh, create_unit_square, locate_entities,
+from dolfinx.common import Reduction
+from dolfinx.fem import (Constant, Function, FunctionSpace, IntegralType,
+                         assemble_scalar, dirichletbc, form,
+                         locate_dofs_topological, profiling)
+from dolfinx.fem.petsc import (apply_lifting, assemble_matrix,
+                               assemble_system_rhs, assemble_vector, set_bc)
+from dolfinx.mesh import (GhostMode, Mesh, compute_midpoints,
+                          create_unit_square, locate_entities,
                           locate_entities_boundary, meshtags,
                           meshtags_from_entities)
 from mpi4py import MPI
@@ -231,6 +234,43 @@ def test_additivity(mode):
     assert (J1 + J2 + J3) == pytest.approx(J123)
 
 
+@pytest.mark.parametrize("mode", [GhostMode.none, GhostMode.shared_facet])
+def test_cached_integration_domains(mode):
+    """Test that facet integration domains are computed once for mesh
+    tags and shared by forms"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 8, 8, ghost_mode=mode)
+    tdim = mesh.topology.dim
+    mesh.topology.create_entities(tdim - 1)
+    facet_map = mesh.topology.index_map(tdim - 1)
+    facets = np.arange(facet_map.size_local + facet_map.num_ghosts, dtype=np.int32)
+    midpoints = compute_midpoints(mesh, tdim - 1, facets)
+    values = np.where(midpoints[:, 0] < 0.5, 1, 2).astype(np.int32)
+    tags = meshtags(mesh, tdim - 1, facets, values)
+    ds = ufl.Measure("ds", domain=mesh, subdomain_data=tags)
+    dS = ufl.Measure("dS", domain=mesh, subdomain_data=tags)
+
+    assert len(tags._integration_domains) == 0
+    forms = [form(Constant(mesh, default_scalar_type(i)) * (ds(1) + dS(2))) for i in range(1, 4)]
+    exterior = tags.integration_domains(_cpp.fem.IntegralType.exterior_facet)
+    interior = tags.integration_domains(_cpp.fem.IntegralType.interior_facet)
+    assert exterior is tags.integration_domains(_cpp.fem.IntegralType.exterior_facet)
+    for domains in (exterior, interior):
+        ids = [value for value, _ in domains]
+        assert ids == sorted(ids) and set(ids) <= {1, 2}
+    assert all(e.shape[0] % 2 == 0 and not e.flags.writeable for _, e in exterior)
+    assert all(e.shape[0] % 4 == 0 for _, e in interior)
+
+    # Forms sharing the cached data give the same result as forms on
+    # new tags
+    tags_new = meshtags(mesh, tdim - 1, facets, values)
+    ds_new = ufl.Measure("ds", domain=mesh, subdomain_data=tags_new)
+    dS_new = ufl.Measure("dS", domain=mesh, subdomain_data=tags_new)
+    ref = mesh.comm.allreduce(assemble_scalar(form(ds_new(1) + dS_new(2))), op=MPI.SUM)
+    for i, M in enumerate(forms):
+        value = mesh.comm.allreduce(assemble_scalar(M), op=MPI.SUM)
+        assert value == pytest.approx((i + 1) * ref)
+
+
 def test_manual_integration_domains():
     """Test that specifying integration domains manually i.e.
     by passing a list of cell indices or (cell, local facet) pairs to
@@ -333,3 +373,113 @@ def test_manual_integration_domains():
 
     assert np.isclose((A - A_mt).norm(), 0.0)
     assert np.isclose((b - b_mt).norm(), 0.0)
+
+
+@pytest.mark.parametrize("num_threads", [1, 2])
+def test_assembly_profiling(mesh, num_threads):
+    """Test that assembly is profiled by form, integral type and id"""
+    V = FunctionSpace(mesh, ("Lagrange", 1))
+    u, v = ufl.TrialFunction(V), ufl.TestFunction(V)
+    tdim = mesh.topology.dim
+    cells = locate_entities(mesh, tdim, lambda x: x[0] <= 0.5)
+    cell_tags = meshtags(mesh, tdim, cells, np.full(len(cells), 1, dtype=np.int32))
+    dx = ufl.Measure("dx", subdomain_data=cell_tags, domain=mesh)
+
+    profiling.enable()
+    try:
+        profiling.reset()
+        a = form(ufl.inner(u, v) * dx(1) + ufl.inner(u, v) * ufl.ds)
+        L = form(ufl.inner(1.0, v) * dx)
+        a.name, L.name = "mass", "load"
+        A = assemble_matrix(a, num_threads=num_threads)
+        A.assemble()
+        b = assemble_vector(L, num_threads=num_threads)
+        A.destroy(), b.destroy()
+    finally:
+        profiling.disable()
+
+    rows = {(p.form, p.integral_type, p.id): p for p in profiling.table(mesh.comm, Reduction.max)}
+    assert set(rows) == {("mass", IntegralType.cell, 1), ("mass", IntegralType.exterior_facet, -1),
+                         ("load", IntegralType.cell, -1)}
+    for (name, integral_type, i), p in rows.items():
+        f = a if name == "mass" else L
+        num_entities = mesh.comm.allreduce(len(f.domains(integral_type, i)), op=MPI.MAX)
+        assert p.num_entities == num_entities
+        assert p.kernel > 0.0 and p.packing > 0.0
+        assert (p.insertion > 0.0) == (name == "mass")
+
+    # No data is recorded when profiling is disabled
+    b = assemble_vector(L)
+    assert profiling.table(mesh.comm) == list(rows.values())
+    b.destroy()
+
+
+def test_assembly_profiling_lifting(mesh):
+    """Test that lifting is profiled for the bilinear form, in the fused
+    right-hand side assembly and in apply_lifting"""
+    V = FunctionSpace(mesh, ("Lagrange", 1))
+    u, v = ufl.TrialFunction(V), ufl.TestFunction(V)
+    a = form(ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx + ufl.inner(u, v) * ufl.ds)
+    L = form(ufl.inner(1.0, v) * ufl.dx + ufl.inner(1.0, v) * ufl.ds)
+    a.name, L.name = "stiffness", "load"
+    facets = locate_entities_boundary(mesh, 1, lambda x: np.isclose(x[0], 0.0))
+    bc = dirichletbc(PETSc.ScalarType(1.0), locate_dofs_topological(V, 1, facets), V)
+
+    def assemble_rhs():
+        b = assemble_vector(L)
+        apply_lifting(b, [a], [[bc]])
+        return b
+
+    keys = {(name, integral_type, -1) for name in ("stiffness", "load")
+            for integral_type in (IntegralType.cell, IntegralType.exterior_facet)}
+    for assemble in (lambda: assemble_system_rhs(L, a, [bc]), assemble_rhs):
+        profiling.enable()
+        try:
+            profiling.reset()
+            assemble().destroy()
+        finally:
+            profiling.disable()
+
+        rows = {(p.form, p.integral_type, p.id): p for p in profiling.table(mesh.comm, Reduction.max)}
+        assert set(rows) == keys
+        for (name, integral_type, i), p in rows.items():
+            f = a if name == "stiffness" else L
+            num_entities = mesh.comm.allreduce(len(f.domains(integral_type, i)), op=MPI.MAX)
+            assert p.num_entities == num_entities
+            assert p.kernel > 0.0
+
+
+def test_assembly_profiling_flops(mesh):
+    """Test the FLOP estimates of profiled integrals, which are kept when
+    a form is renamed"""
+    pytest.importorskip("ffcx.codegeneration.flop_count")
+    V = FunctionSpace(mesh, ("Lagrange", 1))
+    u, v = ufl.TrialFunction(V), ufl.TestFunction(V)
+
+    profiling.enable()
+    try:
+        profiling.reset()
+        a = form(ufl.inner(u, v) * ufl.dx + ufl.inner(u, v) * ufl.ds)
+        a.name = "mass"
+        A = assemble_matrix(a)
+        A.assemble()
+        A.destroy()
+    finally:
+        profiling.disable()
+
+    rows = profiling.table(mesh.comm, Reduction.max)
+    keys = {(p.form, p.integral_type) for p in rows}
+    assert keys == {("mass", IntegralType.cell), ("mass", IntegralType.exterior_facet)}
+    for p in rows:
+        assert p.flops > 0.0
+
+    # The FLOP count is per kernel call, so it doubles with a second
+    # assembly
+    profiling.enable()
+    try:
+        A = assemble_matrix(a)
+        A.destroy()
+    finally:
+        profiling.disable()
+    for p0, p1 in zip(rows, profiling.table(mesh.comm, Reduction.max)):
+        assert p1.flops == pytest.approx(2 * p0.flops)
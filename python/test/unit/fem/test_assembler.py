@@ -27,7 +27,7 @@ from dolfinx.fem.petsc import (apply_lifting, apply_lifting_nest,
                                set_bc, set_bc_nest)
 from dolfinx.mesh import (CellType, GhostMode, create_mesh, create_rectangle,
                           create_unit_cube, create_unit_square,
-                          locate_entities_boundary)
+                          locate_entities_boundary, meshtags)
 from ufl import derivative, ds, dx, inner
 from ufl.geometry import SpatialCoordinate
 
@@ -179,6 +179,64 @@ def test_basic_assembly_petsc_matrixcsr(mode):
     A1.destroy()
 
 
+@pytest.mark.parametrize("num_threads", [2, 4])
+def test_threaded_assembly(num_threads):
+    mesh = create_unit_square(MPI.COMM_WORLD, 12, 12, ghost_mode=GhostMode.shared_facet)
+    V = VectorFunctionSpace(mesh, ("Lagrange", 2))
+    u, v = ufl.TrialFunction(V), ufl.TestFunction(V)
+    f = Function(V)
+    f.interpolate(lambda x: (x[0], x[1]))
+    a = form(inner(f[0] * u, v) * dx + inner(u, v) * ds + inner(ufl.avg(u), ufl.avg(v)) * ufl.dS)
+    L = form(inner(f, v) * dx + inner(f, v) * ds + inner(ufl.avg(f), ufl.avg(v)) * ufl.dS)
+    M = form(inner(f, f) * dx + f[0] * ds + ufl.avg(f[1]) * ufl.dS)
+
+    # Cells of the same colour do not share test space dofs
+    cells = a.domains(fem.IntegralType.cell, -1)
+    colouring = a.colouring(fem.IntegralType.cell, -1)
+    assert np.sort(colouring.array).tolist() == list(range(len(cells)))
+    for c in range(colouring.num_nodes):
+        dofs = V.dofmap.list[cells[colouring.links(c)]]
+        assert len(np.unique(dofs)) == dofs.size
+
+    value0 = assemble_scalar(M)
+    value1 = assemble_scalar(M, num_threads=num_threads)
+    assert value1 == pytest.approx(value0, rel=1e-12)
+
+    b0 = fem.assemble_vector(L)
+    b1 = fem.assemble_vector(L, num_threads=num_threads)
+    assert np.allclose(b1.array, b0.array, rtol=1e-12, atol=1e-14)
+
+    A0 = fem.assemble_matrix(a)
+    A1 = fem.assemble_matrix(a, num_threads=num_threads)
+    assert np.allclose(A1.data, A0.data, rtol=1e-12, atol=1e-14)
+
+    A0 = assemble_matrix(a)
+    A0.assemble()
+    A1 = assemble_matrix(a, num_threads=num_threads)
+    A1.assemble()
+    assert A1.norm() == pytest.approx(A0.norm(), rel=1e-12)
+    b0 = assemble_vector(L)
+    b1 = assemble_vector(L, num_threads=num_threads)
+    assert np.allclose(b1.array, b0.array, rtol=1e-12, atol=1e-14)
+    A0.destroy(), A1.destroy(), b0.destroy(), b1.destroy()
+
+
+def test_threaded_assembly_error():
+    """Test that an error in threaded assembly is raised on the calling
+    thread"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 8, 8, ghost_mode=GhostMode.shared_facet)
+    V = FunctionSpace(mesh, ("Lagrange", 1))
+    u, v = ufl.TrialFunction(V), ufl.TestFunction(V)
+
+    # Interior facet integrals couple dofs that are not in the sparsity
+    # pattern of the cell integral
+    A = fem.petsc.create_matrix(form(inner(u, v) * dx))
+    a = form(inner(ufl.avg(u), ufl.avg(v)) * ufl.dS)
+    with pytest.raises(RuntimeError):
+        assemble_matrix(A, a, num_threads=2)
+    A.destroy()
+
+
 @pytest.mark.parametrize("mode", [GhostMode.none, GhostMode.shared_facet])
 def test_assembly_bcs(mode):
     mesh = create_unit_square(MPI.COMM_WORLD, 12, 12, ghost_mode=mode)
@@ -364,6 +422,99 @@ def test_matrix_assembly_block(mode):
     assert bnorm2 == pytest.approx(bnorm0, 1.0e-9)
 
 
+def test_block_layout():
+    """Test re-use of a block layout for block assembly and fieldsplit"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 6, 4, ghost_mode=GhostMode.shared_facet)
+    V = VectorFunctionSpace(mesh, ("Lagrange", 2))
+    Q = FunctionSpace(mesh, ("Lagrange", 1))
+    u, v = ufl.TrialFunction(V), ufl.TestFunction(V)
+    p, q = ufl.TrialFunction(Q), ufl.TestFunction(Q)
+    a = form([[inner(ufl.grad(u), ufl.grad(v)) * dx, inner(p, ufl.div(v)) * dx],
+              [inner(ufl.div(u), q) * dx, inner(p, q) * dx]])
+    L = form([inner(ufl.as_vector([1.0, 0.0]), v) * dx, inner(1.0, q) * dx])
+    facets = locate_entities_boundary(mesh, 1, lambda x: np.isclose(x[0], 0.0))
+    bc = dirichletbc(np.array([1.0, 2.0], dtype=PETSc.ScalarType), locate_dofs_topological(V, 1, facets), V)
+
+    layout = fem.petsc.BlockLayout(a)
+    sizes = [V.dofmap.index_map.size_local * 2, Q.dofmap.index_map.size_local]
+    assert np.array_equal(layout.offsets, [0, sizes[0], sizes[0] + sizes[1]])
+
+    A0 = assemble_matrix_block(a, bcs=[bc])
+    A0.assemble()
+    b0 = assemble_vector_block(L, a, bcs=[bc])
+    A1 = assemble_matrix_block(a, bcs=[bc], layout=layout)
+    A1.assemble()
+    b1 = assemble_vector_block(L, a, bcs=[bc], layout=layout)
+    for _ in range(2):
+        A1.zeroEntries()
+        assemble_matrix_block(A1, a, bcs=[bc], layout=layout)
+        A1.assemble()
+        with b1.localForm() as b_local:
+            b_local.set(0.0)
+        assemble_vector_block(b1, L, a, bcs=[bc], layout=layout)
+    assert A1.norm() == pytest.approx(A0.norm())
+    assert np.allclose(b1.array_r, b0.array_r)
+
+    # The layout re-uses the sparsity pattern of its forms
+    A2 = layout.create_matrix(a)
+    assert A2.getInfo()["nz_allocated"] == A0.getInfo()["nz_allocated"]
+    A2.destroy()
+
+    # Field index sets
+    is_u, is_p = layout.field_index_sets()
+    assert [is_u.getSize(), is_p.getSize()] == sizes
+    assert is_u.getIndices()[0] == A1.getOwnershipRange()[0]
+    assert is_p.getIndices()[-1] == A1.getOwnershipRange()[1] - 1
+    ksp = PETSc.KSP().create(mesh.comm)
+    ksp.setOperators(A1)
+    ksp.getPC().setType("fieldsplit")
+    layout.set_fieldsplit(ksp.getPC(), ["u", "p"])
+    ksp.setUp()
+    assert len(ksp.getPC().getFieldSplitSubKSP()) == 2
+
+    ksp.destroy()
+    A0.destroy(), A1.destroy(), b0.destroy(), b1.destroy()
+
+
+def test_block_layout_patterns():
+    """Test re-use of a block layout for arrays of forms with different
+    non-zero blocks, e.g. a Stokes operator and its preconditioner"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 6, 4)
+    V = VectorFunctionSpace(mesh, ("Lagrange", 2))
+    Q = FunctionSpace(mesh, ("Lagrange", 1))
+    u, v = ufl.TrialFunction(V), ufl.TestFunction(V)
+    p, q = ufl.TrialFunction(Q), ufl.TestFunction(Q)
+    a00 = form(inner(ufl.grad(u), ufl.grad(v)) * dx)
+    a = [[a00, form(inner(p, ufl.div(v)) * dx)], [form(inner(ufl.div(u), q) * dx), None]]
+    a_p = [[a00, None], [None, form(inner(p, q) * dx)]]
+
+    layout = fem.petsc.BlockLayout(a)
+    for forms in (a, a_p):
+        A0 = assemble_matrix_block(forms)
+        A0.assemble()
+        A1 = assemble_matrix_block(forms, layout=layout)
+        A1.assemble()
+        assert A1.getInfo()["nz_used"] == A0.getInfo()["nz_used"]
+        assert A1.norm() == pytest.approx(A0.norm())
+        A0.destroy(), A1.destroy()
+
+    # Forms on other spaces than the layout
+    with pytest.raises(ValueError):
+        assemble_matrix_block([[a00, None], [None, a00]], layout=layout)
+    with pytest.raises(ValueError):
+        assemble_matrix_block([[a00]], layout=layout)
+
+    # A row and column without forms need their spaces
+    a_u = [[a00, None], [None, None]]
+    with pytest.raises(RuntimeError):
+        fem.petsc.BlockLayout(a_u)
+    layout = fem.petsc.BlockLayout(a_u, row_spaces=[V, Q], col_spaces=[V, Q])
+    assert layout.offsets[-1] == V.dofmap.index_map.size_local * 2 + Q.dofmap.index_map.size_local
+    A = assemble_matrix_block(a_p, layout=layout)
+    A.assemble()
+    A.destroy()
+
+
 @pytest.mark.parametrize("mode", [GhostMode.none, GhostMode.shared_facet])
 def test_assembly_solve_block(mode):
     """Solve a two-field mass-matrix like problem with block matrix approaches
@@ -843,6 +994,577 @@ def test_pack_coefficients():
     A.destroy(), A0.destroy()
 
 
+def test_packed_coefficients_cache():
+    """Test that cached coefficient data is updated when a coefficient
+    is modified"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 8, 8, ghost_mode=GhostMode.shared_facet)
+    V = FunctionSpace(mesh, ("Lagrange", 2))
+    u, f = Function(V), Function(V)
+    u.x.array[:] = 1.0
+    f.interpolate(lambda x: x[0] + 2 * x[1])
+    v = ufl.TestFunction(V)
+    n = ufl.FacetNormal(mesh)
+    L = form(inner(u * f, v) * dx + inner(f, v) * ds + inner(ufl.jump(u), ufl.avg(v)) * ufl.dS
+             + inner(ufl.avg(f) * ufl.jump(ufl.grad(u), n), ufl.avg(v)) * ufl.dS)
+
+    L.cache_coefficients = True
+
+    def check():
+        cached, fresh = L.packed_coefficients(), _cpp.fem.pack_coefficients(L)
+        assert cached.keys() == fresh.keys()
+        for key in fresh:
+            assert np.array_equal(cached[key], fresh[key])
+        b0 = fem.assemble_vector(L)
+        b1 = fem.assemble_vector(L, coeffs=fresh)
+        assert np.allclose(b0.array, b1.array)
+
+    check()
+    cached = L.packed_coefficients()
+    assert L.packed_coefficients() is cached
+
+    state = f.x.state
+    f.interpolate(lambda x: np.sin(x[0]))
+    assert f.x.state > state
+    check()
+
+    u.x.array[:] = 3.0
+    u.x.scatter_forward()
+    check()
+
+
+def test_packed_constants_cache():
+    """Test that cached constant data is updated when a constant is
+    modified"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 4, 4)
+    V = FunctionSpace(mesh, ("Lagrange", 1))
+    c = Constant(mesh, PETSc.ScalarType(2.0))
+    L = form(inner(c, ufl.TestFunction(V)) * dx)
+    L.cache_coefficients = True
+    packed = L.packed_constants()
+    assert np.allclose(packed, 2.0)
+    assert L.packed_constants() is packed
+
+    state = c.state
+    c.value = 3.0
+    assert c.state > state
+    assert np.allclose(L.packed_constants(), 3.0)
+    b = fem.assemble_vector(L)
+    b.scatter_reverse(la.InsertMode.add)
+    assert np.isclose(mesh.comm.allreduce(np.sum(b.array[:b.index_map.size_local]), op=MPI.SUM), 3.0)
+
+
+def test_assemble_vectors():
+    """Test assembly of a linear form for multiple coefficient and
+    constant values"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 8, 8, ghost_mode=GhostMode.shared_facet)
+    V = VectorFunctionSpace(mesh, ("Lagrange", 1))
+    f = Function(V)
+    c = Constant(mesh, PETSc.ScalarType(1.0))
+    u, v = ufl.TrialFunction(V), ufl.TestFunction(V)
+    a = form(inner(ufl.grad(u), ufl.grad(v)) * dx)
+    L = form(c * inner(f, v) * dx + inner(f, v) * ds + c * inner(ufl.avg(f), ufl.avg(v)) * ufl.dS)
+
+    coeffs, constants = [], []
+    for i in range(3):
+        f.interpolate(lambda x: (x[0] + i, x[1] ** i))
+        c.value = 2.0 * i - 1.0
+        coeffs.append(_cpp.fem.pack_coefficients(L))
+        constants.append(_cpp.fem.pack_constants(L))
+
+    facets = locate_entities_boundary(mesh, 1, lambda x: np.isclose(x[0], 0.0))
+    bc = dirichletbc(np.array([1.0, 2.0], dtype=PETSc.ScalarType),
+                     locate_dofs_topological(V, 1, facets), V)
+
+    b = fem.assemble_vectors(L, constants, coeffs)
+    B = fem.petsc.assemble_vectors(L, constants, coeffs, a=a, bcs=[bc])
+    assert b.shape[0] == 3
+    assert B.getSize()[1] == 3
+    B_array = B.getDenseArray()
+    for i in range(3):
+        b0 = fem.assemble_vector(L, constants[i], coeffs[i])
+        assert np.allclose(b[i], b0.array)
+
+        b1 = assemble_vector(L, constants[i], coeffs[i])
+        apply_lifting(b1, [a], [[bc]])
+        b1.ghostUpdate(addv=PETSc.InsertMode.ADD, mode=PETSc.ScatterMode.REVERSE)
+        set_bc(b1, [bc])
+        assert np.allclose(B_array[:, i], b1.array)
+        b1.destroy()
+
+    # Lifting and boundary conditions applied to all rows
+    fem.apply_lifting(b, [a], [[bc]])
+    fem.set_bc(b, [bc])
+    for i in range(3):
+        b0 = fem.assemble_vector(L, constants[i], coeffs[i])
+        fem.apply_lifting(b0.array, [a], [[bc]])
+        fem.set_bc(b0.array, [bc])
+        assert np.allclose(b[i], b0.array)
+
+    # Current coefficients are used for all right-hand sides
+    b = fem.assemble_vectors(L, constants=[[1.0], [2.0]])
+    assert np.allclose(2 * b[0] - b[1], fem.assemble_vector(L, np.zeros(1, dtype=PETSc.ScalarType)).array)
+
+    # Explicit all-zero constants are not replaced by the current
+    # constants of the form
+    zero = np.zeros(1, dtype=PETSc.ScalarType)
+    c.value = 1.0
+    b0 = fem.assemble_vector(L, zero, coeffs[0])
+    assert np.allclose(b0.array, fem.assemble_vectors(L, [zero], [coeffs[0]])[0])
+    assert fem.assemble_scalar(form(c * f[0] * dx), zero) == 0.0
+
+    # No right-hand sides
+    assert fem.assemble_vectors(L, [], []).shape == (0, b.shape[1])
+    B.destroy()
+
+
+@pytest.mark.parametrize("space", [FunctionSpace, VectorFunctionSpace])
+def test_assemble_system_rhs(space):
+    """Test fused assembly of a right-hand side with lifting against
+    the separate assembly, lifting and boundary condition steps"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 8, 8, ghost_mode=GhostMode.shared_facet)
+    V = space(mesh, ("Lagrange", 2))
+    shape = V.ufl_element().value_shape()
+    u, v = ufl.TrialFunction(V), ufl.TestFunction(V)
+    k = Function(FunctionSpace(mesh, ("Lagrange", 1)))
+    k.interpolate(lambda x: 1.0 + x[0] * x[1])
+    f = ufl.as_vector([1.0] * shape[0]) if shape else 1.0
+    a = form(k * inner(ufl.grad(u), ufl.grad(v)) * dx + inner(u, v) * ds)
+    L = form(inner(f, v) * dx + k * inner(f, v) * ds)
+
+    facets = locate_entities_boundary(mesh, 1, lambda x: np.isclose(x[0], 0.0))
+    g = Function(V)
+    g.interpolate(lambda x: np.array([x[1] + i for i in range(shape[0])]) if shape else x[1])
+    bc = dirichletbc(g, locate_dofs_topological(V, 1, facets))
+    x0 = Function(V)
+    x0.interpolate(lambda x: np.array([x[0] * x[1]] * shape[0]) if shape else x[0] * x[1])
+    x0.x.scatter_forward()
+
+    for _x0, scale in ((None, 1.0), (x0.vector, -1.0)):
+        b0 = assemble_vector(L)
+        apply_lifting(b0, [a], [[bc]], x0=[] if _x0 is None else [_x0], scale=scale)
+        b0.ghostUpdate(addv=PETSc.InsertMode.ADD, mode=PETSc.ScatterMode.REVERSE)
+        set_bc(b0, [bc], _x0, scale)
+        b1 = fem.petsc.assemble_system_rhs(L, a, [bc], x0=_x0, scale=scale)
+        assert np.allclose(b1.array, b0.array)
+
+        # Re-use of the vector
+        b1.set(1.0)
+        fem.petsc.assemble_system_rhs(L, a, [bc], x0=_x0, scale=scale, b=b1)
+        assert np.allclose(b1.array, b0.array)
+        b0.destroy()
+        b1.destroy()
+
+
+@pytest.mark.parametrize("degree", [1, 2])
+def test_assemble_vector_block_size_2(degree):
+    """Test vector assembly and lifting with a blocked (block size 2)
+    space against the same problem posed on a mixed (block size 1)
+    space"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 6, 5, ghost_mode=GhostMode.shared_facet)
+    P = element("Lagrange", mesh.basix_cell(), degree)
+    facets = locate_entities_boundary(mesh, 1, lambda x: np.isclose(x[0], 0.0))
+    x = ufl.SpatialCoordinate(mesh)
+    f = ufl.as_vector((x[1], 1.0 + x[0]))
+
+    def assemble(V, u, v, dofs, g):
+        a = form(inner(ufl.grad(u), ufl.grad(v)) * dx + inner(u, v) * ds + inner(ufl.jump(u), ufl.jump(v)) * ufl.dS)
+        L = form(inner(f, v) * dx + x[0] * inner(f, v) * ds + inner(ufl.avg(f), ufl.jump(v)) * ufl.dS)
+        bcs = [dirichletbc(g, d) for d in dofs]
+        b = Function(V)
+        assemble_vector(b.vector, L)
+        apply_lifting(b.vector, [a], [bcs])
+        b.vector.ghostUpdate(addv=PETSc.InsertMode.ADD, mode=PETSc.ScatterMode.REVERSE)
+        set_bc(b.vector, bcs)
+        b.x.scatter_forward()
+        b_fused = Function(V)
+        fem.petsc.assemble_system_rhs(L, a, bcs, b=b_fused.vector)
+        b_fused.x.scatter_forward()
+        assert np.allclose(b_fused.x.array, b.x.array)
+        return b
+
+    def gx(x):
+        return x[1]
+
+    def gy(x):
+        return 1.0 + x[0] * x[1]
+
+    # Blocked space
+    V = VectorFunctionSpace(mesh, ("Lagrange", degree))
+    assert V.dofmap.index_map_bs == 2
+    g = Function(V)
+    g.interpolate(lambda x: np.vstack((gx(x), gy(x))))
+    b0 = assemble(V, ufl.TrialFunction(V), ufl.TestFunction(V), [locate_dofs_topological(V, 1, facets)], g)
+
+    # Mixed space with the same components
+    W = FunctionSpace(mesh, mixed_element([P, P]))
+    assert W.dofmap.index_map_bs == 1
+    g = Function(W)
+    g.sub(0).interpolate(gx)
+    g.sub(1).interpolate(gy)
+    dofs = [locate_dofs_topological(W.sub(i), 1, facets) for i in range(2)]
+    b1 = assemble(W, ufl.as_vector(ufl.TrialFunctions(W)), ufl.as_vector(ufl.TestFunctions(W)), dofs, g)
+
+    # Compare the components in a common space
+    Q = FunctionSpace(mesh, P)
+    q0, q1 = Function(Q), Function(Q)
+    for i in range(2):
+        q0.interpolate(b0.sub(i))
+        q1.interpolate(b1.sub(i))
+        assert np.allclose(q0.x.array, q1.x.array)
+
+
+@pytest.mark.parametrize("num_threads", [1, 2])
+def test_assemble_scalars(num_threads):
+    """Test assembly of several functionals in one pass against
+    assembly of each functional"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 8, 8, ghost_mode=GhostMode.shared_facet)
+    facets = locate_entities_boundary(mesh, 1, lambda x: np.isclose(x[0], 0.0))
+    tags = meshtags(mesh, 1, np.sort(facets), np.full(len(facets), 1, dtype=np.int32))
+    ds1 = ufl.Measure("ds", domain=mesh, subdomain_data=tags)
+
+    V = FunctionSpace(mesh, ("Lagrange", 2))
+    u = Function(V)
+    u.interpolate(lambda x: x[0]**2 + 2 * x[1])
+    c = Constant(mesh, PETSc.ScalarType(3.0))
+    x = SpatialCoordinate(mesh)
+    M = [form(u * dx), form(c * u**2 * dx), form(x[0] * dx + u * ds), form(ufl.avg(u) * ufl.dS),
+         form(u * ds1(1)), form(c * ufl.grad(u)[1] * ds1(1) + u * ds)]
+    values = fem.assemble_scalars(M, num_threads=num_threads)
+    assert values.shape == (len(M),)
+    for Mi, value in zip(M, values):
+        assert np.isclose(value, mesh.comm.allreduce(assemble_scalar(Mi), op=MPI.SUM))
+
+    # Packed constants and coefficients
+    constants = [_cpp.fem.pack_constants(Mi) for Mi in M]
+    constants[1] = np.array([1.0], dtype=PETSc.ScalarType)
+    coeffs = [_cpp.fem.pack_coefficients(Mi) for Mi in M]
+    assert np.allclose(fem.assemble_scalars(M, constants, coeffs, num_threads=num_threads)[[0, 1]],
+                       [values[0], values[1] / 3.0])
+
+
+def test_matrix_free():
+    """Test matrix-free operator against an assembled matrix"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 8, 8)
+    V = VectorFunctionSpace(mesh, ("Lagrange", 2))
+    kappa = Function(FunctionSpace(mesh, ("Lagrange", 1)))
+    kappa.interpolate(lambda x: 1 + x[0] * x[1])
+    u, v = ufl.TrialFunction(V), ufl.TestFunction(V)
+    a = kappa * inner(ufl.grad(u), ufl.grad(v)) * dx + inner(u, v) * ds
+    L = inner(ufl.as_vector((1.0, -1.0)), v) * dx
+
+    facets = locate_entities_boundary(mesh, 1, lambda x: np.isclose(x[0], 0.0))
+    bc = dirichletbc(np.array([1.0, 0.5], dtype=PETSc.ScalarType),
+                     locate_dofs_topological(V, 1, facets), V)
+
+    A = assemble_matrix(form(a), bcs=[bc])
+    A.assemble()
+    A_free = fem.petsc.create_matrix_free(a, [bc])
+
+    x, y0 = A.createVecs()
+    y1 = y0.duplicate()
+    x.setRandom()
+    A.mult(x, y0)
+    A_free.mult(x, y1)
+    assert np.allclose(y0.array, y1.array)
+
+    A.getDiagonal(y0)
+    A_free.getDiagonal(y1)
+    assert np.allclose(y0.array, y1.array)
+
+    # Solve with a matrix-free operator
+    petsc_options = {"ksp_type": "cg", "pc_type": "jacobi", "ksp_rtol": 1.0e-12}
+    u0 = fem.petsc.LinearProblem(a, L, bcs=[bc], petsc_options=petsc_options).solve()
+    u1 = fem.petsc.LinearProblem(a, L, bcs=[bc], petsc_options=petsc_options, matrix_free=True).solve()
+    assert np.allclose(u0.x.array, u1.x.array)
+
+    A.destroy(), A_free.destroy(), x.destroy(), y0.destroy(), y1.destroy()
+
+
+@pytest.mark.parametrize("assemble_A", ["always", "once", "on_change"])
+def test_linear_problem_operator_reuse(assemble_A, monkeypatch):
+    mesh = create_unit_square(MPI.COMM_WORLD, 8, 8)
+    V = FunctionSpace(mesh, ("Lagrange", 1))
+    u, v = ufl.TrialFunction(V), ufl.TestFunction(V)
+    k, f = Function(V), Constant(mesh, PETSc.ScalarType(1.0))
+    k.x.array[:] = 1.0
+    a = k * inner(ufl.grad(u), ufl.grad(v)) * dx + inner(u, v) * dx
+    L = inner(f, v) * dx
+
+    num_assembled = [0]
+    assemble_matrix_mat = fem.petsc._assemble_matrix_mat
+
+    def counter(*args, **kwargs):
+        num_assembled[0] += 1
+        return assemble_matrix_mat(*args, **kwargs)
+
+    monkeypatch.setattr(fem.petsc, "_assemble_matrix_mat", counter)
+    petsc_options = {"ksp_type": "preonly", "pc_type": "lu"}
+    problem = fem.petsc.LinearProblem(a, L, petsc_options=petsc_options, assemble_A=assemble_A)
+
+    def check():
+        u0 = problem.solve().x.array.copy()
+        u1 = fem.petsc.LinearProblem(a, L, petsc_options=petsc_options).solve().x.array
+        return np.allclose(u0, u1)
+
+    # Only the right-hand side changes
+    assert check()
+    f.value = 2.0
+    assert check()
+    assert num_assembled[0] == {"always": 4, "once": 3, "on_change": 3}[assemble_A]
+
+    # The operator changes
+    k.x.array[:] = 2.0
+    assert check() != (assemble_A == "once")
+
+    with pytest.raises(ValueError):
+        fem.petsc.LinearProblem(a, L, assemble_A="never")
+
+
+@pytest.mark.skipif(np.issubdtype(PETSc.ScalarType, np.complexfloating),
+                    reason="Single precision solvers are real only")
+def test_linear_problem_mixed_precision():
+    mesh = create_unit_square(MPI.COMM_WORLD, 12, 12)
+    V = VectorFunctionSpace(mesh, ("Lagrange", 1))
+    u, v = ufl.TrialFunction(V), ufl.TestFunction(V)
+    k, f = Function(V), Constant(mesh, PETSc.ScalarType(2.0))
+    k.x.array[:] = 1.0
+    a = (1 + inner(k, k)) * inner(ufl.grad(u), ufl.grad(v)) * dx + f * inner(u, v) * dx
+    L = inner(ufl.as_vector((1.0, -1.0)), v) * dx
+
+    facets = locate_entities_boundary(mesh, 1, lambda x: np.isclose(x[0], 0.0))
+    bc = dirichletbc(np.array([1.0, 0.5], dtype=PETSc.ScalarType),
+                     locate_dofs_topological(V, 1, facets), V)
+
+    petsc_options = {"ksp_type": "preonly", "pc_type": "lu"}
+    u0 = fem.petsc.LinearProblem(a, L, bcs=[bc], petsc_options=petsc_options).solve()
+    problem = fem.petsc.LinearProblem(a, L, bcs=[bc], mixed_precision={"preconditioner": "block_jacobi"})
+    u1 = problem.solve()
+    info = problem.refinement_info
+    assert info.converged and not info.fallback
+    assert info.iterations > 1 and info.inner_iterations > 0
+    assert np.allclose(u0.x.array, u1.x.array, rtol=1.0e-8, atol=1.0e-10)
+
+    # The single precision matrix is updated with the coefficients
+    k.x.array[:] = 2.0
+    f.value = 1.0
+    u0 = fem.petsc.LinearProblem(a, L, bcs=[bc], petsc_options=petsc_options).solve()
+    u1 = problem.solve()
+    assert problem.refinement_info.converged
+    assert np.allclose(u0.x.array, u1.x.array, rtol=1.0e-8, atol=1.0e-10)
+
+    # Fall back to double precision if the refinement does not converge
+    problem = fem.petsc.LinearProblem(a, L, bcs=[bc], mixed_precision={"max_it": 1},
+                                      petsc_options={"ksp_max_it": 1, "fallback_ksp_type": "preonly",
+                                                     "fallback_pc_type": "lu"})
+    u1 = problem.solve()
+    assert problem.refinement_info.fallback and problem.refinement_info.converged
+    assert np.allclose(u0.x.array, u1.x.array)
+
+    with pytest.raises(ValueError):
+        fem.petsc.LinearProblem(a, L, mixed_precision={"tolerance": 1.0e-3})
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_geometry_cache(dtype):
+    """Test assembly with cached cell geometry, and that the cache is
+    updated when the mesh geometry is modified"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 6, 7, ghost_mode=GhostMode.shared_facet)
+    V = FunctionSpace(mesh, ("Lagrange", 2))
+    u, v = ufl.TrialFunction(V), ufl.TestFunction(V)
+    x = ufl.SpatialCoordinate(mesh)
+    a = inner(ufl.grad(u), ufl.grad(v)) * dx + inner(u, v) * ds + inner(ufl.avg(u), ufl.avg(v)) * ufl.dS
+    L = inner(x[0], v) * dx
+    M = x[1] * dx
+    forms0 = form([a, L, M], dtype=dtype)
+    forms1 = form([a, L, M], dtype=dtype)
+    assert not forms1[0].geometry_cache
+    for f in forms1:
+        f.geometry_cache = True
+
+    def check():
+        r0, r1 = ((fem.assemble_matrix(a).to_dense(), fem.assemble_vector(L).array, fem.assemble_scalar(M))
+                  for (a, L, M) in (forms0, forms1))
+        for v0, v1 in zip(r0, r1):
+            assert np.allclose(v0, v1, rtol=1.0e-5)
+
+    check()
+
+    # Reading the geometry does not invalidate the cache, modifications
+    # are recorded with increase_state
+    state = mesh.geometry.state
+    x = mesh.geometry.x
+    assert mesh.geometry.state == state
+    x[:, 0] *= 2.0
+    mesh.geometry.increase_state()
+    assert mesh.geometry.state > state
+    check()
+
+
+def test_sparsity_pattern_cache():
+    mesh = create_unit_square(MPI.COMM_WORLD, 8, 8)
+    V = FunctionSpace(mesh, ("Lagrange", 1))
+    u, v = ufl.TrialFunction(V), ufl.TestFunction(V)
+    k = Function(V)
+    k.x.array[:] = 2.0
+    a0 = form(inner(u, v) * dx)
+    a1 = form(k * inner(ufl.grad(u), ufl.grad(v)) * dx)
+    a2 = form(inner(u, v) * ds)
+
+    cache = fem.sparsity_pattern_cache
+    cache.clear()
+    A0 = fem.create_matrix(a0)
+    A1 = fem.create_matrix(a1)
+    assert cache.cache_info().misses == 1
+    assert cache.cache_info().hits == 1
+    assert cache.get(a0) is cache.get(a1)
+    assert np.array_equal(A0.indices, A1.indices)
+
+    fem.create_matrix(a2)
+    assert cache.cache_info().misses == 2
+    assert cache.cache_info().currsize == 2
+
+    B0 = fem.petsc.create_matrix(a0)
+    B0.zeroEntries()
+    fem.petsc.assemble_matrix(B0, a1)
+    B0.assemble()
+    B1 = fem.petsc.assemble_matrix(a1)
+    B1.assemble()
+    assert B0.norm() == pytest.approx(B1.norm())
+    B0.destroy()
+    B1.destroy()
+
+    cache.clear()
+    assert cache.cache_info().currsize == 0
+    maxsize = cache.maxsize
+    cache.maxsize = 0
+    try:
+        fem.create_matrix(a0)
+        assert cache.cache_info().currsize == 0
+    finally:
+        cache.maxsize = maxsize
+
+
+@pytest.mark.parametrize("mode", [GhostMode.none, GhostMode.shared_facet])
+@pytest.mark.parametrize("space", [FunctionSpace, VectorFunctionSpace])
+def test_assemble_matrix_symmetric(mode, space):
+    mesh = create_unit_square(MPI.COMM_WORLD, 8, 5, ghost_mode=mode)
+    V = space(mesh, ("Lagrange", 1))
+    u, v = ufl.TrialFunction(V), ufl.TestFunction(V)
+    a = form(inner(ufl.grad(u), ufl.grad(v)) * dx + inner(u, v) * ds)
+    bc = dirichletbc(Function(V), locate_dofs_geometrical(V, lambda x: np.isclose(x[0], 0.0)))
+
+    A0 = fem.assemble_matrix(a, bcs=[bc])
+    A0.finalize()
+    A1 = fem.create_matrix(a, storage=la.StorageMode.symmetric)
+    fem.assemble_matrix(A1, a, bcs=[bc])
+    A1.finalize()
+    assert len(A1.data) < len(A0.data)
+    assert A1.squared_norm() == pytest.approx(A0.squared_norm())
+
+    bs = V.dofmap.index_map_bs
+    n = V.dofmap.index_map.size_local * bs
+    assert np.allclose(A1.to_dense()[:n, :n], A0.to_dense()[:n, :n])
+
+    # Matrix-vector product
+    y0, y1 = la.vector(A0.index_map(0), bs), la.vector(A1.index_map(0), bs)
+    x = la.vector(A0.index_map(1), bs)
+    x.array[:n] = np.arange(n) + V.dofmap.index_map.local_range[0] * bs
+    A0.mult(x, y0)
+    A1.mult(x, y1)
+    assert np.allclose(y0.array[:n], y1.array[:n])
+
+    # Symmetric PETSc matrix
+    B0 = la.create_petsc_matrix(A0)
+    B1 = la.create_petsc_matrix(A1)
+    assert B1.getType().endswith("sbaij")
+    assert B1.norm() == pytest.approx(B0.norm())
+    B0.destroy()
+    B1.destroy()
+
+
+@pytest.mark.parametrize("local", [0, 1])
+def test_assemble_condensed(local):
+    """Static condensation of a DG field gives the solution of the block system"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 8, 6)
+    V = FunctionSpace(mesh, ("Lagrange", 2))
+    Q = FunctionSpace(mesh, ("Discontinuous Lagrange", 1))
+    u, v = ufl.TrialFunction(V), ufl.TestFunction(V)
+    q, w = ufl.TrialFunction(Q), ufl.TestFunction(Q)
+    x = ufl.SpatialCoordinate(mesh)
+    a_vv = inner(ufl.grad(u), ufl.grad(v)) * dx + inner(u, v) * ds
+    a_vq, a_qv, a_qq = inner(q, v) * dx, inner(u, w) * dx, -inner(q, w) * dx
+    L_v, L_q = inner(x[0], v) * dx, inner(x[1], w) * dx
+    if local == 0:
+        a, L = form([[a_qq, a_qv], [a_vq, a_vv]]), form([L_q, L_v])
+    else:
+        a, L = form([[a_vv, a_vq], [a_qv, a_qq]]), form([L_v, L_q])
+
+    u0 = Function(V)
+    u0.interpolate(lambda x: 1.0 + x[1])
+    bc = dirichletbc(u0, locate_dofs_geometrical(V, lambda x: np.isclose(x[0], 0.0)))
+
+    def solve(A, b, x):
+        ksp = PETSc.KSP().create(mesh.comm)
+        ksp.setOperators(A)
+        ksp.setType("preonly")
+        ksp.getPC().setType("lu")
+        ksp.solve(b, x)
+        ksp.destroy()
+
+    A, b = fem.petsc.assemble_condensed(a, L, local, bcs=[bc])
+    assert A.getSize() == (V.dofmap.index_map.size_global, V.dofmap.index_map.size_global)
+    uh, qh = Function(V), Function(Q)
+    solve(A, b, uh.vector)
+    fem.petsc.backsubstitute_condensed(a, L, local, uh, qh)
+
+    A_ref = assemble_matrix_block(a, bcs=[bc])
+    A_ref.assemble()
+    b_ref = assemble_vector_block(L, a, bcs=[bc])
+    x_ref = A_ref.createVecRight()
+    solve(A_ref, b_ref, x_ref)
+    xnorm = math.sqrt(uh.vector.norm()**2 + qh.vector.norm()**2)
+    assert xnorm == pytest.approx(x_ref.norm(), rel=1.0e-8)
+
+    # Solution of the block system restricted to the global space
+    offset = 0 if local == 1 else Q.dofmap.index_map.size_local
+    n = V.dofmap.index_map.size_local
+    assert np.allclose(x_ref.array_r[offset:offset + n], uh.x.array[:n])
+
+    for M in (A, A_ref):
+        M.destroy()
+    for y in (b, b_ref, x_ref):
+        y.destroy()
+
+
+def test_packed_coefficients_aliasing():
+    """Test that coefficients that are modified through a retained array
+    or a wrapped PETSc vector are re-packed"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 4, 4)
+    V = FunctionSpace(mesh, ("Lagrange", 1))
+    f = Function(V)
+    L = form(inner(f, ufl.TestFunction(V)) * dx)
+
+    array = f.x.array
+    array[:] = 1.0
+    b0 = fem.assemble_vector(L).array.copy()
+    array[:] = 2.0
+    assert np.allclose(fem.assemble_vector(L).array, 2 * b0)
+
+    x = la.create_petsc_vector_wrap(f.x)
+    with x.localForm() as x_local:
+        x_local.set(3.0)
+    assert np.allclose(fem.assemble_vector(L).array, 3 * b0)
+
+    # With cached coefficients, writes through retained arrays must be
+    # followed by increase_state
+    L.cache_coefficients = True
+    fem.assemble_vector(L)
+    array[:] = 4.0
+    f.x.increase_state()
+    assert np.allclose(fem.assemble_vector(L).array, 4 * b0)
+    x.destroy()
+
+
 def test_coefficents_non_constant():
     "Test packing coefficients with non-constant values"
     mesh = create_unit_square(MPI.COMM_WORLD, 3, 5)
@@ -381,3 +381,37 @@ def test_expression_eval_cells_subset():
     cells = np.arange(cells_imap.size_local, dtype=np.int32)[::-2]
     u_ = e.eval(cells)
     assert np.allclose(u_.ravel(), cells)
+
+
+def test_fused_expressions():
+    """Test evaluation of several expressions with one fused kernel"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 3, 4)
+    V = VectorFunctionSpace(mesh, ("Lagrange", 2))
+    u = Function(V)
+    u.interpolate(lambda x: (x[0]**2 + x[1], x[0] * x[1]))
+
+    eps = ufl.sym(ufl.grad(u))
+    exprs = {"eps": eps, "tr": ufl.tr(eps), "u": u}
+    points = np.array([[0.25, 0.25], [0.5, 0.25]])
+    fused = Expression(exprs, points)
+    assert fused.value_size == 4 + 1 + 2
+
+    num_cells = mesh.topology.index_map(mesh.topology.dim).size_local
+    cells = np.arange(num_cells, dtype=np.int32)
+    values = fused.eval_split(cells)
+    assert values["eps"].shape == (num_cells, 2, 2, 2)
+    assert values["tr"].shape == (num_cells, 2)
+    assert values["u"].shape == (num_cells, 2, 2)
+
+    # Compare with separate expressions
+    for name, e in exprs.items():
+        ref = Expression(e, points).eval(cells)
+        assert np.allclose(values[name].reshape(num_cells, -1), ref)
+
+    # Structured output and list of expressions
+    s = fused.eval_split(cells, structured=True)
+    assert np.allclose(s["eps"], values["eps"])
+    fused_list = Expression([eps, u], points)
+    values_list = fused_list.split(fused_list.eval(cells))
+    assert np.allclose(values_list[0], values["eps"])
+    assert np.allclose(values_list[1], values["u"])
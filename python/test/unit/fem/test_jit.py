@@ -0,0 +1,282 @@
+"""Unit tests for the DOLFINx JIT interface"""
+
+# Copyright (C) 2023 The FEniCS Project
+#
+# This file is part of DOLFINx (https://www.fenicsproject.org)
+#
+# SPDX-License-Identifier:    LGPL-3.0-or-later
+
+import os
+import pathlib
+import socket
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from dolfinx import aot, common, jit
+from dolfinx.fem import (FunctionSpace, assemble_scalar, create_expressions,
+                         form)
+from dolfinx.mesh import create_unit_square
+from ufl import (SpatialCoordinate, TestFunction, TrialFunction, dx, grad,
+                 inner)
+
+from mpi4py import MPI
+
+
+@pytest.mark.parametrize("strategy", ["root", "cache"])
+def test_mpi_strategy(tempdir, strategy):
+    """Test that forms compile with each parallel JIT strategy"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 4, 4)
+    V = FunctionSpace(mesh, ("Lagrange", 1))
+    u, v = TrialFunction(V), TestFunction(V)
+    jit_options = {"cache_dir": pathlib.Path(tempdir), "mpi_strategy": strategy}
+
+    # First call compiles, second call reads from the cache
+    for i in range(2):
+        a = form(inner(u, v) * dx, jit_options=jit_options)
+        assert a.rank == 2
+    M = form(1.0 * dx(domain=mesh), jit_options=jit_options)
+    assert np.isclose(mesh.comm.allreduce(assemble_scalar(M), op=MPI.SUM), 1.0)
+
+
+def test_mpi_strategy_unknown(tempdir):
+    mesh = create_unit_square(MPI.COMM_WORLD, 4, 4)
+    V = FunctionSpace(mesh, ("Lagrange", 1))
+    u, v = TrialFunction(V), TestFunction(V)
+    if mesh.comm.size > 1:
+        with pytest.raises(ValueError):
+            form(inner(u, v) * dx, jit_options={"cache_dir": pathlib.Path(tempdir), "mpi_strategy": "foo"})
+
+
+def test_cache_first_stale_lock(tempdir):
+    """Test that a lock left by a killed compiling process is removed and
+    the object is compiled by a waiting process"""
+    p = subprocess.Popen([sys.executable, "-c", "pass"])
+    p.wait()
+    cache_dir = pathlib.Path(tempdir)
+    key = f"stale_{MPI.COMM_WORLD.rank}"
+    lock = cache_dir.joinpath(f"dolfinx_{key}.lock")
+    lock.write_text(f"{socket.gethostname()} {p.pid}")
+    assert jit._cache_first_jit(lambda x: 2 * x, key, cache_dir, 21) == 42
+    assert not lock.exists()
+    assert cache_dir.joinpath(f"dolfinx_{key}.ready").exists()
+
+
+def test_registry():
+    """Test that identical forms share compiled objects through the registry"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 4, 4)
+    V = FunctionSpace(mesh, ("Lagrange", 1))
+    u, v = TrialFunction(V), TestFunction(V)
+
+    jit.registry.cache_clear()
+    a0 = form(inner(u, v) * dx)
+    info0 = jit.registry.cache_info()
+    a1 = form(inner(u, v) * dx)
+    info1 = jit.registry.cache_info()
+    assert info1.hits == info0.hits + 1
+    assert a0.ufcx_form is a1.ufcx_form
+
+    # Different scalar type is a different entry
+    a2 = form(inner(u, v) * dx, dtype=np.float32)
+    assert a2.ufcx_form is not a0.ufcx_form
+
+    # Eviction of least recently used entries
+    maxsize = jit.registry.maxsize
+    try:
+        jit.registry.maxsize = 1
+        form(inner(u, v) * dx)
+        form(inner(u, v) * dx, dtype=np.float32)
+        assert jit.registry.cache_info().currsize == 1
+    finally:
+        jit.registry.maxsize = maxsize
+        jit.registry.cache_clear()
+
+
+@pytest.mark.parametrize("strategy", ["root", "cache"])
+def test_precompile_block(tempdir, strategy):
+    """Test concurrent compilation of an array of forms"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 4, 4)
+    V0 = FunctionSpace(mesh, ("Lagrange", 1))
+    V1 = FunctionSpace(mesh, ("Lagrange", 2))
+    u0, v0 = TrialFunction(V0), TestFunction(V0)
+    u1, v1 = TrialFunction(V1), TestFunction(V1)
+    jit_options = {"cache_dir": pathlib.Path(tempdir), "compile_workers": 2, "mpi_strategy": strategy}
+    a = form([[inner(u0, v0) * dx, inner(u1, v0) * dx],
+              [inner(u0, v1) * dx, None]], jit_options=jit_options)
+    assert a[0][0].function_spaces[0] is V0._cpp_object
+    assert a[1][0].function_spaces[0] is V1._cpp_object
+    assert a[1][1] is None
+
+
+def test_precompile(tempdir):
+    """Test that precompiled forms are loaded into the registry"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 4, 4)
+    V = FunctionSpace(mesh, ("Lagrange", 3))
+    u, v = TrialFunction(V), TestFunction(V)
+    ufl_forms = [inner(u, v) * dx, inner(grad(u), grad(v)) * dx, inner(1.0, v) * dx]
+    cache_dir = pathlib.Path(tempdir, f"cache_{mesh.comm.rank}")
+    jit_options = {"cache_dir": cache_dir, "compile_workers": 2}
+
+    jit.registry.cache_clear()
+    jit.precompile(MPI.COMM_SELF, ufl_forms, jit_options=jit_options)
+    assert jit.registry.cache_info().currsize == 3
+    assert len(list(cache_dir.glob("libffcx_forms_*.c.cached"))) == 3
+    assert len(list(cache_dir.glob("libffcx_forms_*.c.failed"))) == 0
+
+    # The compiled forms are returned by the registry
+    misses = jit.registry.cache_info().misses
+    a = form(ufl_forms, jit_options=jit_options)
+    assert jit.registry.cache_info().misses == misses
+    assert [a_i.rank for a_i in a] == [2, 2, 1]
+    jit.registry.cache_clear()
+
+
+def test_create_expressions(tempdir):
+    """Test concurrent compilation of several Expressions"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 4, 4)
+    x = SpatialCoordinate(mesh)
+    points = np.array([[0.25, 0.25], [0.5, 0.25]])
+    jit_options = {"cache_dir": pathlib.Path(tempdir, f"cache_{mesh.comm.rank}"), "compile_workers": 2}
+    e0, e1 = create_expressions([(x[0], points), ([x[0] * x[1], x], points)], jit_options=jit_options)
+    cells = np.arange(mesh.topology.index_map(mesh.topology.dim).size_local, dtype=np.int32)
+    assert e0.eval(cells).shape == (len(cells), 2)
+    assert e1.eval(cells).shape == (len(cells), 2 * 3)
+
+
+@pytest.mark.skip_in_parallel
+def test_aot(tempdir):
+    """Test ahead-of-time compilation and loading of forms"""
+    script = pathlib.Path(tempdir, "problem.py")
+    script.write_text("""
+from mpi4py import MPI
+from dolfinx.fem import FunctionSpace, form
+from dolfinx.mesh import create_unit_square
+from ufl import TestFunction, TrialFunction, dx, inner
+mesh = create_unit_square(MPI.COMM_SELF, 2, 2)
+V = FunctionSpace(mesh, ("Lagrange", 2))
+u, v = TrialFunction(V), TestFunction(V)
+a = form(inner(u, v) * dx)
+""")
+    aot_dir = pathlib.Path(tempdir, "aot")
+    objects = aot.build(str(script), aot_dir)
+    assert len(objects) > 0
+    assert pathlib.Path(aot_dir, "manifest.json").exists()
+
+    # Objects are loaded from the AOT directory and not compiled into
+    # the JIT cache
+    jit.registry.cache_clear()
+    cache_dir = pathlib.Path(tempdir, "cache")
+    jit_options = {"aot_dir": aot_dir, "cache_dir": cache_dir}
+    mesh = create_unit_square(MPI.COMM_SELF, 4, 4)
+    V = FunctionSpace(mesh, ("Lagrange", 2), jit_options=jit_options)
+    u, v = TrialFunction(V), TestFunction(V)
+    a = form(inner(u, v) * dx, jit_options=jit_options)
+    assert a.rank == 2
+    assert not cache_dir.exists()
+
+
+@pytest.mark.skip_in_parallel
+def test_cache_management(tempdir):
+    """Test JIT cache index, size limit and clearing"""
+    mesh = create_unit_square(MPI.COMM_SELF, 4, 4)
+    V = FunctionSpace(mesh, ("Lagrange", 1))
+    u, v = TrialFunction(V), TestFunction(V)
+    cache_dir = pathlib.Path(tempdir)
+    jit_options = {"cache_dir": cache_dir}
+
+    jit.registry.cache_clear()
+    info0 = jit.cache_info()
+    form(inner(u, v) * dx, jit_options=jit_options)
+    form(inner(u.dx(0), v) * dx, jit_options=jit_options)
+    info1 = jit.cache_info()
+    assert info1.misses + info1.hits == info0.misses + info0.hits + 2
+    stats = jit.cache_stats(cache_dir)
+    assert stats["num_modules"] == 2
+    assert stats["indexed_size"] > 0
+
+    # Hit through the index
+    jit.registry.cache_clear()
+    form(inner(u, v) * dx, jit_options=jit_options)
+    assert jit.cache_info().hits == info1.hits + 1
+
+    # Evict least recently used module
+    size = stats["indexed_size"] / 1024**2
+    jit.cache_prune(0.75 * size, cache_dir)
+    assert jit.cache_stats(cache_dir)["num_modules"] == 1
+
+    jit.cache_clear(cache_dir)
+    assert jit.cache_stats(cache_dir)["num_modules"] == 0
+    jit.registry.cache_clear()
+    a = form(inner(u, v) * dx, jit_options=jit_options)
+    assert a.rank == 2
+
+
+@pytest.mark.skip_in_parallel
+def test_cache_clear_concurrent(tempdir):
+    """Test that clearing the cache keeps the modules, locks and markers
+    of compilations that are in progress"""
+    cache_dir = pathlib.Path(tempdir)
+    compiling = cache_dir.joinpath("libffcx_forms_compiling.c")
+    compiling.write_text("")
+    compiled = [cache_dir.joinpath("libffcx_forms_compiled" + suffix) for suffix in (".c", ".o", ".c.cached")]
+    for f in compiled:
+        f.write_text("")
+    live = jit._FileLock(cache_dir.joinpath("dolfinx_live.lock"))
+    assert live.acquire()
+    try:
+        cache_dir.joinpath("dolfinx_live.failed").write_text("")
+        cache_dir.joinpath("dolfinx_done.ready").write_text("")
+        jit.cache_clear(cache_dir)
+        assert compiling.exists()
+        assert not any(f.exists() for f in compiled)
+        assert cache_dir.joinpath("dolfinx_live.lock").exists()
+        assert cache_dir.joinpath("dolfinx_live.failed").exists()
+        assert not cache_dir.joinpath("dolfinx_done.ready").exists()
+    finally:
+        live.release()
+
+
+@pytest.mark.skip_in_parallel
+def test_cache_access_time(tempdir, monkeypatch):
+    """Test that registry hits record the access time of cached modules,
+    and that the index lock of a live process is not removed"""
+    mesh = create_unit_square(MPI.COMM_SELF, 4, 4)
+    V = FunctionSpace(mesh, ("Lagrange", 1))
+    u, v = TrialFunction(V), TestFunction(V)
+    cache_dir = pathlib.Path(tempdir)
+    jit_options = {"cache_dir": cache_dir}
+    monkeypatch.setattr(jit, "_ACCESS_INTERVAL", 0.0)
+
+    jit.registry.cache_clear()
+    form(inner(u, v) * dx, jit_options=jit_options)
+    entry, = jit._read_cache_index(cache_dir).values()
+    library = cache_dir.joinpath(entry["file"])
+    os.utime(library, (0, 0))
+    form(inner(u, v) * dx, jit_options=jit_options)
+    assert library.stat().st_mtime > 0
+
+    lock = jit._CacheIndexLock(cache_dir)
+    assert lock.acquire()
+    try:
+        assert not jit._CacheIndexLock(cache_dir).acquire()
+    finally:
+        lock.release()
+
+
+def test_timing_report(tempdir):
+    """Test per-phase JIT timings"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 4, 4)
+    V = FunctionSpace(mesh, ("Lagrange", 3))
+    u, v = TrialFunction(V), TestFunction(V)
+
+    jit.registry.cache_clear()
+    jit.timing_report_clear()
+    form(inner(u.dx(0), v) * dx, jit_options={"cache_dir": pathlib.Path(tempdir)})
+    report = jit.timing_report()
+    assert len(report) == 1
+    assert report[0].kind == "form"
+    assert "signature" in report[0].phases
+    assert report[0].total >= report[0].phases["signature"]
+    assert common.timing("JIT: signature")[0] > 0
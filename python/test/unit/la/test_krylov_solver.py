@@ -11,7 +11,7 @@ import numpy as np
 import pytest
 
 import ufl
-from dolfinx import la
+from dolfinx import fem, la
 from dolfinx.fem import (Function, FunctionSpace, VectorFunctionSpace,
                          dirichletbc, form, locate_dofs_topological)
 from dolfinx.fem.petsc import (apply_lifting, assemble_matrix, assemble_vector,
@@ -58,6 +58,69 @@ def test_krylov_solver_lu():
     x.destroy()
 
 
+@pytest.mark.parametrize("solver", [la.cg, la.gmres, la.bicgstab])
+@pytest.mark.parametrize("pc", [None, la.jacobi, la.block_jacobi, la.chebyshev])
+def test_native_krylov_solver(solver, pc):
+    mesh = create_unit_square(MPI.COMM_WORLD, 12, 12)
+    V = VectorFunctionSpace(mesh, ("Lagrange", 1))
+    u, v = TrialFunction(V), TestFunction(V)
+    a = form(inner(grad(u), grad(v)) * dx + inner(u, v) * dx)
+    L = form(inner(ufl.as_vector((1.0, -2.0)), v) * dx)
+
+    A = fem.assemble_matrix(a)
+    A.finalize()
+    b = fem.assemble_vector(L)
+    b.scatter_reverse(la.InsertMode.add)
+
+    uh = Function(V)
+    M = None if pc is None else pc(A)
+    info = solver(A, b, uh.x, M, rtol=1.0e-10, num_threads=2)
+    assert info.converged
+    assert info.iterations > 0
+    assert info.residual_norm < 1.0e-10 * b.norm()
+
+    # Compare with a direct PETSc solve of the same system
+    A_petsc = la.create_petsc_matrix(A)
+    b_petsc = la.create_petsc_vector_wrap(b)
+    x_petsc = A_petsc.createVecRight()
+    ksp = PETSc.KSP().create(mesh.comm)
+    ksp.setOperators(A_petsc)
+    ksp.setType("preonly")
+    ksp.getPC().setType("lu")
+    ksp.solve(b_petsc, x_petsc)
+    n = V.dofmap.index_map.size_local * V.dofmap.index_map_bs
+    assert np.allclose(uh.x.array[:n], x_petsc.array_r, rtol=1.0e-7, atol=1.0e-10)
+
+    ksp.destroy()
+    A_petsc.destroy()
+    x_petsc.destroy()
+
+
+@pytest.mark.parametrize("num_threads", [2, 4])
+def test_threaded_mult(num_threads):
+    """Test the threaded matrix-vector product, which needs at least 1024
+    rows per thread, against the serial product"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 96, 96)
+    V = VectorFunctionSpace(mesh, ("Lagrange", 1))
+    u, v = TrialFunction(V), TestFunction(V)
+    A = fem.assemble_matrix(form(inner(grad(u), grad(v)) * dx + inner(u, v) * dx))
+    A.finalize()
+
+    bs = V.dofmap.index_map_bs
+    n = V.dofmap.index_map.size_local * bs
+    x = la.vector(A.index_map(1), bs)
+    x.array[:] = np.arange(x.array.size) % 7
+    x.scatter_forward()
+    y0, y1 = la.vector(A.index_map(0), bs), la.vector(A.index_map(0), bs)
+    A.mult(x, y0)
+    A.mult(x, y1, num_threads)
+    assert np.allclose(y1.array[:n], y0.array[:n])
+
+    # Accumulates into y
+    A.mult(x, y1, num_threads)
+    assert np.allclose(y1.array[:n], 2 * y0.array[:n])
+
+
 @pytest.mark.skip
 def test_krylov_samg_solver_elasticity():
     "Test PETScKrylovSolver with smoothed aggregation AMG"
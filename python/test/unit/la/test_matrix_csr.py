@@ -8,7 +8,7 @@
 import pytest
 import numpy as np
 from mpi4py import MPI
-from dolfinx.la import matrix_csr
+from dolfinx.la import matrix_csr, StorageMode
 from dolfinx.cpp.la import SparsityPattern, BlockMode
 from dolfinx.common import IndexMap
 
@@ -101,6 +101,30 @@ def test_set_blocked(dtype):
     assert (n1 == 54.0 * mpi_size)
 
 
+@pytest.mark.parametrize('dtype', [np.float32, np.float64, np.complex64, np.complex128])
+@pytest.mark.parametrize('block_mode', [BlockMode.compact, BlockMode.expanded])
+def test_symmetric_storage(dtype, block_mode):
+    im = IndexMap(MPI.COMM_WORLD, 3)
+    sp = SparsityPattern(MPI.COMM_WORLD, [im, im], [2, 2])
+    for i in range(3):
+        for j in range(3):
+            sp.insert(i, j)
+    sp.finalize()
+    mat0 = matrix_csr(sp, block_mode, dtype=dtype)
+    mat1 = matrix_csr(sp, block_mode, dtype=dtype, storage=StorageMode.symmetric)
+    assert mat1.storage_mode == StorageMode.symmetric
+    assert len(mat1.data) < len(mat0.data)
+
+    # Add a symmetric 4x4 block, using bs=1 and bs=2 data
+    A = np.arange(16, dtype=dtype).reshape(4, 4)
+    A = A + A.T
+    for mat in (mat0, mat1):
+        mat.add(A.ravel(), [2, 3, 4, 5], [2, 3, 4, 5], 1)
+        mat.add(A.ravel(), [0, 1], [0, 1], 2)
+    assert np.allclose(mat0.to_dense(), mat1.to_dense())
+    assert np.isclose(mat0.squared_norm(), mat1.squared_norm())
+
+
 @pytest.mark.parametrize('dtype', [np.float32, np.float64, np.complex64, np.complex128])
 def test_distributed_csr(dtype):
     # global size N
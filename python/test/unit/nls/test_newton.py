@@ -12,9 +12,11 @@ from dolfinx import cpp as _cpp
 from dolfinx import la
 from dolfinx.fem import (Function, FunctionSpace, dirichletbc, form,
                          locate_dofs_geometrical)
-from dolfinx.fem.petsc import (apply_lifting, assemble_matrix, assemble_vector,
+from dolfinx.fem.petsc import (NonlinearProblem, apply_lifting,
+                               assemble_matrix, assemble_vector,
                                create_matrix, create_vector, set_bc)
 from dolfinx.mesh import create_unit_square
+from dolfinx.nls.petsc import NewtonSolver
 from ufl import TestFunction, TrialFunction, derivative, dx, grad, inner
 
 from mpi4py import MPI
@@ -151,6 +153,35 @@ def test_nonlinear_pde():
     assert n > 0 and n < 6
 
 
+def test_nonlinear_pde_matrix_free():
+    """Test Newton solver with a matrix-free Jacobian"""
+    mesh = create_unit_square(MPI.COMM_WORLD, 12, 5)
+    V = FunctionSpace(mesh, ("Lagrange", 1))
+    bc = dirichletbc(PETSc.ScalarType(1.0),
+                     locate_dofs_geometrical(V, lambda x: np.logical_or(np.isclose(x[0], 0.0),
+                                                                        np.isclose(x[0], 1.0))), V)
+
+    def solve(matrix_free):
+        u = Function(V)
+        v = TestFunction(V)
+        F = inner(5.0, v) * dx - ufl.sqrt(u * u) * inner(grad(u), grad(v)) * dx - inner(u, v) * dx
+        problem = NonlinearProblem(F, u, [bc], matrix_free=matrix_free)
+        solver = NewtonSolver(MPI.COMM_WORLD, problem)
+        solver.rtol = 1.0e-10
+        ksp = solver.krylov_solver
+        ksp.setType("gmres")
+        ksp.getPC().setType("jacobi")
+        ksp.setTolerances(rtol=1.0e-12)
+        u.x.array[:] = 0.9
+        n, converged = solver.solve(u)
+        assert converged
+        assert n < 6
+        return u
+
+    u0, u1 = solve(False), solve(True)
+    assert np.allclose(u0.x.array, u1.x.array)
+
+
 def test_nonlinear_pde_snes():
     """Test Newton solver for a simple nonlinear PDE"""
     mesh = create_unit_square(MPI.COMM_WORLD, 12, 15)